@@ -1,7 +1,7 @@
 """Application layer: state machine, control composition, thread pipeline, display."""
 from app.control import ControlLoop, Telemetry
 from app.display import LcdReporter, format_lcd_lines
-from app.pipeline import LatestSlot, Pipeline
+from app.pipeline import LatestSlot, Pipeline, StageStats
 from app.remote import RemoteActions, RemoteListener
 from app.statemachine import FireContext, FireState, FireStateMachine
 
@@ -13,6 +13,7 @@ __all__ = [
     "Telemetry",
     "LatestSlot",
     "Pipeline",
+    "StageStats",
     "format_lcd_lines",
     "LcdReporter",
     "RemoteActions",
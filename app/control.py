@@ -12,8 +12,9 @@ Real settling/aiming behaviour is Pi-only truth.
 from __future__ import annotations
 
 import logging
+import time
 from dataclasses import dataclass
-from typing import Dict, Optional, Sequence
+from typing import Callable, Dict, Optional, Sequence
 
 from aim.calibrate import Calibration, apply_aim_offsets, apply_calibration
 from aim.controller import slew_toward
@@ -21,10 +22,11 @@ from aim.killzone import distance_to_center_px, is_in_kill_zone
 from actuate.servo import Axis, ServoController
 from app.statemachine import FireContext, FireState, FireStateMachine
 from config import Config
-from contracts import Track
-from strategy.scoring import score_track
+from contracts import FrameEnvelope, Track
+from strategy.scoring import score_tracks
 from strategy.selector import TargetSelector
-from track.predict import predict_lead
+from track.predict import measured_latency_s, predict_leads
+from track.table import TrackBatch
 
 logger = logging.getLogger(__name__)
 
@@ -40,14 +42,21 @@ class Telemetry:
     tilt_cmd_deg: Optional[float]
     in_killzone: bool
     would_fire: bool
+    # Age (ms since exposure) of the frame behind these tracks as each stage
+    # finished with it, ending at this control tick. None without an envelope.
+    frame_age_ms: Optional[Dict[str, float]] = None
+    lead_latency_s: float = 0.0          # measured latency added to the lead horizon
+    result_dropped: bool = False         # tracks older than predict.max_result_age_s
 
 
 class ControlLoop:
     def __init__(self, cfg: Config, servo: ServoController,
                  selector: TargetSelector, state_machine: FireStateMachine,
                  calibration: Optional[Calibration] = None,
-                 status_led=None, aux_marker=None, pump=None):
+                 status_led=None, aux_marker=None, pump=None,
+                 clock: Callable[[], float] = time.monotonic):
         self.cfg = cfg
+        self._clock = clock
         self.servo = servo
         self.selector = selector
         self.sm = state_machine
@@ -136,33 +145,54 @@ class ControlLoop:
             logger.info("target switch #%s -> #%s", self._last_selected, target_id)
         self._last_selected = target_id
 
-    def tick(self, tracks: Sequence[Track]) -> Telemetry:
-        tracks = list(tracks)
+    def tick(self, tracks: Sequence[Track],
+             frame: Optional[FrameEnvelope] = None) -> Telemetry:
+        """One control step. ``frame`` is the envelope the tracks were computed
+        from: it drives the age report and drops results past the age budget.
+        ``tracks`` is the tracker's ``TrackBatch`` (any ``Track`` sequence works)."""
+        tracks = TrackBatch.from_tracks(tracks)
         armed = self.sm.state is not FireState.SAFE
         pan_now, tilt_now = self.servo.last_angle(Axis.PAN), self.servo.last_angle(Axis.TILT)
+        now = self._clock()
+        ages = None
+        dropped = False
+        if frame is not None:
+            ages = frame.stage_ages_ms()
+            ages["control"] = frame.age_s(now) * 1e3
+            budget = self.cfg.predict.max_result_age_s
+            if tracks and budget > 0 and frame.age_s(now) > budget:
+                # Too old to aim at: behave as if nothing is in view rather than
+                # shoot at where the bird was.
+                logger.debug("dropping tracks from frame %d (%.0f ms old)",
+                             frame.seq, ages["control"])
+                tracks, dropped = TrackBatch.empty(), True
         if not tracks:
             self.selector.select([])
             self.sm.step(FireContext(has_target=False))
             self._note_target(None)
             self._update_indicators()
             return Telemetry(self.sm.state, 0, None, float("inf"), None,
-                             pan_now, tilt_now, False, False)
-
-        by_id: Dict[int, Track] = {t.id: t for t in tracks}
-        scored = [(t.id, score_track(t, self.cfg.killzone, self.cfg.strategy,
-                                     self._frame_w, self._frame_h)) for t in tracks]
-        target_id = self.selector.select(scored)
-        target = by_id.get(target_id)
-        if target is None:
+                             pan_now, tilt_now, False, False,
+                             frame_age_ms=ages, result_dropped=dropped)
+
+        scores = score_tracks(tracks, self.cfg.killzone, self.cfg.strategy,
+                              self._frame_w, self._frame_h)
+        target_id = self.selector.select(list(zip(tracks.ids.tolist(), scores.tolist())))
+        row = tracks.rows(tracks.ids == target_id)
+        if not len(row):
             self.sm.step(FireContext(has_target=False))
             self._note_target(None)
             self._update_indicators()
             return Telemetry(self.sm.state, len(tracks), None, float("inf"), None,
-                             pan_now, tilt_now, False, False)
+                             pan_now, tilt_now, False, False, frame_age_ms=ages)
 
         self._note_target(target_id)
-        # Predict the lead point and aim there (calibration feed-forward).
-        px, py = predict_lead(target, self.cfg.predict.lead_time_s, self.cfg.predict.fps)
+        # Predict the lead point and aim there (calibration feed-forward). The
+        # target's position is already as old as its frame: lead across that too.
+        p = self.cfg.predict
+        latency_s = measured_latency_s(row[0], now) if p.compensate_latency else 0.0
+        px, py = predict_leads(row, p.lead_time_s, p.fps, latency_s, p.model,
+                               p.min_history, p.history_decay)[0].tolist()
         pan_t, tilt_t = apply_aim_offsets(
             *apply_calibration(self.cal, px, py),
             parallax_pan_deg=self.cfg.aim.parallax_pan_deg,
@@ -191,4 +221,5 @@ class ControlLoop:
             aim_error_px=aim_error_px, predicted_xy=(px, py),
             pan_cmd_deg=pan_cmd, tilt_cmd_deg=tilt_cmd,
             in_killzone=in_kz, would_fire=self.sm.last_would_fire,
+            frame_age_ms=ages, lead_latency_s=latency_s,
         )
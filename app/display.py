@@ -12,6 +12,7 @@ import threading
 from typing import Callable, Optional, Tuple
 
 from actuate.lcd import LCD_WIDTH, StatusLcd
+from app.pipeline import StageStats
 from app.statemachine import FireState
 
 logger = logging.getLogger(__name__)
@@ -56,7 +57,13 @@ def format_lcd_lines(state: FireState, telemetry=None, *, armed: bool = False,
 
 
 class LcdReporter:
-    """Renders latest telemetry to the LCD at a fixed low rate (Pi-side thread)."""
+    """Renders latest telemetry to the LCD at a fixed low rate (Pi-side thread).
+
+    Blocks on the telemetry slot's ``wait_for_newer`` and only writes I2C when a
+    fresh value arrived: a stalled control loop freezes the spinner instead of
+    the display pretending to be alive, and a boot message stays up until the
+    first telemetry lands.
+    """
 
     def __init__(self, lcd: StatusLcd, telemetry_slot, refresh_hz: float = 4.0,
                  armed_getter: Optional[Callable[[], bool]] = None,
@@ -71,6 +78,11 @@ class LcdReporter:
         self._running = False
         self._spin = 0
         self._thread: Optional[threading.Thread] = None
+        self.stats = StageStats()
+
+    def set_refresh_hz(self, refresh_hz: float) -> None:
+        """Change the refresh rate live (standby slows it; takes effect next tick)."""
+        self._period_s = 1.0 / max(0.1, refresh_hz)
 
     def message(self, line1: str, line2: str = "") -> None:
         """Push a one-off lifecycle message (boot, IP, disarm)."""
@@ -87,9 +99,15 @@ class LcdReporter:
         self._running = False
 
     def _loop(self) -> None:
+        last_seq = 0
         while self._running:
-            tel = self._slot.get()
-            state = tel.state if tel is not None else FireState.SEARCHING
+            seq, tel = self._slot.wait_for_newer(last_seq, self._period_s)
+            if tel is None:
+                self.stats.duplicates_avoided += 1    # nothing new: skip the I2C write
+                continue
+            self.stats.consumed(seq, last_seq)
+            last_seq = seq
+            state = tel.state
             try:
                 l1, l2 = format_lcd_lines(state, tel, armed=self._armed(),
                                           fps=self._fps(), shots=self._shots(),
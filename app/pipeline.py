@@ -10,10 +10,18 @@ from __future__ import annotations
 import logging
 import threading
 import time
-from typing import Generic, Optional, TypeVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar, Union
 
 from app.control import ControlLoop
 from app.statemachine import FireState
+from capture import roi_around
+from contracts import FrameEnvelope, TelemetryStats, Track
+from detect.pool import PooledDetector
+from detect.roi import LockOnDetector
+from errors import EndOfStream
+from track.predict import predict_lead
+from track.kalman import KalmanTracker
 from track.tracker import IouTracker
 
 logger = logging.getLogger(__name__)
@@ -22,20 +30,107 @@ T = TypeVar("T")
 
 
 class LatestSlot(Generic[T]):
-    """Latest-value-wins buffer. Drop stale values; read the present."""
+    """Latest-value-wins buffer. Drop stale values; read the present.
+
+    Every ``put`` bumps a monotonically increasing sequence number (0 = never
+    written), so a consumer can tell a fresh value from one it has already
+    handled and block in ``wait_for_newer`` instead of spinning or redoing work.
+    """
 
     def __init__(self) -> None:
-        self._lock = threading.Lock()
+        self._cond = threading.Condition(threading.Lock())
         self._value: Optional[T] = None
+        self._seq = 0
 
-    def put(self, value: T) -> None:
-        with self._lock:
+    def put(self, value: T) -> int:
+        """Store ``value`` (overwriting any unread one); returns its sequence number."""
+        with self._cond:
             self._value = value
+            self._seq += 1
+            self._cond.notify_all()
+            return self._seq
 
     def get(self) -> Optional[T]:
-        with self._lock:
+        with self._cond:
             return self._value
 
+    @property
+    def seq(self) -> int:
+        """Sequence number of the current value (0 until the first ``put``)."""
+        with self._cond:
+            return self._seq
+
+    def get_with_seq(self) -> Tuple[int, Optional[T]]:
+        """Non-blocking ``(seq, value)`` read, taken atomically."""
+        with self._cond:
+            return self._seq, self._value
+
+    def wait_for_newer(self, last_seq: int,
+                       timeout: Optional[float] = None) -> Tuple[int, Optional[T]]:
+        """Block until a value newer than ``last_seq`` is put, or ``timeout`` s pass.
+
+        Returns ``(seq, value)`` for the newest value; on timeout returns
+        ``(last_seq, None)`` so the caller can tell "nothing new" from a fresh read.
+        Values put in between are skipped (latest wins) — ``seq - last_seq - 1``
+        of them.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > last_seq, timeout):
+                return last_seq, None
+            return self._seq, self._value
+
+
+@dataclass
+class TrackedFrame:
+    """One inference result: the tracks plus the envelope they were computed from.
+    ``tracks`` is the tracker's ``TrackBatch`` snapshot (or any ``Track`` list)."""
+
+    frame: Optional[FrameEnvelope]
+    tracks: Sequence[Track] = field(default_factory=list)
+
+
+class StageStats(TelemetryStats):
+    """Per-stage consumer counters for the latest-wins slots.
+
+    Each stage's counters are written only by that stage's own thread (plain int
+    bumps) and read best-effort by telemetry; no lock needed. ``processed`` is
+    the work actually done, ``stale`` the values overwritten before the stage got
+    to them, ``duplicates_avoided`` the times it blocked instead of redoing the
+    value it had already handled (the old spin-and-reinfer behaviour), ``late``
+    the values it dropped for exceeding the result-age budget.
+    """
+
+    __slots__ = ("processed", "stale", "duplicates_avoided", "late", "errors")
+
+    def __init__(self) -> None:
+        self.processed = 0
+        self.stale = 0
+        self.duplicates_avoided = 0
+        self.late = 0
+        self.errors = 0
+
+    def consumed(self, seq: int, last_seq: int) -> None:
+        """Record processing ``seq`` after ``last_seq`` (counts the skipped gap)."""
+        self.processed += 1
+        if seq > last_seq + 1:
+            self.stale += seq - last_seq - 1
+
+
+class StandbyStats(TelemetryStats):
+    """Standby counters: how long the turret idled and how fast it woke."""
+
+    __slots__ = ("standby", "entered", "wakes", "wake_reason", "idle_s",
+                 "wake_latency_ms", "wake_latency_max_ms")
+
+    def __init__(self) -> None:
+        self.standby = False
+        self.entered = 0
+        self.wakes = 0
+        self.wake_reason = ""               # motion | operator
+        self.idle_s = 0.0                   # total time spent in standby (finished spans)
+        self.wake_latency_ms = 0.0          # last wake: trigger -> first full-rate result
+        self.wake_latency_max_ms = 0.0
+
 
 class Pipeline:
     """Wires capture -> inference -> control threads. Started on the Pi only.
@@ -43,21 +138,84 @@ class Pipeline:
     The control thread is the **only** servo mover. Each loop isolates per-frame
     failures: a bad frame or a model hiccup skips the tick; an actuation error
     disarms via the control loop's state machine.
+
+    Inference blocks in ``LatestSlot.wait_for_newer`` rather than polling, so it
+    runs once per captured frame (never twice on the same one). Control ticks at a
+    fixed ``tick_hz`` on the newest tracks, coasting on the last ones if inference
+    stalls or the motion gate skips frames. ``stats()`` exposes the per-stage counters.
+
+    Frames travel as ``FrameEnvelope``s stamped at each stage; frames already older
+    than ``predict.max_result_age_s`` when inference picks them up are dropped, and
+    the control loop drops stale tracks against the same budget.
+
+    ``pipelined=True`` splits inference over two threads joined by one more
+    latest-wins slot: the inference thread only feeds and invokes the model
+    (``detector.invoke``) while the decode thread runs ``detector.decode`` and the
+    tracker on the previous frame. At most one frame is in each stage plus one
+    waiting between them; results stay in capture order, and a decode thread that
+    falls behind skips to the newest raw output (counted as ``stale``).
+
+    A ``PooledDetector`` (several Edge TPUs) always runs that way: the inference
+    thread dispatches frames to the pool's device workers and the pool releases
+    results, in capture order, into the same slot the decode thread tracks from.
+
+    With a ``LockOnDetector`` the inference thread aims each frame before feeding
+    it: while control has a target selected, ``roi_center_px`` is set to where that
+    track is predicted to be at the frame's capture time, except on every
+    ``lock_on_scan_every``-th frame, which scans the whole field.
+
+    With a ``motion_gate`` (``app.detection_mode: motion_gated``) each feed thread
+    asks the gate first and drops still frames before they reach the detector;
+    the gate always passes frames while tracks are alive.
+
+    With ``app.standby_enabled`` the control thread puts the turret in standby after
+    ``standby_after_s`` without a track: the detector is paused (feed threads only
+    run a motion check), capture, control and LCD slow down and the servos relax.
+    Motion in a frame wakes it and that same frame is detected; ``wake()`` (any
+    operator command) wakes it immediately.
+
+    With ``camera.dynamic_roi`` every published result also steers the sensor
+    zoom (``capture.set_roi``) onto the selected target's latest box, falling back
+    to the static ``camera.roi`` with nothing selected; the capture rate-limits it.
     """
 
-    def __init__(self, capture, detector, control: ControlLoop, tracker: IouTracker,
-                 tick_hz: float = 30.0, reporter=None):
+    _WAIT_S = 0.5               # slot-wait timeout so loops notice stop()
+    _CAPTURE_RETRY_S = 0.05     # back-off after a failed read (no hot error spin)
+
+    def __init__(self, capture, detector, control: ControlLoop,
+                 tracker: Union[IouTracker, KalmanTracker],
+                 tick_hz: float = 30.0, reporter=None, pipelined: bool = False,
+                 motion_gate=None):
         self.capture = capture
         self.detector = detector
         self.control = control
         self.tracker = tracker
         self.reporter = reporter            # optional LcdReporter (Pi-side)
+        self.pooled = isinstance(detector, PooledDetector)
+        self.pipelined = pipelined or self.pooled
+        self.lock_on = isinstance(detector, LockOnDetector)
+        self.motion_gate = motion_gate      # optional MotionGate (motion_gated mode)
+        self.standby = False
+        self.standby_stats = StandbyStats()
+        self._standby_lock = threading.Lock()
+        self._wake_event = threading.Event()    # interrupts the standby waits
+        self._wake_gate = motion_gate       # standby motion check (own gate in full_frame mode)
+        self._idle_since: Optional[float] = None
+        self._standby_t = 0.0
+        self._wake_t: Optional[float] = None
+        self._lock_frames = 0               # frames since the last full scan while locked
         self._period_s = 1.0 / tick_hz
-        self.latest_frame: "LatestSlot" = LatestSlot()
-        self.latest_tracks: "LatestSlot" = LatestSlot()
+        self.latest_frame: "LatestSlot[FrameEnvelope]" = LatestSlot()
+        self.latest_raw: "LatestSlot[Tuple[FrameEnvelope, Any]]" = LatestSlot()
+        self.latest_tracks: "LatestSlot[TrackedFrame]" = LatestSlot()
         self.latest_telemetry: "LatestSlot" = LatestSlot()
+        self.capture_stats = StageStats()
+        self.inference_stats = StageStats()
+        self.decode_stats = StageStats()
+        self.control_stats = StageStats()
         self.shots = 0                      # FIRING edges, surfaced on the LCD
         self._fps = 0.0
+        self._last_result_t: Optional[float] = None
         self._prev_state = None
         self._running = False
         self._threads = []
@@ -66,56 +224,368 @@ class Pipeline:
     def fps(self) -> float:
         return self._fps
 
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-stage counters (captured / inferred / stale / duplicates avoided)."""
+        out = {
+            "capture": self.capture_stats.as_dict(),
+            "inference": self.inference_stats.as_dict(),
+            "control": self.control_stats.as_dict(),
+        }
+        if self.pipelined:
+            out["decode"] = self.decode_stats.as_dict()
+        if getattr(self.capture, "exposure_stats", None) is not None:
+            out["exposure"] = self.capture.exposure_stats.as_dict()
+        if getattr(self.detector, "pool_stats", None) is not None:
+            out["pool"] = self.detector.pool_stats.as_dict()
+        if getattr(self.detector, "fallback_stats", None) is not None:
+            out["fallback"] = self.detector.fallback_stats.as_dict()
+        if getattr(self.detector, "tile_stats", None) is not None:
+            out["tiles"] = self.detector.tile_stats.as_dict()
+        if self.lock_on:
+            out["lock_on"] = self.detector.roi_stats.as_dict()
+        if self.motion_gate is not None:
+            out["motion"] = self.motion_gate.stats.as_dict()
+        if self._standby_enabled() or self.standby_stats.entered:
+            st = self.standby_stats.as_dict()
+            if self.standby:
+                st["idle_s"] += time.monotonic() - self._standby_t
+            out["standby"] = st
+        if self.reporter is not None and getattr(self.reporter, "stats", None) is not None:
+            out["lcd"] = self.reporter.stats.as_dict()
+        return out
+
     def start(self) -> None:
         if self._running:
             return
         self._running = True
         if self.reporter is not None:
             self.reporter.start()
+        if self.pooled:
+            self.detector.start(self._on_pool_result)
         self._threads = [
             threading.Thread(target=self._capture_loop, name="capture", daemon=True),
-            threading.Thread(target=self._inference_loop, name="inference", daemon=True),
+            *self._inference_threads(),
             threading.Thread(target=self._control_loop, name="control", daemon=True),
         ]
         for t in self._threads:
             t.start()
 
+    def _inference_threads(self) -> List[threading.Thread]:
+        """The frame -> tracks thread(s) for the configured inference mode."""
+        if not self.pipelined:
+            return [threading.Thread(target=self._inference_loop, name="inference",
+                                     daemon=True)]
+        feed = self._dispatch_loop if self.pooled else self._invoke_loop
+        return [
+            threading.Thread(target=feed, name="inference", daemon=True),
+            threading.Thread(target=self._decode_loop, name="decode", daemon=True),
+        ]
+
     def stop(self) -> None:
         self._running = False
         if self.reporter is not None:
             self.reporter.stop()
+        if self.pooled:
+            self.detector.stop()
 
     def _capture_loop(self) -> None:
+        # read_frame blocks on the camera's own frame cadence (picamera2
+        # capture_array / cv2 read), which is the pacing; only errors back off.
         while self._running:
+            t0 = time.monotonic()
             try:
-                self.latest_frame.put(self.capture.read_frame())
+                envelope = self.capture.read()
+                envelope.stamp("capture", time.monotonic())
+                self.latest_frame.put(envelope)
+                self.capture_stats.processed += 1
+                if self.standby:
+                    # the sensor is slowed too where it can; this paces the rest
+                    period = 1.0 / self.control.cfg.app.standby_capture_fps
+                    self._wake_event.wait(max(0.0, t0 + period - time.monotonic()))
+            except EndOfStream:
+                logger.info("capture source finished; capture thread stopping")
+                return
             except Exception:
+                self.capture_stats.errors += 1
                 logger.warning("frame capture skipped", exc_info=True)
+                threading.Event().wait(self._CAPTURE_RETRY_S)
+
+    def _take_fresh(self, slot: LatestSlot, last_seq: int,
+                    stats: StageStats) -> Tuple[int, Any]:
+        """Block for a value newer than ``last_seq``; count it. ``(last_seq, None)`` on timeout."""
+        waited = slot.seq == last_seq
+        seq, value = slot.wait_for_newer(last_seq, self._WAIT_S)
+        if value is None:
+            return last_seq, None
+        if waited:
+            stats.duplicates_avoided += 1   # the old loop re-inferred the last frame here
+        stats.consumed(seq, last_seq)
+        return seq, value
 
     def _inference_loop(self) -> None:
-        last = None
+        last_seq = 0
+        stats = self.inference_stats
         while self._running:
-            frame = self.latest_frame.get()
-            if frame is None:
+            last_seq, envelope = self._take_fresh(self.latest_frame, last_seq, stats)
+            if envelope is None:
+                continue
+            if self._too_old(envelope):
+                stats.late += 1
+                continue
+            if not self._admit(envelope):
                 continue
             try:
-                detections = self.detector.infer(frame)
-                self.latest_tracks.put(self.tracker.update(detections))
-                now = time.monotonic()
-                if last is not None:
-                    dt = now - last
-                    if dt > 0:
-                        inst = 1.0 / dt
-                        self._fps = inst if self._fps == 0 else 0.8 * self._fps + 0.2 * inst
-                last = now
+                self._aim_roi(envelope)
+                envelope.stamp("inference", time.monotonic())
+                detections = self.detector.infer(envelope)
+                envelope.stamp("detect", time.monotonic())
+                self._publish(envelope, detections)
             except Exception:
+                stats.errors += 1
                 logger.warning("inference tick skipped", exc_info=True)
 
+    def _invoke_loop(self) -> None:
+        # Pipelined mode, device half: this thread is the only interpreter user.
+        last_seq = 0
+        stats = self.inference_stats
+        while self._running:
+            last_seq, envelope = self._take_fresh(self.latest_frame, last_seq, stats)
+            if envelope is None:
+                continue
+            if self._too_old(envelope):
+                stats.late += 1
+                continue
+            if not self._admit(envelope):
+                continue
+            try:
+                self._aim_roi(envelope)
+                envelope.stamp("inference", time.monotonic())
+                raw = self.detector.invoke(envelope)
+                envelope.stamp("invoke", time.monotonic())
+                self.latest_raw.put((envelope, raw))
+            except Exception:
+                stats.errors += 1
+                logger.warning("inference tick skipped", exc_info=True)
+
+    def _admit(self, envelope: FrameEnvelope) -> bool:
+        """Should this frame reach the detector? (standby wake check, motion gate)"""
+        if self.standby:
+            return self._wake_on_motion(envelope)
+        return self._gate(envelope)
+
+    def _gate(self, envelope: FrameEnvelope) -> bool:
+        """Motion-gated mode: False = a still frame with nothing tracked, skip it."""
+        if self.motion_gate is None:
+            return True
+        tracked = self.latest_tracks.get()
+        alive = tracked is not None and bool(tracked.tracks)
+        return self.motion_gate.update(envelope, tracks_alive=alive).run
+
+    # ---- standby ----
+
+    def _standby_enabled(self) -> bool:
+        return self.control is not None and self.control.cfg.app.standby_enabled
+
+    def _check_idle(self, tracks: List[Track], now: float) -> None:
+        """Control thread: enter standby after ``standby_after_s`` with no tracks."""
+        if tracks:
+            self._idle_since = None
+        elif self._idle_since is None:
+            self._idle_since = now
+        elif (not self.standby and self._standby_enabled()
+              and now - self._idle_since >= self.control.cfg.app.standby_after_s):
+            self.enter_standby()
+
+    def enter_standby(self) -> None:
+        """Pause detection, slow capture / control / LCD and relax the servos."""
+        app = self.control.cfg.app
+        with self._standby_lock:
+            if self.standby:
+                return
+            self._wake_event.clear()
+            self.standby = True
+            self._standby_t = time.monotonic()
+            self.standby_stats.standby = True
+            self.standby_stats.entered += 1
+        logger.info("standby: no tracks for %.0f s", app.standby_after_s)
+        if self._wake_gate is not None:
+            self._wake_gate.reset()
+        self._retune(app.standby_capture_fps, app.standby_lcd_hz)
+        try:
+            self.control.servo.disarm()
+        except Exception:
+            logger.warning("servo relax on standby failed", exc_info=True)
+
+    def wake(self, reason: str = "operator", trigger_t: Optional[float] = None) -> bool:
+        """Leave standby now (False if not in it). ``trigger_t`` (monotonic) starts the
+        wake-latency clock; default now."""
+        with self._standby_lock:
+            if not self.standby:
+                return False
+            now = time.monotonic()
+            self.standby = False
+            st = self.standby_stats
+            st.standby = False
+            st.wakes += 1
+            st.wake_reason = reason
+            st.idle_s += now - self._standby_t
+            self._wake_t = trigger_t if trigger_t is not None else now
+            self._idle_since = now              # a fresh idle timeout before the next standby
+            self._wake_event.set()
+        logger.info("standby: woken by %s", reason)
+        self._retune(None, self.control.cfg.app.lcd_refresh_hz)
+        return True
+
+    def _retune(self, capture_fps: Optional[float], lcd_hz: float) -> None:
+        """Capture frame rate (None = normal) and LCD refresh, where supported."""
+        set_rate = getattr(self.capture, "set_frame_rate", None)
+        if callable(set_rate):
+            try:
+                set_rate(capture_fps)
+            except Exception:
+                logger.warning("capture frame-rate change failed", exc_info=True)
+        set_hz = getattr(self.reporter, "set_refresh_hz", None)
+        if callable(set_hz):
+            set_hz(lcd_hz)
+
+    def _wake_on_motion(self, envelope: FrameEnvelope) -> bool:
+        """Standby feed check: True (and awake) when this frame shows motion."""
+        if self._wake_gate is None:
+            from detect.motion import MotionGate
+            self._wake_gate = MotionGate(self.control.cfg.app)
+        if self._wake_gate.update(envelope).reason != "motion":
+            return False
+        return self.wake("motion", envelope.capture_t) or not self.standby
+
+    def _aim_roi(self, envelope: FrameEnvelope) -> None:
+        """Lock-on: point this frame's inference at the selected target, or scan."""
+        if not self.lock_on:
+            return
+        envelope.roi_center_px = None
+        d = self.detector.cfg
+        telemetry = self.latest_telemetry.get()
+        tracked = self.latest_tracks.get()
+        target_id = telemetry.selected_target_id if telemetry is not None else None
+        target = next((t for t in tracked.tracks if t.id == target_id), None) \
+            if tracked is not None and target_id is not None else None
+        if target is None or target.time_since_update > d.lock_on_max_coast_frames:
+            self._lock_frames = 0           # nothing (still) locked: scan
+            return
+        self._lock_frames += 1
+        if self._lock_frames % d.lock_on_scan_every == 0:
+            return                          # periodic full scan
+        latency_s = (envelope.capture_t - target.capture_t
+                     if target.capture_t is not None else 0.0)
+        envelope.roi_center_px = predict_lead(target, 0.0, self.control.cfg.predict.fps,
+                                              latency_s=max(0.0, latency_s))
+
+    def _dispatch_loop(self) -> None:
+        # Pooled mode: the devices' own threads invoke (and decode); this one just
+        # keeps them fed, blocking while every device is busy.
+        last_seq = 0
+        stats = self.inference_stats
+        while self._running:
+            last_seq, envelope = self._take_fresh(self.latest_frame, last_seq, stats)
+            if envelope is None:
+                continue
+            if self._too_old(envelope):
+                stats.late += 1
+                continue
+            if not self._admit(envelope):
+                continue
+            envelope.stamp("inference", time.monotonic())
+            while self._running and not self.detector.submit(envelope, self._WAIT_S):
+                pass
+
+    def _on_pool_result(self, envelope: FrameEnvelope, detections: List) -> None:
+        # Called by the pool in capture order; the decode thread tracks from here
+        # (``PooledDetector.decode`` passes the detections straight through).
+        envelope.stamp("invoke", time.monotonic())
+        self.latest_raw.put((envelope, detections))
+
+    def _decode_loop(self) -> None:
+        # Pipelined mode, host half: decode + track frame N while N+1 is invoked.
+        last_seq = 0
+        stats = self.decode_stats
+        while self._running:
+            last_seq, item = self._take_fresh(self.latest_raw, last_seq, stats)
+            if item is None:
+                continue
+            envelope, raw = item
+            if self._too_old(envelope):
+                stats.late += 1
+                continue
+            try:
+                detections = self.detector.decode(raw)
+                envelope.stamp("detect", time.monotonic())
+                self._publish(envelope, detections)
+            except Exception:
+                stats.errors += 1
+                logger.warning("decode tick skipped", exc_info=True)
+
+    def _publish(self, envelope: FrameEnvelope, detections) -> None:
+        """Track ``detections``, hand the result to control, update the fps EMA."""
+        tracks = self.tracker.update(detections, envelope)
+        now = time.monotonic()
+        envelope.stamp("track", now)
+        self.latest_tracks.put(TrackedFrame(envelope, tracks))
+        self._steer_zoom(tracks)
+        if self._wake_t is not None:
+            ms = (now - self._wake_t) * 1e3
+            st = self.standby_stats
+            st.wake_latency_ms = ms
+            st.wake_latency_max_ms = max(st.wake_latency_max_ms, ms)
+            self._wake_t = None
+        if self._last_result_t is not None:
+            dt = now - self._last_result_t
+            if dt > 0:
+                inst = 1.0 / dt
+                self._fps = inst if self._fps == 0 else 0.8 * self._fps + 0.2 * inst
+        self._last_result_t = now
+
+    def _steer_zoom(self, tracks: List[Track]) -> None:
+        """Dynamic sensor ROI: zoom onto the selected target, else the static roi."""
+        cam = self.control.cfg.camera if self.control is not None else None
+        if cam is None or not cam.dynamic_roi or not hasattr(self.capture, "set_roi"):
+            return
+        telemetry = self.latest_telemetry.get()
+        target_id = telemetry.selected_target_id if telemetry is not None else None
+        target = next((t for t in tracks if t.id == target_id), None) \
+            if target_id is not None else None
+        if target is None:
+            self.capture.set_roi(cam.roi)
+            return
+        self.capture.set_roi(roi_around(target.cx, target.cy, cam.capture_width_px,
+                                        cam.capture_height_px, cam.dynamic_roi_size))
+
+    def _too_old(self, envelope: FrameEnvelope) -> bool:
+        budget = self.control.cfg.predict.max_result_age_s if self.control is not None else 0.0
+        return budget > 0 and envelope.age_s(time.monotonic()) > budget
+
     def _control_loop(self) -> None:
+        tracked = TrackedFrame(None)
+        last_seq = 0
+        last_tick = 0.0
+        stats = self.control_stats
         while self._running:
-            tracks = self.latest_tracks.get() or []
+            # Fixed cadence at tick_hz (max_step_deg is per tick, so the slew rate
+            # depends on it): wait out the period, then take the newest tracks
+            # without blocking. With none fresh, coast on the last tracks so slew
+            # and the state machine keep advancing at the same rate.
+            standby = self.standby
+            period = 1.0 / self.control.cfg.app.standby_tick_hz if standby else self._period_s
+            wait = self._wake_event.wait if standby else threading.Event().wait
+            wait(max(0.0, last_tick + period - time.monotonic()))
+            seq, fresh = self.latest_tracks.wait_for_newer(last_seq, 0.0)
+            if fresh is not None:
+                stats.consumed(seq, last_seq)
+                last_seq, tracked = seq, fresh
+            last_tick = time.monotonic()
+            self._check_idle(tracked.tracks, last_tick)
             try:
-                telemetry = self.control.tick(tracks)
+                telemetry = self.control.tick(tracked.tracks, tracked.frame)
+                if telemetry.result_dropped:
+                    stats.late += 1
                 if telemetry.state is not self._prev_state:
                     logger.info("state %s -> %s",
                                 self._prev_state.value if self._prev_state else "init",
@@ -128,6 +598,6 @@ class Pipeline:
                 self._prev_state = telemetry.state
                 self.latest_telemetry.put(telemetry)
             except Exception:
+                stats.errors += 1
                 logger.exception("control tick failed -> SAFE")
                 self.control.sm.enter_safe()
-            threading.Event().wait(self._period_s)  # non-blocking pacing
@@ -28,7 +28,10 @@ from dataclasses import asdict, fields
 from typing import Any, Dict, Optional
 
 from actuate.servo import Axis
+from app.pipeline import StageStats
 from config import _SECTIONS
+from contracts import FrameEnvelope
+from detect.base import frame_array
 from errors import ConfigError
 
 logger = logging.getLogger(__name__)
@@ -81,7 +84,8 @@ class TurretWebController:
         self.control = control
         self.streamer = streamer            # optional UsbStreamer (Pi-side), may be None
         self.jog_step_deg = jog_step_deg
-        self._jpeg_cache = None             # (monotonic_t, bytes) for the detection view
+        self._jpeg_cache = None             # (monotonic_t, frame_seq, bytes) for the detection view
+        self.jpeg_stats = StageStats()      # detection-view encodes vs re-used frames
         self._cal_samples = []              # [(cx, cy, pan_deg, tilt_deg)] calibration points
 
 
@@ -91,7 +95,8 @@ class TurretWebController:
         from app.statemachine import FireState
 
         t = self.pipeline.latest_telemetry.get()
-        tracks = self.pipeline.latest_tracks.get() or []
+        tracked = self.pipeline.latest_tracks.get()
+        tracks = tracked.tracks if tracked is not None else []
         out: Dict[str, Any] = {
             "fps": round(float(self.pipeline.fps), 2),
             "shots": int(self.pipeline.shots),
@@ -118,6 +123,9 @@ class TurretWebController:
                 "tilt_cmd_deg": _finite(t.tilt_cmd_deg),
                 "in_killzone": t.in_killzone,
                 "would_fire": t.would_fire,
+                "frame_age_ms": ({k: round(v, 1) for k, v in t.frame_age_ms.items()}
+                                 if t.frame_age_ms else None),
+                "lead_latency_s": round(t.lead_latency_s, 4),
             })
         else:
             out["state"] = self.control.sm.state.value
@@ -127,6 +135,9 @@ class TurretWebController:
             "port": self.cfg.stream.port,
         }
         out["detection_video"] = {"enabled": bool(self.cfg.app.detection_video_enabled)}
+        stages = self.pipeline.stats()
+        stages["web_jpeg"] = self.jpeg_stats.as_dict()
+        out["pipeline"] = stages
         # Geometry for the tactical display (detection-frame pixel space).
         out["frame"] = {"w": int(self.cfg.camera.capture_width_px),
                         "h": int(self.cfg.camera.capture_height_px)}
@@ -146,23 +157,37 @@ class TurretWebController:
 
     def detection_jpeg(self) -> Optional[bytes]:
         """JPEG of the raw lores frame the detector sees (debug). None when disabled
-        / no frame. Rate-capped server-side so a fast client can't starve detection.
+        / no frame. Rate-capped server-side so a fast client can't starve detection,
+        and keyed on the frame's slot sequence so the same frame is never re-encoded.
         """
         if not self.cfg.app.detection_video_enabled:
             return None
         min_dt = 1.0 / max(0.5, float(self.cfg.app.detection_video_max_fps))
         now = time.monotonic()
         if self._jpeg_cache is not None and (now - self._jpeg_cache[0]) < min_dt:
-            return self._jpeg_cache[1]
-        frame = self.pipeline.latest_frame.get()
-        if frame is None:
+            return self._jpeg_cache[2]
+        seq, envelope = self.pipeline.latest_frame.get_with_seq()
+        if envelope is None:
             return None
+        if self._jpeg_cache is not None and self._jpeg_cache[1] == seq:
+            self.jpeg_stats.duplicates_avoided += 1
+            return self._jpeg_cache[2]
         from app.debugview import encode_jpeg
-        data = encode_jpeg(frame, self.cfg.app.detection_video_quality)
+        data = encode_jpeg(self._upright(envelope), self.cfg.app.detection_video_quality)
         if data is not None:
-            self._jpeg_cache = (now, data)
+            self.jpeg_stats.consumed(seq, self._jpeg_cache[1] if self._jpeg_cache else 0)
+            self._jpeg_cache = (now, seq, data)
         return data
 
+    @staticmethod
+    def _upright(envelope) -> Any:
+        """The detection frame as a human sees it: rotated upright (the detection
+        path keeps sensor orientation and rotates boxes instead)."""
+        if isinstance(envelope, FrameEnvelope):
+            from capture import upright_frame
+            return upright_frame(envelope)
+        return frame_array(envelope)
+
     def turret_state(self) -> Dict[str, str]:
         """v1-compatible: 'Enabled' when armed (auto-tracking), else 'Disabled'."""
         from app.statemachine import FireState
@@ -179,20 +204,28 @@ class TurretWebController:
         (``pipeline.latest_frame``). Runs on the web thread so it never stalls
         control; the write is non-critical — any error is reported, not raised.
         """
-        frame = self.pipeline.latest_frame.get()
-        if frame is None:
+        envelope = self.pipeline.latest_frame.get()
+        if envelope is None:
             return {"ok": False, "error": "no frame available yet"}
         from app.snapshots import save_frame
         try:
-            path = save_frame(self.cfg.app.snapshot_dir, frame)
+            path = save_frame(self.cfg.app.snapshot_dir, self._upright(envelope))
         except Exception as exc:  # noqa: BLE001 — snapshot I/O is non-critical
             logger.warning("snapshot save failed", exc_info=True)
             return {"ok": False, "error": str(exc)}
         logger.info("snapshot saved: %s", path)
         return {"ok": True, "command": "save_snapshot", "path": path}
 
+    def _wake(self) -> bool:
+        """Any operator command brings the pipeline out of standby first."""
+        wake = getattr(self.pipeline, "wake", None)
+        return bool(wake("operator")) if callable(wake) else False
+
     def command(self, code: Optional[str]) -> Dict[str, Any]:
         code = (code or "").strip()
+        woke = self._wake()
+        if code == "wake":
+            return {"ok": True, "command": code, "woke": woke}
         if code in ("arm", "enable_turret"):
             self.control.sm.reset()
         elif code in ("disarm", "disable_turret"):
@@ -246,6 +279,7 @@ class TurretWebController:
         from app.statemachine import FireState
 
         code = (code or "").strip()
+        self._wake()
         if code not in _JOG:
             return {"ok": False, "error": f"unknown control: {code!r}"}
         if self.control.sm.state is not FireState.SAFE:
@@ -355,7 +389,7 @@ class TurretWebController:
         except (TypeError, ValueError):
             return {"ok": False, "error": "rotation_deg must be one of 0, 90, 180, 270"}
         old = self.cfg.camera.rotation_deg
-        self.cfg.camera.rotation_deg = deg     # in-place; PiCamCapture reads it each frame
+        self.cfg.camera.rotation_deg = deg     # in-place; PiCamCapture stamps it on each frame
         try:
             self.cfg.validate()
         except ConfigError as exc:
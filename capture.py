@@ -1,25 +1,63 @@
 """Camera capture abstractions. Hardware imports are lazy (Pi-only truth).
 
-Two cameras, two roles (never crossed): the **Pi Camera** is the detection source
-(picamera2 lores **YUV420** on Pi 4 — RGB lores is Pi 5 only — sized to the model
-input to avoid a resize cost); the **USB webcam** is the live-stream source. The
-detection path reads the Y plane (greyscale) at model-input resolution.
+The **Pi Camera** is the detection source (picamera2 lores **YUV420** on Pi 4 —
+RGB lores is Pi 5 only — sized to the model input to avoid a resize cost); the
+**USB webcam** is the live-stream source, or — on a rig without a Pi Camera
+(``camera.detection_source: usb``) — the detection source via ``UsbCapture``'s
+reduced-size MJPEG decode. The detection path reads the Y plane (greyscale) at
+model-input resolution — or, for tiled detection, a bigger lores Y plane or the
+full-res ``main`` stream.
+
+``ReplayCapture`` streams a recorded session (``.npy`` / raw Y planes / video)
+instead of a camera, so the whole stack runs — and is benchmarked reproducibly —
+off the Pi.
+
+``read()`` wraps each frame in a ``FrameEnvelope`` stamped with its exposure time
+so downstream stages can measure how old a result is; ``read_frame()`` remains
+the bare-array path for callers that don't care.
+
+Zoom is done by the ISP, not numpy: ``PiCamCapture`` sets picamera2's
+``ScalerCrop`` to the configured (or pipeline-steered) ROI between frames, and
+stamps each envelope with the crop that frame was *actually* taken with (read
+back from its metadata — a control change lands a few frames late), so detectors
+map boxes into full-frame pixels exactly.
 """
 from __future__ import annotations
 
 import abc
+import os
+import time
+from typing import Callable, Optional, Sequence, Tuple
 
 import numpy as np
 
 from config import CameraConfig
-from errors import CameraError
+from contracts import FrameEnvelope, TelemetryStats
+from errors import CameraError, EndOfStream
+
+
+def sensor_ts_to_monotonic(sensor_ts_ns: int, boottime_now_ns: int,
+                           monotonic_now_s: float) -> float:
+    """Map a libcamera ``SensorTimestamp`` (CLOCK_BOOTTIME ns) onto ``time.monotonic()``.
+
+    Pure: the caller samples both clocks back to back; the frame's age on the
+    boottime clock is the same age on the monotonic one (they only differ by time
+    spent suspended, which a running Pi never is).
+    """
+    return monotonic_now_s - (boottime_now_ns - sensor_ts_ns) / 1e9
+
+
+def _boottime_ns() -> Optional[int]:
+    clock = getattr(time, "CLOCK_BOOTTIME", None)  # Linux only (absent on the Mac)
+    return time.clock_gettime_ns(clock) if clock is not None else None
 
 
 def rotate_frame(frame: np.ndarray, rotation_deg: int) -> np.ndarray:
     """Rotate a frame counter-clockwise by 0/90/180/270 deg (pure, Mac-testable).
 
-    Corrects a physically rotated camera module. Returns a contiguous array so the
-    Edge-TPU interpreter (which needs C-contiguous input) is never handed a view.
+    Corrects a physically rotated camera module for human eyes (debug JPEG,
+    snapshots); the detection path never rotates pixels — the envelope carries
+    ``rotation_deg`` and detectors rotate their boxes. Returns a contiguous array.
     """
     k = (rotation_deg // 90) % 4
     if k == 0:
@@ -27,28 +65,206 @@ def rotate_frame(frame: np.ndarray, rotation_deg: int) -> np.ndarray:
     return np.ascontiguousarray(np.rot90(frame, k))
 
 
+def upright_frame(envelope: FrameEnvelope) -> np.ndarray:
+    """The envelope's pixels rotated upright (a copy when rotated), for display / saving.
+    A colour frame (RGB on the envelope, as the model sees it) comes back BGR, the
+    order ``cv2.imencode`` / ``cv2.imwrite`` expect."""
+    frame = envelope.frame
+    if getattr(frame, "ndim", 2) == 3:
+        frame = np.ascontiguousarray(frame[..., ::-1])
+    return rotate_frame(frame, envelope.rotation_deg)
+
+
+Roi = Tuple[float, float, float, float]         # normalized (x, y, w, h)
+FULL_ROI: Roi = (0.0, 0.0, 1.0, 1.0)
+
+
+def rotate_roi(roi: Sequence[float], rotation_deg: int) -> Roi:
+    """A normalized ROI of the sensor image -> the same region of the frame after
+    ``rotate_frame(.., rotation_deg)`` (counter-clockwise quarter turns)."""
+    x, y, w, h = (float(v) for v in roi)
+    for _ in range((rotation_deg // 90) % 4):
+        x, y, w, h = y, 1.0 - x - w, h, w
+    return x, y, w, h
+
+
+def roi_to_scaler_crop(roi: Sequence[float],
+                       base_crop: Sequence[int]) -> Tuple[int, int, int, int]:
+    """Normalized sensor-image ROI -> ``ScalerCrop`` (x, y, w, h) in sensor pixels.
+
+    ``base_crop`` is the camera's full-field crop (the ``ScalerCrop`` it starts with).
+    """
+    bx, by, bw, bh = base_crop
+    x, y, w, h = roi
+    return (bx + int(round(x * bw)), by + int(round(y * bh)),
+            max(1, int(round(w * bw))), max(1, int(round(h * bh))))
+
+
+def scaler_crop_to_roi(crop: Sequence[int], base_crop: Sequence[int]) -> Optional[Roi]:
+    """A frame's reported ``ScalerCrop`` -> normalized ROI; None when it is the full field."""
+    if tuple(crop) == tuple(base_crop):
+        return None
+    bx, by, bw, bh = base_crop
+    x, y, w, h = crop
+    return (x - bx) / bw, (y - by) / bh, w / bw, h / bh
+
+
+def roi_around(cx_px: float, cy_px: float, width_px: float, height_px: float,
+               size: float) -> Roi:
+    """Normalized ``size x size`` window centered on a full-frame point, kept inside.
+
+    Equal normalized sides keep the full frame's aspect, so the ISP scales the zoomed
+    view exactly like the unzoomed one.
+    """
+    half = size / 2.0
+    x = min(max(cx_px / width_px - half, 0.0), 1.0 - size)
+    y = min(max(cy_px / height_px - half, 0.0), 1.0 - size)
+    return x, y, size, size
+
+
+def exposure_clamp(exposure_us: float, gain: float, max_exposure_us: float,
+                   max_gain: float) -> Tuple[int, float]:
+    """Shutter capped at ``max_exposure_us`` with the light made up by gain, up to
+    ``max_gain`` (0 = no ceiling). The total exposure (time x gain) is kept where the
+    ceilings allow; past the gain ceiling the shutter takes back what it can."""
+    total = exposure_us * gain
+    if max_exposure_us and exposure_us > max_exposure_us:
+        exposure_us = max_exposure_us
+    gain = total / exposure_us
+    if max_gain and gain > max_gain:
+        gain = max_gain
+        exposure_us = total / gain
+        if max_exposure_us:
+            exposure_us = min(exposure_us, max_exposure_us)
+    return int(round(exposure_us)), gain
+
+
+class ExposureStats(TelemetryStats):
+    """What the sensor actually did, from request metadata (written by the capture thread only)."""
+
+    __slots__ = ("fps", "frame_interval_ms", "frame_duration_us", "exposure_us",
+                 "analogue_gain", "ae", "clamps")
+
+    def __init__(self) -> None:
+        self.fps = 0.0                      # from frame_interval_ms
+        self.frame_interval_ms = 0.0        # EMA of SensorTimestamp deltas
+        self.frame_duration_us = 0          # last frame's FrameDuration
+        self.exposure_us = 0                # last frame's ExposureTime
+        self.analogue_gain = 0.0
+        self.ae = "auto"                    # auto | clamped (ceiling bound) | locked
+        self.clamps = 0                     # times AE was overridden by a ceiling
+
+
 class FrameSource(abc.ABC):
+    _seq = 0
+
     @abc.abstractmethod
     def read_frame(self) -> np.ndarray:
         """Return the latest frame as an ndarray (detection path = Y-plane greyscale)."""
 
+    def read(self) -> FrameEnvelope:
+        """Latest frame wrapped with a sequence number and its capture time.
+
+        Sources without a sensor clock stamp the read time; override when the
+        hardware reports when the exposure actually happened.
+        """
+        frame = self.read_frame()
+        return FrameEnvelope(frame=frame, seq=self._next_seq(), capture_t=time.monotonic())
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
     def close(self) -> None:
         pass
 
 
 class PiCamCapture(FrameSource):
-    """picamera2 lores YUV420 detection source, sized to the model input."""
+    """picamera2 detection source: lores YUV420 sized to the model input by default.
+
+    ``camera.lores_size_px`` makes the lores bigger than the model input and
+    ``camera.detection_stream: main`` reads the full-res RGB stream instead; both
+    are for ``TiledDetector``, which cuts them into model-sized tiles.
+
+    ``camera.roi`` zooms at the sensor (``ScalerCrop``); ``set_roi`` moves the zoom
+    live, at most once per ``roi_min_interval_s``. ROIs are normalized to the
+    (rotated) detection frame, like the boxes.
+
+    The exposure profile pins ``FrameDurationLimits`` at start. Once AE has run for
+    ``ae_settle_s``, a shutter or gain past its ceiling (or any, with ``ae_lock``)
+    is replaced by manual ``ExposureTime`` / ``AnalogueGain`` from
+    ``exposure_clamp``; ``ae_relock_s`` hands control back to AE periodically so
+    the fixed values follow the daylight. ``exposure_stats`` reports the achieved
+    frame interval, exposure and gain from each request's metadata.
+    """
 
-    def __init__(self, cfg: CameraConfig, input_size_px: int):
+    _EMA = 0.1
+
+    def __init__(self, cfg: CameraConfig, input_size_px: int, clock=time.monotonic):
         self._cfg = cfg
-        self._size = input_size_px
+        self._size = cfg.lores_size_px or input_size_px
         self._picam = None
+        self._clock = clock
+        self._base_crop: Optional[Tuple[int, int, int, int]] = None   # full-field ScalerCrop
+        self._roi_wanted: Roi = tuple(cfg.roi)
+        self._roi_applied: Optional[Tuple[Roi, int]] = None     # (roi, rotation_deg) in force
+        self._roi_t = float("-inf")
+        self._frame_limits_us: Optional[Tuple[int, int]] = None     # profile / sensor range
+        self._ae_t = 0.0                    # when AE was (re)enabled or overridden
+        self._last_sensor_ns: Optional[int] = None
+        self.exposure_stats = ExposureStats()
 
     def apply_config(self, cfg: CameraConfig) -> None:
-        """Adopt new camera config live. ``rotation_deg`` is read per-frame so it
-        applies immediately; capture/lores size, format and detection_source are
-        fixed at ``start()`` and need a restart (re-pointed here for persistence)."""
+        """Adopt new camera config live. ``rotation_deg`` is stamped per-frame so it
+        applies immediately, and a new static ``roi`` on the next frames, the
+        exposure ceilings and AE lock at the next settle; capture/lores size,
+        format, frame-duration limits and detection_source are fixed at ``start()``
+        and need a restart (re-pointed here for persistence)."""
         self._cfg = cfg
+        self.set_roi(cfg.roi)
+
+    def set_roi(self, roi: Sequence[float]) -> None:
+        """Zoom to ``roi`` (normalized frame x, y, w, h). Applied by ``read`` between
+        frames once the rate limit allows; a newer call before then replaces it."""
+        self._roi_wanted = tuple(float(v) for v in roi)
+
+    def _profile_limits(self, sensor: Optional[Sequence[int]]) -> Optional[Tuple[int, int]]:
+        """``frame_duration_limits_us`` with its zeros filled from the sensor's range."""
+        lo, hi = self._cfg.frame_duration_limits_us
+        if sensor is None:
+            return (lo, hi) if lo and hi else None
+        return int(lo or sensor[0]), int(hi or sensor[1])
+
+    def set_frame_rate(self, fps: Optional[float]) -> None:
+        """Pin the sensor to ``fps`` (standby), or None to go back to the profile's
+        frame-duration range. Applied between frames, no restart."""
+        if self._picam is None:
+            return
+        if fps is None:
+            if self._frame_limits_us is None:
+                return
+            limits = self._frame_limits_us
+        else:
+            duration_us = int(1e6 / fps)
+            limits = (duration_us, duration_us)
+        try:
+            self._picam.set_controls({"FrameDurationLimits": limits})
+        except Exception as exc:  # noqa: BLE001
+            raise CameraError("picamera2 frame-rate change failed") from exc
+
+    def _apply_roi(self) -> None:
+        """Push a pending ROI change to the ISP (no restart), rate-limited."""
+        wanted = (self._roi_wanted, self._cfg.rotation_deg)
+        if self._base_crop is None or wanted == self._roi_applied:
+            return
+        now = self._clock()
+        if now - self._roi_t < self._cfg.roi_min_interval_s:
+            return
+        sensor_roi = rotate_roi(self._roi_wanted, -self._cfg.rotation_deg)
+        self._picam.set_controls({"ScalerCrop": roi_to_scaler_crop(sensor_roi,
+                                                                   self._base_crop)})
+        self._roi_applied = wanted
+        self._roi_t = now
 
     def start(self) -> None:
         try:
@@ -64,21 +280,99 @@ class PiCamCapture(FrameSource):
             if self._cfg.fixed_focus:
                 # Manual focus (AfMode 0): no AF hunting on a moving target.
                 picam.set_controls({"AfMode": 0, "LensPosition": self._cfg.lens_position})
+            sensor = picam.camera_controls.get("FrameDurationLimits")
+            self._frame_limits_us = frame_limits = self._profile_limits(sensor)
+            if frame_limits is not None and any(self._cfg.frame_duration_limits_us):
+                picam.set_controls({"FrameDurationLimits": frame_limits})
             picam.start()
             self._picam = picam
+            self._ae_t = self._clock()
+            self.exposure_stats = ExposureStats()
+            crop = picam.capture_metadata().get("ScalerCrop")
+            self._base_crop = tuple(crop) if crop is not None else None
+            self._roi_applied = None         # first read applies camera.roi (a no-op if full)
         except Exception as exc:  # noqa: BLE001
             raise CameraError("picamera2 init failed") from exc
 
     def read_frame(self) -> np.ndarray:
+        return self.read().frame
+
+    def read(self) -> FrameEnvelope:
+        """Detection frame + the request's ``SensorTimestamp`` (start of exposure)."""
         if self._picam is None:
             raise CameraError("camera not started")
+        main = self._cfg.detection_stream == "main"
         try:
-            yuv = self._picam.capture_array("lores")
-            # YUV420 planar: the first H rows are the Y (luma) plane.
-            frame = yuv[: self._size, : self._size]
-            return rotate_frame(frame, self._cfg.rotation_deg)
+            self._apply_roi()
+            request = self._picam.capture_request()
+            try:
+                array = request.make_array("main" if main else "lores")
+                metadata = request.get_metadata()
+            finally:
+                request.release()
+            if main:
+                # picamera2 "RGB888" is B, G, R in memory; the model was trained on RGB.
+                frame = array[..., ::-1]
+            else:
+                # YUV420 planar: the first H rows are the Y (luma) plane.
+                frame = array[: self._size, : self._size]
+            # No pixel rotation: a mounted-sideways camera is a box transform downstream.
+            rotation = self._cfg.rotation_deg
         except Exception as exc:  # noqa: BLE001
             raise CameraError("picamera2 capture failed") from exc
+        now = time.monotonic()
+        sensor_ns = metadata.get("SensorTimestamp")
+        boot_ns = _boottime_ns()
+        capture_t = (sensor_ts_to_monotonic(sensor_ns, boot_ns, now)
+                     if sensor_ns is not None and boot_ns is not None else now)
+        self._track_exposure(metadata, self._clock())
+        crop = metadata.get("ScalerCrop")
+        roi = (scaler_crop_to_roi(crop, self._base_crop)
+               if crop is not None and self._base_crop is not None else None)
+        return FrameEnvelope(frame=frame, seq=self._next_seq(), capture_t=capture_t,
+                             sensor_ts_ns=sensor_ns,
+                             crop=rotate_roi(roi, rotation) if roi else None,
+                             rotation_deg=rotation)
+
+    def _track_exposure(self, metadata: dict, now: float) -> None:
+        """Fold a request's metadata into ``exposure_stats``; clamp / lock AE when due."""
+        st = self.exposure_stats
+        sensor_ns = metadata.get("SensorTimestamp")
+        last, self._last_sensor_ns = self._last_sensor_ns, sensor_ns
+        if sensor_ns is not None and last is not None and sensor_ns > last:
+            ms = (sensor_ns - last) / 1e6
+            st.frame_interval_ms = (ms if not st.frame_interval_ms
+                                    else (1 - self._EMA) * st.frame_interval_ms + self._EMA * ms)
+            st.fps = 1e3 / st.frame_interval_ms
+        st.frame_duration_us = int(metadata.get("FrameDuration", st.frame_duration_us))
+        st.exposure_us = int(metadata.get("ExposureTime", st.exposure_us))
+        st.analogue_gain = float(metadata.get("AnalogueGain", st.analogue_gain))
+        cfg = self._cfg
+        if st.ae != "auto":
+            if cfg.ae_relock_s and now - self._ae_t >= cfg.ae_relock_s:
+                try:
+                    self._picam.set_controls({"AeEnable": True})
+                except Exception as exc:  # noqa: BLE001
+                    raise CameraError("picamera2 exposure control failed") from exc
+                st.ae, self._ae_t = "auto", now
+            return
+        if now - self._ae_t < cfg.ae_settle_s or not st.exposure_us or not st.analogue_gain:
+            return
+        ceiling = min([v for v in (cfg.max_exposure_us, cfg.frame_duration_limits_us[1]) if v],
+                      default=0)
+        exposure, gain = exposure_clamp(st.exposure_us, st.analogue_gain, ceiling,
+                                        cfg.max_analogue_gain)
+        clamped = exposure != st.exposure_us or abs(gain - st.analogue_gain) > 1e-3
+        if not (clamped or cfg.ae_lock):
+            return
+        try:
+            self._picam.set_controls({"AeEnable": False, "ExposureTime": exposure,
+                                      "AnalogueGain": gain})
+        except Exception as exc:  # noqa: BLE001
+            raise CameraError("picamera2 exposure control failed") from exc
+        st.ae = "clamped" if clamped else "locked"
+        st.clamps += int(clamped)
+        self._ae_t = now
 
     def close(self) -> None:
         if self._picam is not None:
@@ -86,29 +380,312 @@ class PiCamCapture(FrameSource):
             self._picam = None
 
 
+# Reduced-size JPEG decode: luma only, scaled down in the DCT domain (libjpeg skips
+# the chroma planes and most of the IDCT), by decode scale.
+_REDUCED_GRAYSCALE = {1: "IMREAD_GRAYSCALE", 2: "IMREAD_REDUCED_GRAYSCALE_2",
+                      4: "IMREAD_REDUCED_GRAYSCALE_4", 8: "IMREAD_REDUCED_GRAYSCALE_8"}
+
+
+def mjpeg_decode_scale(width_px: int, height_px: int, size_px: int) -> int:
+    """Largest JPEG decode downscale (8, 4, 2 or 1) still at least ``size_px`` on both sides."""
+    for scale in (8, 4, 2):
+        if width_px // scale >= size_px and height_px // scale >= size_px:
+            return scale
+    return 1
+
+
 class UsbCapture(FrameSource):
-    """USB webcam source (streaming / spotter). Not the detection path."""
+    """USB (UVC) webcam detection source: MJPEG decoded straight to a small Y plane.
+
+    The camera is asked for MJPEG at ``usb_width_px x usb_height_px`` with one
+    driver buffer, and OpenCV hands over the compressed frame
+    (``CAP_PROP_CONVERT_RGB`` off) instead of decoding it to BGR. ``imdecode`` with
+    a reduced-grayscale flag decodes luma only at 1/``usb_decode_scale`` (auto: the
+    largest scale that keeps the detection size). A 16:9 (or any non-square) frame
+    is center-cropped to a square first, so birds aren't squashed, and one area
+    resize lands it at the detection size (``lores_size_px`` or the model input) —
+    square like the Pi Cam lores, so detectors map it onto ``capture_*_px``
+    unchanged; the cropped side strips are outside the field. A backend that won't
+    pass MJPEG through gets a grey convert of its BGR frame instead.
+
+    ``read`` takes the newest frame: a ``grab`` that returns well inside a frame
+    period handed back one queued while the pipeline was busy, so it is dropped
+    (``stale_dropped``) and the next one grabbed. The compressed and grey scratch
+    buffers are reused; each returned frame is its own (the pipeline's threads
+    hold on to frames).
+    """
+
+    _DRAIN_MAX = 4                      # stale grabs skipped per read at most
 
-    def __init__(self, device_index: int = 0):
-        self._index = device_index
+    def __init__(self, cfg: CameraConfig, input_size_px: int,
+                 clock: Callable[[], float] = time.monotonic):
+        self._cfg = cfg
+        self._size = cfg.lores_size_px or input_size_px
+        self._clock = clock
+        self._cv2 = None
         self._cap = None
+        self._imread_flag = None
+        self._raw: Optional[np.ndarray] = None      # retrieve() buffer (compressed frame)
+        self._gray: Optional[np.ndarray] = None     # BGR fallback's grey buffer
+        self.decode_scale = 1
+        self.stale_dropped = 0
+
+    def apply_config(self, cfg: CameraConfig) -> None:
+        """``rotation_deg`` applies live; device, mode and decode scale need a restart."""
+        self._cfg = cfg
 
     def start(self) -> None:
+        cfg = self._cfg
         try:
             import cv2  # lazy
-            self._cap = cv2.VideoCapture(self._index)
+            device = int(cfg.usb_device) if cfg.usb_device.isdigit() else cfg.usb_device
+            cap = cv2.VideoCapture(device, cv2.CAP_V4L2)
+            if not cap.isOpened():
+                raise CameraError(f"cannot open usb camera {cfg.usb_device}")
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, cfg.usb_width_px)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, cfg.usb_height_px)
+            cap.set(cv2.CAP_PROP_FPS, cfg.usb_fps)
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+            # the driver picks the nearest mode it has
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or cfg.usb_width_px
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or cfg.usb_height_px
+        except CameraError:
+            raise
         except Exception as exc:  # noqa: BLE001
             raise CameraError("usb camera init failed") from exc
+        self.decode_scale = cfg.usb_decode_scale or mjpeg_decode_scale(width, height, self._size)
+        self._imread_flag = getattr(cv2, _REDUCED_GRAYSCALE[self.decode_scale])
+        self._cv2, self._cap = cv2, cap
 
     def read_frame(self) -> np.ndarray:
+        return self.read().frame
+
+    def read(self) -> FrameEnvelope:
+        """Newest frame as a detection-size Y plane, stamped when its grab returned."""
         if self._cap is None:
             raise CameraError("usb camera not started")
-        ok, frame = self._cap.read()
-        if not ok:
-            raise CameraError("usb camera read failed")
-        return frame
+        cap = self._cap
+        try:
+            t0 = self._clock()
+            ok = cap.grab()
+            for _ in range(self._DRAIN_MAX):
+                now = self._clock()
+                if not ok or now - t0 >= 0.5 / self._cfg.usb_fps:
+                    break
+                t0 = now
+                ok = cap.grab()
+                self.stale_dropped += 1
+            if not ok:
+                raise CameraError("usb camera grab failed")
+            capture_t = self._clock()
+            ok, self._raw = cap.retrieve(self._raw)
+            if not ok or self._raw is None:
+                raise CameraError("usb camera retrieve failed")
+            frame = self._to_luma(self._raw)
+        except CameraError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            raise CameraError("usb capture failed") from exc
+        return FrameEnvelope(frame=frame, seq=self._next_seq(), capture_t=capture_t,
+                             rotation_deg=self._cfg.rotation_deg)
+
+    def _to_luma(self, raw: np.ndarray) -> np.ndarray:
+        cv2, size = self._cv2, self._size
+        if raw.ndim == 1 or raw.shape[0] == 1:          # compressed MJPEG passthrough
+            luma = cv2.imdecode(raw.reshape(-1), self._imread_flag)
+            if luma is None:
+                raise CameraError("usb MJPEG decode failed")
+            fresh = True
+        else:                                           # the backend decoded to BGR
+            self._gray = cv2.cvtColor(raw, cv2.COLOR_BGR2GRAY, dst=self._gray)
+            luma, fresh = self._gray, False
+        h, w = luma.shape[:2]
+        if h != w:                                      # center square, not a squash
+            side = min(h, w)
+            y0, x0 = (h - side) // 2, (w - side) // 2
+            luma = luma[y0:y0 + side, x0:x0 + side]
+        if luma.shape[:2] != (size, size):
+            return cv2.resize(luma, (size, size), interpolation=cv2.INTER_AREA)
+        return luma if fresh else luma.copy()
 
     def close(self) -> None:
         if self._cap is not None:
             self._cap.release()
             self._cap = None
+
+
+# ---- recorded sessions ----
+
+def timestamp_index_path(path: str) -> str:
+    """The capture-time index next to a recording: ``<stem>.ts.npy``."""
+    return os.path.splitext(path)[0] + ".ts.npy"
+
+
+def write_recording(path: str, frames: np.ndarray,
+                    timestamps_s: Optional[Sequence[float]] = None) -> None:
+    """Save ``[N, H, W]`` frames as ``path`` (.npy) plus, if given, their capture times."""
+    np.save(path, np.ascontiguousarray(frames, dtype=np.uint8))
+    if timestamps_s is not None:
+        np.save(timestamp_index_path(path), np.asarray(timestamps_s, dtype=np.float64))
+
+
+class _VideoFrames:
+    """Frames of a video file by index: sequential cv2 decode to luma (BGR -> GRAY);
+    skipping ahead only ``grab``s (no decode), going back seeks."""
+
+    def __init__(self, path: str):
+        import cv2  # lazy
+        self._cv2 = cv2
+        self._cap = cv2.VideoCapture(path)
+        if not self._cap.isOpened():
+            raise CameraError(f"cannot open video {path}")
+        self.count = int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if self.count <= 0:
+            raise CameraError(f"{path}: unknown frame count (transcode it to .npy)")
+        self.fps = float(self._cap.get(cv2.CAP_PROP_FPS) or 0.0)
+        self._pos = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        if i < self._pos:
+            self._cap.set(self._cv2.CAP_PROP_POS_FRAMES, i)
+            self._pos = i
+        while self._pos < i:
+            self._cap.grab()
+            self._pos += 1
+        ok, bgr = self._cap.read()
+        if not ok:
+            raise EndOfStream("video ended early")
+        self._pos += 1
+        return self._cv2.cvtColor(bgr, self._cv2.COLOR_BGR2GRAY)
+
+    def close(self) -> None:
+        self._cap.release()
+
+
+class ReplayCapture(FrameSource):
+    """A recorded session as a detection source (``camera.detection_source: replay``).
+
+    ``camera.replay_path`` is a ``.npy`` stack of Y planes (memory-mapped: frames are
+    paged in on read, never loaded whole), raw concatenated Y planes (``.y8`` /
+    ``.raw``, ``replay_raw_size_px`` or the lores size) or a video file (lazy cv2).
+    ``<stem>.ts.npy`` holds the capture times in seconds; without it frames are
+    ``1 / replay_fps`` apart (a video's own rate, if it reports one).
+
+    ``replay_pacing: realtime`` hands out frames on the recording's schedule and,
+    like a live camera, skips those a slow consumer missed (``dropped``);
+    ``fast`` returns the next frame immediately, for throughput runs. At the end
+    ``read`` raises ``EndOfStream``, or wraps around with ``replay_loop``.
+    """
+
+    def __init__(self, cfg: CameraConfig, input_size_px: int,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self._cfg = cfg
+        self._size = cfg.lores_size_px or input_size_px
+        self._clock = clock
+        self._sleep = sleep
+        self._frames = None
+        self._offsets_s: Optional[np.ndarray] = None    # capture time - first capture time
+        self._has_index = False
+        self._next = 0                      # index of the next frame to hand out
+        self._t0: Optional[float] = None    # monotonic time of frame 0 in this pass
+        self.dropped = 0                    # frames skipped to keep real-time pace
+        self.loops = 0
+
+    def apply_config(self, cfg: CameraConfig) -> None:
+        """Pacing, looping and rotation apply live; the recording needs a restart."""
+        self._cfg = cfg
+
+    def start(self) -> None:
+        cfg = self._cfg
+        path = cfg.replay_path
+        ext = os.path.splitext(path)[1].lower()
+        fps = cfg.replay_fps
+        try:
+            if ext == ".npy":
+                frames = np.load(path, mmap_mode="r")
+            elif ext in (".y8", ".raw"):
+                w, h = (v or self._size for v in cfg.replay_raw_size_px)
+                frames = np.memmap(path, dtype=np.uint8, mode="r").reshape(-1, h, w)
+            else:
+                frames = _VideoFrames(path)
+                fps = frames.fps or fps
+        except CameraError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            raise CameraError(f"cannot open recording {path}") from exc
+        if len(frames) == 0:
+            raise CameraError(f"recording {path} has no frames")
+        index = timestamp_index_path(path)
+        self._has_index = os.path.exists(index)
+        if self._has_index:
+            ts = np.load(index).astype(np.float64)
+            if ts.shape != (len(frames),):
+                raise CameraError(f"{index}: {ts.size} timestamps for {len(frames)} frames")
+            self._ts0 = float(ts[0])
+            self._offsets_s = ts - ts[0]
+        else:
+            self._ts0 = 0.0
+            self._offsets_s = np.arange(len(frames), dtype=np.float64) / fps
+        self._frames = frames
+        self._next = 0
+        self._t0 = None
+
+    def read_frame(self) -> np.ndarray:
+        return self.read().frame
+
+    def read(self) -> FrameEnvelope:
+        if self._frames is None:
+            raise CameraError("replay not started")
+        n = len(self._frames)
+        if self._next >= n:
+            if not self._cfg.replay_loop:
+                raise EndOfStream(f"replay of {self._cfg.replay_path} finished")
+            self._wrap()
+        i, capture_t = self._pace(n)
+        self._next = i + 1
+        frame = self._frames[i]
+        offset = float(self._offsets_s[i])
+        return FrameEnvelope(frame=frame, seq=self._next_seq(), capture_t=capture_t,
+                             sensor_ts_ns=(int(round((self._ts0 + offset) * 1e9))
+                                           if self._has_index else None),
+                             rotation_deg=self._cfg.rotation_deg)
+
+    def _pace(self, n: int) -> Tuple[int, float]:
+        """Index of the frame to hand out now and its capture time (monotonic)."""
+        i = self._next
+        if self._cfg.replay_pacing == "fast":
+            return i, self._clock()
+        offsets = self._offsets_s
+        if self._t0 is None:
+            self._t0 = self._clock() - offsets[i]
+        now = self._clock()
+        due = self._t0 + offsets[i]
+        if due > now:
+            self._sleep(due - now)
+        else:
+            # late: jump to the newest frame already exposed, as a live sensor would
+            j = int(np.searchsorted(offsets, now - self._t0, side="right")) - 1
+            j = min(max(j, i), n - 1)
+            self.dropped += j - i
+            i = j
+        return i, self._t0 + float(offsets[i])
+
+    def _wrap(self) -> None:
+        offsets = self._offsets_s
+        period = float(offsets[-1] / (len(offsets) - 1)) if len(offsets) > 1 \
+            else 1.0 / self._cfg.replay_fps
+        if self._t0 is not None:
+            self._t0 += float(offsets[-1]) + period
+        self._next = 0
+        self.loops += 1
+
+    def close(self) -> None:
+        if isinstance(self._frames, _VideoFrames):
+            self._frames.close()
+        self._frames = None
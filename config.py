@@ -18,43 +18,129 @@ from errors import ConfigError
 
 @dataclass
 class CameraConfig:
-    detection_source: str = "picamera2"      # picamera2 (Pi Cam) | usb
+    detection_source: str = "picamera2"      # picamera2 (Pi Cam) | usb | replay | synthetic
     capture_width_px: int = 1152             # v1 square capture (3x384)
     capture_height_px: int = 1152
     lores_format: str = "YUV420"             # Pi 4 lores MUST be YUV420
     fixed_focus: bool = True                 # no AF hunting on a moving target
     lens_position: float = 4.0               # diopters; tune to engagement range
+    # Exposure profile for fast movers (picamera2). Pinned frame durations make the
+    # capture rate what predict.fps assumes instead of whatever AE picks in shade;
+    # once AE has settled, a shutter above max_exposure_us (motion blur) is traded
+    # for gain up to max_analogue_gain and fixed there (or always, with ae_lock),
+    # until AE gets the next ae_relock_s run to follow the light (dawn, clouds).
+    frame_duration_limits_us: List[int] = field(default_factory=lambda: [0, 0])  # min, max; 0 = sensor's
+    max_exposure_us: int = 0                 # shutter ceiling; 0 = AE's choice
+    max_analogue_gain: float = 0.0           # gain ceiling when trading shutter for gain; 0 = none
+    ae_settle_s: float = 1.0                 # AE runs this long before a clamp / lock
+    ae_lock: bool = False                    # freeze exposure + gain once settled
+    ae_relock_s: float = 30.0                # hand back to AE this often after a clamp / lock; 0 = never
     # Software correction for a physically rotated module (e.g. FPC ribbon exits
-    # to the side). 0/90/180/270 only; applied to the detection frame at capture
-    # (np.rot90) so the whole pipeline shares one consistent pixel space. Prefer a
-    # physical remount (ribbon at the bottom); this is the fallback. Square frames
-    # so dims are unchanged.
+    # to the side). 0/90/180/270 only; the detector sees sensor-orientation pixels
+    # and its boxes are rotated into the upright full frame (no per-frame np.rot90
+    # copy), so the whole pipeline still shares one consistent pixel space; only the
+    # debug JPEG and snapshots rotate pixels. Prefer a physical remount (ribbon at
+    # the bottom); this is the fallback.
     rotation_deg: int = 0
+    # What the detector is fed: the lores Y plane, or the full-res main stream
+    # (RGB) for tiled detection. lores_size_px > the model input gives tiling a
+    # higher-res lores instead (cheaper than main: luma only, ISP-scaled).
+    detection_stream: str = "lores"          # lores | main
+    lores_size_px: int = 0                   # square lores size; 0 = detector.input_size_px
+    # Sensor-level zoom: picamera2 ScalerCrop, so the ISP delivers the cropped,
+    # rescaled frames (no numpy crop). Normalized (x, y, w, h) of the full field
+    # of view (of the rotated frame); w == h keeps the full frame's aspect. Boxes
+    # still map to full-frame pixels, so calibration and the kill zone hold.
+    roi: List[float] = field(default_factory=lambda: [0.0, 0.0, 1.0, 1.0])
+    dynamic_roi: bool = False                # zoom onto the selected target; roi when none
+    dynamic_roi_size: float = 0.5            # dynamic window side, fraction of the full frame
+    roi_min_interval_s: float = 0.5          # rate limit on ScalerCrop changes (applied between frames)
+    # detection_source: usb reads a UVC webcam as MJPEG, decoded luma-only at reduced
+    # scale, center-cropped square, to the detection size. Not the stream.device
+    # while that streams.
+    usb_device: str = "/dev/video0"          # V4L2 device path or index
+    usb_width_px: int = 1280                 # requested MJPEG mode (driver picks nearest)
+    usb_height_px: int = 720
+    usb_fps: int = 30
+    usb_decode_scale: int = 0                # JPEG decode downscale 1|2|4|8; 0 = largest fitting
+    # detection_source: replay streams a recording instead of the camera (offline
+    # runs and benchmarks on any machine): a memory-mapped .npy of [N, H, W] Y
+    # planes, raw concatenated Y planes (.y8 / .raw, replay_raw_size_px), or any
+    # video cv2 can read. A sibling <stem>.ts.npy of capture times (s) paces it.
+    replay_path: str = ""
+    replay_pacing: str = "realtime"          # realtime (drops frames like a camera) | fast
+    replay_loop: bool = False                # wrap around at the end instead of stopping
+    replay_fps: float = 30.0                 # pacing without a timestamp index
+    replay_raw_size_px: List[int] = field(default_factory=lambda: [0, 0])  # W, H of raw frames; 0 = lores
 
 
 @dataclass
 class DetectorConfig:
-    backend: str = "coral_yolo"              # coral_yolo | coral_mobiledet | cpu
+    backend: str = "coral_yolo"              # coral_yolo | coral_mobiledet | cpu | synthetic
     model_path: str = "models/bird_yolov8n_256_int8_edgetpu_run1.tflite"
     input_size_px: int = 256                 # YOLOv8n@256 primary; MobileDet uses 320
     num_classes: int = 1                     # single-class "bird"
     conf_threshold: float = 0.25
+    low_conf_threshold: float = 0.0          # >0: also return scores down to this (tracker's low tier)
     iou_threshold: float = 0.5
     coords_normalized: bool = True           # golden-fixture pinned: Ultralytics v8 tflite emits normalized xywh
+    max_detections: int = 300                # post-NMS cap (Ultralytics max_det)
+    edge_tpus: int = 1                       # >1 pools that many Edge TPUs round-robin; 0 = all found
+    # CPU backend (backend: cpu, or the fallback when the Coral won't load): a plain
+    # INT8 tflite export of the same model (no _edgetpu), run by tflite + XNNPACK. Not
+    # in models/ yet; validation rejects backend: cpu / cpu_fallback until it exists.
+    cpu_model_path: str = "models/bird_yolov8n_256_int8_run1.tflite"
+    cpu_threads: int = 3                     # interpreter threads; leave a core for capture/control
+    cpu_xnnpack: bool = True                 # tflite's default CPU delegate; off = reference kernels (A/B)
+    cpu_fallback: bool = False               # Coral won't load, or drops out mid-run -> CPU (needs cpu_model_path)
+    cpu_fallback_after: int = 3              # consecutive Coral invoke failures before switching
+    # Tiled detection (small/distant birds): overlapping model-sized tiles of a
+    # higher-res detection frame (camera.detection_stream / lores_size_px).
+    tiled: bool = False
+    tile_overlap_px: int = 48                # seam overlap; birds smaller than this land whole in a tile
+    tile_budget: int = 0                     # max tiles per frame, sweeping the grid in turn; 0 = all
+    tile_full_frame: bool = True             # + one downscaled whole-frame pass (birds spanning tiles)
+    # Lock-on: while a target is selected, infer on a model-sized crop of the
+    # higher-res detection frame around its predicted position, with a full scan
+    # every lock_on_scan_every frames so other birds keep their tracks.
+    lock_on: bool = False
+    lock_on_scan_every: int = 4              # 1 = always scan (lock-on off in effect)
+    lock_on_max_coast_frames: int = 2        # target unmatched this long -> scan until reacquired
 
 
 @dataclass
 class TrackerConfig:
+    backend: str = "iou"                     # iou (last-box IoU) | kalman (predicted boxes + gate)
     iou_match_threshold: float = 0.3
+    # Two-stage (ByteTrack) association: detections scoring below this only extend
+    # confirmed tracks left unmatched by the rest, never spawn one. 0 = off.
+    high_score_threshold: float = 0.0
     max_age_frames: int = 30                 # keep a lost track this long (occlusion)
     min_hits: int = 3                        # frames before a track is "confirmed"
     velocity_smoothing: float = 0.5          # EMA alpha for vx/vy (0..1)
+    assignment: str = "greedy"               # greedy | optimal (max total IoU; fewer swaps in flocks)
+    # Kalman backend: noise is relative to the box size, so near and far birds gate alike.
+    kalman_model: str = "cv"                 # cv (constant velocity) | ca (constant acceleration)
+    kalman_process_noise: float = 0.05       # accel (cv) / jerk (ca) std per frame, x box size
+    kalman_measurement_noise: float = 0.1    # detected centre std, x box size
+    kalman_init_speed_px: float = 40.0       # velocity std of a new track, px/frame
+    kalman_gate_chi2: float = 9.21           # Mahalanobis^2 gate on the centre (99%, 2 dof)
+    history_frames: int = 16                 # centroids kept per track for predict.model (0 = none)
 
 
 @dataclass
 class PredictConfig:
     lead_time_s: float = 0.45                # servo travel + water time-of-flight
     fps: float = 20.0                        # px/frame <-> px/s; refine on-Pi
+    compensate_latency: bool = True          # add measured capture->control age to the lead
+    max_result_age_s: float = 0.25           # drop frames/tracks older than this (0 = never)
+    # Lead model: cv (EMA velocity) | linear / quadratic (weighted fit of the track's
+    # centroid history) | turn (constant speed + turn rate from that fit). A track
+    # with fewer than min_history centroids falls back to cv. The fitted models
+    # are opt-in until they are measured on-Pi (scripts/predict_bench.py).
+    model: str = "cv"
+    min_history: int = 6
+    history_decay: float = 0.85              # fit weight per frame of sample age (0..1]
 
 
 @dataclass
@@ -149,7 +235,27 @@ class AppConfig:
     snapshot_mode: str = "off"               # off | every | fire_only | sampled
     snapshot_sample_every: int = 30
     snapshot_dir: str = "dataset"
-    detection_mode: str = "full_frame"       # full_frame | motion_gated (seam for 1.10)
+    detection_mode: str = "full_frame"       # full_frame | motion_gated (skip the detector on still frames)
+    # Motion gate (detection_mode: motion_gated): running-average background of the
+    # subsampled Y plane; the detector runs on motion, while tracks are alive, and
+    # at least every motion_force_every frames (perched birds don't move).
+    motion_downsample: int = 4               # luma subsample stride (256 px lores -> 64 px)
+    motion_bg_shift: int = 4                 # background update rate 1/2^shift per frame
+    motion_pixel_threshold: int = 20         # Y levels off the background = moving pixel
+    motion_energy_threshold: float = 0.002   # moving fraction of the frame that wakes the detector
+    motion_force_every: int = 15             # forced full detection after this many frames
+    motion_cell_px: int = 4                  # blob grid cell (subsampled px) for the telemetry boxes
+    motion_max_boxes: int = 8                # motion boxes reported per frame
+    # Low-power standby: after standby_after_s without a track the pipeline pauses
+    # the detector (a motion check runs instead), drops the capture rate, slows the
+    # control and LCD ticks and relaxes the servos. Motion or any operator command
+    # wakes it, and the waking frame itself is detected.
+    standby_enabled: bool = False
+    standby_after_s: float = 120.0           # no tracks for this long -> standby
+    standby_capture_fps: float = 2.0         # frame rate while waiting for motion
+    standby_tick_hz: float = 2.0             # control-loop rate in standby
+    standby_lcd_hz: float = 0.5              # LCD refresh in standby
+    inference_mode: str = "serial"           # serial | pipelined (TPU invoke overlaps host decode)
     stream_source: str = "usb"               # usb (default) | picam_annotated (debug)
     web_port: int = 8001
     log_level: str = "INFO"
@@ -242,6 +348,31 @@ class StreamConfig:
     www_dir: str = ""                        # optional -w web root (empty -> stream only)
 
 
+@dataclass
+class SyntheticConfig:
+    """Synthetic bird scene (``camera.detection_source: synthetic``) and its fake
+    detector (``detector.backend: synthetic``) for x86 benchmarks and tracker /
+    strategy regression. Scene units are detection-frame pixels; the ground truth
+    and the fake detections are full-frame pixels like everything downstream."""
+    seed: int = 0
+    birds: int = 3                           # birds in view at once (1..200)
+    fps: float = 30.0                        # frame rate and ground-truth time step
+    realtime: bool = True                    # sleep to fps (false: a frame per read, no wait)
+    size_px: List[float] = field(default_factory=lambda: [6.0, 20.0])      # bird length range
+    speed_px_s: List[float] = field(default_factory=lambda: [20.0, 120.0])  # speed range
+    turn_deg_s: float = 45.0                 # max heading rate (curved flight paths)
+    occluders: int = 2                       # vertical posts drawn over the birds
+    noise_sigma: float = 3.0                 # per-frame sensor noise, grey levels
+    exposure_swing: float = 0.2              # +/- gain of the slow exposure drift
+    exposure_period_s: float = 8.0
+    # fake detector: ground truth + box jitter, misses and false positives
+    jitter: float = 0.05                     # box noise, sigma as a fraction of its size
+    miss_rate: float = 0.05                  # chance a fully visible bird is missed
+    min_visible: float = 0.3                 # less visible than this (occluded): never found
+    false_positives: float = 0.2             # mean spurious boxes per frame (Poisson)
+    latency_ms: float = 0.0                  # invoke sleeps this long (accelerator stand-in)
+
+
 _SECTIONS = {
     "camera": CameraConfig,
     "stream": StreamConfig,
@@ -257,6 +388,7 @@ _SECTIONS = {
     "fire": FireConfig,
     "app": AppConfig,
     "remote": RemoteConfig,
+    "synthetic": SyntheticConfig,
 }
 
 
@@ -276,6 +408,7 @@ class Config:
     fire: FireConfig = field(default_factory=FireConfig)
     app: AppConfig = field(default_factory=AppConfig)
     remote: RemoteConfig = field(default_factory=RemoteConfig)
+    synthetic: SyntheticConfig = field(default_factory=SyntheticConfig)
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -301,19 +434,162 @@ class Config:
             raise ConfigError("servo pulse_min_us must be < pulse_max_us")
         if self.camera.rotation_deg not in (0, 90, 180, 270):
             raise ConfigError("camera.rotation_deg must be one of 0, 90, 180, 270")
+        c = self.camera
+        if c.detection_source not in ("picamera2", "usb", "replay", "synthetic"):
+            raise ConfigError("camera.detection_source must be picamera2, usb, replay "
+                              "or synthetic")
+        if c.detection_source == "replay" and not c.replay_path:
+            raise ConfigError("camera.replay_path is required for detection_source: replay")
+        if c.detection_source == "usb" and self.stream.enabled \
+                and self.app.stream_source == "usb" and self.stream.device == c.usb_device:
+            raise ConfigError("camera.usb_device is the live-stream device; disable stream "
+                              "or use another camera for detection")
+        if c.usb_width_px <= 0 or c.usb_height_px <= 0 or c.usb_fps <= 0:
+            raise ConfigError("camera.usb_width_px, usb_height_px and usb_fps must be positive")
+        if c.usb_decode_scale not in (0, 1, 2, 4, 8):
+            raise ConfigError("camera.usb_decode_scale must be 0 (auto), 1, 2, 4 or 8")
+        if c.replay_pacing not in ("realtime", "fast"):
+            raise ConfigError("camera.replay_pacing must be realtime or fast")
+        if c.replay_fps <= 0:
+            raise ConfigError("camera.replay_fps must be positive")
+        if len(c.replay_raw_size_px) != 2 or min(c.replay_raw_size_px) < 0:
+            raise ConfigError("camera.replay_raw_size_px must be [width, height] (0 = lores)")
+        limits = c.frame_duration_limits_us
+        if len(limits) != 2 or min(limits) < 0 or (all(limits) and limits[0] > limits[1]):
+            raise ConfigError("camera.frame_duration_limits_us must be [min, max] us "
+                              "(0 = sensor default)")
+        if all(limits) and not (1e6 / limits[1] * 0.99 <= self.predict.fps
+                                             <= 1e6 / limits[0] * 1.01):
+            raise ConfigError("predict.fps is outside the frame rates camera."
+                              "frame_duration_limits_us allows")
+        if c.max_exposure_us < 0 or c.ae_settle_s < 0 or c.ae_relock_s < 0:
+            raise ConfigError("camera.max_exposure_us, ae_settle_s and ae_relock_s must be >= 0")
+        if c.max_analogue_gain and c.max_analogue_gain < 1.0:
+            raise ConfigError("camera.max_analogue_gain must be >= 1 (0 = no ceiling)")
+        if c.detection_stream not in ("lores", "main"):
+            raise ConfigError("camera.detection_stream must be lores or main")
+        if not 0 <= c.lores_size_px <= min(c.capture_width_px, c.capture_height_px):
+            raise ConfigError("camera.lores_size_px must be in [0, capture size] (0 = model input)")
+        if len(c.roi) != 4:
+            raise ConfigError("camera.roi must be [x, y, w, h] (normalized)")
+        x, y, w, h = c.roi
+        if min(x, y) < 0 or w <= 0 or h <= 0 or x + w > 1 + 1e-9 or y + h > 1 + 1e-9:
+            raise ConfigError("camera.roi must lie inside [0, 1] with positive w, h")
+        if not 0 < c.dynamic_roi_size <= 1:
+            raise ConfigError("camera.dynamic_roi_size must be in (0, 1]")
+        if c.roi_min_interval_s < 0:
+            raise ConfigError("camera.roi_min_interval_s must be >= 0")
         d = self.detector
-        for n in ("conf_threshold", "iou_threshold"):
+        for n in ("conf_threshold", "low_conf_threshold", "iou_threshold"):
             v = getattr(d, n)
             if not 0.0 <= v <= 1.0:
                 raise ConfigError(f"detector.{n} must be in [0, 1]")
+        if d.low_conf_threshold:
+            if d.low_conf_threshold >= d.conf_threshold:
+                raise ConfigError("detector.low_conf_threshold must be < conf_threshold")
+            if self.tracker.high_score_threshold < d.conf_threshold:
+                # else detections below conf_threshold would spawn tracks
+                raise ConfigError("detector.low_conf_threshold needs "
+                                  "tracker.high_score_threshold >= detector.conf_threshold")
         if d.input_size_px <= 0:
             raise ConfigError("detector.input_size_px must be positive")
+        if d.max_detections <= 0:
+            raise ConfigError("detector.max_detections must be positive")
+        if d.edge_tpus < 0:
+            raise ConfigError("detector.edge_tpus must be >= 0 (0 = all found)")
+        if d.backend not in ("coral_yolo", "coral_mobiledet", "cpu", "synthetic"):
+            raise ConfigError("detector.backend must be coral_yolo, coral_mobiledet, cpu "
+                              "or synthetic")
+        if d.cpu_threads < 1:
+            raise ConfigError("detector.cpu_threads must be >= 1")
+        if d.cpu_fallback_after < 1:
+            raise ConfigError("detector.cpu_fallback_after must be >= 1")
+        if (d.backend == "cpu" or d.cpu_fallback) and not os.path.isfile(d.cpu_model_path):
+            raise ConfigError(f"detector.cpu_model_path {d.cpu_model_path!r} not found; "
+                              "backend: cpu and cpu_fallback need the plain int8 tflite "
+                              "export (no _edgetpu) of the model")
+        if not 0 <= d.tile_overlap_px < d.input_size_px:
+            raise ConfigError("detector.tile_overlap_px must be in [0, input_size_px)")
+        if d.tile_budget < 0:
+            raise ConfigError("detector.tile_budget must be >= 0 (0 = every tile)")
+        if d.lock_on_scan_every < 1:
+            raise ConfigError("detector.lock_on_scan_every must be >= 1")
+        if d.lock_on_max_coast_frames < 0:
+            raise ConfigError("detector.lock_on_max_coast_frames must be >= 0")
+        if (d.edge_tpus != 1 and d.backend in ("coral_yolo", "coral_mobiledet")
+                and (d.tiled or d.lock_on)):
+            # The tiler / lock-on run their crops through one infer() at a time, which
+            # claims a single pool worker: N TPUs would tile serially on one device.
+            raise ConfigError("detector.tiled / lock_on need detector.edge_tpus: 1")
+        a = self.app
+        if a.detection_mode not in ("full_frame", "motion_gated"):
+            raise ConfigError("app.detection_mode must be full_frame or motion_gated")
+        if a.motion_downsample < 1 or a.motion_cell_px < 1:
+            raise ConfigError("app.motion_downsample and motion_cell_px must be >= 1")
+        if not 0 <= a.motion_bg_shift <= 8:
+            raise ConfigError("app.motion_bg_shift must be in [0, 8]")
+        if not 0 <= a.motion_pixel_threshold <= 255:
+            raise ConfigError("app.motion_pixel_threshold must be in [0, 255]")
+        if not 0.0 <= a.motion_energy_threshold <= 1.0:
+            raise ConfigError("app.motion_energy_threshold must be in [0, 1]")
+        if a.motion_force_every < 1:
+            raise ConfigError("app.motion_force_every must be >= 1")
+        if a.motion_max_boxes < 0:
+            raise ConfigError("app.motion_max_boxes must be >= 0")
+        for n in ("standby_after_s", "standby_capture_fps", "standby_tick_hz", "standby_lcd_hz"):
+            if getattr(a, n) <= 0:
+                raise ConfigError(f"app.{n} must be positive")
+        if self.app.inference_mode not in ("serial", "pipelined"):
+            raise ConfigError("app.inference_mode must be serial or pipelined")
+        t = self.tracker
+        if t.backend not in ("iou", "kalman"):
+            raise ConfigError("tracker.backend must be iou or kalman")
+        if t.assignment not in ("greedy", "optimal"):
+            raise ConfigError("tracker.assignment must be greedy or optimal")
+        if not 0.0 <= t.high_score_threshold <= 1.0:
+            raise ConfigError("tracker.high_score_threshold must be in [0, 1]")
+        if t.kalman_model not in ("cv", "ca"):
+            raise ConfigError("tracker.kalman_model must be cv or ca")
+        for n in ("kalman_process_noise", "kalman_measurement_noise", "kalman_init_speed_px",
+                  "kalman_gate_chi2"):
+            if getattr(t, n) <= 0:
+                raise ConfigError(f"tracker.{n} must be positive")
         if self.predict.fps <= 0:
             raise ConfigError("predict.fps must be positive")
+        if self.predict.max_result_age_s < 0:
+            raise ConfigError("predict.max_result_age_s must be >= 0")
+        if t.history_frames < 0:
+            raise ConfigError("tracker.history_frames must be >= 0")
+        p = self.predict
+        if p.model not in ("cv", "linear", "quadratic", "turn"):
+            raise ConfigError("predict.model must be cv, linear, quadratic or turn")
+        if p.min_history < 3:
+            raise ConfigError("predict.min_history must be >= 3")
+        if not 0.0 < p.history_decay <= 1.0:
+            raise ConfigError("predict.history_decay must be in (0, 1]")
+        if p.model != "cv" and t.history_frames < p.min_history:
+            raise ConfigError(f"predict.model {p.model} needs tracker.history_frames >= "
+                              "predict.min_history")
         if self.fire.fire_duration_s <= 0 or self.fire.cooldown_s < 0:
             raise ConfigError("fire timings invalid")
         if len(self.aim.pan_coeffs) != 3 or len(self.aim.tilt_coeffs) != 3:
             raise ConfigError("aim coeffs must each be length 3 (a, b, c)")
+        sy = self.synthetic
+        if not 1 <= sy.birds <= 200:
+            raise ConfigError("synthetic.birds must be in [1, 200]")
+        for n in ("size_px", "speed_px_s"):
+            lo_hi = getattr(sy, n)
+            if len(lo_hi) != 2 or not 0 < lo_hi[0] <= lo_hi[1]:
+                raise ConfigError(f"synthetic.{n} must be [min, max] with 0 < min <= max")
+        if sy.fps <= 0 or sy.exposure_period_s <= 0:
+            raise ConfigError("synthetic.fps and exposure_period_s must be positive")
+        if sy.occluders < 0 or sy.noise_sigma < 0 or sy.turn_deg_s < 0 or sy.jitter < 0:
+            raise ConfigError("synthetic occluders, noise, turn rate and jitter must be >= 0")
+        if sy.false_positives < 0 or sy.latency_ms < 0:
+            raise ConfigError("synthetic.false_positives and latency_ms must be >= 0")
+        for n in ("exposure_swing", "miss_rate", "min_visible"):
+            if not 0.0 <= getattr(sy, n) <= 1.0:
+                raise ConfigError(f"synthetic.{n} must be in [0, 1]")
         st = self.stream
         if st.port <= 0:
             raise ConfigError("stream.port must be positive")
@@ -1,15 +1,81 @@
-"""Frozen data contracts shared across layers: ``Detection`` and ``Track``.
+"""Frozen data contracts shared across layers: ``FrameEnvelope``, ``Detection``
+and ``Track``, plus ``TelemetryStats``, the base of every stage's counters.
 
-These are the stable interface between detect -> track -> strategy -> aim. All
-coordinates are **full-frame pixels** (the detector maps back from model input),
-so nothing downstream needs to know the model input size or which backend ran.
+These are the stable interface between capture -> detect -> track -> strategy ->
+aim. All coordinates are **full-frame pixels** (the detector maps back from model
+input), so nothing downstream needs to know the model input size or which backend
+ran. All times are ``time.monotonic()`` seconds unless the name says otherwise.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Tuple
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple
 
 
+def _slotted(cls):
+    """``@dataclass(slots=True)`` for Python 3.9: rebuild ``cls`` with ``__slots__``
+    (no per-instance ``__dict__``; the defaults already live in ``__init__``)."""
+    names = tuple(f.name for f in fields(cls))
+    body = {k: v for k, v in cls.__dict__.items()
+            if k not in names and k not in ("__dict__", "__weakref__")}
+    body["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, body)
+
+
+class TelemetryStats:
+    """Base of the per-stage counter objects telemetry reads (``StageStats``,
+    ``ExposureStats``, ...): a subclass lists its fields in ``__slots__`` and sets
+    them in ``__init__``; ``as_dict`` reports exactly those."""
+
+    __slots__ = ()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass
+class FrameEnvelope:
+    """A captured frame plus when its photons hit the sensor.
+
+    ``capture_t`` is the exposure time on the monotonic clock (mapped from the
+    picamera2 ``SensorTimestamp`` when the source has one, else the read time);
+    ``sensor_ts_ns`` keeps the raw sensor timestamp. Each pipeline stage stamps
+    ``stage_t`` as it finishes with the frame, so the age at every stage — and the
+    glass-to-servo latency — can be reported without any stage knowing the others.
+    ``roi_center_px`` is set by the pipeline in lock-on mode: where (full-frame
+    pixels) the detector should crop its ROI; None = scan the whole frame.
+    ``crop`` is the part of the full field of view the frame shows when the camera
+    zoomed in at the sensor (picamera2 ``ScalerCrop``), as normalized (x, y, w, h)
+    of the upright frame; detectors map into full-frame pixels through it.
+    ``rotation_deg`` is the camera mount's rotation, *not* applied to ``frame``:
+    the pixels stay in sensor orientation and detectors rotate their boxes instead
+    (``detect.base.FrameMap``); ``capture.upright_frame`` rotates for human eyes.
+    ``truth`` is the ground truth of a synthetic frame (``synthetic.TrueBird`` list,
+    full-frame pixels); None from a real camera.
+    """
+
+    frame: Any                               # np.ndarray (Y plane on the detection path)
+    seq: int
+    capture_t: float
+    sensor_ts_ns: Optional[int] = None
+    stage_t: Dict[str, float] = field(default_factory=dict)
+    roi_center_px: Optional[Tuple[float, float]] = None
+    crop: Optional[Tuple[float, float, float, float]] = None     # None = the whole frame
+    rotation_deg: int = 0                    # counter-clockwise turn to make frame upright
+    truth: Optional[List[Any]] = None        # synthetic frames: what is really there
+
+    def age_s(self, now: float) -> float:
+        return now - self.capture_t
+
+    def stamp(self, stage: str, now: float) -> None:
+        self.stage_t[stage] = now
+
+    def stage_ages_ms(self) -> Dict[str, float]:
+        """Frame age (ms) when each stamped stage finished, in stamp order."""
+        return {k: (t - self.capture_t) * 1e3 for k, t in self.stage_t.items()}
+
+
+@_slotted
 @dataclass
 class Detection:
     """One detection in full-frame pixel coordinates.
@@ -40,12 +106,18 @@ class Detection:
         return max(0.0, x2 - x1) * max(0.0, y2 - y1)
 
 
+@_slotted
 @dataclass
 class Track:
     """A detection associated across frames with a stable id and velocity.
 
     vx/vy are in pixels-per-frame. ``time_since_update`` counts frames since the
-    track was last matched to a detection (0 = updated this frame).
+    track was last matched to a detection (0 = updated this frame). ``capture_t``
+    is the capture time of the frame that last updated it (None when the tracker
+    was fed bare detections), so the predictor can lead by the result's real age.
+
+    This is the contract: the trackers hand out ``track.table.TrackView`` rows of
+    their column store, which read the same; strategy / aim accept either.
     """
 
     id: int
@@ -59,6 +131,7 @@ class Track:
     age: int = 0
     hits: int = 0
     time_since_update: int = 0
+    capture_t: Optional[float] = None
 
     @property
     def area_px(self) -> float:
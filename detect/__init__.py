@@ -1,20 +1,44 @@
-"""Detection layer: backend-agnostic detector interface + anchor-free v8 decode."""
+"""Detection layer: backend-agnostic detector interface + v8 / SSD decode + motion gate."""
 from detect.base import Detector
 from detect.coral import CoralDetector
+from detect.cpu import CpuDetector, CpuFallbackDetector
+from detect.mobiledet import MobileDetDetector
+from detect.motion import MotionGate
+from detect.pool import PooledDetector, enumerate_edge_tpus
+from detect.roi import LockOnDetector
+from detect.synthetic import SyntheticDetector
+from detect.tiled import TiledDetector
 from detect.decode import (
+    batched_nms,
     compute_iou,
     decode_v8,
+    decode_v8_dfl,
     multiclass_nms,
     nms,
     xywh_to_xyxy,
 )
+from detect.ssd import decode_ssd, postprocess_to_detections, ssd_anchors
 
 __all__ = [
     "Detector",
     "CoralDetector",
+    "CpuDetector",
+    "CpuFallbackDetector",
+    "MobileDetDetector",
+    "PooledDetector",
+    "TiledDetector",
+    "LockOnDetector",
+    "SyntheticDetector",
+    "MotionGate",
+    "enumerate_edge_tpus",
     "decode_v8",
+    "decode_v8_dfl",
     "nms",
+    "batched_nms",
     "multiclass_nms",
     "compute_iou",
     "xywh_to_xyxy",
+    "decode_ssd",
+    "postprocess_to_detections",
+    "ssd_anchors",
 ]
@@ -2,23 +2,136 @@
 
 ``strategy``/``aim`` never know whether a Coral YOLOv8, Coral MobileDet, or CPU
 backend ran: they only see ``list[Detection]`` in full-frame pixels.
+
+``infer`` is ``decode(invoke(frame))``: ``invoke`` is the accelerator half (feed the
+input, run the model, take the output), ``decode`` the host half. The pipelined
+inference mode runs them on two threads so the TPU works on frame N+1 while the CPU
+decodes frame N; a backend that doesn't split simply does everything in ``invoke``.
 """
 from __future__ import annotations
 
 import abc
-from typing import List
+from typing import Any, List, NamedTuple, Tuple, Union
 
 import numpy as np
 
-from contracts import Detection
+from contracts import Detection, FrameEnvelope
+
+FrameLike = Union[np.ndarray, FrameEnvelope]
+
+
+def score_floor(cfg) -> float:
+    """Lowest score a backend keeps: ``conf_threshold``, or ``low_conf_threshold``
+    when the low tier (the tracker's second association pass) is on."""
+    return cfg.low_conf_threshold or cfg.conf_threshold
+
+
+def frame_array(frame: FrameLike) -> np.ndarray:
+    """The pixel array of a bare frame or a ``FrameEnvelope``."""
+    return frame.frame if isinstance(frame, FrameEnvelope) else frame
+
+
+def upright_size(frame: FrameLike) -> Tuple[int, int]:
+    """(width, height) of the frame once rotated upright (``FrameEnvelope.rotation_deg``)."""
+    h, w = frame_array(frame).shape[:2]
+    return (h, w) if _quarter_turns(frame) % 2 else (w, h)
+
+
+def _quarter_turns(frame: FrameLike) -> int:
+    rotation = frame.rotation_deg if isinstance(frame, FrameEnvelope) else 0
+    return (rotation // 90) % 4
+
+
+def rotate_xyxy(box: Tuple[float, float, float, float], width_px: float, height_px: float,
+                rotation_deg: int) -> Tuple[float, float, float, float]:
+    """A box in a ``width_px x height_px`` image -> the same box after ``np.rot90`` by
+    ``rotation_deg`` (counter-clockwise quarter turns, like ``capture.rotate_frame``)."""
+    x1, y1, x2, y2 = box
+    for _ in range((rotation_deg // 90) % 4):
+        x1, y1, x2, y2 = y1, width_px - x2, y2, width_px - x1
+        width_px, height_px = height_px, width_px
+    return x1, y1, x2, y2
+
+
+class FrameMap(NamedTuple):
+    """Where a frame's boxes land in full-frame pixels.
+
+    The frame's array is in sensor orientation (rotation is not applied to the
+    pixels) and may show a sensor crop. A decoder scales its boxes into
+    ``width_px x height_px`` — the frame's full-frame region, in the array's
+    orientation — and ``apply`` turns them upright and moves them to the region's
+    origin. Identity for an unrotated, uncropped frame.
+    """
+
+    width_px: float
+    height_px: float
+    rotation_deg: int = 0
+    x0_px: float = 0.0
+    y0_px: float = 0.0
+
+    def box(self, xyxy: Tuple[float, float, float, float], scale_x: float = 1.0,
+            scale_y: float = 1.0) -> Tuple[float, float, float, float]:
+        """One box (array px times ``scale``) -> full-frame xyxy."""
+        x1, y1, x2, y2 = rotate_xyxy((xyxy[0] * scale_x, xyxy[1] * scale_y,
+                                      xyxy[2] * scale_x, xyxy[3] * scale_y),
+                                     self.width_px, self.height_px, self.rotation_deg)
+        return x1 + self.x0_px, y1 + self.y0_px, x2 + self.x0_px, y2 + self.y0_px
+
+    def apply(self, detections: List[Detection], scale_x: float = 1.0,
+              scale_y: float = 1.0) -> List[Detection]:
+        """Detections in the frame's (scaled) pixels -> full-frame pixels."""
+        if (not self.rotation_deg % 360 and not self.x0_px and not self.y0_px
+                and scale_x == 1.0 and scale_y == 1.0):
+            return detections
+        return [Detection.from_xyxy(d.cls_id, d.score, *self.box(d.xyxy, scale_x, scale_y))
+                for d in detections]
+
+    def to_frame(self, x: float, y: float) -> Tuple[float, float]:
+        """A full-frame point -> the frame's region pixels (array orientation, unscaled)."""
+        x, y = x - self.x0_px, y - self.y0_px
+        k = (self.rotation_deg // 90) % 4
+        w, h = (self.height_px, self.width_px) if k % 2 else (self.width_px, self.height_px)
+        for _ in range((4 - k) % 4):            # undo k counter-clockwise turns
+            x, y = y, w - x
+            w, h = h, w
+        return x, y
+
+
+def frame_map(frame: FrameLike, width_px: float, height_px: float) -> FrameMap:
+    """``FrameMap`` of ``frame`` into an (upright) ``width_px x height_px`` full frame.
+
+    The frame covers all of it, or — for an envelope captured with a sensor crop
+    (``FrameEnvelope.crop``, normalized to the upright frame) — that window of it.
+    """
+    x0, y0, w, h = 0.0, 0.0, float(width_px), float(height_px)
+    if isinstance(frame, FrameEnvelope) and frame.crop is not None:
+        cx, cy, cw, ch = frame.crop
+        x0, y0, w, h = cx * width_px, cy * height_px, cw * width_px, ch * height_px
+    k = _quarter_turns(frame)
+    if k % 2:
+        w, h = h, w
+    return FrameMap(w, h, k * 90, x0, y0)
 
 
 class Detector(abc.ABC):
     """Abstract detector. Backends implement ``infer`` and return full-frame dets."""
 
     @abc.abstractmethod
-    def infer(self, frame: np.ndarray) -> List[Detection]:
-        """Run inference on a single frame and return detections."""
+    def infer(self, frame: FrameLike) -> List[Detection]:
+        """Run inference on a single frame (array or envelope) and return detections."""
+
+    def invoke(self, frame: FrameLike) -> Any:
+        """Device half of ``infer``; the result is handed to ``decode``.
+
+        Called from one thread only. The result must not alias buffers that the
+        next ``invoke`` overwrites (it is decoded while that call runs).
+        Default: all of ``infer``, leaving nothing to overlap.
+        """
+        return self.infer(frame)
+
+    def decode(self, raw: Any) -> List[Detection]:
+        """Host half of ``infer``: ``invoke``'s result -> full-frame detections."""
+        return raw
 
     def close(self) -> None:  # optional override for backends holding resources
         pass
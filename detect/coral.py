@@ -7,28 +7,52 @@ bypassed. Build/compile the model on the Strix Halo box only.
 
 All heavy imports (tflite_runtime / pycoral) are lazy so the module imports on the
 Mac for type-checking and wiring; actual inference is Pi-only truth.
+
+Preprocessing is a 256-entry lookup table: the input is uint8 and the model's input
+quantization is affine, so every raw pixel value has exactly one quantized input
+value. ``load`` builds the table from the reference math (``_quantize``) and each
+frame is written straight into the interpreter's own input buffer — no float
+intermediates, no ``set_tensor`` copy, no per-frame allocation.
+
+A model exported without the DFL / box-decode ops has one raw output per stride
+instead of the single ``[1, 4+nc, N]`` head; ``load`` notices the extra outputs and
+``decode`` switches to ``decode_v8_dfl``, which rebuilds the boxes on the host.
 """
 from __future__ import annotations
 
 import logging
 import os
-from typing import List, Optional, Tuple
+from typing import List, NamedTuple, Optional, Tuple, Union
 
 import numpy as np
 
 from config import DetectorConfig
 from contracts import Detection
-from detect.base import Detector
-from detect.decode import decode_v8
+from detect.base import (Detector, FrameLike, FrameMap, frame_array, frame_map,
+                         score_floor, upright_size)
+from detect.decode import DFL_REG_MAX, decode_v8, decode_v8_dfl
 from errors import DetectionError
 
 logger = logging.getLogger(__name__)
 
 
+class CoralOutput(NamedTuple):
+    """``invoke`` -> ``decode`` hand-off: the raw head (a tuple of per-stride heads for a
+    DFL graph) plus how its boxes map onto the full frame."""
+
+    tensor: Union[np.ndarray, Tuple[np.ndarray, ...]]
+    frame_map: FrameMap
+
+
 class CoralDetector(Detector):
+    # Real-valued range the model's float input expects for pixels 0..255.
+    _INPUT_RANGE: Tuple[float, float] = (0.0, 1.0)
+
     def __init__(self, cfg: DetectorConfig, frame_width_px: Optional[int] = None,
-                 frame_height_px: Optional[int] = None):
+                 frame_height_px: Optional[int] = None, device: Optional[str] = None):
         self.cfg = cfg
+        # Which Edge TPU (pycoral device string, e.g. ":0", "usb:1"); None = first found.
+        self.device = device
         # Full-frame coordinate space the detections map back to (the space the
         # killzone, scoring, calibration and the tactical canvas all use). The
         # detector runs on the small lores frame (e.g. 256px) but its output must
@@ -48,80 +72,193 @@ class CoralDetector(Detector):
         self._in_dtype = np.uint8
         self._out_scale = 1.0
         self._out_zero = 0
+        # Raw per-stride heads (index, quantization) of a graph without DFL ops; [] = one head.
+        self._dfl_heads: List[Tuple[int, Optional[Tuple[float, int]]]] = []
+        self._lut: Optional[np.ndarray] = None    # [256] uint8 pixel -> model input value
+        self._lut3: Optional[np.ndarray] = None   # [256, 3] same, one entry per channel
+        self._idx: Optional[np.ndarray] = None    # intp scratch: np.take's index dtype
+
+    @property
+    def model_path(self) -> str:
+        return self.cfg.model_path
+
+    def _make_interpreter(self):
+        """The Edge-TPU interpreter (pycoral, else tflite_runtime + the delegate)."""
+        try:
+            from pycoral.utils.edgetpu import make_interpreter
+            return make_interpreter(self.model_path, device=self.device)
+        except ImportError:
+            import tflite_runtime.interpreter as tflite
+            options = {"device": self.device} if self.device else {}
+            return tflite.Interpreter(
+                model_path=self.model_path,
+                experimental_delegates=[tflite.load_delegate("libedgetpu.so.1", options)],
+            )
 
     def load(self) -> None:
         try:
-            try:
-                from pycoral.utils.edgetpu import make_interpreter
-                interpreter = make_interpreter(self.cfg.model_path)
-            except ImportError:
-                import tflite_runtime.interpreter as tflite
-                interpreter = tflite.Interpreter(
-                    model_path=self.cfg.model_path,
-                    experimental_delegates=[tflite.load_delegate("libedgetpu.so.1")],
-                )
+            interpreter = self._make_interpreter()
             interpreter.allocate_tensors()
             in_det = interpreter.get_input_details()[0]
-            out_det = interpreter.get_output_details()[0]
             self._interpreter = interpreter
             self._in_index = in_det["index"]
-            self._out_index = out_det["index"]
             self._in_scale, self._in_zero = in_det["quantization"]
             self._in_dtype = in_det["dtype"]
-            self._out_scale, self._out_zero = out_det["quantization"]
+            self._configure_outputs(interpreter.get_output_details())
+            self._prepare_input_lut()
         except Exception as exc:  # noqa: BLE001
-            raise DetectionError(f"failed to load Coral model {self.cfg.model_path}") from exc
+            raise DetectionError(f"failed to load {type(self).__name__} model "
+                                 f"{self.model_path} on device {self.device or 'default'}"
+                                 ) from exc
+
+    def _configure_outputs(self, details: List[dict]) -> None:
+        """Pick the output tensor(s) ``invoke`` reads and how ``decode`` treats them."""
+        out_det = details[0]
+        self._out_index = out_det["index"]
+        self._out_scale, self._out_zero = out_det["quantization"]
+        self._dfl_heads = []
+        if len(details) > 1:
+            self._check_dfl_heads(details)
+            self._dfl_heads = [(d["index"], tuple(d["quantization"]) if d["quantization"][0]
+                                else None) for d in details]
+            logger.info("%s: %d raw DFL heads, decoding boxes on the host",
+                        self.model_path, len(details))
+
+    def _check_dfl_heads(self, details: List[dict]) -> None:
+        """Each raw head must be ``[1, H, H, 64 + num_classes]`` on its own stride
+        that tiles ``input_size_px`` — caught at load, not as garbage boxes later."""
+        size, channels = self.cfg.input_size_px, 4 * DFL_REG_MAX + self.cfg.num_classes
+        strides = set()
+        for d in details:
+            shape = tuple(int(n) for n in d["shape"])
+            if len(shape) != 4 or shape[0] != 1 or shape[1] != shape[2] \
+                    or shape[3] != channels:
+                raise DetectionError(f"output {d['index']} is {list(shape)}, expected a "
+                                     f"[1, H, H, {channels}] DFL head "
+                                     f"(num_classes={self.cfg.num_classes})")
+            side = shape[1]
+            stride = size // side
+            if stride < 1 or (size + stride - 1) // stride != side or stride in strides:
+                raise DetectionError(f"output {d['index']} is a {side}x{side} head, not a "
+                                     f"distinct stride of a {size}px input")
+            strides.add(stride)
 
-    def infer(self, frame: np.ndarray) -> List[Detection]:
+    def infer(self, frame: FrameLike) -> List[Detection]:
+        return self.decode(self.invoke(frame))
+
+    def invoke(self, frame: FrameLike) -> CoralOutput:
+        """Write the input, run the Edge TPU, take the raw output (a copy)."""
         if self._interpreter is None:
             self.load()
+        envelope, frame = frame, frame_array(frame)
         try:
-            tensor = self._preprocess(frame)
-            self._interpreter.set_tensor(self._in_index, tensor)
+            self._write_input(frame)
             self._interpreter.invoke()
-            raw = self._interpreter.get_tensor(self._out_index)
-            if self._out_scale:  # dequantize INT8 -> float
-                raw = (raw.astype(np.float32) - self._out_zero) * self._out_scale
-            fw, fh = self._frame_dims(frame)
-            return decode_v8(
-                raw, input_size_px=self.cfg.input_size_px,
-                frame_width_px=fw, frame_height_px=fh,
-                conf_threshold=self.cfg.conf_threshold,
-                iou_threshold=self.cfg.iou_threshold,
-                num_classes=self.cfg.num_classes,
-                coords_normalized=self.cfg.coords_normalized,
-            )
+            # get_tensor copies, so the next invoke can't overwrite it mid-decode.
+            if self._dfl_heads:
+                raw = tuple(self._interpreter.get_tensor(i) for i, _ in self._dfl_heads)
+            else:
+                raw = self._interpreter.get_tensor(self._out_index)
+            return CoralOutput(raw, frame_map(envelope, *self._frame_dims(envelope)))
         except DetectionError:
             raise
         except Exception as exc:  # noqa: BLE001
-            raise DetectionError("Coral inference failed") from exc
+            raise DetectionError(f"{type(self).__name__} inference failed") from exc
+
+    def decode(self, raw: CoralOutput) -> List[Detection]:
+        m = raw.frame_map
+        try:
+            if isinstance(raw.tensor, tuple):
+                dets = decode_v8_dfl(
+                    raw.tensor, input_size_px=self.cfg.input_size_px,
+                    frame_width_px=m.width_px, frame_height_px=m.height_px,
+                    conf_threshold=score_floor(self.cfg),
+                    iou_threshold=self.cfg.iou_threshold,
+                    num_classes=self.cfg.num_classes,
+                    quantizations=[q for _, q in self._dfl_heads],
+                    max_detections=self.cfg.max_detections,
+                )
+            else:
+                # INT8 head: threshold on the raw integers, dequantize only survivors.
+                dets = decode_v8(
+                    raw.tensor, input_size_px=self.cfg.input_size_px,
+                    frame_width_px=m.width_px, frame_height_px=m.height_px,
+                    conf_threshold=score_floor(self.cfg),
+                    iou_threshold=self.cfg.iou_threshold,
+                    num_classes=self.cfg.num_classes,
+                    coords_normalized=self.cfg.coords_normalized,
+                    quantization=(self._out_scale, self._out_zero) if self._out_scale else None,
+                    max_detections=self.cfg.max_detections,
+                )
+            return m.apply(dets)               # rotation + sensor crop, when there is one
+        except Exception as exc:  # noqa: BLE001
+            raise DetectionError(f"{type(self).__name__} output decode failed") from exc
 
     def apply_config(self, cfg: DetectorConfig) -> None:
         """Adopt new detector config live. ``conf_threshold`` / ``iou_threshold`` /
-        ``num_classes`` / ``coords_normalized`` take effect on the next ``infer``;
-        ``model_path`` / ``input_size_px`` / ``backend`` need a restart (the Edge-TPU
-        interpreter is already allocated)."""
+        ``num_classes`` / ``coords_normalized`` / ``max_detections`` take effect on
+        the next ``infer``; ``model_path`` / ``input_size_px`` / ``backend`` need a
+        restart (the Edge-TPU interpreter is already allocated)."""
         self.cfg = cfg
 
-    def _frame_dims(self, frame: np.ndarray) -> Tuple[int, int]:
-        """Full-frame (width, height) the detections map to (configured, else frame)."""
-        return (self._frame_width_px or frame.shape[1],
-                self._frame_height_px or frame.shape[0])
+    def _frame_dims(self, frame: FrameLike) -> Tuple[int, int]:
+        """Full-frame (width, height) the detections map to (configured, else the
+        upright frame)."""
+        width, height = upright_size(frame)
+        return (self._frame_width_px or width, self._frame_height_px or height)
 
-    def _preprocess(self, frame: np.ndarray) -> np.ndarray:
-        import cv2
-        size = self.cfg.input_size_px
-        if frame.ndim == 2:  # Y-plane greyscale -> 3 channels
-            frame = np.stack([frame] * 3, axis=-1)
-        if frame.shape[0] != size or frame.shape[1] != size:
-            frame = cv2.resize(frame, (size, size))
+    def _prepare_input_lut(self) -> None:
+        """Build the pixel LUTs for the current input quantization."""
+        self._lut = self._quantize(np.arange(256, dtype=np.uint8))
+        # Y plane -> 3 identical channels in a single gather (no stack, no broadcast pass).
+        self._lut3 = np.ascontiguousarray(np.repeat(self._lut[:, None], 3, axis=1))
+
+    def _quantize(self, pixels: np.ndarray) -> np.ndarray:
+        """Reference uint8 -> model-input math (the LUT is this, evaluated per value)."""
         # The model wants normalized [0,1] input; full-INT8 exports fold that /255 into the
         # input quantization, so quantize per the tensor's own (scale, zero) + dtype. Feeding
         # raw uint8 fails on int8-input edgetpu models (Ultralytics exports use zero_point=-128).
-        x = frame.astype(np.float32) / 255.0
+        x = pixels.astype(np.float32) / 255.0
+        if self._INPUT_RANGE != (0.0, 1.0):
+            lo, hi = self._INPUT_RANGE
+            x = x * np.float32(hi - lo) + np.float32(lo)
         if self._in_scale:
             x = x / self._in_scale + self._in_zero
         if np.issubdtype(self._in_dtype, np.integer):
             info = np.iinfo(self._in_dtype)
             x = np.clip(np.round(x), info.min, info.max)
-        return np.expand_dims(x.astype(self._in_dtype), axis=0)
+        return x.astype(self._in_dtype)
+
+    def _fit_input(self, frame: np.ndarray) -> np.ndarray:
+        size = self.cfg.input_size_px
+        if frame.shape[0] != size or frame.shape[1] != size:
+            import cv2  # lazy: only when the source isn't already at model size
+            frame = cv2.resize(frame, (size, size))
+        return frame
+
+    def _write_input(self, frame: np.ndarray) -> None:
+        """LUT-map ``frame`` directly into the interpreter's input tensor buffer.
+
+        The buffer view from ``interpreter.tensor()`` must not outlive this call
+        (``invoke`` refuses to run while a view is held), hence the local.
+        """
+        if self._lut is None:
+            self._prepare_input_lut()
+        frame = self._fit_input(frame)
+        # np.take converts non-intp indices into a fresh array every call; casting
+        # into a reused scratch instead keeps the steady state allocation-free.
+        if self._idx is None or self._idx.shape != frame.shape:
+            self._idx = np.empty(frame.shape, dtype=np.intp)
+        np.copyto(self._idx, frame)
+        dst = self._interpreter.tensor(self._in_index)()[0]   # [H, W, 3] input buffer
+        if frame.ndim == 2:  # Y-plane greyscale: each pixel gathers its 3-channel row
+            np.take(self._lut3, self._idx, axis=0, out=dst, mode="clip")
+        else:
+            np.take(self._lut, self._idx, out=dst, mode="clip")
+
+    def _preprocess(self, frame: np.ndarray) -> np.ndarray:
+        """Allocating reference preprocess -> ``[1, H, W, 3]`` (bench + golden test)."""
+        frame = self._fit_input(frame)
+        if frame.ndim == 2:  # Y-plane greyscale -> 3 channels
+            frame = np.stack([frame] * 3, axis=-1)
+        return np.expand_dims(self._quantize(frame), axis=0)
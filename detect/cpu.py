@@ -0,0 +1,151 @@
+"""CPU detector backend: plain tflite + XNNPACK (x86 dev box, Pi CPU, Coral-less mode).
+
+Runs a non-Edge-TPU INT8 export of the same YOLOv8 model (``detector.cpu_model_path``)
+on the CPU with ``detector.cpu_threads`` interpreter threads. XNNPACK is tflite's
+default CPU delegate, applied by the interpreter's default op resolver;
+``cpu_xnnpack: false`` selects the resolver without default delegates (reference
+kernels) for A/B benchmarking.
+
+Everything after the interpreter is the Coral path unchanged — the LUT preprocess
+written straight into the input tensor, the quantized-domain ``decode_v8`` — so the
+CPU numbers are a like-for-like baseline. Imports are lazy: tflite_runtime on the Pi,
+``ai_edge_litert`` or full TensorFlow on a dev box.
+
+``CpuFallbackDetector`` is the degraded mode (``detector.cpu_fallback``): it runs the
+Coral and switches to an already-loaded ``CpuDetector`` for good once the Coral's
+``invoke`` has failed ``cpu_fallback_after`` frames in a row (dropped off the USB bus).
+"""
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any, List, Optional, Tuple
+
+from config import DetectorConfig
+from contracts import Detection, TelemetryStats
+from detect.base import Detector, FrameLike
+from detect.coral import CoralDetector
+from errors import DetectionError
+
+logger = logging.getLogger(__name__)
+
+
+def _tflite():
+    """The tflite interpreter module available on this box."""
+    try:
+        import tflite_runtime.interpreter as tflite
+    except ImportError:
+        try:
+            from ai_edge_litert import interpreter as tflite
+        except ImportError:
+            from tensorflow import lite as tflite
+    return tflite
+
+
+def _op_resolver_type(tflite):
+    """``OpResolverType`` enum (top level in tflite_runtime, under experimental in TF)."""
+    resolver = getattr(tflite, "OpResolverType", None)
+    if resolver is None:
+        resolver = getattr(getattr(tflite, "experimental", None), "OpResolverType", None)
+    return resolver
+
+
+class CpuDetector(CoralDetector):
+    """YOLOv8 on the CPU; same preprocess + decode as ``CoralDetector``."""
+
+    def __init__(self, cfg: DetectorConfig, frame_width_px: Optional[int] = None,
+                 frame_height_px: Optional[int] = None):
+        super().__init__(cfg, frame_width_px, frame_height_px)
+        if "_edgetpu" in os.path.basename(cfg.cpu_model_path):
+            logger.warning("cpu_model_path %s is Edge-TPU-compiled — it will not run on the "
+                           "CPU; point it at the plain int8 export", cfg.cpu_model_path)
+
+    @property
+    def model_path(self) -> str:
+        return self.cfg.cpu_model_path
+
+    def _make_interpreter(self):
+        tflite = _tflite()
+        kwargs = {"model_path": self.model_path, "num_threads": self.cfg.cpu_threads}
+        if not self.cfg.cpu_xnnpack:
+            resolver = _op_resolver_type(tflite)
+            if resolver is None:
+                logger.warning("this tflite has no OpResolverType; XNNPACK stays on")
+            else:
+                kwargs["experimental_op_resolver_type"] = \
+                    resolver.BUILTIN_WITHOUT_DEFAULT_DELEGATES
+        logger.info("CPU detector: %s threads=%d xnnpack=%s", self.model_path,
+                    self.cfg.cpu_threads, self.cfg.cpu_xnnpack)
+        return tflite.Interpreter(**kwargs)
+
+
+class FallbackStats(TelemetryStats):
+    """Coral -> CPU degraded-mode counters (written by the inference thread only)."""
+
+    __slots__ = ("backend", "consecutive_failures", "failures")
+
+    def __init__(self) -> None:
+        self.backend = "coral"              # coral | cpu (switched, for good)
+        self.consecutive_failures = 0       # Coral invoke failures since its last success
+        self.failures = 0
+
+
+class CpuFallbackDetector(Detector):
+    """``primary`` (a Coral) until it keeps failing, then ``fallback`` (a loaded CPU).
+
+    After ``max_failures`` consecutive ``invoke`` errors the frame that tipped it over
+    is re-run on ``fallback`` and every later frame goes there too; a Coral that came
+    back is not retried (that needs a restart). Fewer failures re-raise, so the
+    pipeline skips the frame as before. ``invoke`` tags its result with the backend
+    that produced it, so a frame in flight decodes right across the switch.
+    """
+
+    def __init__(self, primary: Detector, fallback: Detector, max_failures: int = 3):
+        self.primary = primary
+        self.fallback = fallback
+        self.max_failures = max(1, max_failures)
+        self.fallback_stats = FallbackStats()
+        self._active = primary
+
+    @property
+    def cfg(self) -> DetectorConfig:
+        return self._active.cfg
+
+    @property
+    def degraded(self) -> bool:
+        return self._active is self.fallback
+
+    def infer(self, frame: FrameLike) -> List[Detection]:
+        return self.decode(self.invoke(frame))
+
+    def invoke(self, frame: FrameLike) -> Tuple[Detector, Any]:
+        if self._active is self.primary:
+            st = self.fallback_stats
+            try:
+                raw = self.primary.invoke(frame)
+            except DetectionError:
+                st.failures += 1
+                st.consecutive_failures += 1
+                if st.consecutive_failures < self.max_failures:
+                    raise
+                logger.error("Coral failed %d frames in a row -> CPU fallback (%s)",
+                             st.consecutive_failures, self.fallback.cfg.cpu_model_path,
+                             exc_info=True)
+                self._active, st.backend = self.fallback, "cpu"
+            else:
+                st.consecutive_failures = 0
+                return self.primary, raw
+        return self.fallback, self.fallback.invoke(frame)
+
+    def decode(self, raw: Tuple[Detector, Any]) -> List[Detection]:
+        detector, out = raw
+        return detector.decode(out)
+
+    def apply_config(self, cfg: DetectorConfig) -> None:
+        """Live thresholds for both backends (see ``CoralDetector.apply_config``)."""
+        self.primary.apply_config(cfg)
+        self.fallback.apply_config(cfg)
+
+    def close(self) -> None:
+        self.primary.close()
+        self.fallback.close()
@@ -4,14 +4,27 @@ This is the v1 Coral accuracy fix. The detector head is **anchor-free**: output
 ``[1, 4+nc, 8400]`` with **no objectness channel** (single class -> ``[1, 5, 8400]``).
 
 Decode = transpose -> ``boxes = out[:, :4]`` (xywh) -> ``scores = out[:, 4:]`` ->
-threshold -> NMS. There is **NO objectness multiply** and **NO YOLOv5 anchor grid**.
+threshold -> NMS (one vectorized pass over all classes, see ``batched_nms``).
+There is **NO objectness multiply** and **NO YOLOv5 anchor grid**.
 Applying a YOLOv5 decoder here was the v1 bug; the golden test guards against it.
 
+An INT8 head can be decoded without dequantizing it first: pass the raw integer
+tensor plus its ``(scale, zero_point)`` and the confidence threshold is moved into
+the integer domain, so only the few surviving anchors are ever gathered and
+converted to float. The result is identical to dequantize-then-decode.
+
+A graph exported without its post-processing ops emits the raw per-stride heads
+instead (``[1, H, W, 4*reg_max + nc]`` each: DFL box bins, then class logits);
+``decode_v8_dfl`` does the DFL softmax-expectation and grid/stride reconstruction on
+the host, again only for the anchors that clear the threshold.
+
 All returned coordinates are full-frame pixels.
 """
 from __future__ import annotations
 
-from typing import List, Optional
+import functools
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -32,32 +45,122 @@ def compute_iou(box: np.ndarray, boxes: np.ndarray) -> np.ndarray:
     return np.where(union > 0.0, inter / union, 0.0)
 
 
+# Ultralytics DFL bins per box side (the ``reg_max`` of every v8 / YOLO11 Detect head).
+DFL_REG_MAX = 16
+# Detect-head strides, finest first.
+V8_STRIDES = (8, 16, 32)
+
+# Pre-NMS cap on candidates (Ultralytics' ``max_nms`` role). A 256 px head has 1344
+# anchors, so this only bites on a pathological frame at 640 px.
+PRE_NMS_TOPK = 3000
+# IoU rows per block: bounds the working set to ``_NMS_CHUNK_ROWS x K`` floats.
+_NMS_CHUNK_ROWS = 128
+
+
+def _iou_block(boxes: np.ndarray, areas: np.ndarray, rows: np.ndarray,
+               cols: np.ndarray) -> np.ndarray:
+    """IoU of ``boxes[rows]`` against ``boxes[cols]`` -> ``[len(rows), len(cols)]``."""
+    a = boxes[rows]
+    b = boxes[cols]
+    iw = np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(a[:, None, 0], b[None, :, 0])
+    ih = np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(a[:, None, 1], b[None, :, 1])
+    inter = np.maximum(iw, 0.0) * np.maximum(ih, 0.0)
+    union = areas[rows][:, None] + areas[cols][None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0.0)
+
+
+def batched_nms(boxes_xyxy: np.ndarray, scores: np.ndarray,
+                class_ids: Optional[np.ndarray], iou_threshold: float,
+                max_detections: Optional[int] = None,
+                pre_nms_topk: Optional[int] = None) -> np.ndarray:
+    """Greedy NMS over all classes in one pass. Returns kept indices, best first.
+
+    Classes never suppress each other: each class's boxes are shifted by
+    ``class_id * span`` so boxes of different classes cannot overlap. Candidates
+    are cut to the ``pre_nms_topk`` best with ``argpartition`` and sorted, then
+    suppressed against the upper triangle of the IoU matrix, computed in row
+    blocks of ``_NMS_CHUNK_ROWS`` and only between boxes still alive. Same keep
+    rule as the greedy loop: a box is dropped when its IoU with a kept box is
+    ``>= iou_threshold``. At most ``max_detections`` indices are returned.
+    """
+    scores = np.asarray(scores)
+    n = scores.shape[0]
+    if n == 0 or max_detections == 0:
+        return np.empty(0, dtype=np.intp)
+    if pre_nms_topk is not None and 0 < pre_nms_topk < n:
+        cand = np.argpartition(scores, n - pre_nms_topk)[n - pre_nms_topk:]
+    else:
+        cand = np.arange(n)
+
+    cls = None
+    if class_ids is not None and cand.size > 1:
+        cls = np.asarray(class_ids)[cand]
+        if cls.min() == cls.max():
+            cls = None
+    if cls is None:
+        order = cand[np.argsort(scores[cand])[::-1]]
+    else:
+        # Greedy per class doesn't depend on the order *between* classes, so sort by
+        # (class, score desc): the offset IoU matrix is then block-diagonal and a row
+        # block only needs columns up to the end of its last class.
+        by_cls = np.lexsort((-scores[cand], cls))
+        order, cls = cand[by_cls], cls[by_cls]
+
+    # Single class: the float32 the decode produced. With classes, float64 so the
+    # offset leaves float32 coordinates exact.
+    boxes = np.asarray(boxes_xyxy, dtype=np.float32 if cls is None else np.float64)[order]
+    if cls is not None:
+        span = float(boxes.max() - boxes.min()) + 1.0
+        boxes += (cls.astype(np.float64) * span)[:, None]
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+
+    k = order.size
+    # Score order can stop at the cap; class order must finish, then rank.
+    stop = None if max_detections is None or cls is not None else int(max_detections)
+    suppressed = np.zeros(k, dtype=bool)
+    keep: List[int] = []
+    for r0 in range(0, k, _NMS_CHUNK_ROWS):
+        r1 = min(r0 + _NMS_CHUNK_ROWS, k)
+        c1 = k if cls is None else int(np.searchsorted(cls, cls[r1 - 1], side="right"))
+        cols = np.flatnonzero(~suppressed[r0:c1]) + r0  # alive boxes from r0 on
+        nr = int(np.searchsorted(cols, r1))             # the alive rows of this block
+        if nr == 0:
+            continue
+        rows = cols[:nr]
+        over = _iou_block(boxes, areas, rows, cols) >= iou_threshold
+        # Greedy inside the block touches only the block's own rows; the kept rows
+        # then suppress the later columns in one reduction.
+        alive = np.ones(nr, dtype=bool)
+        kept_rows: List[int] = []
+        for j in range(nr):
+            if not alive[j]:
+                continue
+            keep.append(int(rows[j]))
+            if stop is not None and len(keep) >= stop:
+                return order[keep]
+            kept_rows.append(j)
+            alive[j + 1:] &= ~over[j, j + 1:nr]
+        suppressed[rows[~alive]] = True
+        if nr < cols.size and kept_rows:
+            suppressed[cols[nr:]] |= over[kept_rows, nr:].any(axis=0)
+
+    kept = order[keep]
+    if cls is not None:
+        kept = kept[np.argsort(scores[kept], kind="stable")[::-1]]
+        if max_detections is not None:
+            kept = kept[:max_detections]
+    return kept
+
+
 def nms(boxes_xyxy: np.ndarray, scores: np.ndarray, iou_threshold: float) -> List[int]:
     """Greedy single-class NMS. Returns kept indices, highest score first."""
-    if boxes_xyxy.shape[0] == 0:
-        return []
-    order = np.argsort(scores)[::-1]
-    keep: List[int] = []
-    while order.size > 0:
-        i = int(order[0])
-        keep.append(i)
-        if order.size == 1:
-            break
-        ious = compute_iou(boxes_xyxy[i, :], boxes_xyxy[order[1:], :])
-        remaining = np.where(ious < iou_threshold)[0]
-        order = order[remaining + 1]
-    return keep
+    return batched_nms(boxes_xyxy, scores, None, iou_threshold).tolist()
 
 
 def multiclass_nms(boxes_xyxy: np.ndarray, scores: np.ndarray,
                    class_ids: np.ndarray, iou_threshold: float) -> List[int]:
-    """NMS applied independently per class. Returns kept indices."""
-    keep: List[int] = []
-    for cls in np.unique(class_ids):
-        idx = np.where(class_ids == cls)[0]
-        cls_keep = nms(boxes_xyxy[idx, :], scores[idx], iou_threshold)
-        keep.extend(idx[cls_keep].tolist())
-    return keep
+    """NMS applied independently per class. Returns kept indices, highest score first."""
+    return batched_nms(boxes_xyxy, scores, class_ids, iou_threshold).tolist()
 
 
 def xywh_to_xyxy(xywh: np.ndarray) -> np.ndarray:
@@ -91,6 +194,101 @@ def _to_anchors_last(raw: np.ndarray) -> np.ndarray:
     return arr
 
 
+def _to_channels_first(raw: np.ndarray) -> np.ndarray:
+    """View raw output as ``[4+nc, N]`` in its own dtype (no copy, no cast)."""
+    arr = np.asarray(raw)
+    if arr.ndim == 3:
+        if arr.shape[0] != 1:
+            raise ValueError(f"expected batch size 1, got shape {arr.shape}")
+        arr = arr[0]
+    if arr.ndim != 2:
+        raise ValueError(f"cannot decode output of shape {np.asarray(raw).shape}")
+    rows, cols = arr.shape
+    if rows > cols:
+        arr = arr.T  # [N, C] -> [C, N] (strided view)
+    return arr
+
+
+def dequantize(q: np.ndarray, scale: float, zero_point: int) -> np.ndarray:
+    """Affine INT8/UINT8 -> float32 (float32 arithmetic throughout)."""
+    return (q.astype(np.float32) - np.float32(zero_point)) * np.float32(scale)
+
+
+def quantized_threshold(conf_threshold: float, scale: float, zero_point: int,
+                        dtype) -> int:
+    """Smallest raw integer whose dequantized score is ``>= conf_threshold``.
+
+    Evaluated over every representable value with ``dequantize`` itself, so the
+    integer compare keeps exactly the anchors the float compare would (no
+    rounding-edge disagreement). Returns ``max + 1`` when nothing can pass.
+    """
+    if scale <= 0:
+        raise ValueError("quantized decode needs a positive output scale")
+    return _quantized_threshold(float(conf_threshold), float(scale), int(zero_point),
+                                np.dtype(dtype).str)
+
+
+@functools.lru_cache(maxsize=32)
+def _quantized_threshold(conf_threshold: float, scale: float, zero_point: int,
+                         dtype: str) -> int:
+    # Cached: the table scan is a few microseconds per call, comparable to the decode itself.
+    info = np.iinfo(np.dtype(dtype))
+    values = np.arange(info.min, info.max + 1, dtype=np.int64)
+    passing = np.flatnonzero(dequantize(values, scale, zero_point) >= conf_threshold)
+    return int(values[passing[0]]) if passing.size else info.max + 1
+
+
+def _logit(p: float) -> float:
+    """Inverse sigmoid, clamped so a 0 / 1 threshold stays finite."""
+    p = min(max(p, 1e-6), 1.0 - 1e-6)
+    return math.log(p / (1.0 - p))
+
+
+def _candidates_float(raw_output: np.ndarray, conf_threshold: float,
+                      num_classes: Optional[int]):
+    """Float head -> ``(boxes_xywh [K,4], scores [K], class_ids [K])`` above threshold."""
+    arr = _to_anchors_last(raw_output)  # [N, 4+nc]
+    if arr.shape[1] < 5:
+        raise ValueError(f"need >=5 channels (4 box + >=1 class), got {arr.shape[1]}")
+
+    nc = arr.shape[1] - 4 if num_classes is None else int(num_classes)
+    cls_scores = arr[:, 4:4 + nc]
+
+    # Anchor-free: class scores are taken DIRECTLY. No objectness multiply.
+    scores = cls_scores.max(axis=1)
+    class_ids = cls_scores.argmax(axis=1)
+
+    keep_mask = scores >= conf_threshold
+    return (arr[keep_mask, :4].astype(np.float32, copy=True), scores[keep_mask],
+            class_ids[keep_mask])
+
+
+def _candidates_quantized(raw_output: np.ndarray, scale: float, zero_point: int,
+                          conf_threshold: float, num_classes: Optional[int]):
+    """Integer head -> the same candidates as ``_candidates_float`` on its dequant.
+
+    Thresholds the class rows in their native ``[C, N]`` layout with one integer
+    compare; argmax over integers equals argmax over their (monotonic) dequant,
+    and only the survivors' box columns and scores are converted to float.
+    """
+    arr = _to_channels_first(raw_output)  # [4+nc, N], integer dtype
+    if arr.shape[0] < 5:
+        raise ValueError(f"need >=5 channels (4 box + >=1 class), got {arr.shape[0]}")
+
+    nc = arr.shape[0] - 4 if num_classes is None else int(num_classes)
+    q_thr = quantized_threshold(conf_threshold, scale, zero_point, arr.dtype)
+    cls_q = arr[4:4 + nc]
+    best_q = cls_q[0] if nc == 1 else cls_q.max(axis=0)
+    idx = np.flatnonzero(best_q >= q_thr)
+    if nc == 1:
+        class_ids = np.zeros(idx.size, dtype=np.intp)
+    else:
+        class_ids = cls_q[:, idx].argmax(axis=0)
+    scores = dequantize(best_q[idx], scale, zero_point)
+    boxes_xywh = dequantize(arr[:4, idx], scale, zero_point).T  # [K, 4]
+    return np.ascontiguousarray(boxes_xywh), scores, class_ids
+
+
 def decode_v8(
     raw_output: np.ndarray,
     input_size_px: int,
@@ -100,6 +298,9 @@ def decode_v8(
     iou_threshold: float = 0.5,
     num_classes: Optional[int] = None,
     coords_normalized: bool = False,
+    quantization: Optional[Tuple[float, int]] = None,
+    max_detections: Optional[int] = None,
+    pre_nms_topk: Optional[int] = PRE_NMS_TOPK,
 ) -> List[Detection]:
     """Decode an anchor-free YOLOv8/YOLO11 output tensor into ``Detection``s.
 
@@ -110,28 +311,24 @@ def decode_v8(
         coords_normalized: True if the model emits xywh in [0,1] (multiply by input
             size first). Default False = xywh already in input pixels (Ultralytics
             default). Pinned by the golden fixture once the real model exists.
+        quantization: ``(scale, zero_point)`` of an integer ``raw_output``. When
+            given, thresholding runs on the raw integers and only surviving anchors
+            are dequantized; the detections match dequantize-then-decode exactly.
+        max_detections: keep at most this many (best first); None = no cap.
+        pre_nms_topk: only the best this-many candidates enter NMS; None = all.
 
     Returns:
-        Detections in full-frame pixel coords, post-NMS.
+        Detections in full-frame pixel coords, post-NMS, highest score first.
     """
-    arr = _to_anchors_last(raw_output)  # [N, 4+nc]
-    if arr.shape[1] < 5:
-        raise ValueError(f"need >=5 channels (4 box + >=1 class), got {arr.shape[1]}")
-
-    nc = arr.shape[1] - 4 if num_classes is None else int(num_classes)
-    boxes_xywh = arr[:, :4].astype(np.float32, copy=True)
-    cls_scores = arr[:, 4:4 + nc]
-
-    # Anchor-free: class scores are taken DIRECTLY. No objectness multiply.
-    scores = cls_scores.max(axis=1)
-    class_ids = cls_scores.argmax(axis=1)
-
-    keep_mask = scores >= conf_threshold
-    if not np.any(keep_mask):
+    if quantization is not None and np.issubdtype(np.asarray(raw_output).dtype, np.integer):
+        scale, zero_point = quantization
+        boxes_xywh, scores, class_ids = _candidates_quantized(
+            raw_output, scale, zero_point, conf_threshold, num_classes)
+    else:
+        boxes_xywh, scores, class_ids = _candidates_float(
+            raw_output, conf_threshold, num_classes)
+    if scores.size == 0:
         return []
-    boxes_xywh = boxes_xywh[keep_mask]
-    scores = scores[keep_mask]
-    class_ids = class_ids[keep_mask]
 
     if coords_normalized:
         boxes_xywh *= float(input_size_px)
@@ -144,22 +341,138 @@ def decode_v8(
     boxes_xyxy[:, [0, 2]] *= sx
     boxes_xyxy[:, [1, 3]] *= sy
 
-    keep = multiclass_nms(boxes_xyxy, scores, class_ids, iou_threshold)
-    keep.sort(key=lambda i: scores[i], reverse=True)
+    return nms_to_detections(boxes_xyxy, scores, class_ids, frame_width_px, frame_height_px,
+                             iou_threshold, max_detections=max_detections,
+                             pre_nms_topk=pre_nms_topk)
+
+
+@functools.lru_cache(maxsize=8)
+def v8_anchor_points(input_size_px: int,
+                     strides: Tuple[int, ...] = V8_STRIDES) -> Dict[int, np.ndarray]:
+    """Per-stride anchor centers ``[H*W, 2]`` (x, y) in input pixels, row-major.
+
+    The grid half a cell in from the corner, as Ultralytics' ``make_anchors``.
+    Cached per input size; the arrays are read-only and shared.
+    """
+    points = {}
+    for stride in strides:
+        side = math.ceil(input_size_px / stride)
+        centers = (np.arange(side, dtype=np.float32) + 0.5) * np.float32(stride)
+        yc, xc = np.meshgrid(centers, centers, indexing="ij")
+        table = np.stack([xc.ravel(), yc.ravel()], axis=1)
+        table.setflags(write=False)
+        points[stride] = table
+    return points
+
+
+def _dfl_distances(bins: np.ndarray, reg_max: int) -> np.ndarray:
+    """``[K, 4*reg_max]`` bin logits -> ``[K, 4]`` (l, t, r, b) expected distances in cells."""
+    x = bins.reshape(-1, 4, reg_max)
+    x = np.exp(x - x.max(axis=2, keepdims=True))
+    return (x @ np.arange(reg_max, dtype=np.float32)) / x.sum(axis=2)
+
+
+def decode_v8_dfl(
+    heads: Sequence[np.ndarray],
+    input_size_px: int,
+    frame_width_px: int,
+    frame_height_px: int,
+    conf_threshold: float = 0.25,
+    iou_threshold: float = 0.5,
+    num_classes: Optional[int] = None,
+    reg_max: int = DFL_REG_MAX,
+    quantizations: Optional[Sequence[Optional[Tuple[float, int]]]] = None,
+    max_detections: Optional[int] = None,
+    pre_nms_topk: Optional[int] = PRE_NMS_TOPK,
+) -> List[Detection]:
+    """Decode raw per-stride YOLOv8 heads (no DFL / box-decode ops in the graph).
+
+    Args:
+        heads: one output per stride, ``[1, H, W, C]`` or ``[1, H*W, C]`` with
+            ``C = 4*reg_max + nc`` (box bins first, then class logits), in any
+            order — the stride is ``input_size_px / H``.
+        num_classes: class channels to keep (default: all after the box bins).
+        quantizations: per-head ``(scale, zero_point)`` of integer heads (None
+            entries / None = float). The threshold moves to the logit domain, and
+            to the integer domain for a quantized head; the DFL softmax, grid
+            offset and sigmoid only run on the surviving anchors.
+
+    Returns:
+        Detections in full-frame pixel coords, post-NMS, highest score first.
+    """
+    thr_logit = _logit(conf_threshold)
+    box_ch = 4 * reg_max
+    boxes, scores, class_ids = [], [], []
+    for i, head in enumerate(heads):
+        arr = np.asarray(head)
+        if arr.ndim < 3 or arr.shape[0] != 1:
+            raise ValueError(f"expected a [1, H, W, C] head, got shape {arr.shape}")
+        cells = int(np.prod(arr.shape[1:-1]))
+        arr = arr.reshape(cells, arr.shape[-1])
+        side = math.isqrt(cells)
+        if side * side != cells or arr.shape[1] <= box_ch:
+            raise ValueError(f"not a square DFL head (reg_max={reg_max}): {np.shape(head)}")
+        stride = input_size_px // side
+        points = v8_anchor_points(input_size_px, (stride,))[stride]
+        if points.shape[0] != cells:
+            raise ValueError(f"{side}x{side} head does not fit a {input_size_px}px input")
+
+        nc = arr.shape[1] - box_ch if num_classes is None else int(num_classes)
+        quant = quantizations[i] if quantizations is not None else None
+        if quant is not None and not np.issubdtype(arr.dtype, np.integer):
+            quant = None
+        thr = quantized_threshold(thr_logit, *quant, arr.dtype) if quant else thr_logit
+        cls = arr[:, box_ch:box_ch + nc]
+        best = cls[:, 0] if nc == 1 else cls.max(axis=1)
+        idx = np.flatnonzero(best >= thr)
+        if idx.size == 0:
+            continue
+        best = best[idx]
+        bins = arr[idx, :box_ch]
+        if quant:
+            best, bins = dequantize(best, *quant), dequantize(bins, *quant)
+        dist = _dfl_distances(bins.astype(np.float32, copy=False), reg_max) * np.float32(stride)
+        xy = points[idx]
+        boxes.append(np.concatenate([xy - dist[:, :2], xy + dist[:, 2:]], axis=1))
+        scores.append(1.0 / (1.0 + np.exp(-best.astype(np.float32))))
+        class_ids.append(np.zeros(idx.size, np.intp) if nc == 1 else cls[idx].argmax(axis=1))
+    if not boxes:
+        return []
+
+    boxes_xyxy = np.concatenate(boxes).astype(np.float32, copy=False)
+    boxes_xyxy[:, [0, 2]] *= float(frame_width_px) / float(input_size_px)
+    boxes_xyxy[:, [1, 3]] *= float(frame_height_px) / float(input_size_px)
+    return nms_to_detections(boxes_xyxy, np.concatenate(scores).astype(np.float32),
+                             np.concatenate(class_ids), frame_width_px, frame_height_px,
+                             iou_threshold, max_detections=max_detections,
+                             pre_nms_topk=pre_nms_topk)
+
+
+def nms_to_detections(boxes_xyxy: np.ndarray, scores: np.ndarray, class_ids: np.ndarray,
+                      frame_width_px: int, frame_height_px: int, iou_threshold: float,
+                      max_detections: Optional[int] = None,
+                      pre_nms_topk: Optional[int] = PRE_NMS_TOPK) -> List[Detection]:
+    """Shared decode tail: full-frame xyxy candidates -> NMS -> clipped ``Detection``s."""
+    keep = batched_nms(boxes_xyxy, scores, class_ids, iou_threshold,
+                       max_detections=max_detections, pre_nms_topk=pre_nms_topk)
+    return clipped_detections(boxes_xyxy[keep], scores[keep], class_ids[keep],
+                              frame_width_px, frame_height_px)
+
 
+def clipped_detections(boxes_xyxy: np.ndarray, scores: np.ndarray, class_ids: np.ndarray,
+                       frame_width_px: int, frame_height_px: int) -> List[Detection]:
+    """Full-frame xyxy rows -> ``Detection``s, each box clipped to the frame."""
     # Clip to frame bounds (matches Ultralytics' clip_boxes): a box can extend past
     # the edge when the target is partly out of view; off-frame corners would skew the
     # centroid the controller aims at. NMS runs on the unclipped boxes, like Ultralytics.
     max_x = float(frame_width_px)
     max_y = float(frame_height_px)
     detections: List[Detection] = []
-    for i in keep:
-        x1, y1, x2, y2 = boxes_xyxy[i]
-        x1 = min(max(float(x1), 0.0), max_x)
-        y1 = min(max(float(y1), 0.0), max_y)
-        x2 = min(max(float(x2), 0.0), max_x)
-        y2 = min(max(float(y2), 0.0), max_y)
-        detections.append(
-            Detection.from_xyxy(int(class_ids[i]), float(scores[i]), x1, y1, x2, y2)
-        )
+    for (x1, y1, x2, y2), score, cls in zip(boxes_xyxy.tolist(), scores.tolist(),
+                                            class_ids.tolist()):
+        x1 = min(max(x1, 0.0), max_x)
+        y1 = min(max(y1, 0.0), max_y)
+        x2 = min(max(x2, 0.0), max_x)
+        y2 = min(max(y2, 0.0), max_y)
+        detections.append(Detection.from_xyxy(int(cls), float(score), x1, y1, x2, y2))
     return detections
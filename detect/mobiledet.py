@@ -0,0 +1,147 @@
+"""Edge-TPU MobileDet (SSD) detector backend (Pi-only runtime; imports clean on the Mac).
+
+The ``coral_mobiledet`` backend: SSDLite-MobileDet at 320 px, as compiled for the
+Coral. Both export styles load (see ``detect.ssd``):
+
+* 4 outputs = the graph ends in ``TFLite_Detection_PostProcess`` (the Coral model
+  zoo's ``*_postprocess_edgetpu.tflite``); boxes / classes / scores / count are read
+  and mapped to pixels. The op runs on the CPU inside ``invoke``.
+* 2 outputs = raw box encodings + class logits; decoded on the host against the
+  precomputed anchor table, thresholding in the integer domain first.
+
+Input handling is ``CoralDetector``'s LUT write with the SSD input range ([-1, 1]
+instead of [0, 1]); everything is full-frame pixels, like the YOLO path.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from contracts import Detection
+from detect.base import FrameLike, FrameMap, frame_array, frame_map, score_floor
+from detect.coral import CoralDetector
+from detect.ssd import decode_ssd, postprocess_to_detections, ssd_anchors
+from errors import DetectionError
+
+logger = logging.getLogger(__name__)
+
+
+class SsdOutput(NamedTuple):
+    """``invoke`` -> ``decode`` hand-off: output tensors by role plus how their boxes
+    map onto the full frame."""
+
+    tensors: Dict[str, np.ndarray]
+    frame_map: FrameMap
+
+
+def postprocess_roles(details: List[dict]) -> Dict[str, int]:
+    """Output index per role for a ``TFLite_Detection_PostProcess`` graph.
+
+    Boxes are the only 3-D output and count the only scalar; classes then scores
+    follow in output order (the TF1 / Coral model zoo layout).
+    """
+    roles: Dict[str, int] = {}
+    rest = []
+    for d in details:
+        shape = tuple(int(x) for x in d["shape"])
+        if len(shape) == 3:
+            roles["boxes"] = d["index"]
+        elif int(np.prod(shape)) == 1:
+            roles["count"] = d["index"]
+        else:
+            rest.append(d["index"])
+    if len(rest) != 2 or len(roles) != 2:
+        raise DetectionError(f"not a detection-postprocess output set: "
+                             f"{[tuple(d['shape']) for d in details]}")
+    roles["classes"], roles["scores"] = rest
+    return roles
+
+
+def raw_roles(details: List[dict]) -> Dict[str, int]:
+    """Output index of the box encodings and class logits of a raw SSD head."""
+    boxes = [d for d in details if "box" in d.get("name", "")]
+    if not boxes:       # unnamed export: the [.., 4] one (the first, if classes has 4 too)
+        boxes = [d for d in details if int(d["shape"][-1]) == 4]
+    if not boxes:
+        raise DetectionError(f"no box-encoding output in {[d.get('name') for d in details]}")
+    box = boxes[0]
+    other = [d for d in details if d is not box]
+    return {"boxes": box["index"], "logits": other[0]["index"]}
+
+
+class MobileDetDetector(CoralDetector):
+    """SSDLite-MobileDet on the Edge TPU; ``decode`` handles both export styles."""
+
+    _INPUT_RANGE = (-1.0, 1.0)
+
+    def __init__(self, cfg, frame_width_px: Optional[int] = None,
+                 frame_height_px: Optional[int] = None, device: Optional[str] = None):
+        super().__init__(cfg, frame_width_px, frame_height_px, device=device)
+        self.has_postprocess = False
+        self._roles: Dict[str, int] = {}
+        self._quant: Dict[str, Optional[Tuple[float, int]]] = {}
+        self._anchors: Optional[np.ndarray] = None
+
+    def _configure_outputs(self, details: List[dict]) -> None:
+        """Called by ``load``: postprocess-op graph (4 outputs) or raw SSD head (2)."""
+        by_index = {d["index"]: d for d in details}
+        if len(details) == 4:
+            self.has_postprocess = True
+            self._roles = postprocess_roles(details)
+        elif len(details) == 2:
+            self.has_postprocess = False
+            self._roles = raw_roles(details)
+            n = int(by_index[self._roles["boxes"]]["shape"][-2])
+            self._anchors = ssd_anchors(self.cfg.input_size_px)
+            if self._anchors.shape[0] != n:
+                raise DetectionError(f"model has {n} anchors, the {self.cfg.input_size_px}px "
+                                     f"anchor table {self._anchors.shape[0]}")
+        else:
+            raise DetectionError(f"MobileDet graph with {len(details)} outputs")
+        self._quant = {}
+        for role, index in self._roles.items():
+            scale, zero = by_index[index]["quantization"]
+            self._quant[role] = (scale, zero) if scale else None
+        logger.info("MobileDet %s: %s", "postprocess-op graph" if self.has_postprocess
+                    else "raw SSD head (host decode, %d anchors)" % len(self._anchors),
+                    self._roles)
+
+    def invoke(self, frame: FrameLike) -> SsdOutput:
+        if self._interpreter is None:
+            self.load()
+        envelope, frame = frame, frame_array(frame)
+        try:
+            self._write_input(frame)
+            self._interpreter.invoke()
+            tensors = {role: self._interpreter.get_tensor(index)
+                       for role, index in self._roles.items()}
+            return SsdOutput(tensors, frame_map(envelope, *self._frame_dims(envelope)))
+        except DetectionError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            raise DetectionError("MobileDetDetector inference failed") from exc
+
+    def decode(self, raw: SsdOutput) -> List[Detection]:
+        t, m = raw.tensors, raw.frame_map
+        try:
+            if self.has_postprocess:
+                dets = postprocess_to_detections(
+                    t["boxes"], t["classes"], t["scores"], t["count"],
+                    m.width_px, m.height_px,
+                    conf_threshold=score_floor(self.cfg),
+                    max_detections=self.cfg.max_detections)
+            else:
+                dets = decode_ssd(
+                    t["boxes"], t["logits"], self._anchors,
+                    m.width_px, m.height_px,
+                    conf_threshold=score_floor(self.cfg),
+                    iou_threshold=self.cfg.iou_threshold,
+                    num_classes=self.cfg.num_classes,
+                    box_quantization=self._quant.get("boxes"),
+                    score_quantization=self._quant.get("logits"),
+                    max_detections=self.cfg.max_detections)
+            return m.apply(dets)
+        except Exception as exc:  # noqa: BLE001
+            raise DetectionError("MobileDetDetector output decode failed") from exc
@@ -0,0 +1,184 @@
+"""Motion gate: skip the detector while the yard is empty (``detection_mode: motion_gated``).
+
+A cheap per-frame test decides whether a frame is worth an inference. The
+detection frame's luma (the Y plane; the G channel of an RGB ``main`` frame) is
+subsampled by ``motion_downsample`` and compared against a running-average
+background kept in 8.8 fixed point (``bg += (y - bg) >> motion_bg_shift``), so
+the update is a handful of integer ops per pixel. Pixels that moved by more than
+``motion_pixel_threshold`` levels form a mask, which a 3x3 cross opening (erode
+then dilate, shifted ANDs / ORs on ``uint8``) cleans of sensor noise and leaf
+flicker. The mask's fraction of the frame is the motion energy.
+
+A frame runs the detector when the energy crosses ``motion_energy_threshold``,
+while any track is alive (the tracker needs every frame to keep it), or when
+``motion_force_every`` frames have gone by without one — a perched bird makes no
+motion and would otherwise never be seen. ``MotionStats`` carries the decisions,
+the skipped fraction and the motion blobs' bounding boxes (full-frame pixels) to
+telemetry. Pure numpy, unit-tested on the Mac.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from config import AppConfig
+from contracts import TelemetryStats
+from detect.base import FrameLike, frame_array, frame_map, upright_size
+
+Box = Tuple[float, float, float, float]     # full-frame xyxy px
+
+
+def luma(frame: np.ndarray, step: int) -> np.ndarray:
+    """Subsampled Y plane (strided view; the G channel stands in for an RGB frame)."""
+    if frame.ndim == 3:
+        frame = frame[..., 1]
+    return frame[::step, ::step]
+
+
+def erode(mask: np.ndarray) -> np.ndarray:
+    """3x3 cross erosion of a 0/1 ``uint8`` mask (the border counts as empty)."""
+    out = mask.copy()
+    out[1:] &= mask[:-1]
+    out[:-1] &= mask[1:]
+    out[:, 1:] &= mask[:, :-1]
+    out[:, :-1] &= mask[:, 1:]
+    out[0] = out[-1] = 0
+    out[:, 0] = out[:, -1] = 0
+    return out
+
+
+def dilate(mask: np.ndarray) -> np.ndarray:
+    """3x3 cross dilation of a 0/1 ``uint8`` mask."""
+    out = mask.copy()
+    out[1:] |= mask[:-1]
+    out[:-1] |= mask[1:]
+    out[:, 1:] |= mask[:, :-1]
+    out[:, :-1] |= mask[:, 1:]
+    return out
+
+
+def mask_boxes(mask: np.ndarray, cell_px: int, max_boxes: int) -> List[Tuple[int, int, int, int]]:
+    """Bounding boxes (mask px, xyxy) of the mask's blobs, largest first.
+
+    Blobs are 8-connected groups of ``cell_px`` cells with any motion — a flood fill
+    over the few active cells of a small grid, not per pixel.
+    """
+    h, w = mask.shape
+    gh, gw = -(-h // cell_px), -(-w // cell_px)
+    padded = np.zeros((gh * cell_px, gw * cell_px), np.uint8)
+    padded[:h, :w] = mask
+    cells = padded.reshape(gh, cell_px, gw, cell_px).max(axis=(1, 3))
+    seen = np.zeros_like(cells, dtype=bool)
+    blobs = []
+    for y, x in zip(*np.nonzero(cells)):
+        if seen[y, x]:
+            continue
+        seen[y, x] = True
+        queue = deque([(y, x)])
+        y0, x0, y1, x1, n = y, x, y, x, 0
+        while queue:
+            cy, cx = queue.popleft()
+            n += 1
+            y0, x0, y1, x1 = min(y0, cy), min(x0, cx), max(y1, cy), max(x1, cx)
+            for ny in range(max(cy - 1, 0), min(cy + 2, gh)):
+                for nx in range(max(cx - 1, 0), min(cx + 2, gw)):
+                    if cells[ny, nx] and not seen[ny, nx]:
+                        seen[ny, nx] = True
+                        queue.append((ny, nx))
+        blobs.append((n, (int(x0) * cell_px, int(y0) * cell_px,
+                          min((int(x1) + 1) * cell_px, w), min((int(y1) + 1) * cell_px, h))))
+    blobs.sort(key=lambda b: -b[0])
+    return [box for _, box in blobs[:max_boxes]]
+
+
+class GateDecision(NamedTuple):
+    run: bool
+    reason: str             # motion | tracks | forced | warmup | idle (skipped)
+    energy: float           # moving fraction of the (subsampled) frame
+    boxes: List[Box]
+
+
+class MotionStats(TelemetryStats):
+    """Gate counters for telemetry (written by the inference thread only)."""
+
+    __slots__ = ("frames", "invoked", "skipped", "skip_fraction", "energy", "reason",
+                 "boxes", "by_reason")
+
+    def __init__(self) -> None:
+        self.frames = 0
+        self.invoked = 0
+        self.skipped = 0
+        self.skip_fraction = 0.0            # skipped / frames
+        self.energy = 0.0                   # last frame's motion energy
+        self.reason = ""                    # last decision
+        self.boxes: List[Box] = []          # last frame's motion blobs, full-frame xyxy px
+        self.by_reason = {}                 # decisions per reason
+
+
+class MotionGate:
+    """Per-frame run / skip decision from background subtraction."""
+
+    def __init__(self, cfg: AppConfig, frame_width_px: Optional[int] = None,
+                 frame_height_px: Optional[int] = None):
+        self.cfg = cfg
+        self._frame_width_px = frame_width_px
+        self._frame_height_px = frame_height_px
+        self._bg: Optional[np.ndarray] = None       # int32, 8.8 fixed point
+        self._since_run = 0
+        self.stats = MotionStats()
+
+    def reset(self) -> None:
+        """Forget the background (next frame re-learns it and runs the detector)."""
+        self._bg = None
+
+    def update(self, frame: FrameLike, tracks_alive: bool = False) -> GateDecision:
+        """Learn from ``frame`` and decide whether to run the detector on it."""
+        cfg = self.cfg
+        image = frame_array(frame)
+        y = luma(image, cfg.motion_downsample).astype(np.int32)
+        if self._bg is None or self._bg.shape != y.shape:
+            self._bg = y << 8
+            return self._decide(frame, "warmup", 0.0, [])
+        diff = np.abs(y - (self._bg >> 8))
+        self._bg += ((y << 8) - self._bg) >> cfg.motion_bg_shift
+        mask = dilate(erode((diff > cfg.motion_pixel_threshold).astype(np.uint8)))
+        energy = float(np.count_nonzero(mask)) / mask.size
+        boxes = self._full_frame(frame, image, mask_boxes(mask, cfg.motion_cell_px,
+                                                          cfg.motion_max_boxes)) \
+            if energy > 0.0 else []
+        if energy >= cfg.motion_energy_threshold:
+            reason = "motion"
+        elif tracks_alive:
+            reason = "tracks"
+        elif self._since_run + 1 >= cfg.motion_force_every:
+            reason = "forced"
+        else:
+            reason = "idle"
+        return self._decide(frame, reason, energy, boxes)
+
+    def _decide(self, frame: FrameLike, reason: str, energy: float,
+                boxes: List[Box]) -> GateDecision:
+        run = reason != "idle"
+        self._since_run = 0 if run else self._since_run + 1
+        st = self.stats
+        st.frames += 1
+        if run:
+            st.invoked += 1
+        else:
+            st.skipped += 1
+        st.skip_fraction = st.skipped / st.frames
+        st.energy, st.reason, st.boxes = energy, reason, boxes
+        st.by_reason[reason] = st.by_reason.get(reason, 0) + 1
+        return GateDecision(run, reason, energy, boxes)
+
+    def _full_frame(self, frame: FrameLike, image: np.ndarray,
+                    boxes: List[Tuple[int, int, int, int]]) -> List[Box]:
+        """Mask-px boxes -> full-frame px (through the rotation and sensor crop)."""
+        h, w = image.shape[:2]
+        up_w, up_h = upright_size(frame)
+        m = frame_map(frame, self._frame_width_px or up_w, self._frame_height_px or up_h)
+        step = self.cfg.motion_downsample
+        return [m.box((a * step, b * step, min(c * step, w), min(d * step, h)),
+                      m.width_px / w, m.height_px / h) for a, b, c, d in boxes]
@@ -0,0 +1,277 @@
+"""Several Edge TPUs behind one ``Detector`` (Pi-only runtime; imports clean on the Mac).
+
+A USB Coral runs one model at a time, so a second one only helps if two frames are
+in flight at once. ``PooledDetector`` owns one ``CoralDetector`` per enumerated
+device, each driven by its own worker thread:
+
+* ``submit`` hands a frame to the next idle worker, round-robin. It blocks while
+  every worker is busy, so at most one frame per device is in flight.
+* Results are released in dispatch (= capture) order through the ``on_result``
+  callback given to ``start``. A fast device finishing frame N+1 before a slow one
+  finishes N waits for N, so the tracker only ever sees increasing frames; a frame
+  whose inference fails is skipped, not waited on forever.
+* A device that fails ``max_failures`` frames in a row (dropped off the USB bus) is
+  retired: it gets no more frames and shows up in ``pool_stats.retired``. The last
+  live device is never retired, so the pool keeps running (and counting errors).
+
+Plain ``infer`` still works (one frame on the calling thread, on an idle worker),
+so the pool is a drop-in ``Detector`` for benches and tests. Enumeration is behind
+``enumerate_edge_tpus`` and the workers are any ``Detector``s, so dispatch and
+ordering are unit-tested with fake interpreters on x86.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from config import DetectorConfig
+from contracts import Detection, FrameEnvelope, TelemetryStats
+from detect.base import Detector, FrameLike
+from detect.coral import CoralDetector
+from detect.cpu import CpuDetector
+from detect.mobiledet import MobileDetDetector
+from errors import DetectionError
+
+logger = logging.getLogger(__name__)
+
+ResultCallback = Callable[[FrameEnvelope, List[Detection]], None]
+
+
+def enumerate_edge_tpus() -> List[str]:
+    """pycoral device strings (``":0"``, ``":1"``, ...) for every attached Edge TPU.
+
+    Empty without pycoral (the tflite_runtime fallback can't enumerate) or with no
+    device plugged in.
+    """
+    try:
+        from pycoral.utils.edgetpu import list_edge_tpus
+    except ImportError:
+        return []
+    return [f":{i}" for i in range(len(list_edge_tpus()))]
+
+
+class PoolStats(TelemetryStats):
+    """Per-device pool counters (written under the pool's lock)."""
+
+    __slots__ = ("dispatched", "errors", "failures", "retired")
+
+    def __init__(self, size: int) -> None:
+        self.dispatched = [0] * size        # frames per worker
+        self.errors = 0                     # failed frames, all workers
+        self.failures = [0] * size          # consecutive failures per worker
+        self.retired: List[int] = []        # workers taken out of rotation
+
+
+class PooledDetector(Detector):
+    """Round-robin dispatch over N detectors; results re-ordered by frame."""
+
+    _WAIT_S = 0.5               # worker wait timeout so threads notice stop()
+
+    def __init__(self, workers: Sequence[Detector], max_failures: int = 3):
+        if not workers:
+            raise DetectionError("PooledDetector needs at least one worker")
+        self.workers = list(workers)
+        self.max_failures = max(1, max_failures)
+        self._cond = threading.Condition(threading.Lock())
+        self._busy = [False] * len(self.workers)
+        self._inbox: List[Optional[Tuple[int, FrameEnvelope]]] = [None] * len(self.workers)
+        self._next = 0                      # round-robin cursor
+        self._ticket = 0                    # dispatch order; results released in it
+        self._pending: List[int] = []       # tickets in flight, oldest first
+        self._done: Dict[int, Tuple[FrameEnvelope, Optional[List[Detection]]]] = {}
+        self._on_result: Optional[ResultCallback] = None
+        self._running = False
+        self._stopped = False               # stop() called; sync ``infer`` gives up too
+        self._emit = threading.Lock()       # serializes on_result calls, outside _cond
+        self._threads: List[threading.Thread] = []
+        self.pool_stats = PoolStats(len(self.workers))
+
+    @classmethod
+    def from_config(cls, cfg: DetectorConfig, frame_width_px: Optional[int] = None,
+                    frame_height_px: Optional[int] = None,
+                    devices: Optional[Sequence[str]] = None,
+                    lister: Callable[[], List[str]] = enumerate_edge_tpus
+                    ) -> "PooledDetector":
+        """One Edge-TPU detector per device (``cfg.edge_tpus`` of them, 0 = all).
+
+        ``MobileDetDetector`` workers for ``backend: coral_mobiledet``, else
+        ``CoralDetector``.
+        Falls back to a single ``CpuDetector`` (``cpu_model_path``) when no Edge TPU
+        is found.
+        """
+        if devices is None:
+            found = lister()
+            devices = found if cfg.edge_tpus <= 0 else found[:cfg.edge_tpus]
+            if cfg.edge_tpus > len(found):
+                logger.warning("detector.edge_tpus=%d but %d Edge TPU(s) found",
+                               cfg.edge_tpus, len(found))
+        if not devices:
+            logger.warning("no Edge TPU found; pooling a single CPU detector")
+            return cls([CpuDetector(cfg, frame_width_px, frame_height_px)])
+        logger.info("detector pool: %s", ", ".join(devices))
+        worker = MobileDetDetector if cfg.backend == "coral_mobiledet" else CoralDetector
+        return cls([worker(cfg, frame_width_px, frame_height_px, device=d) for d in devices])
+
+    @property
+    def size(self) -> int:
+        return len(self.workers)
+
+    @property
+    def dispatched(self) -> List[int]:
+        return self.pool_stats.dispatched
+
+    @property
+    def errors(self) -> int:
+        return self.pool_stats.errors
+
+    def load(self) -> None:
+        """Load every worker's interpreter now (raises ``DetectionError`` on the first failure)."""
+        for w in self.workers:
+            if hasattr(w, "load"):
+                w.load()
+
+    # ---- async path (pipeline) ----
+
+    def start(self, on_result: ResultCallback) -> None:
+        """Start one worker thread per device; ``on_result`` gets results in order."""
+        if self._running:
+            return
+        with self._cond:        # a restart forgets whatever a stop() left in flight
+            self._busy = [k in self.pool_stats.retired for k in range(self.size)]
+            self._inbox = [None] * self.size
+            self._pending.clear()
+            self._done.clear()
+            self._on_result = on_result
+            self._running = True
+            self._stopped = False
+        self._threads = [threading.Thread(target=self._worker_loop, args=(i,),
+                                          name=f"detector-{i}", daemon=True)
+                         for i in range(self.size) if i not in self.pool_stats.retired]
+        for t in self._threads:
+            t.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._stopped = True
+            self._cond.notify_all()
+
+    def submit(self, envelope: FrameEnvelope, timeout: Optional[float] = None) -> bool:
+        """Hand ``envelope`` to the next idle worker. False if none freed up in time."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: not all(self._busy) or not self._running,
+                                       timeout):
+                return False
+            if not self._running:
+                return False
+            k = self._claim()
+            self._ticket += 1
+            self._pending.append(self._ticket)
+            self._inbox[k] = (self._ticket, envelope)
+            self._cond.notify_all()
+            return True
+
+    def _claim(self) -> int:
+        """Next idle worker at or after the round-robin cursor (lock held, one is idle)."""
+        for step in range(self.size):
+            k = (self._next + step) % self.size
+            if not self._busy[k]:
+                self._busy[k] = True
+                self._next = (k + 1) % self.size
+                self.pool_stats.dispatched[k] += 1
+                return k
+        raise RuntimeError("no idle worker")  # unreachable: caller waited for one
+
+    def _finished(self, k: int, ok: bool) -> bool:
+        """Free worker ``k`` after a frame, or retire it on a failure streak (lock held).
+
+        Returns False once ``k`` is retired; a retired worker stays busy for good.
+        """
+        st = self.pool_stats
+        if ok:
+            st.failures[k] = 0
+        else:
+            st.errors += 1
+            st.failures[k] += 1
+            live = self.size - len(st.retired)
+            if st.failures[k] >= self.max_failures and live > 1:
+                st.retired.append(k)
+                logger.error("pooled worker %d failed %d frames in a row; retired (%d left)",
+                             k, st.failures[k], live - 1)
+                self._cond.notify_all()
+                return False
+        self._busy[k] = False
+        self._cond.notify_all()
+        return True
+
+    def _worker_loop(self, k: int) -> None:
+        detector = self.workers[k]
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._inbox[k] is not None or not self._running,
+                                    self._WAIT_S)
+                if not self._running:
+                    return
+                job = self._inbox[k]
+                self._inbox[k] = None
+            if job is None:
+                continue
+            ticket, envelope = job
+            try:
+                detections: Optional[List[Detection]] = detector.infer(envelope)
+            except Exception:
+                detections = None
+                logger.warning("pooled inference on worker %d failed", k, exc_info=True)
+            with self._cond:
+                live = self._finished(k, detections is not None)
+                self._done[ticket] = (envelope, detections)
+            self._release_in_order()
+            if not live:
+                return
+
+    def _release_in_order(self) -> None:
+        """Emit finished results while the oldest in-flight ticket is done.
+
+        The ready results are taken under ``_cond`` but handed to ``on_result`` after
+        it is released, so a slow callback never blocks ``submit`` or the other
+        workers; ``_emit`` keeps two workers' batches from interleaving out of order.
+        """
+        with self._emit:
+            with self._cond:
+                ready = []
+                while self._pending and self._pending[0] in self._done:
+                    ready.append(self._done.pop(self._pending.pop(0)))
+                on_result = self._on_result
+            for envelope, detections in ready:
+                if detections is not None and on_result is not None:
+                    on_result(envelope, detections)
+
+    # ---- Detector interface ----
+
+    def infer(self, frame: FrameLike) -> List[Detection]:
+        """Synchronous inference on an idle worker, on the calling thread."""
+        with self._cond:
+            self._cond.wait_for(lambda: not all(self._busy) or self._stopped)
+            if self._stopped:
+                raise DetectionError("detector pool is stopped")
+            k = self._claim()
+        ok = False
+        try:
+            detections = self.workers[k].infer(frame)
+            ok = True
+            return detections
+        finally:
+            with self._cond:
+                self._finished(k, ok)
+
+    def apply_config(self, cfg: DetectorConfig) -> None:
+        """Live thresholds for every worker (see ``CoralDetector.apply_config``)."""
+        for w in self.workers:
+            if hasattr(w, "apply_config"):
+                w.apply_config(cfg)
+
+    def close(self) -> None:
+        self.stop()
+        for w in self.workers:
+            w.close()
@@ -0,0 +1,121 @@
+"""Lock-on ROI detection: a model-sized crop around the selected target.
+
+Once a target is selected, most of the full field of view is irrelevant to the
+shot. ``LockOnDetector`` runs the backend on a window of ``input_size_px`` pixels
+of the higher-res detection frame (``camera.detection_stream: main`` or a bigger
+lores), centered where the target is predicted to be — so the bird is seen at
+native resolution instead of downscaled — and interleaves a full scan (``scan``,
+the plain backend or a ``TiledDetector``) every ``lock_on_scan_every`` frames so
+other birds keep their tracks.
+
+Which kind of pass a frame gets is the pipeline's call: it sets
+``FrameEnvelope.roi_center_px`` (full-frame pixels) before handing the frame over,
+and a frame without one is scanned. Everything comes back in full-frame pixels,
+the tracker's space, whichever pass ran.
+"""
+from __future__ import annotations
+
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from config import DetectorConfig
+from contracts import Detection, FrameEnvelope, TelemetryStats
+from detect.base import Detector, FrameLike, FrameMap, frame_array, frame_map, upright_size
+
+
+def roi_origin(cx: float, cy: float, width_px: int, height_px: int,
+               size_px: int) -> Tuple[int, int]:
+    """Top-left of the ``size_px`` window centered on (cx, cy), kept inside the frame."""
+    x0 = int(round(cx - size_px / 2.0))
+    y0 = int(round(cy - size_px / 2.0))
+    return (min(max(x0, 0), max(width_px - size_px, 0)),
+            min(max(y0, 0), max(height_px - size_px, 0)))
+
+
+class RoiStats(TelemetryStats):
+    """Lock-on pass counters for telemetry (written by the inference thread only)."""
+
+    __slots__ = ("roi", "scan")
+
+    def __init__(self) -> None:
+        self.roi = 0
+        self.scan = 0
+
+
+class RoiOutput(NamedTuple):
+    """``invoke`` -> ``decode`` hand-off: inner output + how its pixels map to the full frame.
+
+    full = frame_map.box((crop_offset + px) * scale), per axis.
+    """
+
+    raw: Any
+    roi: bool                       # decoded by ``inner`` (crop) or ``scan`` (whole frame)
+    x0: int                         # crop offset in detection-frame pixels
+    y0: int
+    scale_x: float                  # frame-region px per detection-frame px
+    scale_y: float
+    frame_map: FrameMap             # region px -> full frame (rotation, sensor crop)
+
+
+class LockOnDetector(Detector):
+    """ROI-or-scan per frame over one backend; detections in full-frame pixels.
+
+    ``inner`` and ``scan`` must return boxes in the pixel space of the array they
+    are given (built without frame dims); ``scan`` defaults to ``inner``.
+    """
+
+    def __init__(self, inner: Detector, cfg: DetectorConfig,
+                 frame_width_px: Optional[int] = None,
+                 frame_height_px: Optional[int] = None,
+                 scan: Optional[Detector] = None):
+        self.inner = inner
+        self.scan = scan if scan is not None else inner
+        self.cfg = cfg
+        self._frame_width_px = frame_width_px
+        self._frame_height_px = frame_height_px
+        self.roi_stats = RoiStats()
+
+    @property
+    def tile_stats(self):
+        """The scan's tiling counters when it is a ``TiledDetector`` (else None)."""
+        return getattr(self.scan, "tile_stats", None)
+
+    def infer(self, frame: FrameLike) -> List[Detection]:
+        return self.decode(self.invoke(frame))
+
+    def invoke(self, frame: FrameLike) -> RoiOutput:
+        image = frame_array(frame)
+        h, w = image.shape[:2]
+        size = self.cfg.input_size_px
+        up_w, up_h = upright_size(frame)
+        m = frame_map(frame, self._frame_width_px or up_w, self._frame_height_px or up_h)
+        sx, sy = m.width_px / float(w), m.height_px / float(h)
+        center = frame.roi_center_px if isinstance(frame, FrameEnvelope) else None
+        if center is None or (w <= size and h <= size):
+            self.roi_stats.scan += 1
+            return RoiOutput(self.scan.invoke(image), False, 0, 0, sx, sy, m)
+        cx, cy = m.to_frame(*center)
+        x0, y0 = roi_origin(cx / sx, cy / sy, w, h, size)
+        self.roi_stats.roi += 1
+        return RoiOutput(self.inner.invoke(image[y0:y0 + size, x0:x0 + size]),
+                         True, x0, y0, sx, sy, m)
+
+    def decode(self, raw: RoiOutput) -> List[Detection]:
+        dets = (self.inner if raw.roi else self.scan).decode(raw.raw)
+        x0, y0 = raw.x0, raw.y0
+        return [Detection.from_xyxy(d.cls_id, d.score, *raw.frame_map.box(
+                    (x0 + d.xyxy[0], y0 + d.xyxy[1], x0 + d.xyxy[2], y0 + d.xyxy[3]),
+                    raw.scale_x, raw.scale_y)) for d in dets]
+
+    def apply_config(self, cfg: DetectorConfig) -> None:
+        self.cfg = cfg
+        for d in {id(self.inner): self.inner, id(self.scan): self.scan}.values():
+            if hasattr(d, "apply_config"):
+                d.apply_config(cfg)
+
+    def close(self) -> None:
+        """Close the backend once, whether ``scan`` is it, wraps it, or is separate."""
+        if self.scan is not self.inner:
+            self.scan.close()
+            if getattr(self.scan, "inner", None) is self.inner:
+                return              # a TiledDetector scan closed the shared backend
+        self.inner.close()
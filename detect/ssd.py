@@ -0,0 +1,190 @@
+"""SSD (MobileDet) decode — pure logic, unit-tested on the Mac.
+
+Two graph styles come out of the TF Object Detection API export:
+
+* **With** the ``TFLite_Detection_PostProcess`` op: four outputs — boxes
+  ``[1, K, 4]`` (ymin, xmin, ymax, xmax, normalized), classes ``[1, K]`` (0-based,
+  background already dropped), scores ``[1, K]`` and the valid count ``[1]``. The op
+  has done box decode and NMS; ``postprocess_to_detections`` only maps to pixels.
+* **Without** it: raw box encodings ``[1, N, 4]`` (ty, tx, th, tw) against a fixed
+  anchor table, and class logits ``[1, N, nc+1]`` with background in column 0.
+  ``decode_ssd`` thresholds (in the integer domain for a quantized head, like
+  ``decode_v8``), decodes only the surviving anchors, then runs the shared NMS tail.
+
+The anchor table is the API's ``multiple_grid_anchor_generator`` (ssd_anchor_generator
+block of the MobileDet config) computed with numpy in one vectorized pass per layer and
+cached — it depends only on the input size and the generator parameters.
+
+All returned coordinates are full-frame pixels, same contract as ``decode_v8``.
+"""
+from __future__ import annotations
+
+import functools
+import math
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from contracts import Detection
+from detect.decode import (
+    PRE_NMS_TOPK,
+    _logit,
+    clipped_detections,
+    dequantize,
+    nms_to_detections,
+    quantized_threshold,
+)
+
+# ssdlite_mobiledet_edgetpu_320x320_coco: box coder + anchor generator.
+SSD_BOX_SCALES = (10.0, 10.0, 5.0, 5.0)          # y, x, h, w
+SSD_ASPECT_RATIOS = (1.0, 2.0, 0.5, 3.0, 1.0 / 3.0)
+
+
+@functools.lru_cache(maxsize=8)
+def ssd_anchors(input_size_px: int = 320, num_layers: int = 6, min_scale: float = 0.2,
+                max_scale: float = 0.95,
+                aspect_ratios: Tuple[float, ...] = SSD_ASPECT_RATIOS,
+                interpolated_scale_aspect_ratio: float = 1.0,
+                reduce_boxes_in_lowest_layer: bool = True,
+                feature_map_sizes: Optional[Tuple[int, ...]] = None) -> np.ndarray:
+    """Anchor table ``[N, 4]`` of (ycenter, xcenter, h, w), normalized to the input.
+
+    Matches the Object Detection API's ``create_ssd_anchors`` + ``tile_anchors``: per
+    layer, cells in row-major (y, x) order and every box spec within a cell. Feature
+    maps default to stride 16 doubling per layer (320 px -> 20, 10, 5, 3, 2, 1, i.e.
+    2034 anchors). Read-only: the cached array is shared.
+    """
+    if feature_map_sizes is None:
+        feature_map_sizes = tuple(math.ceil(input_size_px / (16 * 2 ** i))
+                                  for i in range(num_layers))
+    scales = [min_scale + (max_scale - min_scale) * i / (num_layers - 1)
+              for i in range(num_layers)] + [1.0]
+    layers = []
+    for layer, size in enumerate(feature_map_sizes):
+        scale, scale_next = scales[layer], scales[layer + 1]
+        if layer == 0 and reduce_boxes_in_lowest_layer:
+            specs = [(0.1, 1.0), (scale, 2.0), (scale, 0.5)]
+        else:
+            specs = [(scale, ar) for ar in aspect_ratios]
+            if interpolated_scale_aspect_ratio > 0.0:
+                specs.append((math.sqrt(scale * scale_next), interpolated_scale_aspect_ratio))
+        spec = np.array(specs, dtype=np.float64)
+        ratio = np.sqrt(spec[:, 1])
+        heights = spec[:, 0] / ratio
+        widths = spec[:, 0] * ratio
+        centers = (np.arange(size, dtype=np.float64) + 0.5) / size
+        yc, xc = np.meshgrid(centers, centers, indexing="ij")       # [size, size]
+        n_spec = len(specs)
+        table = np.empty((size, size, n_spec, 4), dtype=np.float64)
+        table[..., 0] = yc[:, :, None]
+        table[..., 1] = xc[:, :, None]
+        table[..., 2] = heights
+        table[..., 3] = widths
+        layers.append(table.reshape(-1, 4))
+    anchors = np.concatenate(layers).astype(np.float32)
+    anchors.setflags(write=False)
+    return anchors
+
+
+def decode_ssd_boxes(encodings: np.ndarray, anchors: np.ndarray,
+                     scales: Sequence[float] = SSD_BOX_SCALES) -> np.ndarray:
+    """Faster-RCNN box coder: (ty, tx, th, tw) vs (yc, xc, h, w) anchors -> normalized xyxy."""
+    ty, tx, th, tw = (encodings[:, i] / np.float32(scales[i]) for i in range(4))
+    ya, xa, ha, wa = anchors[:, 0], anchors[:, 1], anchors[:, 2], anchors[:, 3]
+    yc = ty * ha + ya
+    xc = tx * wa + xa
+    half_h = np.exp(th) * ha / 2.0
+    half_w = np.exp(tw) * wa / 2.0
+    return np.stack([xc - half_w, yc - half_h, xc + half_w, yc + half_h], axis=1)
+
+
+def decode_ssd(
+    box_encodings: np.ndarray,
+    class_logits: np.ndarray,
+    anchors: np.ndarray,
+    frame_width_px: int,
+    frame_height_px: int,
+    conf_threshold: float = 0.25,
+    iou_threshold: float = 0.5,
+    num_classes: Optional[int] = None,
+    box_quantization: Optional[Tuple[float, int]] = None,
+    score_quantization: Optional[Tuple[float, int]] = None,
+    max_detections: Optional[int] = None,
+    pre_nms_topk: Optional[int] = PRE_NMS_TOPK,
+) -> List[Detection]:
+    """Decode a no-postprocess SSD head into full-frame ``Detection``s.
+
+    Args:
+        box_encodings: ``[1, N, 4]`` or ``[N, 4]`` (ty, tx, th, tw), float or integer.
+        class_logits: ``[1, N, nc+1]`` or ``[N, nc+1]``; column 0 is background.
+            Scores are ``sigmoid(logit)`` (the MobileDet score converter), so the
+            threshold moves to the logit domain — and to the integer domain when
+            ``score_quantization`` is given — and only survivors are converted.
+        anchors: ``[N, 4]`` from ``ssd_anchors``.
+        num_classes: foreground classes to keep (default: all columns after 0).
+        box_quantization / score_quantization: ``(scale, zero_point)`` of an integer
+            tensor.
+
+    Returns:
+        Detections in full-frame pixel coords, post-NMS, highest score first.
+    """
+    enc = np.asarray(box_encodings).reshape(-1, 4)
+    logits = np.asarray(class_logits)
+    logits = logits.reshape(-1, logits.shape[-1])
+    if enc.shape[0] != anchors.shape[0] or logits.shape[0] != anchors.shape[0]:
+        raise ValueError(f"SSD head has {enc.shape[0]}/{logits.shape[0]} anchors, "
+                         f"anchor table {anchors.shape[0]}")
+    nc = logits.shape[1] - 1 if num_classes is None else int(num_classes)
+    cls = logits[:, 1:1 + nc]
+
+    thr = _logit(conf_threshold)
+    if score_quantization is not None:
+        thr = quantized_threshold(thr, *score_quantization, cls.dtype)
+    best = cls[:, 0] if nc == 1 else cls.max(axis=1)
+    idx = np.flatnonzero(best >= thr)
+    if idx.size == 0:
+        return []
+    class_ids = np.zeros(idx.size, np.intp) if nc == 1 else cls[idx].argmax(axis=1)
+    best = best[idx]
+    if score_quantization is not None:
+        best = dequantize(best, *score_quantization)
+    scores = (1.0 / (1.0 + np.exp(-best.astype(np.float32)))).astype(np.float32)
+
+    sel = enc[idx]
+    sel = dequantize(sel, *box_quantization) if box_quantization is not None \
+        else sel.astype(np.float32)
+    boxes = decode_ssd_boxes(sel, anchors[idx])
+    boxes[:, [0, 2]] *= float(frame_width_px)
+    boxes[:, [1, 3]] *= float(frame_height_px)
+    return nms_to_detections(boxes, scores, class_ids, frame_width_px, frame_height_px,
+                             iou_threshold, max_detections=max_detections,
+                             pre_nms_topk=pre_nms_topk)
+
+
+def postprocess_to_detections(
+    boxes: np.ndarray,
+    classes: np.ndarray,
+    scores: np.ndarray,
+    count: np.ndarray,
+    frame_width_px: int,
+    frame_height_px: int,
+    conf_threshold: float = 0.25,
+    max_detections: Optional[int] = None,
+) -> List[Detection]:
+    """``TFLite_Detection_PostProcess`` outputs -> full-frame ``Detection``s.
+
+    The op has already decoded and NMS'd; this keeps the first ``count`` rows over
+    ``conf_threshold`` (best first) and maps (ymin, xmin, ymax, xmax) to pixels.
+    """
+    n = int(np.asarray(count).reshape(-1)[0])
+    yx = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)[:n]
+    sc = np.asarray(scores, dtype=np.float32).reshape(-1)[:n]
+    cl = np.asarray(classes).reshape(-1)[:n].astype(np.intp)
+    order = np.argsort(sc, kind="stable")[::-1]
+    order = order[sc[order] >= conf_threshold]
+    if max_detections is not None:
+        order = order[:max_detections]
+    xyxy = yx[order][:, [1, 0, 3, 2]]
+    xyxy[:, [0, 2]] *= float(frame_width_px)
+    xyxy[:, [1, 3]] *= float(frame_height_px)
+    return clipped_detections(xyxy, sc[order], cl[order], frame_width_px, frame_height_px)
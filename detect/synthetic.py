@@ -0,0 +1,89 @@
+"""Fake detector backend for synthetic frames (``detector.backend: synthetic``).
+
+Reads the ground truth ``SyntheticCapture`` stamps on each ``FrameEnvelope`` and
+degrades it the way a real detector does: box jitter, random misses (likelier
+the more a bird is occluded; never found below ``synthetic.min_visible``),
+Poisson-distributed false positives and scores that drop with occlusion. So the
+tracker, selector and control loop see realistic detections on x86 with no model
+or Coral; ``synthetic.latency_ms`` stands in for the accelerator in ``invoke``.
+
+Boxes are already full-frame pixels. Only whole synthetic frames work: the tiled /
+lock-on wrappers hand their backend bare crops, which carry no truth.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from config import DetectorConfig, SyntheticConfig
+from contracts import Detection, FrameEnvelope
+from detect.base import Detector, FrameLike, score_floor
+from errors import DetectionError
+
+
+class SyntheticOutput(NamedTuple):
+    """``invoke`` -> ``decode`` hand-off: the frame's truth and its full-frame size."""
+
+    truth: Sequence[Any]            # synthetic.TrueBird
+    width_px: float
+    height_px: float
+    scale_px: float                 # full-frame px per detection-frame px
+
+
+class SyntheticDetector(Detector):
+    """Ground truth + detector noise; deterministic per ``synthetic.seed``."""
+
+    def __init__(self, cfg: DetectorConfig, synthetic: SyntheticConfig,
+                 frame_width_px: Optional[int] = None,
+                 frame_height_px: Optional[int] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.cfg = cfg
+        self.synthetic = synthetic
+        self._frame_width_px = frame_width_px
+        self._frame_height_px = frame_height_px
+        self._sleep = sleep
+        self._rng = np.random.default_rng(synthetic.seed + 1)
+
+    def infer(self, frame: FrameLike) -> List[Detection]:
+        return self.decode(self.invoke(frame))
+
+    def invoke(self, frame: FrameLike) -> SyntheticOutput:
+        if not isinstance(frame, FrameEnvelope) or frame.truth is None:
+            raise DetectionError("synthetic backend needs synthetic frames "
+                                 "(camera.detection_source: synthetic, no tiling / lock-on)")
+        if self.synthetic.latency_ms > 0:
+            self._sleep(self.synthetic.latency_ms / 1e3)
+        h, w = frame.frame.shape[:2]
+        width = float(self._frame_width_px or w)
+        return SyntheticOutput(frame.truth, width, float(self._frame_height_px or h), width / w)
+
+    def decode(self, raw: SyntheticOutput) -> List[Detection]:
+        syn, rng = self.synthetic, self._rng
+        dets = []
+        for bird in raw.truth:
+            if bird.visible < syn.min_visible:
+                continue
+            if rng.random() >= (1.0 - syn.miss_rate) * bird.visible:
+                continue
+            x1, y1, x2, y2 = bird.xyxy
+            bw, bh = x2 - x1, y2 - y1
+            jx, jy, jw, jh = rng.normal(0.0, syn.jitter, 4)
+            cx, cy = bird.cx + jx * bw, bird.cy + jy * bh
+            bw, bh = bw * (1.0 + jw), bh * (1.0 + jh)
+            score = float(np.clip(0.5 + 0.45 * bird.visible + rng.normal(0.0, 0.05), 0.0, 1.0))
+            dets.append(Detection.from_xyxy(0, score, cx - bw / 2, cy - bh / 2,
+                                            cx + bw / 2, cy + bh / 2))
+        floor = score_floor(self.cfg)
+        for _ in range(rng.poisson(syn.false_positives)):
+            size = rng.uniform(*syn.size_px) * raw.scale_px
+            x, y = rng.uniform(0.0, raw.width_px - size), rng.uniform(0.0, raw.height_px - size)
+            score = rng.uniform(floor, max(self.cfg.conf_threshold, 0.7))
+            dets.append(Detection.from_xyxy(0, score, x, y, x + size, y + size / 2))
+        dets = [d for d in dets if d.score >= floor]
+        dets.sort(key=lambda d: -d.score)
+        return dets[:self.cfg.max_detections]
+
+    def apply_config(self, cfg: DetectorConfig) -> None:
+        self.cfg = cfg
@@ -0,0 +1,152 @@
+"""Tiled full-resolution detection for small, distant birds.
+
+At 256 px model input a sparrow at 30 m is a few pixels. ``TiledDetector`` wraps
+any ``Detector`` and runs it over overlapping model-sized tiles of a higher-res
+detection frame (the picamera2 ``main`` stream, or a lores stream bigger than the
+model input), then maps every box back to full-frame pixels and merges the
+duplicates that straddle a seam with ``multiclass_nms``.
+
+A full grid costs one inference per tile, so ``tile_budget`` caps the tiles run per
+frame: with fewer than the grid, each frame takes the next ``tile_budget`` tiles in
+turn and the whole field is swept every few frames (the tracker coasts the gaps).
+``tile_full_frame`` adds one downscaled whole-frame pass so birds big enough to
+span several tiles are still seen whole. ``tile_stats`` reports tiles per frame,
+per-tile latency and the achieved frame rate for tuning that trade-off.
+
+Pure numpy around the inner detector, so it is unit-tested with a fake on x86.
+"""
+from __future__ import annotations
+
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config import DetectorConfig
+from contracts import Detection, TelemetryStats
+from detect.base import Detector, FrameLike, frame_array, frame_map, upright_size
+from detect.decode import multiclass_nms
+
+
+def tile_origins(length_px: int, tile_px: int, overlap_px: int) -> List[int]:
+    """Tile start offsets covering ``[0, length_px)``, the last one flush with the end."""
+    if length_px <= tile_px:
+        return [0]
+    step = tile_px - overlap_px
+    n = -(-(length_px - overlap_px) // step)       # ceil
+    origins = [min(i * step, length_px - tile_px) for i in range(n)]
+    return sorted(set(origins))
+
+
+def tile_grid(width_px: int, height_px: int, tile_px: int,
+              overlap_px: int) -> List[Tuple[int, int]]:
+    """``(x0, y0)`` of every tile, row-major."""
+    return [(x, y) for y in tile_origins(height_px, tile_px, overlap_px)
+            for x in tile_origins(width_px, tile_px, overlap_px)]
+
+
+class TileStats(TelemetryStats):
+    """Tiling counters for telemetry (written by the inference thread only)."""
+
+    __slots__ = ("frames", "tiles", "tiles_per_frame", "grid_tiles", "tile_ms", "fps")
+
+    def __init__(self) -> None:
+        self.frames = 0
+        self.tiles = 0
+        self.tiles_per_frame = 0            # last frame, incl. the whole-frame pass
+        self.grid_tiles = 0                 # tiles in the full grid
+        self.tile_ms = 0.0                  # EMA of one inner inference
+        self.fps = 0.0                      # EMA of tiled frames per second
+
+
+class TiledDetector(Detector):
+    """Runs ``inner`` over overlapping tiles; detections in full-frame pixels.
+
+    ``inner`` must return boxes in the pixel space of the array it is given (a
+    backend built without ``frame_width_px`` / ``frame_height_px``).
+    """
+
+    _EMA = 0.2
+
+    def __init__(self, inner: Detector, cfg: DetectorConfig,
+                 frame_width_px: Optional[int] = None,
+                 frame_height_px: Optional[int] = None):
+        self.inner = inner
+        self.cfg = cfg
+        # Full-frame space the boxes map to; unset = the detection frame's own size.
+        self._frame_width_px = frame_width_px
+        self._frame_height_px = frame_height_px
+        self._cursor = 0                    # next grid tile when the budget is short
+        self._last_t: Optional[float] = None
+        self.tile_stats = TileStats()
+
+    def plan(self, width_px: int, height_px: int) -> List[Tuple[int, int]]:
+        """This frame's tiles: the whole grid, or the next ``tile_budget`` of it."""
+        grid = tile_grid(width_px, height_px, self.cfg.input_size_px, self.cfg.tile_overlap_px)
+        self.tile_stats.grid_tiles = len(grid)
+        budget = self.cfg.tile_budget
+        if budget <= 0 or budget >= len(grid):
+            return grid
+        start = self._cursor % len(grid)
+        self._cursor = start + budget
+        return [grid[(start + i) % len(grid)] for i in range(budget)]
+
+    def infer(self, frame: FrameLike) -> List[Detection]:
+        image = frame_array(frame)
+        h, w = image.shape[:2]
+        tile = self.cfg.input_size_px
+        boxes, scores, classes = [], [], []
+
+        def run(array: np.ndarray, x0: int, y0: int) -> None:
+            t0 = time.perf_counter()
+            dets = self.inner.infer(array)
+            ms = (time.perf_counter() - t0) * 1e3
+            st = self.tile_stats
+            st.tiles += 1
+            st.tile_ms = ms if st.tile_ms == 0.0 else (1 - self._EMA) * st.tile_ms + self._EMA * ms
+            for d in dets:
+                x1, y1, x2, y2 = d.xyxy
+                boxes.append((x0 + x1, y0 + y1, x0 + x2, y0 + y2))
+                scores.append(d.score)
+                classes.append(d.cls_id)
+
+        plan = self.plan(w, h)
+        for x0, y0 in plan:
+            run(image[y0:y0 + tile, x0:x0 + tile], x0, y0)
+        whole = self.cfg.tile_full_frame and self.tile_stats.grid_tiles > 1
+        if whole:
+            run(image, 0, 0)                # inner resizes; boxes come back in frame px
+        self._frame_done(len(plan) + int(whole))
+        if not boxes:
+            return []
+
+        xyxy = np.asarray(boxes, dtype=np.float32)
+        score = np.asarray(scores, dtype=np.float32)
+        cls = np.asarray(classes, dtype=np.intp)
+        keep = multiclass_nms(xyxy, score, cls, self.cfg.iou_threshold)
+        if self.cfg.max_detections:
+            keep = keep[:self.cfg.max_detections]
+        up_w, up_h = upright_size(frame)
+        m = frame_map(frame, self._frame_width_px or up_w, self._frame_height_px or up_h)
+        sx, sy = m.width_px / float(w), m.height_px / float(h)
+        return [Detection.from_xyxy(int(cls[i]), float(score[i]), *m.box(xyxy[i], sx, sy))
+                for i in keep]
+
+    def _frame_done(self, tiles: int) -> None:
+        st = self.tile_stats
+        st.frames += 1
+        st.tiles_per_frame = tiles
+        now = time.monotonic()
+        if self._last_t is not None and now > self._last_t:
+            inst = 1.0 / (now - self._last_t)
+            st.fps = inst if st.fps == 0.0 else (1 - self._EMA) * st.fps + self._EMA * inst
+        self._last_t = now
+
+    def apply_config(self, cfg: DetectorConfig) -> None:
+        """Live thresholds, overlap and budget; forwarded to the inner detector."""
+        self.cfg = cfg
+        if hasattr(self.inner, "apply_config"):
+            self.inner.apply_config(cfg)
+
+    def close(self) -> None:
+        self.inner.close()
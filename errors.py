@@ -17,6 +17,10 @@ class CameraError(TurretError):
     """picamera2 init or capture failed."""
 
 
+class EndOfStream(CameraError):
+    """A finite frame source (a replayed recording) has no frames left."""
+
+
 class DetectionError(TurretError):
     """Model load or inference failed."""
 
@@ -34,8 +34,18 @@ from app.statemachine import FireStateMachine
 from app.streamer import UsbStreamer
 from app.web import TurretWebController, start_web_thread
 from config import Config, load_config
+from detect.base import Detector
 from detect.coral import CoralDetector
+from detect.cpu import CpuDetector, CpuFallbackDetector
+from detect.mobiledet import MobileDetDetector
+from detect.motion import MotionGate
+from detect.pool import PooledDetector
+from detect.roi import LockOnDetector
+from detect.synthetic import SyntheticDetector
+from detect.tiled import TiledDetector
+from errors import DetectionError
 from strategy.selector import TargetSelector
+from track.kalman import KalmanTracker
 from track.tracker import IouTracker
 
 logger = logging.getLogger(__name__)
@@ -99,10 +109,101 @@ def _log_reachable_endpoints(web_port: int, stream_port: int) -> str:
     return primary
 
 
+def build_detector(cfg: Config) -> Detector:
+    """The ``detector.backend`` from config, mapping into full capture-frame pixels.
+
+    ``cpu`` -> ``CpuDetector``; ``synthetic`` -> ``SyntheticDetector`` (synthetic
+    frames only); ``coral_yolo`` -> ``CoralDetector`` and
+    ``coral_mobiledet`` -> ``MobileDetDetector`` (or a ``PooledDetector`` of them when
+    ``edge_tpus`` != 1). With ``cpu_fallback`` the Coral and the CPU model are
+    both loaded here: a Coral that won't load (unplugged) degrades to the CPU backend
+    at startup, and a single Coral runs inside a ``CpuFallbackDetector`` that moves to
+    the CPU once it fails ``cpu_fallback_after`` frames in a row (dropped off the USB
+    bus) instead of failing every inference tick. If the CPU model won't load, a
+    working Coral runs without the fallback and a dead one raises its own error.
+    ``detector.tiled`` wraps the backend in a ``TiledDetector`` and
+    ``detector.lock_on`` in a ``LockOnDetector`` (scanning through the tiler if both);
+    config validation keeps those to a single Edge TPU, never a pool.
+    """
+    d = cfg.detector
+    dims = dict(frame_width_px=cfg.camera.capture_width_px,
+                frame_height_px=cfg.camera.capture_height_px)
+    if d.backend == "synthetic":
+        return SyntheticDetector(d, cfg.synthetic, **dims)
+    if not (d.tiled or d.lock_on):
+        return _build_backend(d, dims)
+    # Tiles / ROIs: the backend maps into crop pixels, the wrapper into the full frame.
+    backend = _build_backend(d, {})
+    if not d.lock_on:
+        return TiledDetector(backend, d, **dims)
+    scan = TiledDetector(backend, d) if d.tiled else backend
+    return LockOnDetector(backend, d, scan=scan, **dims)
+
+
+def _build_backend(d, dims) -> Detector:
+    if d.backend == "cpu":
+        return CpuDetector(d, **dims)
+    if d.edge_tpus != 1:
+        detector = PooledDetector.from_config(d, **dims)
+    elif d.backend == "coral_mobiledet":
+        detector = MobileDetDetector(d, **dims)
+    else:
+        detector = CoralDetector(d, **dims)
+    if not d.cpu_fallback:
+        return detector
+    try:
+        detector.load()
+    except DetectionError as coral_error:
+        cpu = CpuDetector(d, **dims)
+        try:
+            cpu.load()
+        except DetectionError:
+            # No usable fallback: fail on the Coral error, not a CPU tick later.
+            logger.error("CPU fallback model %s failed to load too",
+                         d.cpu_model_path, exc_info=True)
+            raise coral_error
+        logger.error("Coral detector failed to load -> CPU fallback (%s, %d threads)",
+                     d.cpu_model_path, d.cpu_threads, exc_info=coral_error)
+        return cpu
+    if isinstance(detector, PooledDetector):
+        return detector                     # the pool retires its own failing devices
+    cpu = CpuDetector(d, **dims)
+    try:
+        cpu.load()
+    except DetectionError:
+        logger.warning("CPU fallback model %s failed to load; running the Coral without it",
+                       d.cpu_model_path, exc_info=True)
+        return detector
+    return CpuFallbackDetector(detector, cpu, d.cpu_fallback_after)
+
+
+def build_capture(cfg: Config):
+    """The detection frame source for ``camera.detection_source`` (not started)."""
+    from capture import PiCamCapture, ReplayCapture, UsbCapture
+    from synthetic import SyntheticCapture
+
+    if cfg.camera.detection_source == "usb":
+        return UsbCapture(cfg.camera, cfg.detector.input_size_px)
+    if cfg.camera.detection_source == "replay":
+        return ReplayCapture(cfg.camera, cfg.detector.input_size_px)
+    if cfg.camera.detection_source == "synthetic":
+        return SyntheticCapture(cfg.synthetic, cfg.camera, cfg.detector.input_size_px)
+    return PiCamCapture(cfg.camera, cfg.detector.input_size_px)
+
+
+def build_tracker(cfg: Config):
+    """The ``tracker.backend`` from config: ``IouTracker`` or ``KalmanTracker``."""
+    t = cfg.tracker
+    if t.backend == "kalman":
+        return KalmanTracker(t)
+    return IouTracker(t.iou_match_threshold, t.max_age_frames, t.min_hits,
+                      t.velocity_smoothing, assignment=t.assignment,
+                      high_score_threshold=t.high_score_threshold,
+                      history_frames=t.history_frames)
+
+
 def build_pipeline(cfg: Config):
     """Construct hardware + threads. Pi-only (touches I2C / GPIO / camera)."""
-    from capture import PiCamCapture
-
     driver = PCA9685(address=cfg.servo.i2c_address, busnum=cfg.servo.i2c_bus)
     driver.setup(cfg.servo.pwm_freq_hz)
     servo = ServoController(driver, cfg.servo)
@@ -122,22 +223,27 @@ def build_pipeline(cfg: Config):
     control = ControlLoop(cfg, servo, selector, sm,
                           status_led=status_led, aux_marker=aux_marker, pump=pump)
 
-    detector = CoralDetector(cfg.detector,
-                             frame_width_px=cfg.camera.capture_width_px,
-                             frame_height_px=cfg.camera.capture_height_px)
+    detector = build_detector(cfg)
     logger.info("detector ready: %s model=%s input=%dpx -> frame=%dpx",
                 cfg.detector.backend, cfg.detector.model_path,
                 cfg.detector.input_size_px, cfg.camera.capture_width_px)
-    capture = PiCamCapture(cfg.camera, cfg.detector.input_size_px)
+    capture = build_capture(cfg)
     capture.start()
     logger.info("camera started (%s, %dpx detection frame, rotation=%d deg)",
                 cfg.camera.detection_source, cfg.detector.input_size_px,
                 cfg.camera.rotation_deg)
-    tracker = IouTracker(cfg.tracker.iou_match_threshold, cfg.tracker.max_age_frames,
-                         cfg.tracker.min_hits, cfg.tracker.velocity_smoothing)
+    tracker = build_tracker(cfg)
 
     lcd = StatusLcd(enabled=cfg.app.lcd_enabled)
-    pipeline = Pipeline(capture, detector, control, tracker)
+    motion_gate = None
+    if cfg.app.detection_mode == "motion_gated":
+        motion_gate = MotionGate(cfg.app, cfg.camera.capture_width_px,
+                                 cfg.camera.capture_height_px)
+        logger.info("motion-gated detection (forced pass every %d frames)",
+                    cfg.app.motion_force_every)
+    pipeline = Pipeline(capture, detector, control, tracker,
+                        pipelined=cfg.app.inference_mode == "pipelined",
+                        motion_gate=motion_gate)
     reporter = LcdReporter(lcd, pipeline.latest_telemetry, cfg.app.lcd_refresh_hz,
                            armed_getter=lambda: cfg.fire.enabled,
                            fps_getter=lambda: pipeline.fps,
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Detection-source benchmark: Pi Camera lores vs USB webcam MJPEG (Pi / any V4L2 box).
+
+For each ``--source`` it starts the real capture class from config.yaml
+(``PiCamCapture`` / ``UsbCapture``), reads for ``--seconds`` and reports the
+delivered frame rate, the host time spent inside ``read`` (decode + resize: what
+the capture thread costs the CPU) and, for USB, the stale frames skipped to stay
+current. ``--decode`` instead times, on one synthetic ``--mode`` JPEG (needs only
+cv2), the full BGR decode + grey convert + resize against the reduced-grayscale
+decode at each DCT scale:
+
+    python3 scripts/capture_bench.py --source picamera2 usb --seconds 5
+    python3 scripts/capture_bench.py --decode --mode 1280 720 --iters 200
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+
+def bench_source(cfg, source, seconds):
+    from main import build_capture
+
+    cfg.camera.detection_source = source
+    cap = build_capture(cfg)
+    cap.start()
+    try:
+        cap.read()                                  # first frame: mode switch, warm-up
+        read_ms = []
+        t0 = time.monotonic()
+        while time.monotonic() - t0 < seconds:
+            r0 = time.perf_counter()
+            env = cap.read()
+            read_ms.append((time.perf_counter() - r0) * 1e3)
+        elapsed = time.monotonic() - t0
+    finally:
+        cap.close()
+    # time blocked on the sensor is in read_ms too; process time is the CPU cost
+    print("  %-9s %6.1f fps  read median=%.2f p95=%.2f ms  frame=%s  stale_dropped=%s"
+          % (source, len(read_ms) / elapsed, np.median(read_ms), np.percentile(read_ms, 95),
+             "x".join(str(v) for v in env.frame.shape), getattr(cap, "stale_dropped", "-")))
+
+
+def bench_decode(size, width, height, iters):
+    import cv2
+    from capture import _REDUCED_GRAYSCALE, mjpeg_decode_scale
+
+    rng = np.random.default_rng(0)
+    # smooth scene + grain: compresses like a real frame, not like noise
+    scene = cv2.resize(rng.integers(0, 255, (height // 16, width // 16, 3), dtype=np.uint8),
+                       (width, height), interpolation=cv2.INTER_CUBIC)
+    scene = np.clip(scene + rng.normal(0, 4, scene.shape), 0, 255).astype(np.uint8)
+    ok, jpeg = cv2.imencode(".jpg", scene, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    assert ok
+
+    def timed(fn):
+        fn()
+        t0 = time.perf_counter()
+        for _ in range(iters):
+            fn()
+        return (time.perf_counter() - t0) / iters * 1e3
+
+    def full():
+        bgr = cv2.imdecode(jpeg, cv2.IMREAD_COLOR)
+        cv2.resize(cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY), (size, size),
+                   interpolation=cv2.INTER_AREA)
+
+    base = timed(full)
+    print("%dx%d MJPEG (%d kB) -> %dpx Y plane, %d iters"
+          % (width, height, jpeg.size // 1024, size, iters))
+    print("  %-22s %7.2f ms" % ("BGR decode+grey+resize", base))
+    auto = mjpeg_decode_scale(width, height, size)
+    for scale, flag in sorted(_REDUCED_GRAYSCALE.items()):
+        if width // scale < size // 2:
+            continue
+
+        def reduced(flag=getattr(cv2, flag)):
+            luma = cv2.imdecode(jpeg, flag)
+            cv2.resize(luma, (size, size), interpolation=cv2.INTER_AREA)
+
+        ms = timed(reduced)
+        print("  %-22s %7.2f ms  x%.1f%s" % ("grey 1/%d + resize" % scale, ms, base / ms,
+                                          "  <- auto" if scale == auto else ""))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--source", nargs="+", default=["picamera2", "usb"],
+                    choices=["picamera2", "usb"])
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--decode", action="store_true", help="offline JPEG decode comparison")
+    ap.add_argument("--mode", type=int, nargs=2, default=[1280, 720], metavar=("W", "H"))
+    ap.add_argument("--iters", type=int, default=200)
+    args = ap.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    from config import load_config
+    cfg = load_config(args.config)
+    size = cfg.camera.lores_size_px or cfg.detector.input_size_px
+    if args.decode:
+        bench_decode(size, args.mode[0], args.mode[1], args.iters)
+        return
+    print("%dpx detection frame, %.0f s per source" % (size, args.seconds))
+    for source in args.source:
+        bench_source(cfg, source, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
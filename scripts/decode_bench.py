@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Host-side decode benchmark (x86 or Pi; no Coral needed).
+
+Times the post-invoke work on a synthetic INT8 YOLOv8 head at each input size, where
+the anchor count is ``N = (s/8)^2 + (s/16)^2 + (s/32)^2`` (256 -> 1344, 320 -> 2100,
+640 -> 8400):
+
+  * ``dequant+decode`` -- the old path: dequantize the whole ``[1, 4+nc, N]`` tensor to
+    float32, then ``decode_v8`` (transpose, copy boxes, threshold, NMS).
+  * ``quantized``      -- ``decode_v8(..., quantization=...)``: integer threshold on the
+    class rows in their native layout, dequantize only the surviving anchors.
+
+Scores are mostly background with a few bird-sized clusters above threshold, like a
+real frame. ``--nms`` instead times NMS alone on 10..2000 candidate boxes (a flock
+in frame): the old per-class greedy ``while`` loop against ``batched_nms``.
+``--dfl`` times ``decode_v8_dfl`` on raw per-stride INT8 heads (a graph exported
+without the DFL / box-decode ops) against the dense host equivalent -- dequantize,
+softmax and sigmoid every anchor, then ``decode_v8`` -- i.e. what the host would
+pay if it simply took over the dropped ops.
+Run from the repo root:
+
+    python3 scripts/decode_bench.py --iters 500 --classes 1 80
+    python3 scripts/decode_bench.py --nms --classes 1 80
+    python3 scripts/decode_bench.py --dfl --classes 1 80
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+SCALE, ZERO = 1.0 / 255.0, -128     # Ultralytics INT8 head (normalized xywh + scores)
+
+
+def anchors_for(size):
+    return sum((size // s) ** 2 for s in (8, 16, 32))
+
+
+def synthetic_head(size, nc, targets, rng):
+    """INT8 ``[1, 4+nc, N]`` with ``targets`` clusters of ~6 overlapping anchors each."""
+    n = anchors_for(size)
+    x = np.zeros((4 + nc, n), np.float32)
+    x[:4] = rng.uniform(0.02, 0.1, (4, n))
+    x[4:] = rng.uniform(0.0, 0.05, (nc, n))
+    for _ in range(targets):
+        cx, cy = rng.uniform(0.1, 0.9, 2)
+        cls = rng.integers(nc)
+        for a in rng.choice(n, 6, replace=False):
+            x[:4, a] = (cx + rng.normal(0, 0.004), cy + rng.normal(0, 0.004), 0.06, 0.05)
+            x[4 + cls, a] = rng.uniform(0.3, 0.95)
+    q = np.clip(np.round(x / SCALE) + ZERO, -128, 127).astype(np.int8)
+    return q[None]
+
+
+def _time_ms(fn, iters, warmup):
+    for _ in range(warmup):
+        fn()
+    out = np.empty(iters)
+    for i in range(iters):
+        t = time.perf_counter()
+        fn()
+        out[i] = (time.perf_counter() - t) * 1e3
+    return out
+
+
+def loop_nms(boxes, scores, class_ids, iou_threshold):
+    """The pre-vectorization NMS: per-class greedy loop, IoU against the remainder."""
+    from detect.decode import compute_iou
+    keep = []
+    for cls in np.unique(class_ids):
+        idx = np.where(class_ids == cls)[0]
+        order = np.argsort(scores[idx])[::-1]
+        while order.size > 0:
+            i = int(order[0])
+            keep.append(int(idx[i]))
+            ious = compute_iou(boxes[idx[i]], boxes[idx[order[1:]]])
+            order = order[1:][ious < iou_threshold]
+    keep.sort(key=lambda i: scores[i], reverse=True)
+    return keep
+
+
+def flock(n, nc, rng):
+    """``n`` candidate boxes in ~n/6 clusters of overlapping proposals, full-frame px."""
+    centers = rng.uniform(0, 1152, (max(1, n // 6), 2))
+    xy = centers[rng.integers(len(centers), size=n)] + rng.normal(0, 4, (n, 2))
+    wh = rng.uniform(30, 60, (n, 2))
+    boxes = np.concatenate([xy - wh / 2, xy + wh / 2], axis=1).astype(np.float32)
+    return boxes, rng.uniform(0.25, 1.0, n).astype(np.float32), rng.integers(nc, size=n)
+
+
+def bench_nms(args):
+    from detect.decode import batched_nms
+
+    rng = np.random.default_rng(0)
+    print("%-6s %-4s %-6s %-14s %-14s %s" % ("boxes", "nc", "kept", "loop ms",
+                                           "batched ms", "speedup"))
+    for n in (10, 50, 200, 500, 1000, 2000):
+        for nc in args.classes:
+            boxes, scores, cls = flock(n, nc, rng)
+            kept = batched_nms(boxes, scores, cls, 0.5).tolist()
+            assert kept == loop_nms(boxes, scores, cls, 0.5), "NMS paths disagree"
+            a = _time_ms(lambda: loop_nms(boxes, scores, cls, 0.5), args.iters, args.warmup)
+            b = _time_ms(lambda: batched_nms(boxes, scores, cls, 0.5), args.iters, args.warmup)
+            print("%-6d %-4d %-6d %-14.3f %-14.3f x%.1f" % (
+                n, nc, len(kept), np.median(a), np.median(b), np.median(a) / np.median(b)))
+
+
+DFL_SCALE, DFL_ZERO = 0.1, 0    # raw head: bin + class logits
+
+
+def synthetic_dfl_heads(size, nc, targets, rng):
+    """INT8 ``[1, H, W, 64 + nc]`` per stride, background logits, ``targets`` hot cells."""
+    heads = []
+    for stride in (8, 16, 32):
+        side = size // stride
+        x = rng.normal(0.0, 1.0, (1, side, side, 64 + nc)).astype(np.float32)
+        x[..., 64:] = rng.uniform(-9.0, -5.0, (1, side, side, nc))
+        heads.append(x)
+    for _ in range(targets):
+        h = heads[rng.integers(3)]
+        r, c = rng.integers(h.shape[1], size=2)
+        h[0, r, c, 64 + rng.integers(nc)] = rng.uniform(0.5, 4.0)
+    return [np.clip(np.round(x / DFL_SCALE) + DFL_ZERO, -128, 127).astype(np.int8)
+            for x in heads]
+
+
+def dense_dfl_decode(heads, size, nc, **kw):
+    """Host takes over the dropped ops wholesale: every anchor, then ``decode_v8``."""
+    from detect.decode import decode_v8, v8_anchor_points
+    rows = []
+    for q, stride in zip(heads, (8, 16, 32)):
+        a = ((q.astype(np.float32) - DFL_ZERO) * DFL_SCALE).reshape(-1, 64 + nc)
+        b = np.exp(a[:, :64].reshape(-1, 4, 16))
+        d = (b / b.sum(axis=2, keepdims=True)) @ np.arange(16, dtype=np.float32) * stride
+        p = v8_anchor_points(size)[stride]
+        rows.append(np.concatenate([p + (d[:, 2:] - d[:, :2]) / 2, d[:, :2] + d[:, 2:],
+                                    1.0 / (1.0 + np.exp(-a[:, 64:]))], axis=1))
+    return decode_v8(np.concatenate(rows)[None], size, num_classes=nc, **kw)
+
+
+def bench_dfl(args):
+    from detect.decode import decode_v8_dfl
+
+    rng = np.random.default_rng(0)
+    print("%-6s %-4s %-6s %-14s %-14s %s" % ("input", "nc", "N", "dense ms", "dfl ms",
+                                           "speedup"))
+    for size in args.sizes:
+        for nc in args.classes:
+            heads = synthetic_dfl_heads(size, nc, args.targets, rng)
+            kw = dict(frame_width_px=1152, frame_height_px=1152, conf_threshold=args.conf,
+                      iou_threshold=0.5)
+            quants = [(DFL_SCALE, DFL_ZERO)] * 3
+            old = dense_dfl_decode(heads, size, nc, **kw)
+            new = decode_v8_dfl(heads, size, num_classes=nc, quantizations=quants, **kw)
+            assert [d.cls_id for d in old] == [d.cls_id for d in new], "paths disagree"
+            a = _time_ms(lambda: dense_dfl_decode(heads, size, nc, **kw), args.iters,
+                         args.warmup)
+            b = _time_ms(lambda: decode_v8_dfl(heads, size, num_classes=nc,
+                                               quantizations=quants, **kw),
+                         args.iters, args.warmup)
+            print("%-6d %-4d %-6d %-14.3f %-14.3f x%.1f" % (
+                size, nc, anchors_for(size), np.median(a), np.median(b),
+                np.median(a) / np.median(b)))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[256, 320, 640])
+    ap.add_argument("--classes", type=int, nargs="+", default=[1, 80])
+    ap.add_argument("--targets", type=int, default=5, help="birds per synthetic frame")
+    ap.add_argument("--conf", type=float, default=0.25)
+    ap.add_argument("--iters", type=int, default=300)
+    ap.add_argument("--warmup", type=int, default=20)
+    ap.add_argument("--nms", action="store_true", help="benchmark NMS alone")
+    ap.add_argument("--dfl", action="store_true", help="benchmark raw DFL-head decode")
+    args = ap.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    if args.nms:
+        bench_nms(args)
+        return
+    if args.dfl:
+        bench_dfl(args)
+        return
+    from detect.decode import decode_v8
+
+    rng = np.random.default_rng(0)
+    print("%-6s %-4s %-6s %-18s %-18s %s" % ("input", "nc", "N", "dequant+decode ms",
+                                             "quantized ms", "speedup"))
+    for size in args.sizes:
+        for nc in args.classes:
+            q = synthetic_head(size, nc, args.targets, rng)
+            kw = dict(input_size_px=size, frame_width_px=1152, frame_height_px=1152,
+                      conf_threshold=args.conf, iou_threshold=0.5, num_classes=nc,
+                      coords_normalized=True)
+
+            def old():
+                return decode_v8((q.astype(np.float32) - ZERO) * SCALE, **kw)
+
+            def new():
+                return decode_v8(q, quantization=(SCALE, ZERO), **kw)
+
+            assert [(d.cls_id, d.score, d.xyxy) for d in old()] == \
+                [(d.cls_id, d.score, d.xyxy) for d in new()], "paths disagree"
+            a = _time_ms(old, args.iters, args.warmup)
+            b = _time_ms(new, args.iters, args.warmup)
+            print("%-6d %-4d %-6d %-18.3f %-18.3f x%.1f" % (
+                size, nc, anchors_for(size), np.median(a), np.median(b),
+                np.median(a) / np.median(b)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Tracker / selector / control throughput and accuracy at flock scale (x86, no camera).
+
+Drives ``SyntheticCapture`` -> ``SyntheticDetector`` -> tracker (``tracker.backend``) ->
+``ControlLoop`` (scoring + ``TargetSelector`` + predict + servo clamps, on a
+do-nothing servo driver) frame by frame for each flock size and reports the ms
+per frame of every stage plus a MOTA-style ``TrackingScore`` of the confirmed
+tracks against the scene's ground truth. The ``synthetic:`` config section sets
+the scene and detector noise; the flag overrides it per run. Run from the repo root:
+
+    python3 scripts/flock_bench.py --birds 1 10 50 200 --frames 600
+    python3 scripts/flock_bench.py --birds 20 --miss-rate 0.2 --false-positives 2
+    python3 scripts/flock_bench.py --tracker kalman
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+
+class _NullDriver:
+    """PCA9685 stand-in: accepts pulses, drives nothing."""
+
+    def set_servo_pulse(self, channel, pulse_us):
+        pass
+
+    def relax(self, channel):
+        pass
+
+
+def run(cfg, birds, frames):
+    from actuate.servo import ServoController
+    from app.control import ControlLoop
+    from app.statemachine import FireStateMachine
+    from detect.synthetic import SyntheticDetector
+    from main import build_tracker
+    from strategy.selector import TargetSelector
+    from synthetic import SyntheticCapture, TrackingScore
+
+    cfg.synthetic.birds = birds
+    cfg.synthetic.realtime = False
+    capture = SyntheticCapture(cfg.synthetic, cfg.camera, cfg.detector.input_size_px)
+    capture.start()
+    detector = SyntheticDetector(cfg.detector, cfg.synthetic,
+                                 cfg.camera.capture_width_px, cfg.camera.capture_height_px)
+    tracker = build_tracker(cfg)
+    control = ControlLoop(cfg, ServoController(_NullDriver(), cfg.servo),
+                          TargetSelector(cfg.strategy.switch_hysteresis,
+                                         cfg.strategy.min_target_dwell_frames),
+                          FireStateMachine(cfg.fire, on_fire=lambda: None,
+                                           off_fire=lambda: None))
+    score = TrackingScore(cfg.tracker.iou_match_threshold, cfg.synthetic.min_visible)
+    ms = {"scene": [], "detect": [], "track": [], "control": []}
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        envelope = capture.read()
+        t1 = time.perf_counter()
+        dets = detector.infer(envelope)
+        t2 = time.perf_counter()
+        tracks = tracker.update(dets, envelope)
+        t3 = time.perf_counter()
+        control.tick(tracks)
+        t4 = time.perf_counter()
+        score.update(envelope.truth, tracks)
+        for name, a, b in (("scene", t0, t1), ("detect", t1, t2), ("track", t2, t3),
+                           ("control", t3, t4)):
+            ms[name].append((b - a) * 1e3)
+    return {k: float(np.mean(v)) for k, v in ms.items()}, score
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--birds", type=int, nargs="+", default=[1, 10, 50, 200])
+    ap.add_argument("--frames", type=int, default=300)
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--miss-rate", type=float, default=None)
+    ap.add_argument("--false-positives", type=float, default=None)
+    ap.add_argument("--tracker", choices=["iou", "kalman"], default=None)
+    args = ap.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    from config import load_config
+    cfg = load_config(args.config)
+    for flag, name in (("seed", "seed"), ("miss_rate", "miss_rate"),
+                       ("false_positives", "false_positives")):
+        if getattr(args, flag) is not None:
+            setattr(cfg.synthetic, name, getattr(args, flag))
+    if args.tracker:
+        cfg.tracker.backend = args.tracker
+
+    print("%d frames per flock, %dpx scene, miss=%.2f fp=%.1f/frame, %s tracker"
+          % (args.frames, cfg.camera.lores_size_px or cfg.detector.input_size_px,
+             cfg.synthetic.miss_rate, cfg.synthetic.false_positives, cfg.tracker.backend))
+    print("  birds   scene  detect   track control  (ms/frame)   MOTA  misses  fp  idsw  err_px")
+    for birds in args.birds:
+        ms, score = run(cfg, birds, args.frames)
+        print("  %5d  %6.2f  %6.2f  %6.2f  %6.2f              %5.3f  %6d  %4d  %4d  %6.1f"
+              % (birds, ms["scene"], ms["detect"], ms["track"], ms["control"], score.mota,
+                 score.misses, score.false_positives, score.id_switches,
+                 score.center_error_px))
+
+
+if __name__ == "__main__":
+    main()
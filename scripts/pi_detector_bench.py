@@ -10,6 +10,24 @@ frame so the boxes can be eyeballed against the golden fixture. Run on the Pi:
 Latency is input-independent (TPU time), so the timing loop uses a frame already sized to
 the model input (no resize inside the loop). ``--image`` drives the sanity boxes; the model
 was trained on RGB, so the image is converted BGR->RGB to match how the fixture was captured.
+
+Also compares the reference preprocess (float quantize + ``set_tensor`` copy) against the
+LUT write straight into the interpreter's input buffer, on the Y-plane frame the Pi Camera
+actually delivers. ``--preprocess-only`` runs just that comparison against a host buffer
+with the verified int8 input quantization (no Coral / model needed, so it runs on x86):
+
+    python3 scripts/pi_detector_bench.py --preprocess-only --iters 500
+
+``--backend cpu`` benches ``CpuDetector`` (``detector.cpu_model_path``, tflite + XNNPACK)
+instead -- the x86 / Pi-CPU baseline; sweep ``--threads`` and ``--no-xnnpack``:
+
+    python3 scripts/pi_detector_bench.py --backend cpu --threads 1 2 3 4
+
+``--backend mobiledet`` benches ``MobileDetDetector`` (SSDLite-MobileDet @ 320) on the
+same Coral, for the YOLO vs MobileDet comparison; either export style loads:
+
+    python3 scripts/pi_detector_bench.py --backend mobiledet \
+        --model models/ssdlite_mobiledet_coco_qat_postprocess_edgetpu.tflite
 """
 from __future__ import annotations
 
@@ -21,6 +39,89 @@ import time
 import numpy as np
 
 
+def report(name, a):
+    print("  %-18s min=%.2f median=%.2f mean=%.2f p95=%.2f max=%.2f ms  | FPS median=%.1f"
+          % (name, a.min(), np.median(a), a.mean(), np.percentile(a, 95), a.max(),
+             1000.0 / np.median(a)))
+
+
+def _time_ms(fn, iters, warmup):
+    for _ in range(warmup):
+        fn()
+    out = np.empty(iters)
+    for i in range(iters):
+        t = time.perf_counter()
+        fn()
+        out[i] = (time.perf_counter() - t) * 1e3
+    return out
+
+
+class _HostInput:
+    """Host-memory stand-in for the interpreter input tensor (``--preprocess-only``)."""
+
+    def __init__(self, size, dtype):
+        self.buf = np.zeros((1, size, size, 3), dtype=dtype)
+
+    def tensor(self, _index):
+        return lambda: self.buf
+
+    def set_tensor(self, _index, value):
+        np.copyto(self.buf, value)
+
+
+def bench_preprocess(detector, iters, warmup):
+    """Reference preprocess + set_tensor vs LUT write, on a model-size Y-plane frame."""
+    isz = detector.cfg.input_size_px
+    luma = np.random.randint(0, 256, (isz, isz), dtype=np.uint8)
+    interp, in_idx = detector._interpreter, detector._in_index
+    old = _time_ms(lambda: interp.set_tensor(in_idx, detector._preprocess(luma)), iters, warmup)
+    new = _time_ms(lambda: detector._write_input(luma), iters, warmup)
+    identical = np.array_equal(detector._preprocess(luma), interp.tensor(in_idx)())
+    print("\n=== preprocess over %d iters (Y plane %dx%d -> %s input) ===" % (
+        iters, isz, isz, np.dtype(detector._in_dtype).name))
+    report("float+set_tensor", old)
+    report("LUT zero-copy", new)
+    print("  speedup x%.1f (median), bit-identical=%s" % (np.median(old) / np.median(new),
+                                                        identical))
+
+
+def bench_cpu(cfg, args):
+    """``CpuDetector`` latency: bare invoke and full ``infer`` on a model-size frame."""
+    from detect.cpu import CpuDetector
+    d = cfg.detector
+    detector = CpuDetector(d, frame_width_px=args.frame_size, frame_height_px=args.frame_size)
+    detector.load()
+    isz = d.input_size_px
+    frame = np.random.randint(0, 256, (isz, isz), dtype=np.uint8)   # Y plane, like the Pi Cam
+    detector._write_input(frame)
+    invoke = _time_ms(detector._interpreter.invoke, args.iters, args.warmup)
+    full = _time_ms(lambda: detector.infer(frame), args.iters, args.warmup)
+    print("\n=== CPU %s threads=%d xnnpack=%s (%d iters, input=%d) ===" % (
+        d.cpu_model_path, d.cpu_threads, d.cpu_xnnpack, args.iters, isz))
+    report("invoke", invoke)
+    report("full infer", full)
+
+
+def bench_mobiledet(cfg, args):
+    """``MobileDetDetector`` latency: bare invoke (incl. any postprocess op) and full ``infer``."""
+    from detect.mobiledet import MobileDetDetector
+    d = cfg.detector
+    d.input_size_px = 320
+    detector = MobileDetDetector(d, frame_width_px=args.frame_size,
+                                 frame_height_px=args.frame_size)
+    detector.load()
+    frame = np.random.randint(0, 256, (320, 320), dtype=np.uint8)
+    detector._write_input(frame)
+    invoke = _time_ms(detector._interpreter.invoke, args.iters, args.warmup)
+    full = _time_ms(lambda: detector.infer(frame), args.iters, args.warmup)
+    print("\n=== MobileDet %s (%s, %d iters, input=320) ===" % (
+        d.model_path, "postprocess op" if detector.has_postprocess else "host SSD decode",
+        args.iters))
+    report("invoke", invoke)
+    report("full infer", full)
+    print("  host preprocess+decode ~= %.2f ms (median)" % (np.median(full) - np.median(invoke)))
+
+
 def main():
     ap = argparse.ArgumentParser(description=__doc__)
     ap.add_argument("--image", default=None, help="real frame for the sanity boxes")
@@ -28,21 +129,43 @@ def main():
     ap.add_argument("--iters", type=int, default=200)
     ap.add_argument("--warmup", type=int, default=10)
     ap.add_argument("--model", default=None, help="override config detector.model_path")
+    ap.add_argument("--preprocess-only", action="store_true",
+                    help="only compare preprocess paths on a host buffer (no Coral)")
+    ap.add_argument("--backend", choices=("coral", "cpu", "mobiledet"), default="coral")
+    ap.add_argument("--threads", type=int, nargs="+", default=None,
+                    help="cpu backend: interpreter thread counts to sweep")
+    ap.add_argument("--no-xnnpack", action="store_true", help="cpu backend: reference kernels")
     args = ap.parse_args()
 
     sys.path.insert(0, os.getcwd())
     from config import load_config
-    from detect.coral import CoralDetector
 
     cfg = load_config()
+    if args.backend == "cpu":
+        if args.model:
+            cfg.detector.cpu_model_path = args.model
+        cfg.detector.cpu_xnnpack = not args.no_xnnpack
+        for threads in args.threads or [cfg.detector.cpu_threads]:
+            cfg.detector.cpu_threads = threads
+            bench_cpu(cfg, args)
+        return
     if args.model:
         cfg.detector.model_path = args.model
+    if args.backend == "mobiledet":
+        bench_mobiledet(cfg, args)
+        return
+    from detect.coral import CoralDetector
     d = cfg.detector
     print("model=%s" % d.model_path)
     print("input=%d num_classes=%d conf=%.2f iou=%.2f coords_normalized=%s"
           % (d.input_size_px, d.num_classes, d.conf_threshold, d.iou_threshold, d.coords_normalized))
 
     detector = CoralDetector(d)
+    if args.preprocess_only:
+        detector._in_scale, detector._in_zero, detector._in_dtype = 1.0 / 255.0, -128, np.int8
+        detector._interpreter = _HostInput(d.input_size_px, np.int8)
+        bench_preprocess(detector, args.iters, args.warmup)
+        return
     t0 = time.perf_counter()
     detector.load()
     print("load(): %.1f ms" % ((time.perf_counter() - t0) * 1e3))
@@ -97,16 +220,12 @@ def main():
         detector.infer(bench_frame)
         full[i] = (time.perf_counter() - t) * 1e3
 
-    def report(name, a):
-        print("  %-18s min=%.2f median=%.2f mean=%.2f p95=%.2f max=%.2f ms  | FPS median=%.1f"
-              % (name, a.min(), np.median(a), a.mean(), np.percentile(a, 95), a.max(),
-                 1000.0 / np.median(a)))
-
     print("\n=== latency over %d iters (input=%d, USB3) ===" % (args.iters, isz))
     report("TPU invoke", tpu)
     report("full infer", full)
     print("  decode+dequant overhead ~= %.2f ms (median)"
           % (np.median(full) - np.median(tpu)))
+    bench_preprocess(detector, args.iters, args.warmup)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Serial vs pipelined inference: throughput and capture->track latency.
+
+Runs the real ``Pipeline`` capture->inference threads (no control / servos) twice --
+``pipelined=False`` then ``pipelined=True`` -- on the same detector and reports the
+tracked results per second and each result's frame age when tracking finished.
+
+By default the Edge TPU is a fake interpreter whose ``invoke`` sleeps ``--invoke-ms``
+(releasing the GIL like the real call), so it runs on x86; the host side is the real
+``CoralDetector.decode`` + ``IouTracker`` plus ``--host-ms`` of GIL-holding busy work
+standing in for the rest of the per-frame Python. On the Pi, pass ``--model`` to use
+the real Coral instead. ``--replay`` feeds a recorded session (``ReplayCapture``,
+on its own timestamps; ``--replay-fast`` as fast as it is consumed) instead of the
+blank synthetic frames at ``--fps``:
+
+    python3 scripts/pipeline_bench.py --invoke-ms 12 --host-ms 6 --seconds 5
+    python3 scripts/pipeline_bench.py --replay recordings/feeder.npy
+    cd ~/pi-turret && python3 scripts/pipeline_bench.py --model models/<m>_edgetpu.tflite
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+
+class _FakeInterpreter:
+    """TPU stand-in: one-bird INT8 v8 head, ``invoke`` sleeps ``latency_s``."""
+
+    def __init__(self, size, latency_s):
+        self.input = np.zeros((1, size, size, 3), np.int8)
+        anchors = sum((size // s) ** 2 for s in (8, 16, 32))
+        self.output = np.full((1, 5, anchors), -128, np.int8)
+        self.output[0, :, 100] = (0, 0, -102, -102, 100)   # centered bird, score ~0.89
+        self.latency_s = latency_s
+
+    def tensor(self, _index):
+        return lambda: self.input
+
+    def invoke(self):
+        time.sleep(self.latency_s)
+
+    def get_tensor(self, _index):
+        return self.output.copy()
+
+
+class _BusyTracker:
+    """Wraps the real tracker and adds ``host_s`` of GIL-holding CPU work per frame."""
+
+    def __init__(self, tracker, host_s):
+        self.tracker = tracker
+        self.host_s = host_s
+
+    def update(self, detections, frame=None):
+        end = time.perf_counter() + self.host_s
+        while time.perf_counter() < end:
+            pass
+        return self.tracker.update(detections, frame)
+
+
+def build_detector(cfg, args):
+    from detect.coral import CoralDetector
+    det = CoralDetector(cfg.detector, frame_width_px=cfg.camera.capture_width_px,
+                        frame_height_px=cfg.camera.capture_height_px)
+    if args.model:
+        det.load()
+        return det
+    det._interpreter = _FakeInterpreter(cfg.detector.input_size_px, args.invoke_ms / 1e3)
+    det._in_scale, det._in_zero, det._in_dtype = 1.0 / 255.0, -128, np.int8
+    det._out_scale, det._out_zero = 1.0 / 255.0, -128
+    return det
+
+
+def run(cfg, detector, args, pipelined):
+    from app.pipeline import Pipeline
+    from contracts import FrameEnvelope
+    from errors import EndOfStream
+    from main import build_tracker
+
+    tracker = _BusyTracker(build_tracker(cfg), args.host_ms / 1e3)
+    pipe = Pipeline(capture=None, detector=detector, control=None, tracker=tracker,
+                    pipelined=pipelined)
+    pipe._running = True
+    threads = pipe._inference_threads()
+    for t in threads:
+        t.start()
+
+    ages_ms = []
+
+    def consume():
+        last = 0
+        while pipe._running:
+            last, tracked = pipe.latest_tracks.wait_for_newer(last, 0.2)
+            if tracked is not None:
+                ages_ms.append((tracked.frame.stage_t["track"] - tracked.frame.capture_t) * 1e3)
+
+    consumer = threading.Thread(target=consume, daemon=True)
+    consumer.start()
+    size = cfg.detector.input_size_px
+    frame = np.zeros((size, size), np.uint8)
+    period = 1.0 / args.fps
+    seq = 0
+    source = None
+    if args.replay:
+        from capture import ReplayCapture
+        source = ReplayCapture(cfg.camera, size)
+        source.start()
+    t0 = time.monotonic()
+    while time.monotonic() - t0 < args.seconds:
+        if source is not None:
+            try:
+                pipe.latest_frame.put(source.read())    # paced by the recording
+            except EndOfStream:
+                break
+            continue
+        seq += 1                                    # capture stand-in at --fps
+        pipe.latest_frame.put(FrameEnvelope(frame, seq, time.monotonic()))
+        # Absolute deadlines: a late wake-up (GIL held by host work) doesn't lower the rate.
+        time.sleep(max(0.0, t0 + seq * period - time.monotonic()))
+    elapsed = time.monotonic() - t0
+    if source is not None:
+        source.close()
+    pipe._running = False
+    for t in threads + [consumer]:
+        t.join(timeout=1.0)
+    return np.array(ages_ms), elapsed, pipe.stats()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--model", default=None, help="real Edge-TPU model (Pi only)")
+    ap.add_argument("--invoke-ms", type=float, default=12.0, help="fake TPU invoke latency")
+    ap.add_argument("--host-ms", type=float, default=6.0, help="extra host work per frame")
+    ap.add_argument("--fps", type=float, default=60.0, help="capture rate")
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--replay", default=None, help="recorded session (.npy / .y8 / video)")
+    ap.add_argument("--replay-fast", action="store_true",
+                    help="replay without real-time pacing")
+    args = ap.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    from config import load_config
+    cfg = load_config(args.config)
+    if args.model:
+        cfg.detector.model_path = args.model
+    if args.replay:
+        cfg.camera.replay_path = args.replay
+        cfg.camera.replay_pacing = "fast" if args.replay_fast else "realtime"
+    detector = build_detector(cfg, args)
+
+    print("capture=%s  invoke=%s  host=+%.1f ms  %.0f s per mode"
+          % (args.replay or "%.0f fps" % args.fps,
+             "real" if args.model else "%.1f ms (fake)" % args.invoke_ms, args.host_ms, args.seconds))
+    rates = {}
+    for mode in ("serial", "pipelined"):
+        ages, elapsed, stats = run(cfg, detector, args, mode == "pipelined")
+        rates[mode] = ages.size / elapsed
+        print("  %-9s %6.1f results/s  capture->track median=%.1f p95=%.1f ms  stale=%d"
+              % (mode, rates[mode], np.median(ages), np.percentile(ages, 95),
+                 stats["inference"]["stale"]))
+    print("  throughput x%.2f" % (rates["pipelined"] / rates["serial"]))
+
+
+if __name__ == "__main__":
+    main()
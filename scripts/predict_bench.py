@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Lead prediction error of every ``predict.model`` on replayed tracks (x86, no camera).
+
+Records ``--frames`` of ``SyntheticDetector`` output per flock size, runs the
+configured tracker over them, and every frame predicts each confirmed track
+``predict.lead_time_s`` ahead (``synthetic.fps`` frames) with every model at
+once. Tracks are paired with scene birds by IoU; a prediction is scored against
+that bird's true centroid when the horizon arrives (skipped if it has left the
+view or is mostly hidden). Reports mean / median / p90 error in full-frame px
+and the ms one batched ``predict_positions`` call takes. Run from the repo root:
+
+    python3 scripts/predict_bench.py --birds 1 10 50 --frames 600
+    python3 scripts/predict_bench.py --turn-deg-s 90 --tracker kalman
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+
+def record(cfg, birds, frames):
+    from detect.synthetic import SyntheticDetector
+    from synthetic import SyntheticCapture
+
+    cfg.synthetic.birds = birds
+    cfg.synthetic.realtime = False
+    capture = SyntheticCapture(cfg.synthetic, cfg.camera, cfg.detector.input_size_px)
+    capture.start()
+    detector = SyntheticDetector(cfg.detector, cfg.synthetic,
+                                 cfg.camera.capture_width_px, cfg.camera.capture_height_px)
+    out = []
+    for _ in range(frames):
+        envelope = capture.read()
+        out.append((envelope, detector.infer(envelope)))
+    return out
+
+
+def run(cfg, stream, models, lead_frames):
+    from main import build_tracker
+    from track.assign import greedy_assignment, iou_matrix
+    from track.predict import predict_positions
+
+    p = cfg.predict
+    tracker = build_tracker(cfg)
+    pending = {}                # frame index -> [(bird id, {model: (x, y)})]
+    errors = {m: [] for m in models}
+    ms = []
+    for k, (envelope, dets) in enumerate(stream):
+        tracks = tracker.update(dets, envelope)
+        truth = {b.id: b for b in envelope.truth if b.visible >= cfg.synthetic.min_visible}
+        for bird_id, predicted in pending.pop(k, []):
+            bird = truth.get(bird_id)
+            if bird is not None:
+                for m, (x, y) in predicted.items():
+                    errors[m].append(np.hypot(x - bird.cx, y - bird.cy))
+        if not len(tracks) or not truth:
+            continue
+        t0 = time.perf_counter()
+        predicted = {m: predict_positions(tracks, lead_frames, m, p.min_history,
+                                          p.history_decay) for m in models}
+        ms.append((time.perf_counter() - t0) * 1e3 / len(models))
+        birds = list(truth.values())
+        pairs = greedy_assignment(
+            iou_matrix(tracks.xyxy, np.asarray([b.xyxy for b in birds], dtype=np.float64)),
+            cfg.tracker.iou_match_threshold)
+        pending[k + lead_frames] = [
+            (birds[bi].id, {m: tuple(predicted[m][ti]) for m in models}) for ti, bi in pairs]
+    return errors, float(np.mean(ms)) if ms else 0.0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--birds", type=int, nargs="+", default=[1, 10, 50])
+    ap.add_argument("--frames", type=int, default=600)
+    ap.add_argument("--tracker", choices=["iou", "kalman"], default=None)
+    ap.add_argument("--turn-deg-s", type=float, default=None, help="synthetic.turn_deg_s")
+    ap.add_argument("--models", nargs="+", default=["cv", "linear", "quadratic", "turn"],
+                    choices=["cv", "linear", "quadratic", "turn"])
+    args = ap.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    from config import load_config
+    cfg = load_config(args.config)
+    if args.tracker:
+        cfg.tracker.backend = args.tracker
+    if args.turn_deg_s is not None:
+        cfg.synthetic.turn_deg_s = args.turn_deg_s
+    lead_frames = int(round(cfg.predict.lead_time_s * cfg.synthetic.fps))
+
+    print("%d frames per flock, %s tracker, lead %.2f s = %d frames, turn <= %.0f deg/s, "
+          "history %d" % (args.frames, cfg.tracker.backend, cfg.predict.lead_time_s,
+                          lead_frames, cfg.synthetic.turn_deg_s, cfg.tracker.history_frames))
+    print("  birds  model       n   mean px  median px  p90 px   predict ms")
+    for birds in args.birds:
+        stream = record(cfg, birds, args.frames)
+        errors, ms = run(cfg, stream, args.models, lead_frames)
+        for m in args.models:
+            e = np.asarray(errors[m])
+            if not e.size:
+                continue
+            print("  %5d  %-9s %5d  %8.2f  %9.2f  %6.2f  %10.3f"
+                  % (birds, m, e.size, e.mean(), np.median(e), np.percentile(e, 90), ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Per-frame allocation and time of tracker update + control tick (x86, no camera).
+
+Records ``--frames`` of ``SyntheticDetector`` output per flock size, then replays
+them through the configured tracker (``tracker.backend``) and ``ControlLoop.tick``
+(scoring + selection + aim, do-nothing servo driver). Per frame it reports the
+mean ms of each stage and the tracemalloc peak above the frame's starting heap
+(KiB: everything the frame allocates and still holds at its high-water mark —
+per-track objects, lists, dicts and NumPy temporaries). Run from the repo root:
+
+    python3 scripts/track_alloc_bench.py --birds 10 50 200 --frames 300
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+
+class _NullDriver:
+    def set_servo_pulse(self, channel, pulse_us):
+        pass
+
+    def relax(self, channel):
+        pass
+
+
+def record(cfg, birds, frames):
+    from detect.synthetic import SyntheticDetector
+    from synthetic import SyntheticCapture
+
+    cfg.synthetic.birds = birds
+    cfg.synthetic.realtime = False
+    capture = SyntheticCapture(cfg.synthetic, cfg.camera, cfg.detector.input_size_px)
+    capture.start()
+    detector = SyntheticDetector(cfg.detector, cfg.synthetic,
+                                 cfg.camera.capture_width_px, cfg.camera.capture_height_px)
+    out = []
+    for _ in range(frames):
+        envelope = capture.read()
+        out.append((envelope, detector.infer(envelope)))
+    return out
+
+
+def run(cfg, stream, trace):
+    from actuate.servo import ServoController
+    from app.control import ControlLoop
+    from app.statemachine import FireStateMachine
+    from main import build_tracker
+    from strategy.selector import TargetSelector
+
+    tracker = build_tracker(cfg)
+    control = ControlLoop(cfg, ServoController(_NullDriver(), cfg.servo),
+                          TargetSelector(cfg.strategy.switch_hysteresis,
+                                         cfg.strategy.min_target_dwell_frames),
+                          FireStateMachine(cfg.fire, on_fire=lambda: None,
+                                           off_fire=lambda: None))
+    track_ms, tick_ms, peak_kib = [], [], []
+    for envelope, dets in stream:
+        if trace:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        tracks = tracker.update(dets, envelope)
+        t1 = time.perf_counter()
+        control.tick(tracks)
+        t2 = time.perf_counter()
+        if trace:
+            peak_kib.append((tracemalloc.get_traced_memory()[1] - base) / 1024)
+        track_ms.append((t1 - t0) * 1e3)
+        tick_ms.append((t2 - t1) * 1e3)
+    return (float(np.mean(track_ms)), float(np.mean(tick_ms)),
+            float(np.mean(peak_kib)) if peak_kib else 0.0)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--birds", type=int, nargs="+", default=[10, 50, 200])
+    ap.add_argument("--frames", type=int, default=300)
+    ap.add_argument("--tracker", choices=["iou", "kalman"], default=None)
+    args = ap.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    from config import load_config
+    cfg = load_config(args.config)
+    if args.tracker:
+        cfg.tracker.backend = args.tracker
+
+    print("%d frames per flock, %s tracker; times untraced, memory under tracemalloc"
+          % (args.frames, cfg.tracker.backend))
+    print("  birds  track ms  tick ms  peak KiB/frame")
+    for birds in args.birds:
+        stream = record(cfg, birds, args.frames)
+        track_ms, tick_ms, _ = run(cfg, stream, trace=False)
+        tracemalloc.start()
+        _, _, peak_kib = run(cfg, stream, trace=True)
+        tracemalloc.stop()
+        print("  %5d  %8.3f  %7.3f  %14.1f" % (birds, track_ms, tick_ms, peak_kib))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Tracker association cost from 1 to 200 simultaneous birds (x86, no camera).
+
+Records ``--frames`` of ``SyntheticDetector`` output per flock size once, then
+replays the same detections through the tracker's ``update`` in each mode:
+``loop`` (the previous per-pair Python IoU + sort, kept here as the reference),
+``greedy`` (NumPy IoU matrix, same pairs), ``optimal`` (max total IoU) and
+``kalman`` (``KalmanTracker`` with the config's model / assignment). Reports
+mean / p95 ms per update and the id switches / fragmentations ``TrackingScore``
+counts against the scene truth. ``--low-conf`` also records the detector's low
+score tier and runs every mode twice: ``1-stage`` (detections below
+``conf_threshold`` dropped, as without the tier) and ``2-stage`` (ByteTrack: the low
+tier extends unmatched tracks). Run from the repo root:
+
+    python3 scripts/tracker_bench.py --birds 1 10 50 100 200 --frames 300
+    python3 scripts/tracker_bench.py --modes greedy kalman --conf 0.75 --low-conf 0.3
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import os
+import sys
+import time
+
+import numpy as np
+
+
+def _iou(a, b) -> float:
+    ix = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (max(0.0, a[2] - a[0]) * max(0.0, a[3] - a[1])
+             + max(0.0, b[2] - b[0]) * max(0.0, b[3] - b[1]) - inter)
+    return inter / union if union > 0.0 else 0.0
+
+
+def _loop_match(tracker, boxes, detections):
+    """Association as it was before ``track.assign``: per-pair IoU, sort, greedy."""
+    candidates = []
+    for ti, box in enumerate(boxes.tolist()):
+        for di, det in enumerate(detections):
+            iou = _iou(box, det.xyxy)
+            if iou >= tracker.iou_threshold:
+                candidates.append((iou, ti, di))
+    candidates.sort(reverse=True)
+    used_t, used_d, matches = set(), set(), []
+    for _, ti, di in candidates:
+        if ti in used_t or di in used_d:
+            continue
+        used_t.add(ti)
+        used_d.add(di)
+        matches.append((ti, di))
+    return matches
+
+
+def record(cfg, birds, frames):
+    from detect.synthetic import SyntheticDetector
+    from synthetic import SyntheticCapture
+
+    cfg.synthetic.birds = birds
+    cfg.synthetic.realtime = False
+    capture = SyntheticCapture(cfg.synthetic, cfg.camera, cfg.detector.input_size_px)
+    capture.start()
+    detector = SyntheticDetector(cfg.detector, cfg.synthetic,
+                                 cfg.camera.capture_width_px, cfg.camera.capture_height_px)
+    out = []
+    for _ in range(frames):
+        envelope = capture.read()
+        out.append((envelope, detector.infer(envelope)))
+    return out
+
+
+def run(cfg, stream, mode, two_stage=False):
+    from synthetic import TrackingScore
+    from track.kalman import KalmanTracker
+    from track.tracker import IouTracker
+
+    conf = cfg.detector.conf_threshold
+    t = dataclasses.replace(cfg.tracker, high_score_threshold=conf if two_stage else 0.0)
+    if mode == "kalman":
+        tracker = KalmanTracker(t)
+    else:
+        tracker = IouTracker(t.iou_match_threshold, t.max_age_frames, t.min_hits,
+                             t.velocity_smoothing,
+                             assignment="greedy" if mode == "loop" else mode,
+                             high_score_threshold=t.high_score_threshold)
+    if mode == "loop":
+        tracker._match = lambda boxes, dets: _loop_match(tracker, boxes, dets)
+    score = TrackingScore(t.iou_match_threshold, cfg.synthetic.min_visible)
+    ms = []
+    for envelope, dets in stream:
+        if not two_stage:
+            dets = [d for d in dets if d.score >= conf]
+        t0 = time.perf_counter()
+        tracks = tracker.update(dets, envelope)
+        ms.append((time.perf_counter() - t0) * 1e3)
+        score.update(envelope.truth, tracks)
+    return float(np.mean(ms)), float(np.percentile(ms, 95)), score
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--birds", type=int, nargs="+", default=[1, 10, 50, 100, 200])
+    ap.add_argument("--frames", type=int, default=300)
+    ap.add_argument("--modes", nargs="+", default=["loop", "greedy", "optimal", "kalman"],
+                    choices=["loop", "greedy", "optimal", "kalman"])
+    ap.add_argument("--conf", type=float, default=None, help="detector conf_threshold")
+    ap.add_argument("--low-conf", type=float, default=0.0,
+                    help="record the low tier down to this and compare 1- / 2-stage")
+    args = ap.parse_args()
+
+    sys.path.insert(0, os.getcwd())
+    from config import load_config
+    cfg = load_config(args.config)
+    if args.conf is not None:
+        cfg.detector.conf_threshold = args.conf
+    cfg.detector.low_conf_threshold = args.low_conf
+    stages = [False, True] if args.low_conf else [False]
+
+    print("%d frames per flock, tracker update only (detections pre-recorded), "
+          "conf=%.2f low=%.2f" % (args.frames, cfg.detector.conf_threshold, args.low_conf))
+    print("  birds  mode     assoc     mean ms   p95 ms   idsw   frag    MOTA")
+    for birds in args.birds:
+        stream = record(cfg, birds, args.frames)
+        for mode in args.modes:
+            for two_stage in stages:
+                mean, p95, score = run(cfg, stream, mode, two_stage)
+                print("  %5d  %-8s %-8s %8.3f %8.3f  %5d  %5d  %6.3f"
+                      % (birds, mode, "2-stage" if two_stage else "1-stage", mean, p95,
+                         score.id_switches, score.fragmentations, score.mota))
+
+
+if __name__ == "__main__":
+    main()
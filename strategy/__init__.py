@@ -1,5 +1,5 @@
 """Strategy layer: per-track scoring + target selection/switching."""
-from strategy.scoring import score_track
+from strategy.scoring import score_track, score_tracks
 from strategy.selector import TargetSelector
 
-__all__ = ["score_track", "TargetSelector"]
+__all__ = ["score_track", "score_tracks", "TargetSelector"]
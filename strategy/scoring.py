@@ -2,15 +2,19 @@
 
 Score is normalized to [0, 1] (weighted features / total weight) so the selector's
 ``switch_hysteresis`` reads as a fraction. All weights live in ``StrategyConfig``;
-set a weight to 0 to drop a feature without touching code.
+set a weight to 0 to drop a feature without touching code. ``score_tracks``
+scores a whole ``TrackBatch`` from its columns, with the same arithmetic.
 """
 from __future__ import annotations
 
 import math
 from typing import Tuple
 
+import numpy as np
+
 from config import KillZoneConfig, StrategyConfig
 from contracts import Track
+from track.table import TrackBatch
 
 
 def _killzone_center(kz: KillZoneConfig) -> Tuple[float, float]:
@@ -21,6 +25,10 @@ def _clamp01(x: float) -> float:
     return 0.0 if x < 0.0 else 1.0 if x > 1.0 else x
 
 
+def _clip01_array(x: np.ndarray) -> np.ndarray:
+    return np.minimum(np.maximum(x, 0.0), 1.0)
+
+
 def score_track(track: Track, kz: KillZoneConfig, cfg: StrategyConfig,
                 frame_width_px: float, frame_height_px: float) -> float:
     """Return a priority score in [0, 1]. Higher = engage sooner."""
@@ -61,3 +69,38 @@ def score_track(track: Track, kz: KillZoneConfig, cfg: StrategyConfig,
     )
     total = cfg.w_killzone + cfg.w_size + cfg.w_dwell + cfg.w_approach + cfg.w_confidence
     return weighted / total if total > 0 else 0.0
+
+
+def score_tracks(tracks: TrackBatch, kz: KillZoneConfig, cfg: StrategyConfig,
+                 frame_width_px: float, frame_height_px: float) -> np.ndarray:
+    """``score_track`` of every row of ``tracks`` as one ``[N]`` array."""
+    frame_diag = math.hypot(frame_width_px, frame_height_px)
+    kzx, kzy = _killzone_center(kz)
+
+    dx = kzx - tracks.cxy[:, 0]
+    dy = kzy - tracks.cxy[:, 1]
+    dist = np.hypot(dx, dy)
+    killzone_prox = _clip01_array(1.0 - dist / frame_diag)
+
+    box = tracks.xyxy
+    size = _clip01_array(np.hypot(box[:, 2] - box[:, 0], box[:, 3] - box[:, 1]) / frame_diag)
+
+    dwell = _clip01_array(tracks.hits / float(max(1, cfg.dwell_norm_frames)))
+
+    vx, vy = tracks.vxy[:, 0], tracks.vxy[:, 1]
+    speed = np.hypot(vx, vy)
+    moving = (speed > 1e-6) & (dist > 1e-6)
+    cosine = (vx * dx + vy * dy) / np.where(moving, speed * dist, 1.0)
+    approach = np.where(moving, _clip01_array(cosine), 0.0)
+
+    confidence = _clip01_array(tracks.scores)
+
+    weighted = (
+        cfg.w_killzone * killzone_prox
+        + cfg.w_size * size
+        + cfg.w_dwell * dwell
+        + cfg.w_approach * approach
+        + cfg.w_confidence * confidence
+    )
+    total = cfg.w_killzone + cfg.w_size + cfg.w_dwell + cfg.w_approach + cfg.w_confidence
+    return weighted / total if total > 0 else np.zeros(len(tracks))
@@ -0,0 +1,288 @@
+"""Synthetic bird scenes: a camera-free frame source with ground truth.
+
+``SyntheticScene`` renders dark, bird-like ellipses flying curved paths over a
+textured sky at the detection-frame size, with vertical posts occluding them,
+sensor noise and a slow exposure drift. Birds that leave the frame are replaced
+by new ones entering from an edge (new ids), so the flock size stays at
+``synthetic.birds``. Every frame comes with the truth for each bird in view
+(``TrueBird``, full-frame pixels like the detections).
+
+``SyntheticCapture`` is the ``FrameSource`` (``camera.detection_source:
+synthetic``) and stamps the truth on ``FrameEnvelope.truth``; the fake backend
+``detect.synthetic.SyntheticDetector`` turns it into noisy detections, and
+``TrackingScore`` grades the tracker's output against it. Together they run
+tracker / selector / control throughput and accuracy at flock scale on x86
+(``scripts/flock_bench.py``). Pure numpy, deterministic per ``synthetic.seed``.
+"""
+from __future__ import annotations
+
+import math
+import time
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from capture import FrameSource
+from config import CameraConfig, SyntheticConfig
+from contracts import FrameEnvelope, Track
+from track.assign import greedy_assignment, iou_matrix
+
+
+class TrueBird(NamedTuple):
+    """A bird in view: its clipped box (full-frame px) and velocity (px per frame)."""
+
+    id: int
+    xyxy: Tuple[float, float, float, float]
+    cx: float
+    cy: float
+    vx: float
+    vy: float
+    visible: float          # unoccluded, in-frame fraction of the bird (0..1)
+
+
+def _texture(rng: np.random.Generator, width_px: int, height_px: int) -> np.ndarray:
+    """Static background: sky gradient + smooth clutter (bilinear-upsampled noise) + grain."""
+    cell = 16
+    coarse = rng.normal(0.0, 18.0, (height_px // cell + 2, width_px // cell + 2))
+    ys, xs = np.arange(height_px) / cell, np.arange(width_px) / cell
+    y0, x0 = ys.astype(np.intp), xs.astype(np.intp)
+    fy, fx = (ys - y0)[:, None], (xs - x0)[None, :]
+    top = coarse[y0][:, x0] * (1 - fx) + coarse[y0][:, x0 + 1] * fx
+    bottom = coarse[y0 + 1][:, x0] * (1 - fx) + coarse[y0 + 1][:, x0 + 1] * fx
+    sky = np.linspace(190.0, 140.0, height_px)[:, None]
+    grain = rng.normal(0.0, 4.0, (height_px, width_px))
+    return (sky + top * (1 - fy) + bottom * fy + grain).astype(np.float32)
+
+
+class SyntheticScene:
+    """Birds on curved paths over a static background; ``render`` then ``step`` per frame."""
+
+    _POST_LUMA = 70.0
+
+    def __init__(self, cfg: SyntheticConfig, width_px: int, height_px: int,
+                 full_width_px: Optional[int] = None, full_height_px: Optional[int] = None):
+        self.cfg = cfg
+        self.width_px, self.height_px = width_px, height_px
+        self._scale_x = (full_width_px or width_px) / float(width_px)
+        self._scale_y = (full_height_px or height_px) / float(height_px)
+        self._rng = np.random.default_rng(cfg.seed)
+        self._background = _texture(self._rng, width_px, height_px)
+        self.posts = np.zeros(width_px, dtype=bool)         # occluded columns
+        for _ in range(cfg.occluders):
+            w = int(self._rng.integers(3, max(4, width_px // 24)))
+            x = int(self._rng.integers(0, max(1, width_px - w)))
+            self.posts[x:x + w] = True
+        n = cfg.birds
+        self._next_id = 1
+        self.ids = np.zeros(n, dtype=np.int64)
+        self.pos = np.zeros((n, 2))             # detection px
+        self.heading = np.zeros(n)              # rad
+        self.turn = np.zeros(n)                 # rad/s
+        self.speed = np.zeros(n)                # px/s
+        self.length = np.zeros(n)               # px
+        self.luma = np.zeros(n)
+        for i in range(n):
+            self._spawn(i, inside=True)
+        self.frame_index = 0
+
+    @property
+    def t_s(self) -> float:
+        """Scene time of the current frame."""
+        return self.frame_index / self.cfg.fps
+
+    def _spawn(self, i: int, inside: bool) -> None:
+        cfg, rng = self.cfg, self._rng
+        w, h = self.width_px, self.height_px
+        self.ids[i] = self._next_id
+        self._next_id += 1
+        self.length[i] = rng.uniform(*cfg.size_px)
+        self.speed[i] = rng.uniform(*cfg.speed_px_s)
+        self.luma[i] = rng.uniform(30.0, 90.0)
+        self.turn[i] = rng.uniform(-1.0, 1.0) * math.radians(cfg.turn_deg_s)
+        if inside:
+            self.pos[i] = rng.uniform((0.0, 0.0), (w, h))
+            self.heading[i] = rng.uniform(0.0, 2 * math.pi)
+            return
+        # enter from a random edge, heading roughly inward
+        edge, along, margin = int(rng.integers(4)), rng.uniform(), self.length[i]
+        x, y, heading = ((-margin, along * h, 0.0),
+                         (w + margin, along * h, math.pi),
+                         (along * w, -margin, math.pi / 2),
+                         (along * w, h + margin, -math.pi / 2))[edge]
+        self.pos[i] = (x, y)
+        self.heading[i] = heading + rng.uniform(-math.pi / 4, math.pi / 4)
+
+    def step(self) -> None:
+        """Advance one frame: heading random walk (bounded turn rate), move, respawn leavers."""
+        cfg, rng = self.cfg, self._rng
+        dt = 1.0 / cfg.fps
+        turn_max = math.radians(cfg.turn_deg_s)
+        self.turn = np.clip(self.turn + rng.normal(0.0, 0.5 * turn_max * math.sqrt(dt),
+                                                   self.turn.size), -turn_max, turn_max)
+        self.heading += self.turn * dt
+        self.pos += self._velocity() * dt
+        margin = 2 * self.length
+        gone = ((self.pos[:, 0] < -margin) | (self.pos[:, 0] > self.width_px + margin)
+                | (self.pos[:, 1] < -margin) | (self.pos[:, 1] > self.height_px + margin))
+        for i in np.flatnonzero(gone):
+            self._spawn(int(i), inside=False)
+        self.frame_index += 1
+
+    def _velocity(self) -> np.ndarray:
+        return self.speed[:, None] * np.stack([np.cos(self.heading), np.sin(self.heading)], 1)
+
+    def render(self) -> Tuple[np.ndarray, List[TrueBird]]:
+        """The current frame (``uint8`` Y plane) and the truth for each bird in view."""
+        cfg = self.cfg
+        w, h = self.width_px, self.height_px
+        image = self._background.copy()
+        velocity = self._velocity() / cfg.fps
+        truth: List[TrueBird] = []
+        for i in range(self.ids.size):
+            cx, cy = self.pos[i]
+            a, b = self.length[i] / 2.0, self.length[i] / 4.0
+            c, s = math.cos(self.heading[i]), math.sin(self.heading[i])
+            ex, ey = math.hypot(a * c, b * s), math.hypot(a * s, b * c)
+            x0, x1 = max(int(cx - ex), 0), min(int(math.ceil(cx + ex)) + 1, w)
+            y0, y1 = max(int(cy - ey), 0), min(int(math.ceil(cy + ey)) + 1, h)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            dx = (np.arange(x0, x1) + 0.5 - cx)[None, :]
+            dy = (np.arange(y0, y1) + 0.5 - cy)[:, None]
+            u, v = dx * c + dy * s, dy * c - dx * s
+            mask = (u / a) ** 2 + (v / b) ** 2 <= 1.0
+            drawn = int(np.count_nonzero(mask))
+            if not drawn:
+                continue
+            image[y0:y1, x0:x1][mask] = self.luma[i]
+            seen = np.count_nonzero(mask & ~self.posts[None, x0:x1])
+            visible = min(1.0, seen / max(math.pi * a * b, drawn))
+            bx0, by0 = max(cx - ex, 0.0) * self._scale_x, max(cy - ey, 0.0) * self._scale_y
+            bx1, by1 = min(cx + ex, w) * self._scale_x, min(cy + ey, h) * self._scale_y
+            truth.append(TrueBird(int(self.ids[i]), (bx0, by0, bx1, by1),
+                                  (bx0 + bx1) / 2.0, (by0 + by1) / 2.0,
+                                  float(velocity[i, 0]) * self._scale_x,
+                                  float(velocity[i, 1]) * self._scale_y, visible))
+        image[:, self.posts] = self._POST_LUMA
+        image *= 1.0 + cfg.exposure_swing * math.sin(2 * math.pi * self.t_s
+                                                     / cfg.exposure_period_s)
+        if cfg.noise_sigma > 0:
+            image += self._rng.standard_normal(image.shape, dtype=np.float32) * cfg.noise_sigma
+        return np.clip(image, 0, 255).astype(np.uint8), truth
+
+
+class SyntheticCapture(FrameSource):
+    """``SyntheticScene`` as a detection source; envelopes carry the frame's truth.
+
+    Frames are ``camera.lores_size_px`` (or the model input) square and upright;
+    the truth maps onto the ``capture_*_px`` full frame. ``synthetic.realtime``
+    paces reads to ``synthetic.fps``; otherwise each read renders the next frame
+    straight away (scene time still advances one frame per read).
+    """
+
+    def __init__(self, cfg: SyntheticConfig, camera: CameraConfig, input_size_px: int,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self._cfg = cfg
+        self._camera = camera
+        self._size = camera.lores_size_px or input_size_px
+        self._clock = clock
+        self._sleep = sleep
+        self.scene: Optional[SyntheticScene] = None
+        self._t0: Optional[float] = None
+
+    def start(self) -> None:
+        self.scene = SyntheticScene(self._cfg, self._size, self._size,
+                                    self._camera.capture_width_px,
+                                    self._camera.capture_height_px)
+        self._t0 = None
+
+    def read_frame(self) -> np.ndarray:
+        return self.read().frame
+
+    def read(self) -> FrameEnvelope:
+        if self.scene is None:
+            self.start()
+        scene = self.scene
+        if self._cfg.realtime:
+            if self._t0 is None:
+                self._t0 = self._clock()
+            wait = self._t0 + scene.t_s - self._clock()
+            if wait > 0:
+                self._sleep(wait)
+        frame, truth = scene.render()
+        scene.step()
+        return FrameEnvelope(frame=frame, seq=self._next_seq(), capture_t=self._clock(),
+                             truth=truth)
+
+
+class TrackingScore:
+    """MOTA-style score of tracker output against ``TrueBird`` truth, over many frames.
+
+    Each frame, tracks and birds are paired greedily by IoU (>= ``iou_threshold``).
+    A bird at least ``min_visible`` in view left unpaired is a miss, an unpaired
+    track a false positive, and a bird paired with another track id than last time
+    an id switch. A track on a mostly hidden bird counts as neither. A fragmentation
+    is a bird tracked again after an in-view stretch with no track on it.
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, min_visible: float = 0.3):
+        self.iou_threshold = iou_threshold
+        self.min_visible = min_visible
+        self.frames = 0
+        self.ground_truth = 0
+        self.matches = 0
+        self.misses = 0
+        self.false_positives = 0
+        self.id_switches = 0
+        self.fragmentations = 0
+        self._center_error_px = 0.0
+        self._last_track = {}       # bird id -> track id it was last paired with
+        self._lost = set()          # tracked-before birds with no track when last in view
+
+    def update(self, truth: Sequence[TrueBird], tracks: Sequence[Track]) -> None:
+        self.frames += 1
+        visible = [b.visible >= self.min_visible for b in truth]
+        self.ground_truth += int(sum(visible))
+        pairs = []
+        if truth and tracks:
+            iou = iou_matrix(np.asarray([t.xyxy for t in tracks], dtype=np.float64),
+                             np.asarray([b.xyxy for b in truth], dtype=np.float64))
+            pairs = greedy_assignment(iou, self.iou_threshold)
+        paired_b = {bi for _, bi in pairs}
+        self.misses += sum(1 for bi, v in enumerate(visible) if v and bi not in paired_b)
+        self._lost.update(b.id for bi, b in enumerate(truth)
+                          if visible[bi] and bi not in paired_b and b.id in self._last_track)
+        self.false_positives += len(tracks) - len(pairs)
+        for ti, bi in pairs:
+            track, bird = tracks[ti], truth[bi]
+            if not visible[bi]:
+                continue
+            self.matches += 1
+            self._center_error_px += math.hypot(track.cx - bird.cx, track.cy - bird.cy)
+            last = self._last_track.get(bird.id)
+            if last is not None and last != track.id:
+                self.id_switches += 1
+            if bird.id in self._lost:
+                self._lost.discard(bird.id)
+                self.fragmentations += 1
+            self._last_track[bird.id] = track.id
+
+    @property
+    def mota(self) -> float:
+        """1 - (misses + false positives + id switches) / ground truth."""
+        if not self.ground_truth:
+            return 1.0
+        return 1.0 - (self.misses + self.false_positives + self.id_switches) / self.ground_truth
+
+    @property
+    def center_error_px(self) -> float:
+        """Mean centroid error of the paired tracks (full-frame px)."""
+        return self._center_error_px / self.matches if self.matches else 0.0
+
+    def as_dict(self) -> dict:
+        return {"frames": self.frames, "ground_truth": self.ground_truth,
+                "matches": self.matches, "misses": self.misses,
+                "false_positives": self.false_positives, "id_switches": self.id_switches,
+                "fragmentations": self.fragmentations, "mota": self.mota,
+                "center_error_px": self.center_error_px}
@@ -1,6 +1,7 @@
 """Shared pytest fixtures + factory helpers. Mock the hardware, never the logic."""
 from __future__ import annotations
 
+import time
 from typing import List, Optional, Tuple
 from unittest.mock import MagicMock
 
@@ -66,6 +67,64 @@ def fake_pump_device():
     return dev
 
 
+class FakeInterpreter:
+    """Edge-TPU interpreter stand-in: fixed output, configurable ``invoke`` latency.
+
+    ``invoke`` sleeps, releasing the GIL like the real call does while the TPU
+    runs, so host work on other threads overlaps it the way it does on the Pi.
+    """
+
+    def __init__(self, output: np.ndarray, input_size: int = 256,
+                 in_dtype=np.int8, latency_s: float = 0.0):
+        self.input = np.zeros((1, input_size, input_size, 3), dtype=in_dtype)
+        self.output = output
+        self.latency_s = latency_s
+        self.invokes = 0
+
+    # load-time API (``CoralDetector.load``): index 0 in, 1 out, Ultralytics int8 quant
+    def allocate_tensors(self) -> None:
+        pass
+
+    def get_input_details(self):
+        quant = (1.0 / 255.0, -128) if self.input.dtype == np.int8 else (0.0, 0)
+        return [{"index": 0, "dtype": self.input.dtype.type, "quantization": quant,
+                 "shape": np.array(self.input.shape)}]
+
+    def get_output_details(self):
+        quant = (1.0 / 255.0, -128) if self.output.dtype == np.int8 else (0.0, 0)
+        return [{"index": 1, "dtype": self.output.dtype.type, "quantization": quant,
+                 "shape": np.array(self.output.shape)}]
+
+    def tensor(self, index):
+        return lambda: self.input
+
+    def invoke(self) -> None:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        self.invokes += 1
+
+    def get_tensor(self, index) -> np.ndarray:
+        return self.output.copy()
+
+
+def one_bird_output(num_anchors: int = 1344, anchor: int = 100) -> np.ndarray:
+    """INT8 ``[1, 5, N]`` v8 head (scale 1/255, zero -128) with one confident bird."""
+    out = np.full((1, 5, num_anchors), -128, dtype=np.int8)
+    out[0, :4, anchor] = np.array([0.5, 0.5, 0.1, 0.1]) * 255 - 128   # normalized xywh
+    out[0, 4, anchor] = 100                                          # score ~0.89
+    return out
+
+
+def coral_with_fake_interpreter(cfg, interpreter, **kwargs):
+    """A ``CoralDetector`` already "loaded" onto ``interpreter`` (int8 in and out)."""
+    from detect.coral import CoralDetector
+    det = CoralDetector(cfg, **kwargs)
+    det._interpreter = interpreter
+    det._in_scale, det._in_zero, det._in_dtype = 1.0 / 255.0, -128, np.int8
+    det._out_scale, det._out_zero = 1.0 / 255.0, -128
+    return det
+
+
 class FakeClock:
     """Manually-advanced monotonic clock for state-machine timing tests."""
 
@@ -0,0 +1,77 @@
+"""Association: vectorised IoU matrix, greedy order, optimal (Hungarian) pairing."""
+import itertools
+
+import numpy as np
+import pytest
+
+from track.assign import _hungarian, greedy_assignment, iou_matrix, optimal_assignment
+
+
+def _scalar_iou(a, b):
+    iw = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+    ih = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = iw * ih
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def test_iou_matrix_matches_pairwise():
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(0, 100, (7, 2))
+    a = np.hstack([xy, xy + rng.uniform(5, 40, (7, 2))])
+    xy = rng.uniform(0, 100, (5, 2))
+    b = np.hstack([xy, xy + rng.uniform(5, 40, (5, 2))])
+    m = iou_matrix(a, b)
+    assert m.shape == (7, 5)
+    for i, j in itertools.product(range(7), range(5)):
+        assert m[i, j] == pytest.approx(_scalar_iou(a[i], b[j]))
+
+
+def test_iou_matrix_empty_and_degenerate():
+    assert iou_matrix(np.zeros((0, 4)), np.zeros((3, 4))).shape == (0, 3)
+    assert iou_matrix([[5, 5, 5, 5]], [[5, 5, 5, 5]])[0, 0] == 0.0   # zero-area: no nan
+
+
+def test_greedy_ties_prefer_later_row_then_column():
+    score = np.array([[0.5, 0.5],
+                      [0.5, 0.5]])
+    assert greedy_assignment(score, 0.3) == [(1, 1), (0, 0)]
+
+
+def test_greedy_respects_threshold():
+    score = np.array([[0.9, 0.2],
+                      [0.1, 0.25]])
+    assert greedy_assignment(score, 0.3) == [(0, 0)]
+
+
+def _brute_force_total(score, threshold):
+    if score.shape[0] > score.shape[1]:
+        score = score.T
+    n, m = score.shape
+    return max(sum(score[r, c] for r, c in zip(range(n), cols) if score[r, c] >= threshold)
+               for cols in itertools.permutations(range(m), n))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_optimal_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n, m = rng.integers(1, 6, 2)
+    score = rng.uniform(0, 1, (n, m)) * (rng.uniform(0, 1, (n, m)) > 0.4)
+    pairs = optimal_assignment(score, 0.3)
+    assert len({r for r, _ in pairs}) == len(pairs) == len({c for _, c in pairs})
+    assert all(score[r, c] >= 0.3 for r, c in pairs)
+    assert sum(score[r, c] for r, c in pairs) == pytest.approx(_brute_force_total(score, 0.3))
+
+
+def test_optimal_beats_greedy_on_contested_pair():
+    score = np.array([[0.6, 0.5],
+                      [0.55, 0.0]])
+    assert sum(score[r, c] for r, c in greedy_assignment(score, 0.3)) == pytest.approx(0.6)
+    assert sorted(optimal_assignment(score, 0.3)) == [(0, 1), (1, 0)]
+
+
+def test_hungarian_rectangular():
+    cost = np.array([[4.0, 1.0, 3.0],
+                     [2.0, 6.0, 5.0]])
+    assert sorted(_hungarian(cost)) == [(0, 1), (1, 0)]
+    assert sorted(_hungarian(cost.T)) == [(0, 1), (1, 0)]
@@ -1,7 +1,9 @@
-"""rotate_frame: pure orientation correction (Mac-runnable; no picamera2)."""
+"""rotate_frame, clock mapping, ScalerCrop ROIs and replay (Mac-runnable; fake picamera2)."""
 import numpy as np
+import pytest
 
 from capture import rotate_frame
+from contracts import FrameEnvelope
 
 
 def test_rotate_0_is_identity_no_copy():
@@ -32,3 +34,472 @@ def test_picam_apply_config_repoints_cfg():
     new.camera.rotation_deg = 90
     cap.apply_config(new.camera)
     assert cap._cfg.rotation_deg == 90      # live: read per-frame in read_frame
+
+
+def test_sensor_timestamp_maps_onto_monotonic_clock():
+    from capture import sensor_ts_to_monotonic
+    # exposure 30 ms before "now" on the boottime clock -> 30 ms before monotonic now
+    t = sensor_ts_to_monotonic(sensor_ts_ns=1_000_000_000, boottime_now_ns=1_030_000_000,
+                               monotonic_now_s=500.0)
+    assert t == 500.0 - 0.030
+
+
+def test_default_read_wraps_frame_in_numbered_envelope():
+    from capture import FrameSource
+
+    class _Src(FrameSource):
+        def read_frame(self):
+            return np.zeros((4, 4), np.uint8)
+
+    src = _Src()
+    a, b = src.read(), src.read()
+    assert (a.seq, b.seq) == (1, 2)
+    assert a.frame.shape == (4, 4)
+    assert b.capture_t >= a.capture_t
+
+
+# ---- sensor-level ROI (ScalerCrop) ----
+
+def test_rotate_roi_tracks_rotate_frame_and_inverts():
+    from capture import rotate_roi
+    a = np.zeros((40, 60), np.uint8)
+    a[4:12, 30:45] = 1                                  # rows 4..12, cols 30..45
+    roi = (30 / 60, 4 / 40, 15 / 60, 8 / 40)
+    for deg in (90, 180, 270):
+        r = rotate_frame(a, deg)
+        h, w = r.shape
+        ys, xs = np.nonzero(r)
+        x, y, rw, rh = rotate_roi(roi, deg)
+        assert (x * w, y * h, rw * w, rh * h) == pytest.approx(
+            (xs.min(), ys.min(), xs.max() + 1 - xs.min(), ys.max() + 1 - ys.min()))
+        assert rotate_roi(rotate_roi(roi, deg), -deg) == pytest.approx(roi)
+
+
+def test_scaler_crop_round_trip_and_full_field_is_none():
+    from capture import roi_to_scaler_crop, scaler_crop_to_roi
+    base = (16, 8, 4000, 3000)
+    crop = roi_to_scaler_crop((0.25, 0.5, 0.5, 0.25), base)
+    assert crop == (1016, 1508, 2000, 750)
+    assert scaler_crop_to_roi(crop, base) == pytest.approx((0.25, 0.5, 0.5, 0.25))
+    assert scaler_crop_to_roi(base, base) is None
+
+
+def test_roi_around_centers_and_clamps_inside_the_frame():
+    from capture import roi_around
+    assert roi_around(576, 576, 1152, 1152, 0.5) == pytest.approx((0.25, 0.25, 0.5, 0.5))
+    assert roi_around(10, 1100, 1152, 1152, 0.5) == pytest.approx((0.0, 0.5, 0.5, 0.5))
+
+
+class _FakeRequest:
+    def __init__(self, metadata, array):
+        self._metadata = metadata
+        self._array = array
+
+    def make_array(self, stream):
+        return self._array
+
+    def get_metadata(self):
+        return dict(self._metadata)
+
+    def release(self):
+        pass
+
+
+class _FakePicam:
+    """Applies ScalerCrop ``lag`` frames after set_controls, like the real pipeline."""
+
+    BASE = (0, 0, 4000, 4000)
+
+    def __init__(self, lag=2):
+        self.lag = lag
+        self.crop = self.BASE
+        self.queued = []
+        self.controls = []
+        self.metadata = {}
+
+    def set_controls(self, controls):
+        self.controls.append(controls)
+        if "ScalerCrop" in controls:
+            self.queued.append([self.lag, controls["ScalerCrop"]])
+
+    def capture_request(self):
+        for q in self.queued:
+            q[0] -= 1
+            if q[0] <= 0:
+                self.crop = q[1]
+        self.queued = [q for q in self.queued if q[0] > 0]
+        self.last_array = np.zeros((384, 256), np.uint8)
+        return _FakeRequest({"ScalerCrop": self.crop, **self.metadata}, self.last_array)
+
+
+def _started_picam(fake_clock, **camera):
+    from capture import PiCamCapture
+    from config import Config
+    cfg = Config()
+    for k, v in camera.items():
+        setattr(cfg.camera, k, v)
+    cap = PiCamCapture(cfg.camera, 256, clock=fake_clock)
+    cap._picam = _FakePicam()
+    cap._base_crop = _FakePicam.BASE
+    return cap
+
+
+def test_static_roi_applied_once_and_frames_report_their_real_crop(fake_clock):
+    cap = _started_picam(fake_clock, roi=[0.5, 0.0, 0.5, 0.5])
+    crops = [cap.read().crop for _ in range(4)]
+    assert cap._picam.controls == [{"ScalerCrop": (2000, 0, 2000, 2000)}]
+    assert crops[0] is None                                 # control not in effect yet
+    assert crops[-1] == pytest.approx((0.5, 0.0, 0.5, 0.5))
+
+
+def test_roi_changes_are_rate_limited(fake_clock):
+    cap = _started_picam(fake_clock, roi_min_interval_s=0.5)
+    cap.read()                                              # full field, no-op crop
+    cap.set_roi((0.0, 0.0, 0.5, 0.5))
+    cap.read()
+    n = len(cap._picam.controls)
+    cap.set_roi((0.25, 0.25, 0.5, 0.5))
+    cap.read()
+    assert len(cap._picam.controls) == n                    # too soon: held back
+    fake_clock.advance(0.5)
+    cap.read()
+    assert cap._picam.controls[-1] == {"ScalerCrop": (1000, 1000, 2000, 2000)}
+
+
+def test_roi_is_given_in_rotated_frame_space(fake_clock):
+    cap = _started_picam(fake_clock, rotation_deg=90, roi=[0.0, 0.0, 0.5, 0.5])
+    for _ in range(3):
+        env = cap.read()
+    # top-left of the rotated frame is the top-right of the sensor image
+    assert cap._picam.controls[-1] == {"ScalerCrop": (2000, 0, 2000, 2000)}
+    assert env.crop == pytest.approx((0.0, 0.0, 0.5, 0.5))
+
+
+def test_standby_frame_rate_pins_sensor_and_restores_auto(fake_clock):
+    cap = _started_picam(fake_clock)
+    cap._frame_limits_us = (33333, 120000)
+    cap.set_frame_rate(2.0)
+    cap.set_frame_rate(None)
+    assert cap._picam.controls == [{"FrameDurationLimits": (500000, 500000)},
+                                   {"FrameDurationLimits": (33333, 120000)}]
+
+
+def test_exposure_clamp_trades_shutter_for_gain_up_to_the_ceiling():
+    from capture import exposure_clamp
+    assert exposure_clamp(20000, 2.0, 5000, 0.0) == (5000, pytest.approx(8.0))
+    assert exposure_clamp(20000, 2.0, 5000, 4.0) == (5000, pytest.approx(4.0))    # darker
+    assert exposure_clamp(4000, 2.0, 5000, 0.0) == (4000, pytest.approx(2.0))     # in bounds
+    # AE chose too much gain: the shutter takes it back, up to its own ceiling
+    assert exposure_clamp(2000, 8.0, 5000, 4.0) == (4000, pytest.approx(4.0))
+    assert exposure_clamp(2000, 16.0, 5000, 4.0) == (5000, pytest.approx(4.0))
+
+
+def test_profile_frame_limits_fill_zeros_from_the_sensor(fake_clock):
+    cap = _started_picam(fake_clock, frame_duration_limits_us=[0, 50000])
+    assert cap._profile_limits((33333, 120000, 33333)) == (33333, 50000)
+    assert cap._profile_limits(None) is None
+    cap._cfg.frame_duration_limits_us = [50000, 50000]
+    assert cap._profile_limits(None) == (50000, 50000)
+
+
+def test_exposure_stats_report_the_achieved_interval(fake_clock):
+    cap = _started_picam(fake_clock)
+    for i in range(5):
+        cap._picam.metadata = {"SensorTimestamp": i * 50_000_000, "ExposureTime": 9000,
+                               "AnalogueGain": 1.5, "FrameDuration": 50000}
+        cap.read()
+    st = cap.exposure_stats.as_dict()
+    assert st["frame_interval_ms"] == pytest.approx(50.0) and st["fps"] == pytest.approx(20.0)
+    assert (st["exposure_us"], st["analogue_gain"], st["frame_duration_us"]) == (9000, 1.5, 50000)
+
+
+def test_ae_clamped_after_settling_and_handed_back_on_relock(fake_clock):
+    cap = _started_picam(fake_clock, max_exposure_us=4000, max_analogue_gain=8.0,
+                         ae_settle_s=1.0)                   # default ae_relock_s: 30 s
+    cap._picam.metadata = {"ExposureTime": 16000, "AnalogueGain": 1.0}
+    cap.read()
+    assert cap.exposure_stats.ae == "auto"                  # still settling
+    fake_clock.advance(1.0)
+    cap.read()
+    assert cap._picam.controls[-1] == {"AeEnable": False, "ExposureTime": 4000,
+                                       "AnalogueGain": pytest.approx(4.0)}
+    assert cap.exposure_stats.ae == "clamped" and cap.exposure_stats.clamps == 1
+    fake_clock.advance(30.0)
+    cap.read()
+    assert cap._picam.controls[-1] == {"AeEnable": True}
+    assert cap.exposure_stats.ae == "auto"
+    cap._picam.metadata = {"ExposureTime": 8000, "AnalogueGain": 1.0}   # it got darker
+    fake_clock.advance(1.0)
+    cap.read()                                              # settled again: re-clamped
+    assert cap._picam.controls[-1] == {"AeEnable": False, "ExposureTime": 4000,
+                                       "AnalogueGain": pytest.approx(2.0)}
+    assert cap.exposure_stats.clamps == 2
+
+
+def test_failed_ae_relock_is_a_camera_error(fake_clock):
+    from errors import CameraError
+    cap = _started_picam(fake_clock, ae_lock=True, ae_settle_s=0.0, ae_relock_s=5.0)
+    cap._picam.metadata = {"ExposureTime": 3000, "AnalogueGain": 2.0}
+    cap.read()
+    assert cap.exposure_stats.ae == "locked"
+
+    def broken(controls):
+        raise OSError("camera gone")
+
+    cap._picam.set_controls = broken
+    fake_clock.advance(5.0)
+    with pytest.raises(CameraError):
+        cap.read()
+
+
+def test_ae_within_ceilings_runs_free_unless_locked(fake_clock):
+    cap = _started_picam(fake_clock, max_exposure_us=4000, ae_settle_s=0.0)
+    cap._picam.metadata = {"ExposureTime": 3000, "AnalogueGain": 2.0}
+    cap.read()
+    exposure = [c for c in cap._picam.controls if "ScalerCrop" not in c]
+    assert exposure == [] and cap.exposure_stats.ae == "auto"
+    cap._cfg.ae_lock = True
+    cap.read()
+    assert cap._picam.controls[-1] == {"AeEnable": False, "ExposureTime": 3000,
+                                       "AnalogueGain": pytest.approx(2.0)}
+    assert cap.exposure_stats.ae == "locked" and cap.exposure_stats.clamps == 0
+
+
+def test_rotated_camera_stamps_rotation_instead_of_rotating_pixels(fake_clock):
+    from capture import upright_frame
+    cap = _started_picam(fake_clock, rotation_deg=90)
+    env = cap.read()
+    assert env.rotation_deg == 90
+    assert np.shares_memory(env.frame, cap._picam.last_array)       # no copy on the hot path
+    assert np.array_equal(upright_frame(env), np.rot90(env.frame))
+
+
+def test_upright_colour_frame_is_bgr_for_cv2():
+    from capture import upright_frame
+    rgb = np.zeros((2, 3, 3), np.uint8)
+    rgb[..., 0] = 200                                   # red
+    out = upright_frame(FrameEnvelope(rgb, 1, 0.0))
+    assert out[0, 0].tolist() == [0, 0, 200] and out.flags.c_contiguous
+    out = upright_frame(FrameEnvelope(rgb, 1, 0.0, rotation_deg=90))
+    assert out.shape == (3, 2, 3) and out[0, 0].tolist() == [0, 0, 200]
+
+
+def _replay(tmp_path, clock, n=5, ts=None, name="rec.npy", **camera):
+    from capture import ReplayCapture, write_recording
+    from config import Config
+    cfg = Config()
+    path = str(tmp_path / name)
+    frames = np.arange(n, dtype=np.uint8)[:, None, None] * np.ones((1, 4, 6), np.uint8)
+    if name.endswith(".npy"):
+        write_recording(path, frames, ts)
+    else:
+        frames.tofile(path)
+    cfg.camera.detection_source = "replay"
+    cfg.camera.replay_path = path
+    cfg.camera.replay_fps = 10.0
+    for key, value in camera.items():
+        setattr(cfg.camera, key, value)
+    slept = []
+
+    def sleep(dt):
+        slept.append(dt)
+        clock.advance(dt)
+
+    cap = ReplayCapture(cfg.camera, 256, clock=clock, sleep=sleep)
+    cap.start()
+    return cap, slept
+
+
+def test_replay_realtime_follows_the_recorded_timestamps(tmp_path, fake_clock):
+    cap, slept = _replay(tmp_path, fake_clock, ts=[100.0, 100.1, 100.3, 100.35, 100.4])
+    first = cap.read()
+    assert first.frame[0, 0] == 0 and slept == []
+    assert first.sensor_ts_ns == 100_000_000_000
+    second = cap.read()
+    assert second.frame[0, 0] == 1 and slept == pytest.approx([0.1])
+    assert second.capture_t - first.capture_t == pytest.approx(0.1)
+    fake_clock.advance(0.27)                # slow consumer: frames 2 and 3 are both due
+    third = cap.read()
+    assert third.frame[0, 0] == 3 and cap.dropped == 1
+    assert [cap.read().frame[0, 0]] == [4]
+
+
+def test_replay_fast_never_sleeps_and_ends_with_end_of_stream(tmp_path, fake_clock):
+    from errors import CameraError, EndOfStream
+    cap, slept = _replay(tmp_path, fake_clock, replay_pacing="fast")
+    frames = [cap.read() for _ in range(5)]
+    assert [int(e.frame[0, 0]) for e in frames] == [0, 1, 2, 3, 4]
+    assert [e.seq for e in frames] == [1, 2, 3, 4, 5]
+    assert frames[0].sensor_ts_ns is None       # no timestamp index
+    assert slept == []
+    with pytest.raises(EndOfStream):
+        cap.read()
+    assert issubclass(EndOfStream, CameraError)
+
+
+def test_replay_loop_wraps_and_keeps_the_schedule(tmp_path, fake_clock):
+    cap, slept = _replay(tmp_path, fake_clock, n=3, replay_loop=True)
+    times = [cap.read().capture_t for _ in range(7)]
+    assert cap.loops == 2
+    assert np.diff(times) == pytest.approx([0.1] * 6)     # uniform at replay_fps
+    assert sum(slept) == pytest.approx(0.6)
+
+
+def test_replay_raw_y_planes_use_the_configured_size(tmp_path, fake_clock):
+    cap, _ = _replay(tmp_path, fake_clock, name="rec.y8", replay_raw_size_px=[6, 4],
+                     replay_pacing="fast", rotation_deg=90)
+    env = cap.read()
+    assert env.frame.shape == (4, 6) and env.rotation_deg == 90
+    assert cap.read().frame[3, 5] == 1
+
+
+def test_replay_rejects_a_mismatched_timestamp_index(tmp_path, fake_clock):
+    from errors import CameraError
+    with pytest.raises(CameraError):
+        _replay(tmp_path, fake_clock, ts=[0.0, 0.1])
+
+
+class _FakeCv2:
+    """The cv2 surface UsbCapture touches; 'JPEGs' are [1, N] byte rows."""
+
+    CAP_V4L2 = 200
+    CAP_PROP_FRAME_WIDTH, CAP_PROP_FRAME_HEIGHT, CAP_PROP_FPS = 3, 4, 5
+    CAP_PROP_FOURCC, CAP_PROP_CONVERT_RGB, CAP_PROP_BUFFERSIZE = 6, 16, 38
+    IMREAD_GRAYSCALE, IMREAD_REDUCED_GRAYSCALE_2 = 0, 16
+    IMREAD_REDUCED_GRAYSCALE_4, IMREAD_REDUCED_GRAYSCALE_8 = 32, 64
+    COLOR_BGR2GRAY, INTER_AREA = 6, 3
+
+    def __init__(self, cap):
+        self.cap = cap
+        self.decoded = []
+
+    def VideoCapture(self, device, api):
+        self.cap.opened_with = (device, api)
+        return self.cap
+
+    @staticmethod
+    def VideoWriter_fourcc(*chars):
+        return "".join(chars)
+
+    def imdecode(self, buf, flag):
+        self.decoded.append(flag)
+        scale = {0: 1, 16: 2, 32: 4, 64: 8}[flag]
+        return np.full((720 // scale, 1280 // scale), buf[0], np.uint8)
+
+    @staticmethod
+    def cvtColor(src, code, dst=None):
+        out = src[..., 1].copy() if dst is None else dst
+        out[...] = src[..., 1]
+        return out
+
+    @staticmethod
+    def resize(src, dsize, interpolation=None):
+        w, h = dsize
+        ys = np.arange(h) * src.shape[0] // h
+        xs = np.arange(w) * src.shape[1] // w
+        return src[ys][:, xs]
+
+
+class _FakeUvc:
+    """grab() takes ``grab_s`` of the fake clock unless a stale frame is queued."""
+
+    def __init__(self, clock, frames, grab_s=1 / 30, queued=0, passthrough=True):
+        self.clock, self.frames, self.grab_s = clock, list(frames), grab_s
+        self.queued, self.passthrough = queued, passthrough
+        self.props, self.current, self.retrieved_into = {}, None, []
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        self.props[prop] = value
+
+    def get(self, prop):
+        return {3: 1280, 4: 720}.get(prop, 0)
+
+    def grab(self):
+        if self.queued:
+            self.queued -= 1
+        else:
+            self.clock.advance(self.grab_s)
+        self.current = self.frames.pop(0)
+        return True
+
+    def retrieve(self, image=None):
+        self.retrieved_into.append(image)
+        if self.passthrough:
+            return True, np.array([[self.current, 0xD8, 0xFF]], np.uint8)
+        return True, np.full((720, 1280, 3), self.current, np.uint8)
+
+    def release(self):
+        pass
+
+
+def _usb(monkeypatch, fake_clock, uvc, **camera):
+    import sys
+    from capture import UsbCapture
+    from config import Config
+    cfg = Config()
+    for k, v in camera.items():
+        setattr(cfg.camera, k, v)
+    cv2 = _FakeCv2(uvc)
+    monkeypatch.setitem(sys.modules, "cv2", cv2)
+    cap = UsbCapture(cfg.camera, 256, clock=fake_clock)
+    cap.start()
+    return cap, cv2
+
+
+def test_mjpeg_decode_scale_keeps_the_detection_size():
+    from capture import mjpeg_decode_scale
+    assert mjpeg_decode_scale(1280, 720, 256) == 2
+    assert mjpeg_decode_scale(1920, 1080, 256) == 4
+    assert mjpeg_decode_scale(640, 480, 256) == 1
+    assert mjpeg_decode_scale(4096, 2160, 256) == 8
+
+
+def test_usb_requests_mjpeg_passthrough_and_decodes_reduced_luma(monkeypatch, fake_clock):
+    uvc = _FakeUvc(fake_clock, [7, 8])
+    cap, cv2 = _usb(monkeypatch, fake_clock, uvc, usb_device="2", rotation_deg=180)
+    assert uvc.opened_with == (2, cv2.CAP_V4L2)
+    assert uvc.props[cv2.CAP_PROP_FOURCC] == "MJPG"
+    assert uvc.props[cv2.CAP_PROP_CONVERT_RGB] == 0 and uvc.props[cv2.CAP_PROP_BUFFERSIZE] == 1
+    env = cap.read()
+    assert cv2.decoded == [cv2.IMREAD_REDUCED_GRAYSCALE_2]      # 640x360 >= 256
+    assert env.frame.shape == (256, 256) and env.frame[0, 0] == 7
+    assert env.rotation_deg == 180 and env.capture_t == pytest.approx(1 / 30)
+    cap.read()
+    assert uvc.retrieved_into[1] is not None                  # compressed buffer reused
+
+
+def test_usb_skips_frames_queued_while_busy(monkeypatch, fake_clock):
+    uvc = _FakeUvc(fake_clock, [1, 2, 3, 4], queued=1)
+    cap, _ = _usb(monkeypatch, fake_clock, uvc)
+    assert cap.read().frame[0, 0] == 2 and cap.stale_dropped == 1
+    assert cap.read().frame[0, 0] == 3 and cap.stale_dropped == 1
+
+
+def test_usb_frame_is_center_cropped_square_not_squashed(monkeypatch, fake_clock):
+    uvc = _FakeUvc(fake_clock, [0])
+    cap, cv2 = _usb(monkeypatch, fake_clock, uvc)
+    ramp = np.tile((np.arange(640) // 3).astype(np.uint8), (360, 1))    # value = x // 3
+    monkeypatch.setattr(cv2, "imdecode", lambda buf, flag: ramp)
+    frame = cap.read().frame
+    assert frame.shape == (256, 256)
+    assert frame[0, 0] == 140 // 3                          # left edge of the middle 360 px
+    assert frame[0, -1] == (140 + 255 * 360 // 256) // 3
+
+
+def test_usb_forced_scale_and_bgr_fallback(monkeypatch, fake_clock):
+    uvc = _FakeUvc(fake_clock, [5], passthrough=False)
+    cap, cv2 = _usb(monkeypatch, fake_clock, uvc, usb_decode_scale=4)
+    assert cap.decode_scale == 4
+    env = cap.read()
+    assert cv2.decoded == [] and env.frame.shape == (256, 256) and env.frame[0, 0] == 5
+
+
+def test_usb_read_before_start_raises():
+    from capture import UsbCapture
+    from config import Config
+    from errors import CameraError
+    with pytest.raises(CameraError):
+        UsbCapture(Config().camera, 256).read()
@@ -43,6 +43,73 @@ def test_threshold_out_of_range_rejected():
         Config.from_dict({"detector": {"conf_threshold": 1.5}})
 
 
+def test_bad_tracker_assignment_rejected():
+    with pytest.raises(ConfigError):
+        Config.from_dict({"tracker": {"assignment": "auction"}})
+
+
+@pytest.mark.parametrize("override", [{"backend": "sort"}, {"kalman_model": "cj"},
+                                      {"kalman_gate_chi2": 0}])
+def test_bad_kalman_tracker_settings_rejected(override):
+    with pytest.raises(ConfigError):
+        Config.from_dict({"tracker": override})
+
+
+@pytest.mark.parametrize("override", [
+    {"predict": {"model": "spline"}},
+    {"predict": {"min_history": 2}},
+    {"predict": {"history_decay": 0.0}},
+    {"tracker": {"history_frames": -1}},
+    {"tracker": {"history_frames": 4}, "predict": {"model": "linear", "min_history": 6}},
+])
+def test_bad_predict_model_settings_rejected(override):
+    with pytest.raises(ConfigError):
+        Config.from_dict(override)
+
+
+def test_predict_model_defaults_to_cv():
+    assert Config().predict.model == "cv"
+
+
+def test_cv_predict_model_needs_no_history():
+    cfg = Config.from_dict({"tracker": {"history_frames": 0}, "predict": {"model": "cv"}})
+    assert cfg.predict.model == "cv"
+
+
+@pytest.mark.parametrize("mode", ["tiled", "lock_on"])
+def test_tiling_and_lock_on_reject_an_edge_tpu_pool(mode):
+    with pytest.raises(ConfigError):
+        Config.from_dict({"detector": {"edge_tpus": 2, mode: True}})
+    Config.from_dict({"detector": {"edge_tpus": 1, mode: True}})
+    Config.from_dict({"detector": {"backend": "synthetic", "edge_tpus": 2, mode: True}})
+
+
+@pytest.mark.parametrize("override", [{"backend": "cpu"}, {"cpu_fallback": True}])
+def test_cpu_backend_and_fallback_need_the_cpu_model_on_disk(override, tmp_path):
+    with pytest.raises(ConfigError, match="cpu_model_path"):
+        Config.from_dict({"detector": dict(override, cpu_model_path=str(tmp_path / "no.tflite"))})
+    model = tmp_path / "bird_int8.tflite"
+    model.write_bytes(b"TFL3")
+    Config.from_dict({"detector": dict(override, cpu_model_path=str(model))})
+    Config.from_dict({"detector": {"cpu_model_path": str(tmp_path / "no.tflite")}})   # unused
+
+
+def test_low_conf_tier_needs_a_two_stage_tracker():
+    with pytest.raises(ConfigError):           # low tier would spawn tracks
+        Config.from_dict({"detector": {"low_conf_threshold": 0.1}})
+    with pytest.raises(ConfigError):           # not below the primary threshold
+        Config.from_dict({"detector": {"conf_threshold": 0.3, "low_conf_threshold": 0.3},
+                          "tracker": {"high_score_threshold": 0.3}})
+    with pytest.raises(ConfigError, match="conf_threshold"):   # 0.35..0.5 would spawn tracks
+        Config.from_dict({"detector": {"conf_threshold": 0.5, "low_conf_threshold": 0.3},
+                          "tracker": {"high_score_threshold": 0.35}})
+    cfg = Config.from_dict({"detector": {"conf_threshold": 0.4, "low_conf_threshold": 0.1},
+                            "tracker": {"high_score_threshold": 0.4}})
+    from detect.base import score_floor
+    assert score_floor(cfg.detector) == 0.1
+    assert score_floor(Config().detector) == 0.25
+
+
 def test_bad_camera_rotation_rejected():
     with pytest.raises(ConfigError):
         Config.from_dict({"camera": {"rotation_deg": 45}})
@@ -53,6 +120,30 @@ def test_camera_rotation_quarter_turns_ok():
         assert Config.from_dict({"camera": {"rotation_deg": deg}}).camera.rotation_deg == deg
 
 
+@pytest.mark.parametrize("camera", [{"detection_stream": "raw"}, {"lores_size_px": 2048},
+                                    {"lores_size_px": -1}, {"roi": [0, 0, 1]},
+                                    {"roi": [0.6, 0, 0.5, 0.5]}, {"roi": [0, 0, 0, 1]},
+                                    {"dynamic_roi_size": 0}, {"roi_min_interval_s": -1},
+                                    {"detection_source": "gige"},
+                                    {"detection_source": "replay"},
+                                    {"replay_path": "a.npy", "replay_pacing": "slow"},
+                                    {"replay_fps": 0}, {"replay_raw_size_px": [640]},
+                                    {"detection_source": "usb"},        # the stream's device
+                                    {"usb_decode_scale": 3}, {"usb_fps": 0},
+                                    {"frame_duration_limits_us": [50000, 20000]},
+                                    {"frame_duration_limits_us": [100000, 100000]},  # 10 fps
+                                    {"max_exposure_us": -1}, {"max_analogue_gain": 0.5}])
+def test_bad_detection_stream_rejected(camera):
+    with pytest.raises(ConfigError):
+        Config.from_dict({"camera": camera})
+
+
+def test_pinned_frame_rate_matching_predict_fps_ok():
+    cfg = Config.from_dict({"camera": {"frame_duration_limits_us": [50000, 50000]},
+                            "predict": {"fps": 20.0}})
+    assert cfg.camera.frame_duration_limits_us == [50000, 50000]
+
+
 def test_loads_repo_config_yaml():
     path = os.path.join(os.path.dirname(__file__), "..", "config.yaml")
     cfg = load_config(os.path.abspath(path))
@@ -1,13 +1,16 @@
 """Integration: ControlLoop wiring honors clamps + fire predicate (Mac, fakes)."""
+import math
+
 import pytest
 
-from conftest import make_track
+from conftest import make_detection, make_track
 
 from actuate.servo import Axis, ServoController
 from app.control import ControlLoop
 from app.statemachine import FireState, FireStateMachine
 from config import Config
 from strategy.selector import TargetSelector
+from track.tracker import IouTracker
 
 
 class FakeDriver:
@@ -181,3 +184,74 @@ def test_manual_marker_forces_aux_independent_of_state():
     loop.set_marker(False)
     assert aux.state is False                       # back to auto (off, not aiming)
 
+
+
+def _envelope(capture_t, **stages):
+    from contracts import FrameEnvelope
+    env = FrameEnvelope(None, seq=1, capture_t=capture_t)
+    for name, t in stages.items():
+        env.stamp(name, t)
+    return env
+
+
+def test_frame_age_reported_for_every_stage(fake_clock):
+    cfg = Config()
+    loop = ControlLoop(cfg, ServoController(FakeDriver(), cfg.servo),
+                       TargetSelector(min_target_dwell_frames=1), FireStateMachine(cfg.fire),
+                       clock=fake_clock)
+    fake_clock.t = 10.060
+    tel = loop.tick([], _envelope(10.0, capture=10.010, inference=10.012,
+                                  detect=10.030, track=10.031))
+    assert list(tel.frame_age_ms) == ["capture", "inference", "detect", "track", "control"]
+    assert tel.frame_age_ms["detect"] == pytest.approx(30.0)
+    assert tel.frame_age_ms["control"] == pytest.approx(60.0)
+
+
+def test_lead_includes_measured_latency(fake_clock):
+    cfg = Config()
+    cfg.predict.lead_time_s = 0.4
+    cfg.predict.fps = 20.0
+    cfg.predict.max_result_age_s = 0.5
+    loop = ControlLoop(cfg, ServoController(FakeDriver(), cfg.servo),
+                       TargetSelector(min_target_dwell_frames=1), FireStateMachine(cfg.fire),
+                       clock=fake_clock)
+    target = make_track(track_id=1, cx=100, cy=100, vx=10, vy=0)
+    target.capture_t = 0.0
+    fake_clock.t = 0.1                                  # result is 100 ms old
+    tel = loop.tick([target], _envelope(0.0))
+    assert tel.lead_latency_s == pytest.approx(0.1)
+    assert tel.predicted_xy[0] == pytest.approx(100 + 10 * 0.5 * 20)
+    cfg.predict.compensate_latency = False
+    tel = loop.tick([target], _envelope(0.0))
+    assert tel.predicted_xy[0] == pytest.approx(100 + 10 * 0.4 * 20)
+
+
+def test_result_older_than_budget_is_dropped(fake_clock):
+    cfg = Config()
+    cfg.predict.max_result_age_s = 0.25
+    loop = ControlLoop(cfg, ServoController(FakeDriver(), cfg.servo),
+                       TargetSelector(min_target_dwell_frames=1), FireStateMachine(cfg.fire),
+                       clock=fake_clock)
+    target = make_track(track_id=1, cx=cfg.killzone.cx_px, cy=cfg.killzone.cy_px)
+    fake_clock.t = 0.3
+    tel = loop.tick([target], _envelope(0.0))
+    assert tel.result_dropped is True
+    assert tel.selected_target_id is None and tel.num_tracks == 0
+    fake_clock.t = 0.1
+    assert loop.tick([target], _envelope(0.0)).selected_target_id == 1
+
+
+def test_tick_leads_a_turning_track_with_the_configured_model():
+    leads = {}
+    for model in ("cv", "turn"):
+        cfg, loop, *_ = _loop()
+        cfg.predict.model = model
+        tracker = IouTracker(min_hits=1, history_frames=16)
+        for t in range(16):                     # anticlockwise arc, 0.05 rad/frame
+            a = 0.05 * t
+            tracks = tracker.update([make_detection(cx=576 + 200 * math.cos(a),
+                                                    cy=576 + 200 * math.sin(a))])
+        leads[model] = loop.tick(tracks).predicted_xy
+    end = 0.05 * (15 + cfg.predict.lead_time_s * cfg.predict.fps)
+    truth = (576 + 200 * math.cos(end), 576 + 200 * math.sin(end))
+    assert math.dist(leads["turn"], truth) < math.dist(leads["cv"], truth) / 3
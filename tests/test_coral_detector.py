@@ -2,11 +2,16 @@
 
 The detector runs on the small lores frame but its detections must land in the
 full capture-frame pixel space that the killzone, scoring, calibration and the
-tactical canvas share. Guards the 256-vs-1152 mismatch bug.
+tactical canvas share. Guards the 256-vs-1152 mismatch bug. Also pins the LUT
+preprocess to the reference quantize math, bit for bit, with a fake input buffer.
 """
+import tracemalloc
+
 import numpy as np
+import pytest
 
 from config import Config
+from conftest import FakeInterpreter, coral_with_fake_interpreter, one_bird_output
 from detect.coral import CoralDetector
 
 
@@ -33,3 +38,180 @@ def test_apply_config_updates_thresholds_live():
     new.detector.conf_threshold = 0.55
     det.apply_config(new.detector)
     assert det.cfg.conf_threshold == 0.55   # read on the next infer()
+
+
+# ---- LUT preprocessing: bit-identical to the reference quantize math ----
+
+class _FakeInputInterpreter:
+    """Just the ``tensor(index)()`` buffer accessor the zero-copy path writes into."""
+
+    def __init__(self, size, dtype):
+        self.buf = np.zeros((1, size, size, 3), dtype=dtype)
+
+    def tensor(self, index):
+        return lambda: self.buf
+
+
+_QUANT_CASES = [
+    (1.0 / 255.0, -128, np.int8),      # Ultralytics full-INT8 edgetpu export (verified)
+    (1.0 / 255.0, 0, np.uint8),
+    (0.0039215, 3, np.uint8),          # off-by-a-hair scale: rounding must still agree
+    (0.0, 0, np.float32),              # float input, no quantization
+]
+
+
+@pytest.mark.parametrize("scale,zero,dtype", _QUANT_CASES)
+def test_lut_write_is_bit_identical_to_reference_preprocess(scale, zero, dtype):
+    cfg = Config()
+    size = cfg.detector.input_size_px
+    det = CoralDetector(cfg.detector)
+    det._in_scale, det._in_zero, det._in_dtype = scale, zero, dtype
+    det._interpreter = _FakeInputInterpreter(size, dtype)
+    rng = np.random.default_rng(0)
+    grey = rng.integers(0, 256, (size, size), dtype=np.uint8)
+    grey[0, :256] = np.arange(256)                 # every pixel value at least once
+    rgb = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+    for frame in (grey, rgb):
+        det._write_input(frame)
+        ref = det._preprocess(frame)
+        assert ref.dtype == det._interpreter.buf.dtype
+        assert np.array_equal(ref, det._interpreter.buf)
+
+
+def test_lut_write_allocates_no_new_buffers():
+    cfg = Config()
+    size = cfg.detector.input_size_px
+    det = CoralDetector(cfg.detector)
+    det._in_scale, det._in_zero, det._in_dtype = 1.0 / 255.0, -128, np.int8
+    det._interpreter = _FakeInputInterpreter(size, np.int8)
+    frame = np.full((size, size), 255, np.uint8)
+    det._write_input(frame)
+    lut, lut3 = det._lut, det._lut3
+    tracemalloc.start()
+    det._write_input(frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert det._lut is lut and det._lut3 is lut3   # steady state rebuilds nothing
+    assert peak < 4096                              # no frame-sized temporaries (196 KB)
+    assert det._interpreter.buf.max() == 127       # 255 -> 1.0 -> int8 max
+
+
+# ---- invoke / decode split (pipelined inference) ----
+
+def test_invoke_then_decode_matches_infer():
+    cfg = Config()
+    interp = FakeInterpreter(one_bird_output())
+    det = coral_with_fake_interpreter(cfg.detector, interp, frame_width_px=1152,
+                                      frame_height_px=1152)
+    frame = np.zeros((256, 256), np.uint8)
+    dets = det.infer(frame)
+    assert len(dets) == 1
+    assert dets[0].cx == pytest.approx(576.0, abs=5.0)   # mapped onto the 1152px frame
+    assert det.decode(det.invoke(frame)) == dets
+
+
+def test_invoke_output_survives_the_next_invoke():
+    # The decode thread reads frame N's output while frame N+1 is being invoked.
+    cfg = Config()
+    interp = FakeInterpreter(one_bird_output())
+    det = coral_with_fake_interpreter(cfg.detector, interp)
+    raw = det.invoke(np.zeros((256, 256), np.uint8))
+    interp.output[...] = -128                      # next frame: nothing detected
+    assert det.decode(det.invoke(np.zeros((256, 256), np.uint8))) == []
+    assert len(det.decode(raw)) == 1
+
+
+class _DflInterpreter(FakeInterpreter):
+    """One int8 output per raw head, indices 10, 11, ..."""
+
+    def __init__(self, heads):
+        super().__init__(np.zeros(1, np.int8))
+        self.heads = {10 + i: h for i, h in enumerate(heads)}
+
+    def get_output_details(self):
+        return [{"index": i, "dtype": np.int8, "quantization": (0.1, 0),
+                 "shape": np.array(a.shape)} for i, a in self.heads.items()]
+
+    def get_tensor(self, index):
+        return self.heads[index].copy()
+
+
+def _dfl_detector(heads):
+    det = CoralDetector(Config().detector, frame_width_px=256, frame_height_px=256)
+    det._make_interpreter = lambda: _DflInterpreter(heads)
+    return det
+
+
+def test_multi_output_graph_decodes_raw_dfl_heads():
+    # A graph exported without the DFL ops: one int8 [1, H, W, 64 + nc] output per stride.
+    heads = [np.full((1, 256 // s, 256 // s, 65), -128, np.int8)   # logit -12.8 at scale 0.1
+             for s in (8, 16, 32)]
+    heads[1][0, 8, 8, :64] = 0                                # flat bins -> 7.5 cells
+    heads[1][0, 8, 8, 64] = 30                                # logit +3.0
+    det = _dfl_detector(heads)
+    det.load()
+    dets = det.infer(np.zeros((256, 256), np.uint8))
+    assert len(dets) == 1
+    assert (dets[0].cx, dets[0].cy) == pytest.approx((136.0, 136.0))   # stride 16, cell 8
+    assert dets[0].xyxy[2] - dets[0].xyxy[0] == pytest.approx(240.0)   # 2 * 7.5 * 16
+
+
+@pytest.mark.parametrize("shapes", [
+    [(1, 32, 32, 66), (1, 16, 16, 66), (1, 8, 8, 66)],     # 2 classes, num_classes is 1
+    [(1, 32, 16, 65), (1, 16, 16, 65), (1, 8, 8, 65)],     # not square
+    [(1, 1024, 65), (1, 256, 65), (1, 64, 65)],            # flattened, no H / W
+    [(1, 32, 32, 65), (1, 12, 12, 65), (1, 8, 8, 65)],     # 12 cells don't tile 256 px
+    [(1, 32, 32, 65), (1, 16, 16, 65), (1, 16, 16, 65)],   # stride 16 twice
+])
+def test_malformed_dfl_heads_are_rejected_at_load(shapes):
+    from errors import DetectionError
+    det = _dfl_detector([np.zeros(s, np.int8) for s in shapes])
+    with pytest.raises(DetectionError) as err:
+        det.load()
+    assert "DFL head" in str(err.value.__cause__) or "stride" in str(err.value.__cause__)
+
+
+def test_sensor_cropped_frame_maps_into_the_crop_window():
+    # ScalerCrop zoomed onto the right half's top: the frame shows x 576..1152, y 0..576.
+    from contracts import FrameEnvelope
+    cfg = Config()
+    det = coral_with_fake_interpreter(cfg.detector, FakeInterpreter(one_bird_output()),
+                                      frame_width_px=1152, frame_height_px=1152)
+    env = FrameEnvelope(np.zeros((256, 256), np.uint8), 1, 0.0, crop=(0.5, 0.0, 0.5, 0.5))
+    full = det.infer(np.zeros((256, 256), np.uint8))[0]
+    zoomed = det.infer(env)[0]
+    assert zoomed.cx == pytest.approx(576.0 + full.cx / 2)
+    assert zoomed.cy == pytest.approx(full.cy / 2)
+    assert zoomed.area_px == pytest.approx(full.area_px / 4)
+
+
+# ---- camera rotation as a box transform ----
+
+class _BlobModel(FakeInterpreter):
+    """A "model" that boxes the bright blob in its input (float v8 head, normalized xywh)."""
+
+    def invoke(self) -> None:
+        super().invoke()
+        n = self.input.shape[1]
+        ys, xs = np.nonzero(self.input[0, :, :, 0] == 127)
+        x1, x2, y1, y2 = xs.min() / n, (xs.max() + 1) / n, ys.min() / n, (ys.max() + 1) / n
+        self.output = np.zeros((1, 5, 1344), np.float32)
+        self.output[0, :, 0] = ((x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1, 0.9)
+
+
+@pytest.mark.parametrize("rotation_deg", [90, 180, 270])
+@pytest.mark.parametrize("crop", [None, (0.25, 0.5, 0.5, 0.5)])
+def test_box_rotation_matches_rotating_the_pixels(rotation_deg, crop):
+    from capture import rotate_frame
+    from contracts import FrameEnvelope
+    cfg = Config()
+    det = coral_with_fake_interpreter(cfg.detector, _BlobModel(np.zeros((1, 5, 1344))),
+                                      frame_width_px=1152, frame_height_px=1152)
+    det._out_scale = 0.0                            # float head: no rounding either way
+    sensor = np.zeros((256, 256), np.uint8)
+    sensor[40:56, 150:182] = 255                    # 32x16 px bird, off-centre
+    rotated = det.infer(FrameEnvelope(rotate_frame(sensor, rotation_deg), 1, 0.0, crop=crop))
+    boxed = det.infer(FrameEnvelope(sensor, 2, 0.0, crop=crop, rotation_deg=rotation_deg))
+    assert len(rotated) == len(boxed) == 1
+    np.testing.assert_allclose(boxed[0].xyxy, rotated[0].xyxy, atol=1e-6)
+    assert boxed[0].score == rotated[0].score
@@ -0,0 +1,186 @@
+"""CpuDetector + backend selection, with a fake tflite module (no TFLite on the Mac)."""
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from config import Config
+from conftest import FakeInterpreter, one_bird_output
+from detect.coral import CoralDetector
+from detect.cpu import CpuDetector
+from errors import DetectionError
+
+
+@pytest.fixture
+def fake_tflite(monkeypatch):
+    """``tflite_runtime.interpreter`` stand-in that records how it was constructed."""
+    mod = types.ModuleType("tflite_runtime.interpreter")
+    mod.OpResolverType = types.SimpleNamespace(AUTO="auto",
+                                               BUILTIN_WITHOUT_DEFAULT_DELEGATES="no-xnnpack")
+    mod.calls = []
+
+    def interpreter(**kwargs):
+        mod.calls.append(kwargs)
+        return FakeInterpreter(one_bird_output())
+
+    mod.Interpreter = interpreter
+    pkg = types.ModuleType("tflite_runtime")
+    pkg.interpreter = mod
+    monkeypatch.setitem(sys.modules, "tflite_runtime", pkg)
+    monkeypatch.setitem(sys.modules, "tflite_runtime.interpreter", mod)
+    return mod
+
+
+def test_cpu_detector_loads_cpu_model_with_threads_and_default_xnnpack(fake_tflite):
+    cfg = Config()
+    cfg.detector.cpu_threads = 2
+    det = CpuDetector(cfg.detector)
+    det.load()
+    assert fake_tflite.calls == [{"model_path": cfg.detector.cpu_model_path, "num_threads": 2}]
+    assert (det._in_scale, det._in_zero) == (1.0 / 255.0, -128)
+
+
+def test_cpu_detector_xnnpack_off_uses_reference_kernels(fake_tflite):
+    cfg = Config()
+    cfg.detector.cpu_xnnpack = False
+    CpuDetector(cfg.detector).load()
+    assert fake_tflite.calls[0]["experimental_op_resolver_type"] == "no-xnnpack"
+
+
+def test_cpu_detector_shares_preprocess_and_decode(fake_tflite):
+    cfg = Config()
+    det = CpuDetector(cfg.detector, frame_width_px=1152, frame_height_px=1152)
+    frame = np.full((256, 256), 255, np.uint8)
+    dets = det.infer(frame)
+    assert len(dets) == 1 and dets[0].cx == pytest.approx(576.0, abs=5.0)
+    assert det._interpreter.input.max() == 127     # LUT write into the input tensor
+
+
+def test_cpu_detector_load_failure_is_a_detection_error(monkeypatch):
+    monkeypatch.setitem(sys.modules, "tflite_runtime", None)
+    monkeypatch.setitem(sys.modules, "tflite_runtime.interpreter", None)
+    monkeypatch.setitem(sys.modules, "ai_edge_litert", None)
+    monkeypatch.setitem(sys.modules, "tensorflow", None)
+    with pytest.raises(DetectionError):
+        CpuDetector(Config().detector).load()
+
+
+# ---- main.build_detector: backend selection + Coral -> CPU fallback ----
+
+def test_build_detector_cpu_backend(fake_tflite):
+    from main import build_detector
+    cfg = Config()
+    cfg.detector.backend = "cpu"
+    det = build_detector(cfg)
+    assert isinstance(det, CpuDetector)
+    assert det._frame_dims(np.zeros((256, 256))) == (1152, 1152)
+
+
+_load = CoralDetector.load
+
+
+def _no_coral(self):
+    if type(self) is CoralDetector:                 # CpuDetector inherits load()
+        raise DetectionError("no Edge TPU")
+    _load(self)
+
+
+class _DroppingInterpreter(FakeInterpreter):
+    """A Coral that works, then falls off the bus: ``invoke`` raises after ``ok`` calls."""
+
+    def __init__(self, ok):
+        super().__init__(one_bird_output())
+        self.ok = ok
+
+    def invoke(self):
+        if self.invokes >= self.ok:
+            raise RuntimeError("Failed to invoke Edge TPU: USB transfer error")
+        super().invoke()
+
+
+def test_build_detector_wraps_a_working_coral_with_the_loaded_cpu(monkeypatch, fake_tflite):
+    from detect.cpu import CpuFallbackDetector
+    from main import build_detector
+
+    monkeypatch.setattr(CoralDetector, "_make_interpreter",
+                        lambda self: FakeInterpreter(one_bird_output()))
+    cfg = Config()
+    cfg.detector.cpu_fallback = True
+    det = build_detector(cfg)
+    assert isinstance(det, CpuFallbackDetector) and not det.degraded
+    assert det.fallback._interpreter is not None            # loaded up front
+
+
+def test_coral_that_drops_out_mid_run_switches_to_the_cpu(fake_tflite):
+    from detect.cpu import CpuFallbackDetector
+
+    cfg = Config()
+    cfg.detector.cpu_fallback_after = 3
+    coral = CoralDetector(cfg.detector)
+    coral._make_interpreter = lambda: _DroppingInterpreter(ok=2)
+    coral.load()
+    cpu = CpuDetector(cfg.detector)
+    cpu.load()
+    det = CpuFallbackDetector(coral, cpu, cfg.detector.cpu_fallback_after)
+    frame = np.zeros((256, 256), np.uint8)
+    assert len(det.infer(frame)) == 1 and len(det.infer(frame)) == 1
+    for _ in range(2):                                      # first failures: frame skipped
+        with pytest.raises(DetectionError):
+            det.infer(frame)
+    assert not det.degraded and cpu._interpreter.invokes == 0
+    assert len(det.infer(frame)) == 1                       # third in a row: re-run on the CPU
+    assert det.degraded and cpu._interpreter.invokes == 1
+    det.infer(frame)
+    assert coral._interpreter.invokes == 2 and cpu._interpreter.invokes == 2
+    assert det.fallback_stats.as_dict() == {"backend": "cpu", "consecutive_failures": 3,
+                                            "failures": 3}
+
+
+def test_coral_failure_streak_resets_on_success(fake_tflite):
+    from detect.cpu import CpuFallbackDetector
+
+    coral = CoralDetector(Config().detector)
+    coral._make_interpreter = lambda: _DroppingInterpreter(ok=0)
+    coral.load()
+    det = CpuFallbackDetector(coral, CpuDetector(Config().detector), max_failures=2)
+    frame = np.zeros((256, 256), np.uint8)
+    for _ in range(3):                                      # fail, succeed: never 2 in a row
+        with pytest.raises(DetectionError):
+            det.infer(frame)
+        coral._interpreter.ok += 1
+        det.infer(frame)
+    assert not det.degraded and det.fallback_stats.failures == 3
+
+
+def test_build_detector_falls_back_to_cpu_when_coral_wont_load(monkeypatch, fake_tflite):
+    from main import build_detector
+
+    monkeypatch.setattr(CoralDetector, "load", _no_coral)
+    cfg = Config()
+    assert type(build_detector(cfg)) is CoralDetector   # off by default: lazy, fails per tick
+    cfg.detector.cpu_fallback = True
+    det = build_detector(cfg)
+    assert type(det) is CpuDetector and det._interpreter is not None   # loaded up front
+
+
+def test_cpu_fallback_that_wont_load_raises_the_coral_error(monkeypatch):
+    from main import build_detector
+
+    monkeypatch.setattr(CoralDetector, "load", _no_coral)
+    monkeypatch.setitem(sys.modules, "tflite_runtime", None)
+    monkeypatch.setitem(sys.modules, "tflite_runtime.interpreter", None)
+    monkeypatch.setitem(sys.modules, "ai_edge_litert", None)
+    monkeypatch.setitem(sys.modules, "tensorflow", None)
+    cfg = Config()
+    cfg.detector.cpu_fallback = True
+    with pytest.raises(DetectionError, match="no Edge TPU"):
+        build_detector(cfg)
+
+
+def test_backend_must_be_known():
+    from errors import ConfigError
+    cfg = Config()
+    cfg.detector.backend = "gpu"
+    with pytest.raises(ConfigError):
+        cfg.validate()
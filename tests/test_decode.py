@@ -165,3 +165,173 @@ def test_v8_decode_matches_ultralytics_reference():
         assert d.cls_id == e["cls_id"]
         for got, want in zip(d.xyxy, e["xyxy"]):
             assert got == pytest.approx(want, abs=2.0)
+
+
+# ---- Quantized-domain decode: identical to dequantize-then-decode ----
+
+_OUT_SCALE = 1.0 / 255.0    # Ultralytics INT8 head: normalized [0,1] xywh + scores
+_OUT_ZERO = -128
+
+
+def _quantize_output(x, scale=_OUT_SCALE, zero=_OUT_ZERO, dtype=np.int8):
+    info = np.iinfo(dtype)
+    return np.clip(np.round(x / scale) + zero, info.min, info.max).astype(dtype)
+
+
+def _dequantize_output(q, scale=_OUT_SCALE, zero=_OUT_ZERO):
+    return (q.astype(np.float32) - zero) * scale   # what CoralDetector used to do
+
+
+def _same_detections(a, b):
+    assert len(a) == len(b)
+    for x, y in zip(a, b):
+        assert x.cls_id == y.cls_id
+        assert x.score == y.score                   # bit-identical, not approx
+        assert x.xyxy == y.xyxy
+
+
+@pytest.mark.parametrize("conf", [0.0, 0.1, 0.25, 0.2509, 0.5, 0.99, 1.0])
+def test_quantized_threshold_agrees_with_float_compare(conf):
+    from detect.decode import quantized_threshold
+    q = np.arange(-128, 128, dtype=np.int8)
+    thr = quantized_threshold(conf, _OUT_SCALE, _OUT_ZERO, np.int8)
+    assert np.array_equal(q >= thr, _dequantize_output(q) >= conf)
+
+
+@pytest.mark.skipif(not os.path.exists(_RAW), reason="real-model fixture not captured")
+@pytest.mark.parametrize("transposed", [False, True])
+def test_quantized_decode_matches_float_decode_on_fixture(transposed):
+    q = _quantize_output(np.load(_RAW))
+    if transposed:
+        q = np.transpose(q, (0, 2, 1))
+    kw = dict(input_size_px=256, frame_width_px=1152, frame_height_px=1152,
+              conf_threshold=0.25, iou_threshold=0.5, coords_normalized=True)
+    ref = decode_v8(_dequantize_output(q), **kw)
+    got = decode_v8(q, quantization=(_OUT_SCALE, _OUT_ZERO), **kw)
+    assert len(got) >= 1
+    _same_detections(got, ref)
+
+
+def test_quantized_decode_multiclass_matches_float_decode():
+    rng = np.random.default_rng(1)
+    x = np.zeros((1, 4 + 3, 2100), np.float32)      # 320px input: N = 2100
+    x[0, :4] = rng.uniform(0.05, 0.95, (4, 2100))
+    x[0, 4:] = rng.uniform(0.0, 0.3, (3, 2100))
+    x[0, 4 + 2, 10] = 0.9
+    x[0, 4 + 1, 500] = 0.8
+    x[0, 4 + 0, 1500] = 0.7
+    q = _quantize_output(x)
+    kw = dict(input_size_px=320, frame_width_px=1152, frame_height_px=1152,
+              conf_threshold=0.25, iou_threshold=0.5, coords_normalized=True)
+    _same_detections(decode_v8(q, quantization=(_OUT_SCALE, _OUT_ZERO), **kw),
+                     decode_v8(_dequantize_output(q), **kw))
+
+
+def test_quantized_decode_nothing_passes_returns_empty():
+    q = np.full((1, 5, 1344), -128, np.int8)
+    assert decode_v8(q, 256, 1152, 1152, quantization=(_OUT_SCALE, _OUT_ZERO)) == []
+
+
+# ---- raw DFL heads (graph exported without the DFL / box-decode ops) ----
+
+def _dfl_bins(dist_cells, reg_max=16):
+    """Bin logits whose softmax expectation is ``dist_cells`` (two adjacent bins)."""
+    lo = int(np.floor(dist_cells))
+    frac = dist_cells - lo
+    bins = np.full(reg_max, -30.0, np.float32)
+    bins[lo] = np.log(max(1.0 - frac, 1e-9))
+    if lo + 1 < reg_max:
+        bins[lo + 1] = np.log(max(frac, 1e-9))
+    return bins
+
+
+def _dfl_heads(size=INPUT, nc=1, reg_max=16):
+    """Blank ``[1, H, W, 4*reg_max + nc]`` float heads, strides 8/16/32, logits -10."""
+    heads = []
+    for stride in (8, 16, 32):
+        side = size // stride
+        h = np.zeros((1, side, side, 4 * reg_max + nc), np.float32)
+        h[..., 4 * reg_max:] = -10.0
+        heads.append(h)
+    return heads
+
+
+def _plant_dfl(heads, level, row, col, ltrb_cells, cls, logit, reg_max=16):
+    head = heads[level]
+    for side, d in enumerate(ltrb_cells):
+        head[0, row, col, side * reg_max:(side + 1) * reg_max] = _dfl_bins(d, reg_max)
+    head[0, row, col, 4 * reg_max + cls] = logit
+
+
+def test_v8_anchor_points_are_cell_centers_in_input_pixels():
+    from detect.decode import v8_anchor_points
+    pts = v8_anchor_points(256)
+    assert {s: p.shape for s, p in pts.items()} == {8: (1024, 2), 16: (256, 2), 32: (64, 2)}
+    np.testing.assert_allclose(pts[16][0], (8.0, 8.0))
+    np.testing.assert_allclose(pts[16][1], (24.0, 8.0))        # row-major: x moves first
+    np.testing.assert_allclose(pts[32][8], (16.0, 48.0))
+    assert v8_anchor_points(256) is pts and not pts[8].flags.writeable
+
+
+def test_dfl_decode_reconstructs_box_from_distances_and_stride():
+    from detect.decode import decode_v8_dfl
+    heads = _dfl_heads()
+    # stride 16, cell (row 5, col 7) -> center (120, 88); l,t,r,b = 2, 1.5, 3.25, 4 cells
+    _plant_dfl(heads, 1, 5, 7, (2.0, 1.5, 3.25, 4.0), cls=0, logit=2.0)
+    dets = decode_v8_dfl(heads[::-1], INPUT, FRAME, FRAME, conf_threshold=0.5)
+    assert len(dets) == 1
+    k = FRAME / INPUT
+    np.testing.assert_allclose(dets[0].xyxy, ((120 - 32) * k, (88 - 24) * k,
+                                              (120 + 52) * k, (88 + 64) * k), atol=1e-2)
+    assert dets[0].score == pytest.approx(1 / (1 + np.exp(-2.0)), abs=1e-6)
+
+
+def test_dfl_decode_matches_dense_reference():
+    from detect.decode import decode_v8_dfl, v8_anchor_points
+    rng = np.random.default_rng(3)
+    nc = 3
+    heads = [rng.normal(0, 2, (1, INPUT // s, INPUT // s, 64 + nc)).astype(np.float32)
+             for s in (8, 16, 32)]
+    for h in heads:
+        h[..., 64:] -= 6.0                                  # mostly background
+    # Dense reference: softmax-expectation + sigmoid over every anchor, then decode_v8.
+    rows = []
+    for h, s in zip(heads, (8, 16, 32)):
+        a = h.reshape(-1, 64 + nc)
+        b = np.exp(a[:, :64].reshape(-1, 4, 16))
+        d = (b / b.sum(axis=2, keepdims=True)) @ np.arange(16) * s
+        p = v8_anchor_points(INPUT)[s]
+        xyxy = np.concatenate([p - d[:, :2], p + d[:, 2:]], axis=1)
+        xywh = np.concatenate([(xyxy[:, :2] + xyxy[:, 2:]) / 2, xyxy[:, 2:] - xyxy[:, :2]], 1)
+        rows.append(np.concatenate([xywh, 1 / (1 + np.exp(-a[:, 64:]))], axis=1))
+    ref = decode_v8(np.concatenate(rows)[None].astype(np.float32), INPUT, FRAME, FRAME,
+                    conf_threshold=0.3, iou_threshold=0.5, num_classes=nc)
+    got = decode_v8_dfl(heads, INPUT, FRAME, FRAME, conf_threshold=0.3, iou_threshold=0.5,
+                        num_classes=nc)
+    assert len(ref) > 5
+    assert [d.cls_id for d in got] == [d.cls_id for d in ref]
+    np.testing.assert_allclose([d.xyxy for d in got], [d.xyxy for d in ref], atol=1e-2)
+    np.testing.assert_allclose([d.score for d in got], [d.score for d in ref], atol=1e-5)
+
+
+def test_dfl_quantized_heads_match_float_decode_of_their_dequant():
+    from detect.decode import decode_v8_dfl
+    heads = _dfl_heads()
+    _plant_dfl(heads, 0, 10, 20, (1.0, 2.0, 1.5, 0.5), cls=0, logit=3.0)
+    _plant_dfl(heads, 2, 3, 4, (2.0, 2.0, 2.0, 2.0), cls=0, logit=1.0)
+    quants = [(0.25, 3), (0.2, -5), (0.3, 0)]
+    q_heads = [np.clip(np.round(h / s) + z, -128, 127).astype(np.int8)
+               for h, (s, z) in zip(heads, quants)]
+    deq = [(q.astype(np.float32) - z) * s for q, (s, z) in zip(q_heads, quants)]
+    ref = decode_v8_dfl(deq, INPUT, FRAME, FRAME, conf_threshold=0.5)
+    got = decode_v8_dfl(q_heads, INPUT, FRAME, FRAME, conf_threshold=0.5,
+                        quantizations=quants)
+    assert len(got) == len(ref) == 2
+    np.testing.assert_allclose([d.score for d in got], [d.score for d in ref], atol=1e-6)
+    np.testing.assert_allclose([d.xyxy for d in got], [d.xyxy for d in ref], atol=1e-3)
+
+
+def test_dfl_decode_rejects_non_square_heads():
+    from detect.decode import decode_v8_dfl
+    with pytest.raises(ValueError):
+        decode_v8_dfl([np.zeros((1, 12, 65), np.float32)], INPUT, FRAME, FRAME)
@@ -0,0 +1,40 @@
+"""FrameMap: array pixels -> full-frame pixels through rotation and sensor crop."""
+import numpy as np
+import pytest
+
+from capture import rotate_frame
+from contracts import Detection, FrameEnvelope
+from detect.base import frame_map, rotate_xyxy, upright_size
+
+
+def _blob_box(a):
+    ys, xs = np.nonzero(a)
+    return (xs.min(), ys.min(), xs.max() + 1, ys.max() + 1)
+
+
+@pytest.mark.parametrize("rotation_deg", [0, 90, 180, 270])
+def test_rotate_xyxy_matches_rot90_of_the_pixels(rotation_deg):
+    a = np.zeros((30, 50), np.uint8)
+    a[3:9, 20:41] = 1
+    assert rotate_xyxy(_blob_box(a), 50, 30, rotation_deg) == \
+        _blob_box(rotate_frame(a, rotation_deg))
+
+
+def test_upright_size_swaps_for_quarter_turns():
+    env = FrameEnvelope(np.zeros((30, 50), np.uint8), 1, 0.0, rotation_deg=270)
+    assert upright_size(env) == (30, 50)
+    assert upright_size(np.zeros((30, 50))) == (50, 30)
+
+
+def test_identity_map_returns_detections_untouched():
+    dets = [Detection.from_xyxy(0, 0.9, 1, 2, 3, 4)]
+    assert frame_map(np.zeros((8, 8)), 8, 8).apply(dets) is dets
+
+
+@pytest.mark.parametrize("rotation_deg", [0, 90, 180, 270])
+def test_to_frame_inverts_the_box_map(rotation_deg):
+    env = FrameEnvelope(np.zeros((64, 64), np.uint8), 1, 0.0, crop=(0.5, 0.25, 0.5, 0.5),
+                        rotation_deg=rotation_deg)
+    m = frame_map(env, 1152, 1152)
+    x1, y1, _, _ = m.box((100.0, 40.0, 100.0, 40.0))
+    assert m.to_frame(x1, y1) == pytest.approx((100.0, 40.0))
@@ -9,9 +9,11 @@ import importlib
 import pytest
 
 MODULES = [
-    "errors", "contracts", "config", "capture", "main",
-    "detect", "detect.base", "detect.decode", "detect.coral",
-    "track", "track.tracker", "track.predict",
+    "errors", "contracts", "config", "capture", "synthetic", "main",
+    "detect", "detect.base", "detect.decode", "detect.coral", "detect.cpu", "detect.pool",
+    "detect.ssd", "detect.mobiledet", "detect.tiled",
+    "detect.roi", "detect.motion", "detect.synthetic",
+    "track", "track.tracker", "track.predict", "track.assign", "track.kalman", "track.table",
     "strategy", "strategy.scoring", "strategy.selector",
     "aim", "aim.calibrate", "aim.controller", "aim.killzone",
     "actuate", "actuate.pca9685", "actuate.servo", "actuate.pump",
@@ -0,0 +1,151 @@
+"""Kalman tracker: predicted-box association, gating, batched state, Track output."""
+import numpy as np
+import pytest
+from conftest import make_detection
+
+from config import TrackerConfig
+from contracts import FrameEnvelope
+from track.kalman import KalmanTracker
+from track.tracker import IouTracker
+
+
+def _kalman(**kw):
+    kw.setdefault("min_hits", 1)
+    return KalmanTracker(TrackerConfig(backend="kalman", **kw))
+
+
+def test_new_detection_creates_tentative_track():
+    tr = KalmanTracker(TrackerConfig(min_hits=3))
+    assert tr.update([make_detection(cx=100, cy=100)]) == []
+    assert [t.id for t in tr.tracks] == [1]
+
+
+def test_track_confirmed_after_min_hits():
+    tr = KalmanTracker(TrackerConfig(min_hits=3))
+    for _ in range(3):
+        out = tr.update([make_detection(cx=100, cy=100)])
+    assert [(t.id, t.hits) for t in out] == [(1, 3)]
+
+
+def test_tentative_track_dropped_on_first_miss():
+    tr = KalmanTracker(TrackerConfig(min_hits=3))
+    tr.update([make_detection(cx=100, cy=100)])
+    tr.update([])
+    assert tr.tracks == []
+
+
+def test_fast_bird_keeps_its_id_where_iou_tracker_breaks():
+    # 40 px box moving 60 px/frame: consecutive boxes never overlap.
+    xs = [100 + 60 * i for i in range(10)]
+    kf, iou = _kalman(), IouTracker(min_hits=1)
+    for x in xs:
+        k_out = kf.update([make_detection(cx=x, cy=200)])
+        i_out = iou.update([make_detection(cx=x, cy=200)])
+    assert [t.id for t in k_out] == [1]
+    assert k_out[0].vx == pytest.approx(60.0, abs=2.0)
+    assert k_out[0].vy == pytest.approx(0.0, abs=1.0)
+    assert max(t.id for t in i_out) > 1          # the IoU tracker re-spawned
+
+
+def test_gate_rejects_a_detection_far_from_the_prediction():
+    tr = _kalman()
+    for x in range(100, 200, 10):
+        tr.update([make_detection(cx=x, cy=100)])
+    out = tr.update([make_detection(cx=700, cy=600)])
+    by_id = {t.id: t for t in out}
+    assert by_id[1].time_since_update == 1
+    assert 2 in by_id
+
+
+def test_crossing_birds_keep_their_ids():
+    tr = _kalman()
+    out = []
+    for i in range(12):                        # paths cross at i == 6
+        out = tr.update([make_detection(cx=100 + 20 * i, cy=100),
+                         make_detection(cx=340 - 20 * i, cy=104)])
+    by_id = {t.id: t for t in out}
+    assert by_id[1].vx > 0 > by_id[2].vx
+
+
+def test_coasting_reports_last_observation():
+    tr = _kalman(max_age_frames=5)
+    for i, x in enumerate((100, 110, 120, 130)):
+        tr.update([make_detection(cx=x, cy=100)], FrameEnvelope(None, i + 1, capture_t=i))
+    seen = tr.tracks[0].cx
+    out = tr.update([], FrameEnvelope(None, 5, capture_t=4.0))
+    assert out[0].cx == seen and out[0].capture_t == 3
+    assert out[0].time_since_update == 1
+
+
+def test_seq_gap_predicts_across_dropped_frames():
+    tr = _kalman()
+    for seq in range(1, 9):
+        tr.update([make_detection(cx=100 + 30 * seq, cy=100)],
+                  FrameEnvelope(None, seq, capture_t=seq / 20))
+    # three frames dropped: the bird is 120 px on, still the same track
+    out = tr.update([make_detection(cx=100 + 30 * 12, cy=100)],
+                    FrameEnvelope(None, 12, capture_t=0.6))
+    assert [t.id for t in out] == [1]
+    assert out[0].vx == pytest.approx(30.0, abs=2.0)
+
+
+def test_lost_track_dropped_after_max_age():
+    tr = _kalman(max_age_frames=2)
+    tr.update([make_detection(cx=100, cy=100)])
+    tr.update([])
+    tr.update([])
+    assert len(tr.tracks) == 1
+    tr.update([])
+    assert tr.tracks == []
+
+
+def test_constant_acceleration_model():
+    tr = _kalman(kalman_model="ca")
+    for i in range(15):
+        out = tr.update([make_detection(cx=100 + 2 * i * i, cy=100)])
+    assert len(tr.tracks) == 1 and tr._table.extra["kf_x"].shape[1] == 6
+    assert out[0].vx == pytest.approx(4 * 14, rel=0.1)
+
+
+def test_dropped_tracks_free_their_slots_for_reuse():
+    tr = _kalman(max_age_frames=1)
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        n = rng.integers(0, 8)
+        tr.update([make_detection(cx=x, cy=y) for x, y in rng.uniform(0, 1000, (n, 2))])
+        assert len(tr._table) == len(tr.tracks)
+    assert tr._table.capacity == 64                # never grew past the initial slots
+
+
+def test_apply_config_model_change_resets():
+    tr = _kalman()
+    tr.update([make_detection()])
+    tr.apply_config(TrackerConfig(kalman_model="ca", min_hits=1))
+    assert tr.tracks == [] and tr._table.extra["kf_x"].shape[1] == 6
+
+
+def test_two_stage_low_tier_extends_confirmed_tracks_only():
+    tr = _kalman(min_hits=2, high_score_threshold=0.5)
+    for x in (100, 110, 120):
+        tr.update([make_detection(cx=x, cy=100)])
+    out = tr.update([make_detection(cx=130, cy=100, score=0.2),
+                     make_detection(cx=600, cy=600, score=0.2)])
+    assert [(t.id, t.time_since_update) for t in out] == [(1, 0)]
+    assert len(tr.tracks) == 1 and tr.tracks[0].score == 0.2
+
+
+def test_build_tracker_selects_backend():
+    from config import Config
+    from main import build_tracker
+    cfg = Config()
+    assert isinstance(build_tracker(cfg), IouTracker)
+    cfg.tracker.backend = "kalman"
+    assert isinstance(build_tracker(cfg), KalmanTracker)
+
+
+def test_history_is_stamped_across_dropped_frames():
+    tr = _kalman(history_frames=4)
+    for seq in (1, 2, 5):
+        out = tr.update([make_detection(cx=100 + 4 * seq, cy=100)],
+                        FrameEnvelope(None, seq, capture_t=seq / 20))
+    assert out.hist_frame[0, :3].tolist() == [1, 2, 5]
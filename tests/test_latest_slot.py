@@ -28,3 +28,57 @@ def test_concurrent_writes_leave_a_valid_value():
     for t in threads:
         t.join()
     assert slot.get() in {0, 1, 2, 3}
+
+
+def test_seq_increments_per_put():
+    slot = LatestSlot()
+    assert slot.seq == 0
+    assert slot.put("a") == 1
+    assert slot.put("b") == 2
+    assert slot.get_with_seq() == (2, "b")
+
+
+def test_wait_for_newer_returns_immediately_when_already_newer():
+    slot = LatestSlot()
+    slot.put("a")
+    slot.put("b")
+    assert slot.wait_for_newer(0, timeout=0.0) == (2, "b")
+
+
+def test_wait_for_newer_times_out_without_a_new_value():
+    slot = LatestSlot()
+    slot.put("a")
+    assert slot.wait_for_newer(1, timeout=0.01) == (1, None)
+
+
+def test_wait_for_newer_wakes_on_put():
+    slot = LatestSlot()
+    got = []
+    t = threading.Thread(target=lambda: got.append(slot.wait_for_newer(0, timeout=2.0)))
+    t.start()
+    slot.put("fresh")
+    t.join(timeout=2.0)
+    assert got == [(1, "fresh")]
+
+
+def test_stage_stats_counts_skipped_gap_as_stale():
+    from app.pipeline import StageStats
+    st = StageStats()
+    st.consumed(1, 0)
+    st.consumed(4, 1)          # 2 and 3 were overwritten before being read
+    assert st.as_dict() == {"processed": 2, "stale": 2, "duplicates_avoided": 0,
+                            "late": 0, "errors": 0}
+
+
+def test_every_stage_stats_reports_its_slots_through_the_shared_base():
+    from app.pipeline import StageStats, StandbyStats
+    from capture import ExposureStats
+    from contracts import TelemetryStats
+    from detect.motion import MotionStats
+    from detect.roi import RoiStats
+    from detect.tiled import TileStats
+    for cls in (StageStats, StandbyStats, ExposureStats, MotionStats, RoiStats, TileStats):
+        st = cls()
+        assert isinstance(st, TelemetryStats) and "as_dict" not in vars(cls)
+        assert list(st.as_dict()) == list(cls.__slots__)
+        assert not hasattr(st, "__dict__")
@@ -0,0 +1,117 @@
+"""MobileDetDetector on fake interpreters: both export styles, SSD input range, selection."""
+import numpy as np
+import pytest
+
+from config import Config
+from conftest import FakeInterpreter
+from detect.mobiledet import MobileDetDetector, postprocess_roles, raw_roles
+from detect.ssd import ssd_anchors
+from errors import DetectionError
+
+_SSD_IN_QUANT = (1.0 / 128.0, 128)      # Coral model zoo MobileDet: uint8, [-1, 1]
+
+
+class MultiOutputInterpreter(FakeInterpreter):
+    """``FakeInterpreter`` with several named outputs (index -> array)."""
+
+    def __init__(self, outputs, quant=None, names=None):
+        super().__init__(np.zeros(1, np.float32), input_size=320, in_dtype=np.uint8)
+        self.outputs = outputs
+        self.quant = quant or {}
+        self.names = names or {}
+
+    def get_input_details(self):
+        return [{"index": 0, "dtype": np.uint8, "quantization": _SSD_IN_QUANT,
+                 "shape": np.array(self.input.shape)}]
+
+    def get_output_details(self):
+        return [{"index": i, "name": self.names.get(i, f"out{i}"), "dtype": a.dtype.type,
+                 "quantization": self.quant.get(i, (0.0, 0)), "shape": np.array(a.shape)}
+                for i, a in self.outputs.items()]
+
+    def get_tensor(self, index):
+        return self.outputs[index].copy()
+
+
+def _loaded(interpreter, **kwargs):
+    cfg = Config()
+    cfg.detector.backend = "coral_mobiledet"
+    cfg.detector.input_size_px = 320
+    cfg.detector.conf_threshold = 0.5
+    det = MobileDetDetector(cfg.detector, **kwargs)
+    det._make_interpreter = lambda: interpreter
+    det.load()
+    return det
+
+
+def _postprocess_graph():
+    boxes = np.zeros((1, 10, 4), np.float32)
+    boxes[0, 0] = (0.25, 0.5, 0.75, 0.75)
+    scores = np.zeros((1, 10), np.float32)
+    scores[0, 0] = 0.9
+    return MultiOutputInterpreter({10: boxes, 11: np.zeros((1, 10), np.float32),
+                                   12: scores, 13: np.array([1.0], np.float32)})
+
+
+def test_postprocess_graph_reads_four_outputs_into_full_frame_pixels():
+    det = _loaded(_postprocess_graph(), frame_width_px=1152, frame_height_px=1152)
+    assert det.has_postprocess
+    assert det._roles == {"boxes": 10, "count": 13, "classes": 11, "scores": 12}
+    dets = det.infer(np.zeros((320, 320), np.uint8))
+    assert len(dets) == 1
+    np.testing.assert_allclose(dets[0].xyxy, (576, 288, 864, 864), atol=1e-3)
+    assert dets[0].score == pytest.approx(0.9)
+
+
+def test_raw_graph_decodes_quantized_head_on_the_host():
+    anchors = ssd_anchors(320)
+    n, k = anchors.shape[0], 1530             # layer 1, cell (5, 5), 1:1
+    enc = np.zeros((1, n, 4), np.uint8) + 128          # zero encoding = the anchor itself
+    logits = np.zeros((1, n, 2), np.uint8)             # scale 0.1, zero 128 -> -12.8
+    logits[0, k, 1] = 158                              # +3.0 -> sigmoid 0.95
+    interp = MultiOutputInterpreter(
+        {5: logits, 4: enc}, quant={4: (0.05, 128), 5: (0.1, 128)},
+        names={4: "raw_outputs/box_encodings", 5: "raw_outputs/class_predictions"})
+    det = _loaded(interp, frame_width_px=1000, frame_height_px=1000)
+    assert not det.has_postprocess
+    assert det._roles == {"boxes": 4, "logits": 5}
+    dets = det.infer(np.zeros((320, 320), np.uint8))
+    assert len(dets) == 1
+    yc, xc, h, w = anchors[k] * 1000
+    np.testing.assert_allclose(dets[0].xyxy, (xc - w / 2, yc - h / 2, xc + w / 2, yc + h / 2),
+                               atol=0.05)
+    assert dets[0].score == pytest.approx(1 / (1 + np.exp(-3.0)), abs=1e-4)
+
+
+def test_raw_graph_with_wrong_anchor_count_fails_to_load():
+    interp = MultiOutputInterpreter({0: np.zeros((1, 100, 4), np.float32),
+                                     1: np.zeros((1, 100, 2), np.float32)})
+    with pytest.raises(DetectionError):
+        _loaded(interp)
+
+
+def test_input_lut_maps_pixels_to_the_ssd_range():
+    det = _loaded(_postprocess_graph())
+    # uint8 (1/128, 128) over [-1, 1]: 0 -> 0, 255 -> 255, mid-grey ~128
+    assert det._lut[0] == 0 and det._lut[255] == 255
+    assert abs(int(det._lut[128]) - 128) <= 1
+    assert np.all(np.diff(det._lut.astype(int)) >= 0)
+
+
+def test_output_role_helpers():
+    shapes = [(1, 10, 4), (1, 10), (1, 10), (1,)]
+    details = [{"index": i, "shape": np.array(s)} for i, s in enumerate(shapes)]
+    assert postprocess_roles(details) == {"boxes": 0, "classes": 1, "scores": 2, "count": 3}
+    with pytest.raises(DetectionError):
+        postprocess_roles(details[:3] + [{"index": 3, "shape": np.array((1, 10))}])
+    unnamed = [{"index": 7, "shape": np.array((1, 5, 91))},
+               {"index": 8, "shape": np.array((1, 5, 4))}]
+    assert raw_roles(unnamed) == {"boxes": 8, "logits": 7}
+
+
+def test_build_detector_selects_mobiledet_for_the_backend():
+    from main import build_detector
+    cfg = Config()
+    cfg.detector.backend = "coral_mobiledet"
+    cfg.detector.cpu_fallback = False
+    assert isinstance(build_detector(cfg), MobileDetDetector)
@@ -0,0 +1,101 @@
+"""MotionGate: background model, mask cleanup, run/skip decisions, telemetry boxes."""
+import numpy as np
+import pytest
+
+from config import Config
+from contracts import FrameEnvelope
+from detect.motion import MotionGate, dilate, erode, mask_boxes
+
+
+def _cfg(**kw):
+    a = Config().app
+    a.detection_mode = "motion_gated"
+    for k, v in kw.items():
+        setattr(a, k, v)
+    return a
+
+
+def _still():
+    return np.full((256, 256), 90, np.uint8)
+
+
+def _bird(x=100, y=60, size=16):
+    frame = _still()
+    frame[y:y + size, x:x + size] = 200
+    return frame
+
+
+def test_opening_removes_speckle_and_keeps_blobs():
+    mask = np.zeros((20, 20), np.uint8)
+    mask[3, 3] = 1                                  # single-pixel noise
+    mask[10:15, 10:15] = 1
+    opened = dilate(erode(mask))
+    assert opened[3, 3] == 0
+    assert opened[12, 12] == 1
+    assert mask.sum() == 26                         # inputs untouched
+
+
+def test_mask_boxes_groups_cells_largest_first():
+    mask = np.zeros((64, 64), np.uint8)
+    mask[40:60, 4:30] = 1
+    mask[2:5, 50:53] = 1
+    assert mask_boxes(mask, 4, 8) == [(4, 40, 32, 60), (48, 0, 56, 8)]
+    assert len(mask_boxes(mask, 4, 1)) == 1
+
+
+def test_still_scene_is_skipped_until_the_forced_pass():
+    gate = MotionGate(_cfg(motion_force_every=5))
+    runs = [gate.update(_still()).run for _ in range(11)]
+    assert runs == [True, False, False, False, False, True, False, False, False, False, True]
+    assert gate.stats.reason == "forced"
+    assert gate.stats.skip_fraction == pytest.approx(8 / 11)
+
+
+def test_motion_runs_detector_and_reports_full_frame_box():
+    gate = MotionGate(_cfg(), frame_width_px=1152, frame_height_px=1152)
+    gate.update(_still())
+    decision = gate.update(_bird())
+    assert decision.run and decision.reason == "motion"
+    assert decision.energy > 0.002
+    (box,) = decision.boxes
+    x1, y1, x2, y2 = box                            # bird at 100..116, 60..76 of 256 px
+    assert x1 <= 100 * 4.5 and x2 >= 116 * 4.5 - 4.5 * 4
+    assert y1 <= 60 * 4.5 and y2 >= 76 * 4.5 - 4.5 * 4
+    assert gate.stats.boxes == decision.boxes
+
+
+def test_live_tracks_keep_the_detector_running_without_motion():
+    gate = MotionGate(_cfg())
+    gate.update(_still())
+    assert gate.update(_still(), tracks_alive=True).reason == "tracks"
+    assert gate.update(_still()).reason == "idle"
+
+
+def test_background_absorbs_a_parked_object():
+    gate = MotionGate(_cfg(motion_force_every=1000))
+    gate.update(_still())
+    reasons = [gate.update(_bird()).reason for _ in range(40)]
+    assert reasons[0] == "motion" and reasons[-1] == "idle"
+
+
+def test_sensor_crop_maps_boxes_through_the_crop():
+    gate = MotionGate(_cfg(), frame_width_px=1152, frame_height_px=1152)
+    gate.update(FrameEnvelope(_still(), 1, 0.0, crop=(0.5, 0.5, 0.5, 0.5)))
+    d = gate.update(FrameEnvelope(_bird(x=0, y=0), 2, 0.0, crop=(0.5, 0.5, 0.5, 0.5)))
+    assert d.boxes[0][:2] == (576.0, 576.0)
+
+
+def test_rgb_frames_gate_on_green():
+    gate = MotionGate(_cfg())
+    gate.update(np.dstack([_still()] * 3))
+    assert gate.update(np.dstack([_bird()] * 3)).reason == "motion"
+
+
+@pytest.mark.parametrize("key,value", [("detection_mode", "sometimes"),
+                                       ("motion_downsample", 0),
+                                       ("motion_energy_threshold", 2.0),
+                                       ("motion_force_every", 0)])
+def test_motion_config_validation(key, value):
+    from errors import ConfigError
+    with pytest.raises(ConfigError):
+        Config.from_dict({"app": {key: value}})
@@ -2,7 +2,7 @@
 import numpy as np
 import pytest
 
-from detect.decode import compute_iou, multiclass_nms, nms
+from detect.decode import batched_nms, compute_iou, multiclass_nms, nms
 
 
 def test_iou_identical_boxes_is_one():
@@ -53,3 +53,63 @@ def test_multiclass_nms_does_not_suppress_across_classes():
     class_ids = np.array([0, 1])
     keep = multiclass_nms(boxes, scores, class_ids, iou_threshold=0.5)
     assert set(keep) == {0, 1}
+
+
+# --- batched_nms vs the reference greedy loop -------------------------------------
+
+def _reference_multiclass_nms(boxes, scores, class_ids, iou_threshold):
+    """The original per-class ``while`` loop, kept here as the behavioural oracle."""
+    keep = []
+    for cls in np.unique(class_ids):
+        idx = np.where(class_ids == cls)[0]
+        order = np.argsort(scores[idx])[::-1]
+        while order.size > 0:
+            i = int(order[0])
+            keep.append(int(idx[i]))
+            ious = compute_iou(boxes[idx[i]], boxes[idx[order[1:]]])
+            order = order[1:][ious < iou_threshold]
+    return sorted(keep, key=lambda i: -scores[i])
+
+
+def _random_boxes(rng, n, num_classes, extent=1152.0):
+    xy = rng.uniform(-20.0, extent, (n, 2))
+    wh = rng.uniform(5.0, 120.0, (n, 2))
+    boxes = np.concatenate([xy, xy + wh], axis=1).astype(np.float32)
+    scores = rng.uniform(0.25, 1.0, n).astype(np.float32)
+    class_ids = rng.integers(0, num_classes, n)
+    return boxes, scores, class_ids
+
+
+@pytest.mark.parametrize("n,num_classes", [(10, 1), (200, 1), (200, 80), (1500, 3)])
+def test_batched_nms_matches_reference_loop(n, num_classes):
+    # 1500 boxes spans several IoU row chunks.
+    boxes, scores, class_ids = _random_boxes(np.random.default_rng(n), n, num_classes)
+    for thr in (0.3, 0.5, 0.7):
+        got = batched_nms(boxes, scores, class_ids, thr).tolist()
+        assert got == _reference_multiclass_nms(boxes, scores, class_ids, thr)
+
+
+def test_batched_nms_max_detections_keeps_best():
+    boxes, scores, class_ids = _random_boxes(np.random.default_rng(7), 300, 2)
+    full = batched_nms(boxes, scores, class_ids, 0.5).tolist()
+    capped = batched_nms(boxes, scores, class_ids, 0.5, max_detections=5).tolist()
+    assert len(full) > 5
+    assert capped == full[:5]
+    assert batched_nms(boxes, scores, class_ids, 0.5, max_detections=0).size == 0
+
+
+def test_batched_nms_pre_nms_topk_only_considers_best_scores():
+    boxes = np.array([[0.0, 0.0, 10.0, 10.0],
+                      [100.0, 100.0, 110.0, 110.0],
+                      [200.0, 200.0, 210.0, 210.0]])
+    scores = np.array([0.3, 0.9, 0.6])
+    assert batched_nms(boxes, scores, None, 0.5, pre_nms_topk=2).tolist() == [1, 2]
+
+
+def test_batched_nms_class_offset_handles_negative_coords():
+    # Same box (partly off-frame) in two classes: both survive, and the same-class
+    # duplicate is still suppressed.
+    boxes = np.array([[-30.0, -30.0, 10.0, 10.0]] * 3)
+    scores = np.array([0.9, 0.8, 0.7])
+    class_ids = np.array([0, 1, 0])
+    assert batched_nms(boxes, scores, class_ids, 0.5).tolist() == [0, 1]
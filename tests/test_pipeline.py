@@ -0,0 +1,447 @@
+"""Pipeline threads wired with fakes: one inference per captured frame, no spin."""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.pipeline import Pipeline
+from contracts import FrameEnvelope
+
+
+class _CountingDetector:
+    def __init__(self):
+        self.calls = 0
+
+    def infer(self, frame):
+        self.calls += 1
+        return []
+
+
+class _FakeTracker:
+    def update(self, detections, frame=None):
+        return list(detections)
+
+
+def _env(seq, capture_t=None):
+    return FrameEnvelope(np.zeros((4, 4), np.uint8), seq,
+                         time.monotonic() if capture_t is None else capture_t)
+
+
+def _run_inference(pipe):
+    pipe._running = True
+    t = threading.Thread(target=pipe._inference_loop, daemon=True)
+    t.start()
+    return t
+
+
+def test_inference_runs_once_per_frame_not_per_spin():
+    det = _CountingDetector()
+    pipe = Pipeline(capture=None, detector=det, control=None, tracker=_FakeTracker())
+    t = _run_inference(pipe)
+    pipe.latest_frame.put(_env(1))
+    time.sleep(0.1)                    # the old loop re-inferred this frame ~forever
+    assert det.calls == 1
+    pipe.latest_frame.put(_env(2))
+    time.sleep(0.1)
+    pipe._running = False
+    t.join(timeout=1.0)
+    assert det.calls == 2
+    stats = pipe.stats()["inference"]
+    assert stats["processed"] == 2
+    assert stats["duplicates_avoided"] >= 1
+    assert pipe.latest_tracks.seq == 2  # one tracker result per frame
+
+
+def test_stale_frames_are_counted_not_inferred():
+    det = _CountingDetector()
+    pipe = Pipeline(capture=None, detector=det, control=None, tracker=_FakeTracker())
+    for i in range(3):                  # 3 frames land before inference starts
+        pipe.latest_frame.put(_env(i + 1))
+    t = _run_inference(pipe)
+    time.sleep(0.1)
+    pipe._running = False
+    t.join(timeout=1.0)
+    assert det.calls == 1
+    assert pipe.stats()["inference"]["stale"] == 2
+
+
+def test_frames_older_than_budget_are_dropped_before_inference():
+    from types import SimpleNamespace
+
+    from config import Config
+    cfg = Config()
+    cfg.predict.max_result_age_s = 0.05
+    det = _CountingDetector()
+    pipe = Pipeline(capture=None, detector=det, control=SimpleNamespace(cfg=cfg),
+                    tracker=_FakeTracker())
+    t = _run_inference(pipe)
+    pipe.latest_frame.put(_env(1, capture_t=time.monotonic() - 1.0))   # 1 s old
+    time.sleep(0.1)
+    pipe._running = False
+    t.join(timeout=1.0)
+    assert det.calls == 0
+    assert pipe.stats()["inference"]["late"] == 1
+
+
+# ---- pipelined inference: invoke frame N+1 while decoding/tracking frame N ----
+
+class _SlowTracker:
+    """Host-side work stand-in: records frame order, takes ``work_s`` per update."""
+
+    def __init__(self, work_s=0.0):
+        self.work_s = work_s
+        self.seqs = []
+
+    def update(self, detections, frame=None):
+        time.sleep(self.work_s)
+        self.seqs.append(frame.seq)
+        return list(detections)
+
+
+def _run_pipelined(pipe):
+    pipe._running = True
+    threads = pipe._inference_threads()
+    for t in threads:
+        t.start()
+    return threads
+
+
+def _feed(pipe, duration_s, period_s=0.005):
+    """Capture stand-in: a fresh model-size frame every ``period_s`` for ``duration_s``."""
+    seq = 0
+    end = time.monotonic() + duration_s
+    while time.monotonic() < end:
+        seq += 1
+        pipe.latest_frame.put(FrameEnvelope(np.zeros((256, 256), np.uint8), seq,
+                                            time.monotonic()))
+        time.sleep(period_s)
+
+
+def _results_in(pipelined, invoke_s, host_s, duration_s=0.6):
+    from config import Config
+    from conftest import FakeInterpreter, coral_with_fake_interpreter, one_bird_output
+    det = coral_with_fake_interpreter(Config().detector,
+                                      FakeInterpreter(one_bird_output(), latency_s=invoke_s))
+    tracker = _SlowTracker(host_s)
+    pipe = Pipeline(capture=None, detector=det, control=None, tracker=tracker,
+                    pipelined=pipelined)
+    threads = _run_pipelined(pipe)
+    _feed(pipe, duration_s)
+    pipe._running = False
+    for t in threads:
+        t.join(timeout=1.0)
+    return pipe, tracker
+
+
+def test_pipelined_results_stay_in_capture_order():
+    pipe, tracker = _results_in(pipelined=True, invoke_s=0.01, host_s=0.015, duration_s=0.3)
+    assert len(tracker.seqs) > 3
+    assert tracker.seqs == sorted(set(tracker.seqs))      # strictly increasing
+    tracked = pipe.latest_tracks.get()
+    assert tracked.frame.seq == tracker.seqs[-1]
+    assert len(tracked.tracks) == 1                       # the decoded bird made it through
+    assert {"inference", "invoke", "detect", "track"} <= set(tracked.frame.stage_t)
+    stats = pipe.stats()
+    assert stats["decode"]["processed"] == len(tracker.seqs)
+    assert stats["inference"]["stale"] > 0                # latest-wins: frames were skipped
+
+
+class _HandshakeDetector:
+    """``invoke`` flags ``invoking`` and, once a frame is being tracked, waits
+    (bounded) for host work to be running."""
+
+    def __init__(self, wait_s):
+        self.wait_s = wait_s
+        self.invoking = threading.Event()
+        self.updating = threading.Event()
+        self.tracking = threading.Event()       # the first update has begun
+
+    def infer(self, frame):
+        return self.decode(self.invoke(frame))
+
+    def invoke(self, frame):
+        self.invoking.set()
+        if self.tracking.is_set():
+            self.updating.wait(self.wait_s)
+        self.invoking.clear()
+        return []
+
+    def decode(self, raw):
+        return raw
+
+
+class _HandshakeTracker:
+    """Records, per update, whether an ``invoke`` ran at the same time."""
+
+    def __init__(self, detector):
+        self.detector = detector
+        self.overlapped = []
+
+    def update(self, detections, frame=None):
+        self.detector.tracking.set()
+        self.detector.updating.set()
+        self.overlapped.append(self.detector.invoking.wait(self.detector.wait_s))
+        self.detector.updating.clear()
+        return list(detections)
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_pipelined_overlaps_invoke_with_host_work(pipelined):
+    # Events, not throughput: host work for frame N sees frame N+1's invoke running.
+    det = _HandshakeDetector(wait_s=1.0 if pipelined else 0.05)   # serial: always times out
+    tracker = _HandshakeTracker(det)
+    pipe = Pipeline(capture=None, detector=det, control=None, tracker=tracker,
+                    pipelined=pipelined)
+    threads = _run_pipelined(pipe)
+    _feed(pipe, 0.4)
+    pipe._running = False
+    for t in threads:
+        t.join(timeout=1.0)
+    assert len(tracker.overlapped) >= 2
+    assert any(tracker.overlapped) == pipelined
+
+
+def test_serial_mode_has_no_decode_stage():
+    pipe = Pipeline(capture=None, detector=_CountingDetector(), control=None,
+                    tracker=_FakeTracker())
+    assert [t.name for t in pipe._inference_threads()] == ["inference"]
+    assert "decode" not in pipe.stats()
+
+
+def test_pooled_detector_feeds_tracker_in_capture_order():
+    from config import Config
+    from conftest import FakeInterpreter, coral_with_fake_interpreter, one_bird_output
+    from detect.pool import PooledDetector
+    workers = [coral_with_fake_interpreter(Config().detector,
+                                           FakeInterpreter(one_bird_output(), latency_s=lat))
+               for lat in (0.03, 0.01)]
+    tracker = _SlowTracker()
+    pipe = Pipeline(capture=None, detector=PooledDetector(workers), control=None,
+                    tracker=tracker)
+    assert pipe.pipelined and [t.name for t in pipe._inference_threads()] == [
+        "inference", "decode"]
+    pipe.detector.start(pipe._on_pool_result)
+    threads = _run_pipelined(pipe)
+    _feed(pipe, 0.3)
+    pipe.stop()
+    for t in threads:
+        t.join(timeout=1.0)
+    assert len(tracker.seqs) > 3
+    assert tracker.seqs == sorted(set(tracker.seqs))
+    assert min(pipe.detector.dispatched) > 0       # both devices got work
+
+
+# ---- lock-on ROI aiming ----
+
+def _locked_pipeline(scan_every=3, time_since_update=0):
+    from types import SimpleNamespace
+
+    from app.pipeline import TrackedFrame
+    from config import Config
+    from conftest import make_track
+    from detect.roi import LockOnDetector
+    cfg = Config()
+    cfg.predict.fps = 20.0
+    cfg.detector.lock_on_scan_every = scan_every
+    det = LockOnDetector(_CountingDetector(), cfg.detector)
+    pipe = Pipeline(capture=None, detector=det, control=SimpleNamespace(cfg=cfg),
+                    tracker=_FakeTracker())
+    track = make_track(track_id=7, cx=500.0, cy=300.0, vx=10.0, vy=-4.0,
+                       time_since_update=time_since_update)
+    track.capture_t = 10.0
+    pipe.latest_tracks.put(TrackedFrame(None, [track]))
+    pipe.latest_telemetry.put(SimpleNamespace(selected_target_id=7))
+    return pipe
+
+
+def test_lock_on_aims_at_predicted_target_with_periodic_scans():
+    pipe = _locked_pipeline(scan_every=3)
+    centers = []
+    for seq in range(1, 7):
+        env = _env(seq, capture_t=10.1)             # 0.1 s = 2 frames after the track
+        pipe._aim_roi(env)
+        centers.append(env.roi_center_px)
+    assert centers[0] == pytest.approx((520.0, 292.0))   # led by the frame's age at 20 fps
+    assert [c is None for c in centers] == [False, False, True, False, False, True]
+
+
+def test_lock_on_scans_without_a_fresh_target():
+    pipe = _locked_pipeline(time_since_update=5)   # target coasting: reacquire by scanning
+    env = _env(1)
+    pipe._aim_roi(env)
+    assert env.roi_center_px is None
+    pipe.latest_telemetry.put(None)
+    pipe._aim_roi(env)
+    assert env.roi_center_px is None
+    assert "lock_on" in pipe.stats()
+
+
+# ---- dynamic sensor ROI ----
+
+class _RoiCapture:
+    def __init__(self):
+        self.rois = []
+
+    def set_roi(self, roi):
+        self.rois.append(tuple(roi))
+
+
+def test_dynamic_roi_zooms_on_selected_target_else_static_roi():
+    from types import SimpleNamespace
+
+    from config import Config
+    from conftest import make_track
+    cfg = Config()
+    cfg.camera.dynamic_roi = True
+    cfg.camera.dynamic_roi_size = 0.5
+    cap = _RoiCapture()
+    pipe = Pipeline(capture=cap, detector=_CountingDetector(),
+                    control=SimpleNamespace(cfg=cfg), tracker=_FakeTracker())
+    pipe.latest_telemetry.put(SimpleNamespace(selected_target_id=3))
+    pipe._publish(_env(1), [make_track(track_id=3, cx=864.0, cy=288.0)])
+    pipe._publish(_env(2), [make_track(track_id=4, cx=864.0, cy=288.0)])
+    assert cap.rois[0] == pytest.approx((0.5, 0.0, 0.5, 0.5))
+    assert cap.rois[1] == tuple(cfg.camera.roi)
+    cfg.camera.dynamic_roi = False
+    pipe._publish(_env(3), [])
+    assert len(cap.rois) == 2
+
+
+# ---- motion gate ----
+
+def test_motion_gate_skips_still_frames_before_the_detector():
+    from config import Config
+    from detect.motion import MotionGate
+    cfg = Config()
+    cfg.app.motion_force_every = 1000
+    det = _CountingDetector()
+    pipe = Pipeline(capture=None, detector=det, control=None, tracker=_FakeTracker(),
+                    motion_gate=MotionGate(cfg.app))
+    t = _run_inference(pipe)
+    still = np.full((64, 64), 90, np.uint8)
+    moved = still.copy()
+    moved[10:30, 10:30] = 200
+    for seq, frame in enumerate([still, still, still, moved], start=1):
+        pipe.latest_frame.put(FrameEnvelope(frame, seq, time.monotonic()))
+        time.sleep(0.05)
+    pipe._running = False
+    t.join(1.0)
+    assert det.calls == 2                       # background warm-up + the motion frame
+    assert pipe.stats()["motion"]["skipped"] == 2
+
+
+# ---- standby / wake-on-motion ----
+
+class _Reporter:
+    def __init__(self):
+        self.hz = []
+
+    def set_refresh_hz(self, hz):
+        self.hz.append(hz)
+
+
+class _RateCapture:
+    def __init__(self):
+        self.rates = []
+
+    def set_frame_rate(self, fps):
+        self.rates.append(fps)
+
+
+def _standby_pipeline(det=None):
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+
+    from config import Config
+    cfg = Config()
+    cfg.app.standby_enabled = True
+    cfg.app.standby_after_s = 10.0
+    control = SimpleNamespace(cfg=cfg, servo=MagicMock())
+    pipe = Pipeline(capture=_RateCapture(), detector=det or _CountingDetector(),
+                    control=control, tracker=_FakeTracker())
+    pipe.reporter = _Reporter()
+    return pipe, control
+
+
+def test_standby_after_idle_timeout_relaxes_and_slows_everything():
+    from conftest import make_track
+    pipe, control = _standby_pipeline()
+    pipe._check_idle([], 100.0)
+    pipe._check_idle([make_track()], 105.0)        # a track resets the idle clock
+    pipe._check_idle([], 106.0)
+    pipe._check_idle([], 115.0)
+    assert not pipe.standby
+    pipe._check_idle([], 116.0)
+    assert pipe.standby
+    control.servo.disarm.assert_called_once()
+    assert pipe.capture.rates == [2.0] and pipe.reporter.hz == [0.5]
+    assert pipe.stats()["standby"]["entered"] == 1
+
+
+def test_standby_disabled_never_enters():
+    pipe, control = _standby_pipeline()
+    control.cfg.app.standby_enabled = False
+    for t in (0.0, 1000.0):
+        pipe._check_idle([], t)
+    assert not pipe.standby and "standby" not in pipe.stats()
+
+
+def test_motion_wakes_standby_and_that_frame_is_detected():
+    det = _CountingDetector()
+    pipe, control = _standby_pipeline(det)
+    pipe.enter_standby()
+    t = _run_inference(pipe)
+    still = np.full((64, 64), 90, np.uint8)
+    moved = still.copy()
+    moved[10:30, 10:30] = 200
+    for seq, frame in enumerate([still, still, moved], start=1):
+        pipe.latest_frame.put(FrameEnvelope(frame, seq, time.monotonic()))
+        time.sleep(0.05)
+    pipe._running = False
+    t.join(1.0)
+    assert not pipe.standby
+    assert det.calls == 1                           # only the waking frame
+    st = pipe.stats()["standby"]
+    assert (st["wakes"], st["wake_reason"]) == (1, "motion")
+    assert 0.0 < st["wake_latency_ms"] < 200.0
+    assert pipe.capture.rates == [2.0, None]
+    assert pipe.reporter.hz == [0.5, control.cfg.app.lcd_refresh_hz]
+
+
+def test_operator_wake_is_immediate_and_counts_idle_time():
+    pipe, _ = _standby_pipeline()
+    assert not pipe.wake()                          # not in standby: no-op
+    pipe.enter_standby()
+    time.sleep(0.02)
+    assert pipe.wake("operator")
+    st = pipe.stats()["standby"]
+    assert st["wake_reason"] == "operator" and st["idle_s"] >= 0.02
+    pipe._check_idle([], time.monotonic())          # idle clock restarted at the wake
+    assert not pipe.standby
+
+
+def test_control_ticks_at_tick_hz_while_inference_stalls():
+    from types import SimpleNamespace
+
+    from app.statemachine import FireState
+    from config import Config
+
+    ticks = []
+
+    def tick(tracks, frame):
+        ticks.append(time.monotonic())
+        return SimpleNamespace(state=FireState.SAFE, result_dropped=False)
+
+    control = SimpleNamespace(cfg=Config(), tick=tick)
+    pipe = Pipeline(capture=None, detector=_CountingDetector(), control=control,
+                    tracker=_FakeTracker(), tick_hz=50.0)
+    pipe._running = True
+    t = threading.Thread(target=pipe._control_loop, daemon=True)
+    t.start()
+    time.sleep(0.5)                      # no tracks ever land: every tick coasts
+    pipe._running = False
+    t.join(timeout=1.0)
+    gaps = np.diff(ticks)
+    assert len(ticks) >= 18              # ~25 at 50 Hz; waiting on the slot halved it
+    assert np.median(gaps) == pytest.approx(0.02, abs=0.005)
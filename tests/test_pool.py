@@ -0,0 +1,224 @@
+"""PooledDetector: device enumeration, round-robin dispatch, in-order release (x86 fakes)."""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from config import Config
+from conftest import FakeInterpreter, coral_with_fake_interpreter, one_bird_output
+from contracts import FrameEnvelope
+from detect.pool import PooledDetector
+from errors import DetectionError
+
+
+def _fake_worker(latency_s=0.0):
+    return coral_with_fake_interpreter(Config().detector,
+                                       FakeInterpreter(one_bird_output(), latency_s=latency_s))
+
+
+def _env(seq):
+    return FrameEnvelope(np.zeros((256, 256), np.uint8), seq, time.monotonic())
+
+
+class _Collector:
+    def __init__(self):
+        self.seqs = []
+        self.done = threading.Event()
+        self.expect = None
+
+    def __call__(self, envelope, detections):
+        self.seqs.append(envelope.seq)
+        if self.expect is not None and len(self.seqs) >= self.expect:
+            self.done.set()
+
+
+def _run(pool, n, expect=None):
+    got = _Collector()
+    got.expect = n if expect is None else expect
+    pool.start(got)
+    for seq in range(1, n + 1):
+        assert pool.submit(_env(seq), timeout=2.0)
+    got.done.wait(2.0)
+    pool.stop()
+    return got.seqs
+
+
+# ---- enumeration ----
+
+@pytest.mark.parametrize("edge_tpus,expect", [(2, [":0", ":1"]), (0, [":0", ":1", ":2"]),
+                                              (5, [":0", ":1", ":2"])])
+def test_from_config_builds_one_worker_per_enumerated_tpu(edge_tpus, expect):
+    cfg = Config().detector
+    cfg.edge_tpus = edge_tpus
+    pool = PooledDetector.from_config(cfg, 1152, 1152, lister=lambda: [":0", ":1", ":2"])
+    assert [w.device for w in pool.workers] == expect
+    assert all(w._frame_dims(np.zeros((256, 256))) == (1152, 1152) for w in pool.workers)
+
+
+def test_from_config_falls_back_to_cpu_without_tpus():
+    from detect.cpu import CpuDetector
+    pool = PooledDetector.from_config(Config().detector, lister=lambda: [])
+    assert len(pool.workers) == 1 and isinstance(pool.workers[0], CpuDetector)
+
+
+def test_from_config_pools_mobiledet_workers_for_that_backend():
+    from detect.mobiledet import MobileDetDetector
+    cfg = Config().detector
+    cfg.backend, cfg.edge_tpus = "coral_mobiledet", 2
+    pool = PooledDetector.from_config(cfg, lister=lambda: [":0", ":1"])
+    assert all(isinstance(w, MobileDetDetector) for w in pool.workers)
+
+
+def test_empty_pool_is_rejected():
+    with pytest.raises(DetectionError):
+        PooledDetector([])
+
+
+# ---- dispatch + ordering ----
+
+def test_round_robin_dispatch_and_in_order_results():
+    pool = PooledDetector([_fake_worker(0.01), _fake_worker(0.01)])
+    assert _run(pool, 10) == list(range(1, 11))
+    assert pool.dispatched == [5, 5]
+
+
+def test_results_reordered_when_a_faster_device_finishes_first():
+    # Worker 0 is 10x slower: frames 2, 4, ... finish first but must wait their turn.
+    pool = PooledDetector([_fake_worker(0.05), _fake_worker(0.005)])
+    assert _run(pool, 6) == [1, 2, 3, 4, 5, 6]
+
+
+def test_failed_frame_is_skipped_not_waited_on():
+    class _Broken:
+        def infer(self, frame):
+            raise DetectionError("tpu fell off the bus")
+
+        def close(self):
+            pass
+
+    pool = PooledDetector([_Broken(), _fake_worker(0.005)])
+    got = _Collector()
+    pool.start(got)
+    for seq in range(1, 5):
+        assert pool.submit(_env(seq), timeout=2.0)
+    time.sleep(0.1)
+    pool.stop()
+    # Failed frames drop out; the rest are still released, in order.
+    assert got.seqs and got.seqs == sorted(got.seqs)
+    assert len(got.seqs) + pool.errors == 4
+    assert pool.errors >= 1
+
+
+def test_device_that_keeps_failing_is_retired_from_the_rotation():
+    class _Dropping:
+        """Works for ``ok`` frames, then falls off the bus."""
+
+        def __init__(self, ok):
+            self.ok, self.calls = ok, 0
+
+        def infer(self, frame):
+            self.calls += 1
+            if self.calls > self.ok:
+                raise DetectionError("tpu fell off the bus")
+            return []
+
+        def close(self):
+            pass
+
+    dropping = _Dropping(ok=2)
+    pool = PooledDetector([dropping, _fake_worker(0.002)], max_failures=3)
+    seqs = _run(pool, 20, expect=17)
+    assert dropping.calls == 5                      # 2 good frames, 3 failures, then retired
+    assert pool.pool_stats.retired == [0]
+    assert pool.pool_stats.as_dict()["errors"] == 3
+    assert len(seqs) == 17 and seqs == sorted(seqs)
+    assert pool.dispatched == [5, 15]
+
+
+def test_last_live_device_is_never_retired():
+    class _Broken:
+        def infer(self, frame):
+            raise DetectionError("tpu fell off the bus")
+
+    pool = PooledDetector([_Broken()], max_failures=2)
+    for _ in range(4):
+        with pytest.raises(DetectionError):
+            pool.infer(np.zeros((256, 256), np.uint8))
+    assert pool.pool_stats.retired == [] and pool.errors == 4
+
+
+def test_sync_infer_gives_up_when_the_pool_is_stopped():
+    release = threading.Event()
+
+    class _Stuck:
+        def infer(self, frame):
+            release.wait(2.0)
+            return []
+
+    pool = PooledDetector([_Stuck()])
+    frame = np.zeros((256, 256), np.uint8)
+    first = threading.Thread(target=pool.infer, args=(frame,))
+    first.start()
+    while not pool._busy[0]:
+        time.sleep(0.001)
+    raised = []
+
+    def second():
+        try:
+            pool.infer(frame)
+        except DetectionError as exc:
+            raised.append(exc)
+
+    waiter = threading.Thread(target=second)
+    waiter.start()
+    pool.stop()                                     # every worker busy: must not hang
+    waiter.join(1.0)
+    release.set()
+    first.join(1.0)
+    assert not waiter.is_alive() and len(raised) == 1
+
+
+def test_results_are_delivered_outside_the_pool_lock():
+    pool = PooledDetector([_fake_worker(), _fake_worker()])
+    free = []
+
+    def on_result(envelope, detections):
+        got = pool._cond.acquire(timeout=1.0)       # non-reentrant: False if held here
+        free.append(got)
+        if got:
+            pool._cond.release()
+
+    pool.start(on_result)
+    for seq in range(1, 5):
+        assert pool.submit(_env(seq), timeout=2.0)
+    deadline = time.monotonic() + 2.0
+    while len(free) < 4 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    pool.stop()
+    assert free == [True] * 4
+
+
+def test_sync_infer_runs_on_an_idle_worker():
+    pool = PooledDetector([_fake_worker(), _fake_worker()])
+    assert len(pool.infer(np.zeros((256, 256), np.uint8))) == 1
+    assert sum(pool.dispatched) == 1
+
+
+def test_two_devices_run_frames_at_the_same_time():
+    # A barrier, not throughput: each device only finishes once the other is mid-frame.
+    both = threading.Barrier(2, timeout=2.0)
+
+    class _Paired:
+        def __init__(self):
+            self.met = 0
+
+        def infer(self, frame):
+            both.wait()
+            self.met += 1
+            return []
+
+    workers = [_Paired(), _Paired()]
+    pool = PooledDetector(workers)
+    assert _run(pool, 6) == [1, 2, 3, 4, 5, 6]
+    assert [w.met for w in workers] == [3, 3] and pool.errors == 0
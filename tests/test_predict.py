@@ -1,9 +1,13 @@
-"""Constant-velocity lead predictor."""
+"""Lead predictors: constant velocity and the history-fitted models."""
+import math
+
 import pytest
 
-from conftest import make_track
+from conftest import make_detection, make_track
 
-from track.predict import lead_frames_from_seconds, predict_lead, predict_position
+from track.predict import (lead_frames_from_seconds, predict_lead, predict_leads,
+                           predict_position, predict_positions)
+from track.table import TrackBatch, TrackTable
 
 
 def test_predict_position_linear():
@@ -30,3 +34,80 @@ def test_predict_lead_seconds():
     t = make_track(cx=0, cy=0, vx=20, vy=0)
     px, py = predict_lead(t, lead_time_s=0.5, fps=20)  # 10 frames
     assert (px, py) == (200, 0)
+
+
+def test_predict_lead_adds_measured_latency_to_horizon():
+    t = make_track(cx=0, cy=0, vx=20, vy=0)
+    px, _ = predict_lead(t, lead_time_s=0.4, fps=20, latency_s=0.1)  # 0.5 s -> 10 frames
+    assert px == pytest.approx(200)
+
+
+def test_measured_latency_from_track_capture_time():
+    from track.predict import measured_latency_s
+    t = make_track()
+    assert measured_latency_s(t, now=10.0) == 0.0       # no capture time -> no comp
+    t.capture_t = 9.92
+    assert measured_latency_s(t, now=10.0) == pytest.approx(0.08)
+
+
+def _path(points, history=16, vx=0.0, vy=0.0):
+    """A one-track batch whose centroid history is ``points``, one per frame."""
+    table = TrackTable(history=history)
+    slot = table.spawn([make_detection(cx=points[0][0], cy=points[0][1])], None)
+    for x, y in points[1:]:
+        table.frame += 1
+        table.cxy[slot] = (x, y)
+        table.mark_matched(slot, None)
+    table.vxy[slot] = (vx, vy)
+    return table.snapshot(slot)
+
+
+def test_cv_batch_matches_single_track_prediction():
+    batch = TrackBatch.from_tracks([make_track(cx=100, cy=200, vx=10, vy=-5),
+                                    make_track(track_id=2, cx=0, cy=0, vx=1, vy=2)])
+    assert predict_positions(batch, 3, "cv").tolist() == [[130, 185], [3, 6]]
+
+
+def test_polynomial_models_recover_exact_paths():
+    line = _path([(10 + 4 * t, 50 - 2 * t) for t in range(10)])
+    assert predict_positions(line, 5, "linear")[0] == pytest.approx([66, 22])
+    arc = _path([(t * t, 3 * t) for t in range(10)])
+    assert predict_positions(arc, 2, "quadratic")[0] == pytest.approx([121, 33])
+
+
+def test_turn_model_follows_a_circle():
+    r, w = 200.0, 0.05                              # px, rad/frame
+    pts = [(r * math.cos(w * t), r * math.sin(w * t)) for t in range(16)]
+    end = w * (15 + 12)
+
+    def miss(model):
+        px, py = predict_positions(_path(pts), 12, model)[0]
+        return math.hypot(px - r * math.cos(end), py - r * math.sin(end))
+
+    # 60 px along the arc; the fitted tangent leaves it, the turn model stays close
+    assert miss("turn") < 10 < miss("quadratic") < miss("linear")
+
+
+def test_turn_model_straight_path_is_linear():
+    line = _path([(2 * t, 0.0) for t in range(8)])
+    assert predict_positions(line, 4, "turn")[0] == pytest.approx([22, 0])
+
+
+def test_short_history_falls_back_to_cv():
+    batch = _path([(0, 0), (1, 0), (5, 0)], vx=2.0)
+    assert predict_positions(batch, 10, "quadratic", min_history=6).tolist() == [[25, 0]]
+
+
+def test_history_ring_keeps_the_newest_samples():
+    batch = _path([(100.0, 0.0)] * 20 + [(float(t), 0.0) for t in range(8)], history=8)
+    assert predict_positions(batch, 1, "linear", min_history=8)[0] == pytest.approx([8, 0])
+
+
+def test_predict_leads_converts_seconds_and_latency():
+    batch = TrackBatch.from_tracks([make_track(cx=0, cy=0, vx=20, vy=0)])
+    assert predict_leads(batch, 0.4, 20, latency_s=0.1)[0] == pytest.approx([200, 0])
+
+
+def test_unknown_model_rejected():
+    with pytest.raises(ValueError):
+        predict_positions(TrackBatch.empty(), 1, "spline")
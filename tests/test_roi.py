@@ -0,0 +1,127 @@
+"""LockOnDetector: ROI crop placement, mapping back to full-frame pixels, scan passes."""
+import numpy as np
+import pytest
+
+from config import Config
+from contracts import Detection, FrameEnvelope
+from detect.base import Detector
+from detect.roi import LockOnDetector, roi_origin
+
+
+class BlobDetector(Detector):
+    """Fake backend: one box per bright (255) blob, in the given array's pixels."""
+
+    def __init__(self):
+        self.shapes = []
+
+    def infer(self, frame):
+        self.shapes.append(frame.shape)
+        ys, xs = np.nonzero(frame == 255)
+        if ys.size == 0:
+            return []
+        return [Detection.from_xyxy(0, 0.9, xs.min(), ys.min(), xs.max() + 1, ys.max() + 1)]
+
+
+def _frame():
+    frame = np.zeros((768, 768), np.uint8)
+    frame[600:606, 100:110] = 255                    # 10x6 px bird near the bottom-left
+    return FrameEnvelope(frame, 1, 0.0)
+
+
+def test_roi_origin_centers_and_clamps_to_the_frame():
+    assert roi_origin(400, 400, 768, 768, 256) == (272, 272)
+    assert roi_origin(10, 760, 768, 768, 256) == (0, 512)
+    assert roi_origin(50, 50, 200, 200, 256) == (0, 0)      # frame smaller than the window
+
+
+def test_roi_pass_crops_model_sized_window_and_maps_to_full_frame():
+    inner = BlobDetector()
+    det = LockOnDetector(inner, Config().detector, frame_width_px=1152, frame_height_px=1152)
+    env = _frame()
+    env.roi_center_px = (105 * 1.5, 603 * 1.5)             # full-frame px
+    dets = det.infer(env)
+    assert inner.shapes == [(256, 256)]
+    assert len(dets) == 1
+    np.testing.assert_allclose(dets[0].xyxy, (150, 900, 165, 909))
+    assert det.roi_stats.as_dict() == {"roi": 1, "scan": 0}
+
+
+def test_frame_without_roi_center_is_scanned_whole():
+    inner = BlobDetector()
+    det = LockOnDetector(inner, Config().detector, frame_width_px=1152, frame_height_px=1152)
+    dets = det.infer(_frame())
+    assert inner.shapes == [(768, 768)]
+    np.testing.assert_allclose(dets[0].xyxy, (150, 900, 165, 909))
+    assert det.roi_stats.scan == 1
+
+
+def test_roi_that_misses_the_bird_finds_nothing():
+    det = LockOnDetector(BlobDetector(), Config().detector)
+    env = _frame()
+    env.roi_center_px = (600.0, 100.0)
+    assert det.infer(env) == []
+
+
+def test_build_detector_wraps_backend_for_lock_on():
+    from detect.tiled import TiledDetector
+    from main import build_detector
+    cfg = Config()
+    cfg.detector.backend = "cpu"
+    cfg.detector.lock_on = True
+    det = build_detector(cfg)
+    assert isinstance(det, LockOnDetector) and det.scan is det.inner
+    cfg.detector.tiled = True
+    det = build_detector(cfg)
+    assert isinstance(det.scan, TiledDetector) and det.scan.inner is det.inner
+    assert det.tile_stats is det.scan.tile_stats
+
+
+@pytest.mark.parametrize("key,value", [("lock_on_scan_every", 0),
+                                       ("lock_on_max_coast_frames", -1)])
+def test_lock_on_config_validation(key, value):
+    from errors import ConfigError
+    with pytest.raises(ConfigError):
+        Config.from_dict({"detector": {key: value}})
+
+
+def test_roi_center_is_found_inside_a_sensor_cropped_frame():
+    inner = BlobDetector()
+    det = LockOnDetector(inner, Config().detector, frame_width_px=1152, frame_height_px=1152)
+    env = _frame()
+    env.crop = (0.5, 0.5, 0.5, 0.5)                         # frame px -> 576 + 0.75 * px
+    env.roi_center_px = (576 + 105 * 0.75, 576 + 603 * 0.75)
+    dets = det.infer(env)
+    assert inner.shapes == [(256, 256)]
+    np.testing.assert_allclose(dets[0].xyxy, (576 + 75, 576 + 450, 576 + 82.5, 576 + 454.5))
+
+
+def test_roi_center_is_found_in_a_rotated_frame():
+    inner = BlobDetector()
+    det = LockOnDetector(inner, Config().detector, frame_width_px=1152, frame_height_px=1152)
+    env = _frame()
+    env.rotation_deg = 90
+    # upright, the bird at sensor x 100..110, y 600..606 sits at x 600..606, y 658..668
+    env.roi_center_px = (603 * 1.5, 663 * 1.5)
+    dets = det.infer(env)
+    assert inner.shapes == [(256, 256)]
+    np.testing.assert_allclose(dets[0].xyxy, (900, 987, 909, 1002))
+
+
+@pytest.mark.parametrize("scan", ["default", "tiled", "separate"])
+def test_close_closes_the_shared_backend_once(scan):
+    from detect.tiled import TiledDetector
+
+    class Closing(BlobDetector):
+        def __init__(self):
+            super().__init__()
+            self.closed = 0
+
+        def close(self):
+            self.closed += 1
+
+    cfg = Config().detector
+    inner, other = Closing(), Closing()
+    scanner = {"default": None, "tiled": TiledDetector(inner, cfg), "separate": other}[scan]
+    LockOnDetector(inner, cfg, scan=scanner).close()
+    assert inner.closed == 1
+    assert other.closed == (scan == "separate")
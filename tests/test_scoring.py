@@ -1,10 +1,13 @@
 """Per-track scoring: features behave and weights are honored."""
 from dataclasses import replace
 
+import numpy as np
+import pytest
 from conftest import make_track
 
 from config import KillZoneConfig, StrategyConfig
-from strategy.scoring import score_track
+from strategy.scoring import score_track, score_tracks
+from track.table import TrackBatch
 
 KZ = KillZoneConfig(cx_px=576, cy_px=576, half_w_px=120, half_h_px=120)
 CFG = StrategyConfig()
@@ -52,3 +55,17 @@ def test_score_in_unit_range():
     t = make_track(cx=576, cy=576, w=300, h=300, vx=30, vy=0, score=1.0, hits=99)
     s = _score(t)
     assert 0.0 <= s <= 1.0
+
+
+def test_score_tracks_matches_score_track_per_row():
+    rng = np.random.default_rng(3)
+    tracks = [make_track(track_id=i, cx=x, cy=y, w=w, h=w, vx=vx, vy=vy, score=s, hits=h)
+              for i, (x, y, w, vx, vy, s, h) in enumerate(zip(
+                  rng.uniform(0, 1152, 40), rng.uniform(0, 1152, 40), rng.uniform(5, 200, 40),
+                  rng.normal(0, 10, 40), rng.normal(0, 10, 40), rng.uniform(0, 1, 40),
+                  rng.integers(1, 40, 40)))]
+    tracks.append(make_track(track_id=99, cx=576, cy=576, vx=5))   # at the centre
+    batch = TrackBatch.from_tracks(tracks)
+    assert score_tracks(batch, KZ, CFG, *FRAME) == pytest.approx(
+        [_score(t) for t in tracks], abs=1e-12)
+    assert score_tracks(TrackBatch.empty(), KZ, CFG, *FRAME).shape == (0,)
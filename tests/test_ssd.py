@@ -0,0 +1,106 @@
+"""SSD / MobileDet decode: anchor table, box coder, quantized path, postprocess mapping."""
+import numpy as np
+import pytest
+
+from detect.ssd import (
+    SSD_BOX_SCALES,
+    decode_ssd,
+    decode_ssd_boxes,
+    postprocess_to_detections,
+    ssd_anchors,
+)
+
+
+def _encode(boxes_xyxy, anchors):
+    """Inverse of the box coder (normalized xyxy -> ty, tx, th, tw)."""
+    x1, y1, x2, y2 = boxes_xyxy.T
+    ya, xa, ha, wa = anchors.T
+    sy, sx, sh, sw = SSD_BOX_SCALES
+    return np.stack([((y1 + y2) / 2 - ya) / ha * sy, ((x1 + x2) / 2 - xa) / wa * sx,
+                     np.log((y2 - y1) / ha) * sh, np.log((x2 - x1) / wa) * sw],
+                    axis=1).astype(np.float32)
+
+
+def test_anchor_table_matches_mobiledet_320_layout():
+    a = ssd_anchors(320)
+    assert a.shape == (2034, 4)          # 3*20^2 + 6*(10^2 + 5^2 + 3^2 + 2^2 + 1)
+    assert not a.flags.writeable
+    # layer 0, first cell: (0.1, 1:1), (0.2, 2:1), (0.2, 1:2)
+    np.testing.assert_allclose(a[0], [0.025, 0.025, 0.1, 0.1], atol=1e-6)
+    np.testing.assert_allclose(a[1], [0.025, 0.025, 0.2 / np.sqrt(2), 0.2 * np.sqrt(2)],
+                               atol=1e-6)
+    # first layer-1 anchor: 10x10 grid, scale 0.35, aspect 1
+    np.testing.assert_allclose(a[1200], [0.05, 0.05, 0.35, 0.35], atol=1e-6)
+    assert ssd_anchors(320) is a          # cached
+
+
+def test_box_coder_round_trip():
+    anchors = ssd_anchors(320)[[0, 500, 1500, 2033]]
+    boxes = np.array([[0.0, 0.0, 0.1, 0.1], [0.2, 0.3, 0.5, 0.6],
+                      [0.4, 0.4, 0.9, 0.7], [0.1, 0.1, 0.9, 0.9]], np.float32)
+    np.testing.assert_allclose(decode_ssd_boxes(_encode(boxes, anchors), anchors), boxes,
+                               atol=1e-5)
+
+
+def _head(n_anchors=2034, nc=1, anchor=700, logit=3.0):
+    anchors = ssd_anchors(320)
+    enc = np.zeros((1, n_anchors, 4), np.float32)
+    enc[0, anchor] = _encode(np.array([[0.4, 0.4, 0.6, 0.6]]), anchors[[anchor]])[0]
+    logits = np.full((1, n_anchors, nc + 1), -8.0, np.float32)
+    logits[0, anchor, 1 + nc - 1] = logit
+    return enc, logits, anchors
+
+
+def test_decode_ssd_float_head_to_full_frame_pixels():
+    enc, logits, anchors = _head()
+    dets = decode_ssd(enc, logits, anchors, 1000, 500, conf_threshold=0.5)
+    assert len(dets) == 1
+    d = dets[0]
+    assert d.cls_id == 0 and d.score == pytest.approx(1 / (1 + np.exp(-3.0)), abs=1e-5)
+    np.testing.assert_allclose(d.xyxy, (400, 200, 600, 300), atol=0.05)
+
+
+def test_decode_ssd_skips_background_and_below_threshold():
+    enc, logits, anchors = _head(logit=-1.0)           # sigmoid ~0.27
+    logits[0, :, 0] = 10.0                             # background everywhere
+    assert decode_ssd(enc, logits, anchors, 320, 320, conf_threshold=0.5) == []
+    assert len(decode_ssd(enc, logits, anchors, 320, 320, conf_threshold=0.25)) == 1
+
+
+def test_decode_ssd_quantized_matches_float():
+    enc, logits, anchors = _head(nc=3)
+    bq, sq = (0.05, 0), (0.1, 0)
+    enc_q = np.clip(np.round(enc / bq[0]), -128, 127).astype(np.int8)
+    logits_q = np.clip(np.round(logits / sq[0]), -128, 127).astype(np.int8)
+    ref = decode_ssd(enc_q.astype(np.float32) * bq[0], logits_q.astype(np.float32) * sq[0],
+                     anchors, 640, 640, conf_threshold=0.5)
+    got = decode_ssd(enc_q, logits_q, anchors, 640, 640, conf_threshold=0.5,
+                     box_quantization=bq, score_quantization=sq)
+    assert len(got) == len(ref) == 1
+    assert got[0].cls_id == ref[0].cls_id == 2
+    assert got[0].score == pytest.approx(ref[0].score, abs=1e-6)
+    np.testing.assert_allclose(got[0].xyxy, ref[0].xyxy, atol=1e-3)
+
+
+def test_decode_ssd_rejects_anchor_mismatch():
+    enc, logits, anchors = _head()
+    with pytest.raises(ValueError):
+        decode_ssd(enc[:, :100], logits[:, :100], anchors, 320, 320)
+
+
+def test_postprocess_outputs_map_count_threshold_and_pixels():
+    boxes = np.zeros((1, 10, 4), np.float32)
+    boxes[0, 0] = (0.1, 0.2, 0.3, 0.4)     # ymin, xmin, ymax, xmax
+    boxes[0, 1] = (0.5, 0.5, 0.9, 1.2)     # spills off the frame -> clipped
+    boxes[0, 2] = (0.0, 0.0, 0.5, 0.5)     # past count
+    classes = np.array([[0, 1, 0] + [0] * 7], np.float32)
+    scores = np.array([[0.4, 0.8, 0.99] + [0.0] * 7], np.float32)
+    dets = postprocess_to_detections(boxes, classes, scores, np.array([2.0]), 1000, 500,
+                                     conf_threshold=0.3)
+    assert [d.cls_id for d in dets] == [1, 0]            # best first, count respected
+    np.testing.assert_allclose(dets[0].xyxy, (500, 250, 1000, 450), atol=1e-3)
+    np.testing.assert_allclose(dets[1].xyxy, (200, 50, 400, 150), atol=1e-3)
+    assert len(postprocess_to_detections(boxes, classes, scores, np.array([2.0]), 1000, 500,
+                                         conf_threshold=0.5)) == 1
+    assert len(postprocess_to_detections(boxes, classes, scores, np.array([2.0]), 1000, 500,
+                                         conf_threshold=0.3, max_detections=1)) == 1
@@ -0,0 +1,125 @@
+"""Synthetic scene, capture ground truth and the tracking score (Mac-runnable)."""
+import numpy as np
+import pytest
+
+from conftest import make_track
+
+from config import Config
+from synthetic import SyntheticCapture, SyntheticScene, TrackingScore, TrueBird
+
+
+def _cfg(**synthetic):
+    cfg = Config()
+    for key, value in synthetic.items():
+        setattr(cfg.synthetic, key, value)
+    return cfg
+
+
+def test_scene_is_deterministic_per_seed():
+    a = SyntheticScene(_cfg(birds=5).synthetic, 128, 128)
+    b = SyntheticScene(_cfg(birds=5).synthetic, 128, 128)
+    for _ in range(3):
+        (fa, ta), (fb, tb) = a.render(), b.render()
+        assert np.array_equal(fa, fb) and ta == tb
+        a.step()
+        b.step()
+    other = SyntheticScene(_cfg(birds=5, seed=1).synthetic, 128, 128)
+    assert not np.array_equal(other.render()[0], a.render()[0])
+
+
+def test_truth_boxes_cover_the_dark_birds_in_full_frame_pixels():
+    cfg = _cfg(birds=1, occluders=0, noise_sigma=0.0, exposure_swing=0.0,
+               size_px=[20.0, 20.0])
+    scene = SyntheticScene(cfg.synthetic, 128, 128, 512, 512)
+    scene.pos[0] = (64.0, 64.0)
+    frame, truth = scene.render()
+    (bird,) = truth
+    assert frame.dtype == np.uint8 and frame.shape == (128, 128)
+    assert bird.visible == pytest.approx(1.0, abs=0.1)
+    x1, y1, x2, y2 = (int(v / 4) for v in bird.xyxy)
+    dark = frame < 100
+    assert dark[y1:y2 + 1, x1:x2 + 1].sum() == dark.sum() > 0   # all bird pixels inside
+    assert bird.cx == pytest.approx(256.0, abs=1.0) and bird.cy == pytest.approx(256.0, abs=1.0)
+
+
+def test_birds_follow_their_velocity_and_leavers_respawn_with_new_ids():
+    cfg = _cfg(birds=1, turn_deg_s=0.0, speed_px_s=[60.0, 60.0], fps=30.0)
+    scene = SyntheticScene(cfg.synthetic, 128, 128)
+    scene.pos[0] = (64.0, 64.0)
+    _, (before,) = scene.render()
+    scene.step()
+    _, (after,) = scene.render()
+    assert after.id == before.id
+    assert after.cx - before.cx == pytest.approx(before.vx, abs=0.05)
+    assert after.cy - before.cy == pytest.approx(before.vy, abs=0.05)
+    assert np.hypot(before.vx, before.vy) == pytest.approx(2.0)    # 60 px/s at 30 fps
+    scene.pos[0] = (-1000.0, 0.0)
+    scene.step()
+    assert scene.ids[0] != before.id and scene.ids.size == 1
+
+
+def test_posts_occlude_birds():
+    cfg = _cfg(birds=1, occluders=1, size_px=[16.0, 16.0])
+    scene = SyntheticScene(cfg.synthetic, 128, 128)
+    scene.posts[:] = True
+    scene.pos[0] = (64.0, 64.0)
+    assert scene.render()[1][0].visible == 0.0
+
+
+def test_capture_paces_to_fps_and_stamps_truth(fake_clock):
+    cfg = _cfg(birds=4, fps=10.0)
+    slept = []
+
+    def sleep(dt):
+        slept.append(dt)
+        fake_clock.advance(dt)
+
+    cap = SyntheticCapture(cfg.synthetic, cfg.camera, 64, clock=fake_clock, sleep=sleep)
+    cap.start()
+    envs = [cap.read() for _ in range(3)]
+    assert [e.seq for e in envs] == [1, 2, 3]
+    assert envs[0].frame.shape == (64, 64)
+    assert all(isinstance(b, TrueBird) for b in envs[0].truth)
+    assert slept == pytest.approx([0.1, 0.1])
+    assert envs[2].capture_t - envs[0].capture_t == pytest.approx(0.2)
+    cfg.synthetic.realtime = False
+    cap.read()
+    assert len(slept) == 2
+
+
+def _bird(bid, x, visible=1.0):
+    return TrueBird(bid, (x, 100.0, x + 40.0, 140.0), x + 20.0, 120.0, 0.0, 0.0, visible)
+
+
+def test_tracking_score_counts_misses_false_positives_and_id_switches():
+    score = TrackingScore()
+    truth = [_bird(1, 100.0), _bird(2, 300.0), _bird(3, 500.0, visible=0.1)]
+    score.update(truth, [make_track(1, 120.0, 120.0, w=40, h=40),
+                         make_track(2, 900.0, 900.0, w=40, h=40),
+                         make_track(3, 520.0, 120.0, w=40, h=40)])     # on the hidden bird
+    assert (score.ground_truth, score.matches, score.misses, score.false_positives) == (2, 1, 1, 1)
+    score.update(truth[:1], [make_track(7, 122.0, 120.0, w=40, h=40)])
+    assert score.id_switches == 1 and score.matches == 2
+    assert score.mota == pytest.approx(1.0 - 3 / 3)
+    assert score.center_error_px == pytest.approx(1.0)
+
+
+def test_tracking_score_counts_fragmentations():
+    score = TrackingScore()
+    on = [make_track(1, 120.0, 120.0, w=40, h=40)]
+    for tracks in (on, [], [], on, on, []):
+        score.update([_bird(1, 100.0)], tracks)
+    score.update([_bird(1, 100.0, visible=0.1)], [])        # hidden: not a gap
+    score.update([_bird(1, 100.0)], on)
+    assert score.fragmentations == 2 and score.id_switches == 0
+    assert score.as_dict()["fragmentations"] == 2
+
+
+def test_synthetic_config_validated():
+    from errors import ConfigError
+    for bad in ({"birds": 0}, {"birds": 201}, {"size_px": [10.0, 5.0]}, {"miss_rate": 2.0},
+                {"speed_px_s": [1.0]}, {"fps": 0}):
+        with pytest.raises(ConfigError):
+            Config.from_dict({"synthetic": bad})
+    assert Config.from_dict({"camera": {"detection_source": "synthetic"},
+                             "detector": {"backend": "synthetic"}}).synthetic.birds == 3
@@ -0,0 +1,79 @@
+"""Fake synthetic backend: truth -> noisy detections (Mac-runnable)."""
+import numpy as np
+import pytest
+
+from config import Config
+from contracts import FrameEnvelope
+from detect.synthetic import SyntheticDetector
+from errors import DetectionError
+from synthetic import TrueBird
+
+
+def _detector(**synthetic):
+    cfg = Config()
+    cfg.detector.conf_threshold = 0.3
+    for key, value in synthetic.items():
+        setattr(cfg.synthetic, key, value)
+    slept = []
+    det = SyntheticDetector(cfg.detector, cfg.synthetic, 1024, 1024, sleep=slept.append)
+    return det, slept
+
+
+def _envelope(truth):
+    return FrameEnvelope(np.zeros((256, 256), np.uint8), 1, 0.0, truth=truth)
+
+
+BIRD = TrueBird(1, (100.0, 100.0, 140.0, 120.0), 120.0, 110.0, 0.0, 0.0, 1.0)
+
+
+def test_clean_config_returns_the_truth():
+    det, _ = _detector(jitter=0.0, miss_rate=0.0, false_positives=0.0)
+    (d,) = det.infer(_envelope([BIRD]))
+    assert d.xyxy == pytest.approx(BIRD.xyxy) and d.cls_id == 0
+    assert d.score >= 0.8
+
+
+def test_hidden_birds_are_never_found_and_misses_follow_visibility():
+    det, _ = _detector(miss_rate=0.0, false_positives=0.0)
+    hidden = BIRD._replace(visible=0.2)
+    assert det.infer(_envelope([hidden])) == []
+    half = BIRD._replace(visible=0.5)
+    found = sum(len(det.infer(_envelope([half]))) for _ in range(400))
+    assert 150 < found < 250
+
+
+def test_jitter_false_positives_and_latency():
+    det, slept = _detector(jitter=0.1, miss_rate=0.0, false_positives=2.0, latency_ms=5.0)
+    counts, offsets = [], []
+    for _ in range(200):
+        dets = det.infer(_envelope([BIRD]))
+        counts.append(len(dets))
+        offsets += [d.cx - BIRD.cx for d in dets if abs(d.cx - BIRD.cx) < 20]
+    assert np.mean(counts) == pytest.approx(3.0, abs=0.4)       # the bird + ~2 false
+    assert 1.0 < np.std(offsets) < 8.0                          # 0.1 * 40 px box
+    assert slept[0] == pytest.approx(0.005) and len(slept) == 200
+
+
+def test_deterministic_per_seed():
+    a, _ = _detector()
+    b, _ = _detector()
+    runs = [[d.xyxy for d in x.infer(_envelope([BIRD] * 3))] for x in (a, b)]
+    assert runs[0] == runs[1]
+
+
+def test_needs_synthetic_frames():
+    det, _ = _detector()
+    with pytest.raises(DetectionError):
+        det.infer(np.zeros((256, 256), np.uint8))
+    with pytest.raises(DetectionError):
+        det.infer(FrameEnvelope(np.zeros((256, 256), np.uint8), 1, 0.0))
+
+
+def test_low_conf_threshold_returns_the_low_tier():
+    det, _ = _detector(jitter=0.0, miss_rate=0.0, false_positives=0.0, min_visible=0.0)
+    det.cfg.conf_threshold = 0.9
+    dimmer = BIRD._replace(visible=0.5)            # scores ~0.72, found half the time
+    assert not any(det.infer(_envelope([dimmer])) for _ in range(50))
+    det.cfg.low_conf_threshold = 0.5
+    scores = [d.score for _ in range(50) for d in det.infer(_envelope([dimmer]))]
+    assert len(scores) > 10 and all(0.5 <= s < 0.9 for s in scores)
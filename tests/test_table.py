@@ -0,0 +1,95 @@
+"""Track column store: slot reuse, growth, snapshots and Track-shaped views."""
+import numpy as np
+import pytest
+from conftest import make_detection, make_track
+
+from track.table import TrackBatch, TrackTable
+
+
+def test_spawn_fills_columns_and_assigns_increasing_ids():
+    table = TrackTable(capacity=4)
+    slots = table.spawn([make_detection(cx=10, cy=20), make_detection(cx=30, cy=40)], 5.0)
+    batch = table.snapshot(slots)
+    assert batch.ids.tolist() == [1, 2]
+    assert batch.cxy.tolist() == [[10, 20], [30, 40]]
+    assert batch.hits.tolist() == [1, 1] and batch.ages.tolist() == [1, 1]
+    assert batch[0].capture_t == 5.0 and batch[0].vx == 0.0
+
+
+def test_released_slots_are_reused_and_active_stays_in_id_order():
+    table = TrackTable(capacity=4)
+    first = table.spawn([make_detection() for _ in range(3)], None)
+    table.release(first[:1])
+    again = table.spawn([make_detection()], None)
+    assert again.tolist() == first[:1].tolist()            # slot reused
+    assert table.ids[table.active()].tolist() == [2, 3, 4]
+    assert table.capacity == 4
+
+
+def test_table_grows_when_full_and_keeps_rows():
+    table = TrackTable(capacity=2, extra={"kf_x": (4,)})
+    table.spawn([make_detection(cx=1), make_detection(cx=2)], None)
+    table.extra["kf_x"][:2, 0] = (7.0, 8.0)
+    table.spawn([make_detection(cx=3)], None)
+    assert table.capacity == 4 and len(table) == 3
+    assert table.extra["kf_x"].shape == (4, 4)
+    assert table.extra["kf_x"][:2, 0].tolist() == [7.0, 8.0]
+    assert table.snapshot(table.active()).cxy[:, 0].tolist() == [1, 2, 3]
+
+
+def test_mark_matched_and_missed():
+    table = TrackTable()
+    slots = table.spawn([make_detection(), make_detection()], None)
+    table.mark_missed(slots[1:])
+    table.mark_matched(slots[:1], 2.5)
+    batch = table.snapshot(slots)
+    assert batch.hits.tolist() == [2, 1] and batch.ages.tolist() == [2, 2]
+    assert batch.time_since_update.tolist() == [0, 1]
+    assert batch[0].capture_t == 2.5 and batch[1].capture_t is None
+
+
+def test_snapshot_is_a_copy():
+    table = TrackTable()
+    slots = table.spawn([make_detection(cx=10)], None)
+    batch = table.snapshot(slots)
+    table.cxy[slots] = 99.0
+    assert batch[0].cx == 10.0
+
+
+def test_views_read_like_tracks_and_round_trip():
+    tracks = [make_track(track_id=3, cx=50, cy=60, vx=1.5, vy=-2, hits=4),
+              make_track(track_id=8, cx=5, cy=6, w=10, h=4)]
+    tracks[1].capture_t = 1.25
+    batch = TrackBatch.from_tracks(tracks)
+    assert batch == tracks and list(batch) == tracks
+    view = batch[-1]
+    assert view.id == 8 and view.area_px == pytest.approx(40.0)
+    assert isinstance(view.xyxy, tuple) and isinstance(view.hits, int)
+    assert batch.find(3).vy == -2.0 and batch.find(4) is None
+    assert TrackBatch.from_tracks(list(batch)) == batch
+    with pytest.raises(IndexError):
+        batch[2]
+
+
+def test_empty_batch():
+    batch = TrackBatch.empty()
+    assert len(batch) == 0 and not batch and batch == []
+    assert batch.xyxy.shape == (0, 4) and batch.ids.dtype == np.int64
+
+
+def test_history_ring_records_centroids_with_frame_stamps():
+    table = TrackTable(capacity=2, history=3)
+    slot = table.spawn([make_detection(cx=0, cy=0)], None)
+    for f in range(1, 5):
+        table.frame = f
+        table.cxy[slot] = (10.0 * f, 0.0)
+        table.mark_matched(slot, None)
+    batch = table.snapshot(slot)
+    assert batch.hist_n.tolist() == [5]
+    assert sorted(batch.hist_frame[0].tolist()) == [2, 3, 4]        # oldest overwritten
+    assert sorted(batch.hist_xy[0, :, 0].tolist()) == [20, 30, 40]
+    table.release(slot)
+    again = table.spawn([make_detection(cx=7, cy=7)], None)       # reused slot starts over
+    assert table.hist_n[again].tolist() == [1]
+    table.set_history(5)
+    assert table.history == 5 and table.hist_n[again].tolist() == [0]
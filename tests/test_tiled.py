@@ -0,0 +1,119 @@
+"""TiledDetector: tile grid, coordinate mapping, seam NMS, tile budget, stats."""
+import numpy as np
+import pytest
+
+from config import Config
+from contracts import Detection
+from detect.base import Detector
+from detect.tiled import TiledDetector, tile_grid, tile_origins
+
+
+class BlobDetector(Detector):
+    """Fake backend: one box per bright (255) blob, in the given array's pixels."""
+
+    def __init__(self):
+        self.shapes = []
+
+    def infer(self, frame):
+        self.shapes.append(frame.shape)
+        ys, xs = np.nonzero(frame == 255)
+        if ys.size == 0:
+            return []
+        return [Detection.from_xyxy(0, 0.9, xs.min(), ys.min(), xs.max() + 1, ys.max() + 1)]
+
+
+def _cfg(**kw):
+    d = Config().detector
+    d.tiled = True
+    d.tile_full_frame = False
+    for k, v in kw.items():
+        setattr(d, k, v)
+    return d
+
+
+def test_tile_origins_cover_with_overlap_and_flush_last_tile():
+    assert tile_origins(256, 256, 48) == [0]
+    assert tile_origins(200, 256, 48) == [0]
+    o = tile_origins(1152, 256, 48)
+    assert o[0] == 0 and o[-1] == 1152 - 256
+    assert all(b - a <= 256 - 48 for a, b in zip(o, o[1:]))
+    assert len(tile_grid(1152, 768, 256, 48)) == len(o) * len(tile_origins(768, 256, 48))
+
+
+def test_tile_detections_map_back_to_full_frame_pixels():
+    frame = np.zeros((768, 768), np.uint8)
+    frame[500:510, 600:612] = 255                     # 12x10 px bird, deep in the frame
+    det = TiledDetector(BlobDetector(), _cfg(), frame_width_px=1152, frame_height_px=1152)
+    dets = det.infer(frame)
+    assert len(dets) == 1                             # seam duplicates merged by NMS
+    np.testing.assert_allclose(dets[0].xyxy, (600 * 1.5, 500 * 1.5, 612 * 1.5, 510 * 1.5))
+    assert all(s == (256, 256) for s in det.inner.shapes)
+
+
+def test_budget_sweeps_the_grid_across_frames():
+    det = TiledDetector(BlobDetector(), _cfg(tile_budget=3))
+    grid = tile_grid(768, 768, 256, 48)
+    seen = []
+    for _ in range(-(-len(grid) // 3)):
+        seen += det.plan(768, 768)
+    assert set(seen) == set(grid)
+    assert det.plan(768, 768)[0] == grid[(len(seen)) % len(grid)]
+
+
+def test_stats_report_tiles_latency_and_full_frame_pass():
+    inner = BlobDetector()
+    det = TiledDetector(inner, _cfg(tile_budget=2, tile_full_frame=True))
+    frame = np.zeros((768, 768), np.uint8)
+    det.infer(frame)
+    det.infer(frame)
+    st = det.tile_stats.as_dict()
+    assert st["tiles_per_frame"] == 3 and st["tiles"] == 6 and st["frames"] == 2
+    assert st["grid_tiles"] == len(tile_grid(768, 768, 256, 48))
+    assert st["tile_ms"] > 0 and st["fps"] > 0
+    assert inner.shapes[2] == (768, 768)              # the whole-frame pass
+
+
+def test_single_tile_frame_skips_the_whole_frame_pass():
+    inner = BlobDetector()
+    det = TiledDetector(inner, _cfg(tile_full_frame=True))
+    det.infer(np.zeros((256, 256), np.uint8))
+    assert len(inner.shapes) == 1
+
+
+def test_build_detector_wraps_backend_when_tiled():
+    from main import build_detector
+    cfg = Config()
+    cfg.detector.tiled = True
+    cfg.detector.backend = "cpu"
+    det = build_detector(cfg)
+    assert isinstance(det, TiledDetector)
+    assert det.inner._frame_width_px is None          # backend stays in tile pixels
+    assert det._frame_width_px == cfg.camera.capture_width_px
+
+
+@pytest.mark.parametrize("key,value", [("tile_overlap_px", 256), ("tile_budget", -1)])
+def test_tiling_config_validation(key, value):
+    from errors import ConfigError
+    with pytest.raises(ConfigError):
+        Config.from_dict({"detector": {key: value}})
+
+
+def test_sensor_crop_maps_tiles_into_the_crop_window():
+    from contracts import FrameEnvelope
+    frame = np.zeros((768, 768), np.uint8)
+    frame[500:510, 600:612] = 255
+    det = TiledDetector(BlobDetector(), _cfg(), frame_width_px=1152, frame_height_px=1152)
+    dets = det.infer(FrameEnvelope(frame, 1, 0.0, crop=(0.5, 0.5, 0.5, 0.5)))
+    np.testing.assert_allclose(dets[0].xyxy, (576 + 600 * 0.75, 576 + 500 * 0.75,
+                                              576 + 612 * 0.75, 576 + 510 * 0.75))
+
+
+def test_rotated_frame_tiles_map_like_rotated_pixels():
+    from capture import rotate_frame
+    from contracts import FrameEnvelope
+    frame = np.zeros((768, 768), np.uint8)
+    frame[500:510, 600:612] = 255
+    det = TiledDetector(BlobDetector(), _cfg(), frame_width_px=1152, frame_height_px=1152)
+    expected = det.infer(rotate_frame(frame, 90))
+    dets = det.infer(FrameEnvelope(frame, 1, 0.0, rotation_deg=90))
+    np.testing.assert_allclose(dets[0].xyxy, expected[0].xyxy)
@@ -85,5 +85,77 @@ def test_apply_config_updates_params_live():
     cfg.tracker.max_age_frames = 12
     cfg.tracker.min_hits = 5
     cfg.tracker.velocity_smoothing = 0.2
+    cfg.tracker.assignment = "optimal"
     t.apply_config(cfg.tracker)
     assert (t.iou_threshold, t.max_age_frames, t.min_hits, t.alpha) == (0.6, 12, 5, 0.2)
+    assert t.assignment == "optimal"
+
+
+def test_update_stamps_tracks_with_frame_capture_time():
+    from contracts import FrameEnvelope
+    tr = IouTracker(min_hits=1)
+    tr.update([make_detection(cx=100, cy=100)], FrameEnvelope(None, 1, capture_t=5.0))
+    out = tr.update([make_detection(cx=102, cy=100)], FrameEnvelope(None, 2, capture_t=5.05))
+    assert out[0].capture_t == 5.05
+    out = tr.update([], FrameEnvelope(None, 3, capture_t=5.10))
+    assert out[0].capture_t == 5.05           # coasting keeps its last observation time
+
+
+def _contested_frame(tr):
+    """Tracks at x=100 and x=130; the left detection overlaps both, the right one only
+    the right track. Greedy gives the right track the bigger overlap and strands the left."""
+    tr.update([make_detection(cx=100, cy=100), make_detection(cx=130, cy=100)])
+    return tr.update([make_detection(cx=118, cy=100), make_detection(cx=150, cy=100)])
+
+
+def test_greedy_assignment_takes_highest_iou_first():
+    tr = IouTracker(min_hits=1, assignment="greedy")
+    out = _contested_frame(tr)
+    by_id = {t.id: t for t in out}
+    assert by_id[2].cx == 118                # right track took the contested detection
+    assert by_id[1].time_since_update == 1   # left track went unmatched
+    assert by_id[3].cx == 150                # right detection spawned a new track
+
+
+def test_optimal_assignment_keeps_both_ids():
+    tr = IouTracker(min_hits=1, assignment="optimal")
+    out = _contested_frame(tr)
+    assert {t.id: t.cx for t in out} == {1: 118, 2: 150}
+
+
+def _dimming_bird(tr, score):
+    """Confirmed track on a bird whose next detection scores ``score``, plus a
+    stray low-score box elsewhere."""
+    for x in (100, 105, 110):
+        tr.update([make_detection(cx=x, cy=100)])
+    return tr.update([make_detection(cx=115, cy=100, score=score),
+                      make_detection(cx=500, cy=500, score=score)])
+
+
+def test_two_stage_low_tier_extends_but_never_spawns():
+    tr = IouTracker(min_hits=1, high_score_threshold=0.5)
+    out = _dimming_bird(tr, score=0.2)
+    assert [(t.id, t.cx, t.time_since_update) for t in out] == [(1, 115, 0)]
+    assert len(tr.tracks) == 1                 # the stray low box spawned nothing
+
+
+def test_two_stage_low_tier_skips_tentative_tracks():
+    tr = IouTracker(min_hits=3, high_score_threshold=0.5)
+    tr.update([make_detection(cx=100, cy=100)])
+    tr.update([make_detection(cx=105, cy=100, score=0.2)])
+    assert tr.tracks[0].hits == 1 and tr.tracks[0].time_since_update == 1
+
+
+def test_single_stage_spawns_from_every_detection():
+    tr = IouTracker(min_hits=1)
+    out = _dimming_bird(tr, score=0.2)
+    assert {t.id for t in out} == {1, 2}
+
+
+def test_history_frames_keeps_matched_centroids_per_frame():
+    tr = IouTracker(min_hits=1, history_frames=4)
+    for x in (100, 105, 110):
+        out = tr.update([make_detection(cx=x, cy=100)])
+    assert out.hist_n.tolist() == [3]
+    assert out.hist_frame[0, :3].tolist() == [1, 2, 3]
+    assert out.hist_xy[0, :3, 0].tolist() == [100, 105, 110]
@@ -12,13 +12,18 @@ import pytest
 
 from actuate.servo import Axis, ServoController
 from app.control import ControlLoop, Telemetry
-from app.pipeline import Pipeline
+from app.pipeline import Pipeline, TrackedFrame
 from app.statemachine import FireState, FireStateMachine
 from app.web import TurretWebController
 from config import Config
+from contracts import FrameEnvelope
 from strategy.selector import TargetSelector
 
 
+def _envelope(frame):
+    return FrameEnvelope(frame, seq=1, capture_t=0.0)
+
+
 @pytest.fixture
 def rig(fake_servo_bus, fake_clock):
     cfg = Config()
@@ -41,7 +46,7 @@ def test_telemetry_sanitizes_infinity(rig, track_factory):
         aim_error_px=float("inf"), predicted_xy=(float("nan"), 12.0),
         pan_cmd_deg=20.0, tilt_cmd_deg=15.0, in_killzone=False, would_fire=False,
     ))
-    pipeline.latest_tracks.put([track_factory(track_id=7, cx=100, cy=120)])
+    pipeline.latest_tracks.put(TrackedFrame(None, [track_factory(track_id=7, cx=100, cy=120)]))
     pipeline._fps = 18.5
     pipeline.shots = 3
 
@@ -345,7 +350,7 @@ def test_detection_jpeg_encodes_once_then_serves_cache(rig, monkeypatch):
     cfg, servo, control, pipeline, web = rig
     cfg.app.detection_video_enabled = True
     cfg.app.detection_video_max_fps = 5.0
-    pipeline.latest_frame.put(np.zeros((256, 256), np.uint8))
+    pipeline.latest_frame.put(_envelope(np.zeros((256, 256), np.uint8)))
     calls = {"n": 0}
     monkeypatch.setattr(dv, "encode_jpeg",
                         lambda frame, q: (calls.__setitem__("n", calls["n"] + 1) or b"JPG"))
@@ -355,6 +360,26 @@ def test_detection_jpeg_encodes_once_then_serves_cache(rig, monkeypatch):
     assert calls["n"] == 1
 
 
+def test_detection_jpeg_does_not_reencode_the_same_frame(rig, monkeypatch):
+    import numpy as np
+
+    import app.debugview as dv
+    cfg, servo, control, pipeline, web = rig
+    cfg.app.detection_video_enabled = True
+    cfg.app.detection_video_max_fps = 1e9             # rate cap out of the way
+    pipeline.latest_frame.put(_envelope(np.zeros((256, 256), np.uint8)))
+    calls = {"n": 0}
+    monkeypatch.setattr(dv, "encode_jpeg",
+                        lambda frame, q: (calls.__setitem__("n", calls["n"] + 1) or b"JPG"))
+    web.detection_jpeg()
+    web.detection_jpeg()                           # same slot seq -> cached bytes
+    assert calls["n"] == 1
+    pipeline.latest_frame.put(_envelope(np.zeros((256, 256), np.uint8)))
+    web.detection_jpeg()                           # newer frame -> encode again
+    assert calls["n"] == 2
+    assert web.telemetry()["pipeline"]["web_jpeg"]["duplicates_avoided"] == 1
+
+
 def test_telemetry_exposes_detection_video_flag(rig):
     cfg, servo, control, pipeline, web = rig
     assert web.telemetry()["detection_video"]["enabled"] is False
@@ -375,7 +400,7 @@ def test_save_snapshot_writes_current_frame_to_configured_dir(rig, monkeypatch):
     import app.snapshots as snaps
     cfg, servo, control, pipeline, web = rig
     cfg.app.snapshot_dir = "/tmp/turret-snaps"
-    pipeline.latest_frame.put(np.zeros((256, 256), np.uint8))
+    pipeline.latest_frame.put(_envelope(np.zeros((256, 256), np.uint8)))
     seen = {}
     def _fake_save(out_dir, frame, **kw):
         seen["dir"], seen["shape"] = out_dir, frame.shape
@@ -392,7 +417,7 @@ def test_save_snapshot_reports_write_failure(rig, monkeypatch):
 
     import app.snapshots as snaps
     cfg, servo, control, pipeline, web = rig
-    pipeline.latest_frame.put(np.zeros((8, 8), np.uint8))
+    pipeline.latest_frame.put(_envelope(np.zeros((8, 8), np.uint8)))
     def _boom(*a, **k):
         raise OSError("disk full")
     monkeypatch.setattr(snaps, "save_frame", _boom)
@@ -469,3 +494,13 @@ def test_save_config_writes_overlay(rig, tmp_path, monkeypatch):
     res = web.save_config()
     assert res["ok"] is True and "servo" in res["saved_sections"]
     assert (tmp_path / "config.local.yaml").exists()
+
+
+def test_any_command_wakes_the_pipeline_from_standby(rig):
+    cfg, servo, control, pipeline, web = rig
+    pipeline.enter_standby()
+    assert web.command("wake") == {"ok": True, "command": "wake", "woke": True}
+    pipeline.enter_standby()
+    web.command("center")
+    assert not pipeline.standby
+    assert pipeline.stats()["standby"]["wakes"] == 2
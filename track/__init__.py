@@ -1,10 +1,30 @@
-"""Tracking layer: stable multi-target ids + constant-velocity lead prediction."""
-from track.predict import lead_frames_from_seconds, predict_lead, predict_position
+"""Tracking layer: stable multi-target ids + lead prediction."""
+from track.assign import greedy_assignment, iou_matrix, optimal_assignment
+from track.predict import (
+    lead_frames_from_seconds,
+    measured_latency_s,
+    predict_lead,
+    predict_leads,
+    predict_position,
+    predict_positions,
+)
+from track.kalman import KalmanTracker
+from track.table import TrackBatch, TrackTable, TrackView
 from track.tracker import IouTracker
 
 __all__ = [
     "IouTracker",
+    "KalmanTracker",
+    "TrackTable",
+    "TrackBatch",
+    "TrackView",
+    "iou_matrix",
+    "greedy_assignment",
+    "optimal_assignment",
     "predict_position",
     "predict_lead",
+    "predict_positions",
+    "predict_leads",
     "lead_frames_from_seconds",
+    "measured_latency_s",
 ]
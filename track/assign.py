@@ -0,0 +1,163 @@
+"""Track <-> detection association on an IoU matrix (pure NumPy).
+
+``iou_matrix`` scores every track against every detection in one broadcast.
+Two assignments pick the pairs, both only among pairs at or above the IoU
+threshold:
+
+* ``greedy_assignment`` — highest IoU first, each row / column used once. Ties
+  break towards the later track and detection (the original tracker's order).
+* ``optimal_assignment`` — the pairing with the largest total IoU (Hungarian,
+  shortest augmenting paths). Greedy can steal a track's only match for a
+  neighbour that had another; in a tight flock that is an id swap. The
+  thresholded IoU graph splits into small groups of mutually overlapping boxes,
+  each solved on its own, so the O(n^3) solve only ever sees a few boxes.
+
+``split_tiers`` cuts a frame's detections into the high / low score tiers of
+the trackers' two-stage (ByteTrack) association.
+"""
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from contracts import Detection
+
+Pairs = List[Tuple[int, int]]
+
+
+def split_tiers(detections: Sequence[Detection], high_score_threshold: float
+                ) -> Tuple[List[Detection], List[Detection]]:
+    """(high, low) score tiers for two-stage association; all high when the
+    threshold is 0 (single stage)."""
+    if high_score_threshold <= 0:
+        return list(detections), []
+    high, low = [], []
+    for det in detections:
+        (high if det.score >= high_score_threshold else low).append(det)
+    return high, low
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of ``[N, 4]`` and ``[M, 4]`` xyxy boxes -> ``[N, M]``.
+
+    Built in place in two ``[N, M]`` buffers (plus one transient): at 200 x 200
+    the naive expression held ~9 of them live at once."""
+    a = np.asarray(a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float64).reshape(-1, 4)
+    inter = np.minimum(a[:, None, 2], b[None, :, 2])
+    inter -= np.maximum(a[:, None, 0], b[None, :, 0])
+    np.maximum(inter, 0.0, out=inter)
+    union = np.minimum(a[:, None, 3], b[None, :, 3])
+    union -= np.maximum(a[:, None, 1], b[None, :, 1])
+    np.maximum(union, 0.0, out=union)
+    inter *= union
+    area_a = np.maximum(0.0, a[:, 2] - a[:, 0]) * np.maximum(0.0, a[:, 3] - a[:, 1])
+    area_b = np.maximum(0.0, b[:, 2] - b[:, 0]) * np.maximum(0.0, b[:, 3] - b[:, 1])
+    np.add(area_a[:, None], area_b[None, :], out=union)
+    union -= inter
+    # union == 0 only for two empty boxes, whose inter is already 0
+    return np.divide(inter, union, out=inter, where=union > 0.0)
+
+
+def greedy_assignment(score: np.ndarray, threshold: float) -> Pairs:
+    """Highest score first; each row and column at most once."""
+    rows, cols = np.nonzero(score >= threshold)
+    if rows.size == 0:
+        return []
+    order = np.lexsort((-cols, -rows, -score[rows, cols]))
+    used_r, used_c = set(), set()
+    pairs = []
+    for r, c in zip(rows[order].tolist(), cols[order].tolist()):
+        if r in used_r or c in used_c:
+            continue
+        used_r.add(r)
+        used_c.add(c)
+        pairs.append((r, c))
+    return pairs
+
+
+def optimal_assignment(score: np.ndarray, threshold: float) -> Pairs:
+    """Pairs (score >= threshold) with the largest total score."""
+    valid = score >= threshold
+    pairs = []
+    for rows, cols in _components(valid):
+        if rows.size == 1 and cols.size == 1:
+            pairs.append((int(rows[0]), int(cols[0])))
+            continue
+        sub = np.where(valid[np.ix_(rows, cols)], score[np.ix_(rows, cols)], 0.0)
+        for r, c in _hungarian(-sub):
+            if valid[rows[r], cols[c]]:
+                pairs.append((int(rows[r]), int(cols[c])))
+    return pairs
+
+
+ASSIGNMENTS = {"greedy": greedy_assignment, "optimal": optimal_assignment}
+
+
+def _components(valid: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """(rows, cols) of each connected group of the bipartite graph ``valid``."""
+    n_rows = valid.shape[0]
+    active = np.flatnonzero(valid.any(axis=1))
+    label = np.full(n_rows + valid.shape[1], -1, dtype=np.intp)
+    groups = []
+    for start in active.tolist():
+        if label[start] >= 0:
+            continue
+        label[start] = len(groups)
+        stack, rows, cols = [start], [], []
+        while stack:
+            node = stack.pop()
+            if node < n_rows:
+                rows.append(node)
+                nbrs = np.flatnonzero(valid[node]) + n_rows
+            else:
+                cols.append(node - n_rows)
+                nbrs = np.flatnonzero(valid[:, node - n_rows])
+            new = nbrs[label[nbrs] < 0]
+            label[new] = len(groups)
+            stack.extend(new.tolist())
+        groups.append((np.array(sorted(rows)), np.array(sorted(cols))))
+    return groups
+
+
+def _hungarian(cost: np.ndarray) -> Pairs:
+    """Minimum-cost assignment of a dense ``[N, M]`` cost matrix (every row of the
+    shorter side assigned). Shortest augmenting paths with row / column potentials;
+    the scan over columns is a vector op."""
+    transpose = cost.shape[0] > cost.shape[1]
+    if transpose:
+        cost = cost.T
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.intp)      # 1-based row holding each column; 0 = free
+    way = np.zeros(m + 1, dtype=np.intp)
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            free = ~used
+            free[0] = False
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free[1:] & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+            j1 = int(np.argmin(np.where(free, minv, np.inf)))
+            delta = minv[j1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:                                # flip the augmenting path
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+    pairs = [(int(owner[j]) - 1, j - 1) for j in range(1, m + 1) if owner[j]]
+    return [(c, r) for r, c in pairs] if transpose else pairs
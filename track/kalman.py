@@ -0,0 +1,216 @@
+"""Kalman-filter tracker: all tracks predicted / updated as stacked NumPy arrays.
+
+``IouTracker`` matches detections against each track's *last* box, so once a fast
+bird moves more than its own width between frames (15-20 FPS) the boxes stop
+overlapping, the track breaks and ``min_hits`` re-confirmation delays the shot.
+``KalmanTracker`` keeps a constant-velocity (``kalman_model: cv``) or
+constant-acceleration (``ca``) state of the box centre per track; every frame
+all tracks are predicted to the frame being associated in one batched matrix
+product, and each detection is scored against the *predicted* box:
+
+* gate — the detection centre is within ``kalman_gate_chi2`` (Mahalanobis^2 of
+  the innovation under the track's predicted covariance) *or* its box overlaps
+  the predicted box by ``iou_match_threshold``;
+* score — IoU with the predicted box + the innovation likelihood
+  ``exp(-d^2 / 2)``, paired greedy / optimal (``track.assign``) like ``IouTracker``,
+  including its two-stage pass of the low score tier (``high_score_threshold``),
+  which is admitted by predicted-box IoU alone.
+
+Noise is relative to the box size (near and far birds gate alike). A new track
+has a wide velocity prior (``kalman_init_speed_px``), so its second sighting is
+found even when the boxes don't overlap. Steps are capture frames: a frame seq
+gap (dropped / stale frames) predicts that many frames ahead.
+
+Unlike ``IouTracker`` a tentative track (below ``min_hits``) is dropped on its
+first miss. The filter state is extra columns of the same ``TrackTable`` and the
+output the same ``TrackBatch`` (vx/vy in px/frame, filtered centre, last detected
+box size, filtered-centre history), so ``strategy/`` and ``aim/`` don't change. A
+coasting track keeps its last filtered position and ``capture_t``, exactly like
+``IouTracker``.
+"""
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from config import TrackerConfig
+from contracts import Detection, FrameEnvelope
+from track.assign import ASSIGNMENTS, iou_matrix, split_tiers
+from track.table import TrackBatch, TrackTable
+
+
+def _per_axis(model: str, dt: float):
+    """(F, G) for one axis: transition and noise gain of [pos, vel(, acc)]."""
+    if model == "ca":
+        f = np.array([[1.0, dt, dt * dt / 2], [0.0, 1.0, dt], [0.0, 0.0, 1.0]])
+        g = np.array([dt ** 3 / 6, dt * dt / 2, dt])
+    else:
+        f = np.array([[1.0, dt], [0.0, 1.0]])
+        g = np.array([dt * dt / 2, dt])
+    return f, g
+
+
+class KalmanTracker:
+    """Batched Kalman tracker producing stable integer track ids.
+
+    State rows are ``[x, y, vx, vy(, ax, ay)]`` in px and px/frame, kept as extra
+    columns of the ``TrackTable``: ``kf_x`` ``[slots, d]``, ``kf_p`` ``[slots, d, d]``
+    and the last detected box size ``wh``.
+    """
+
+    def __init__(self, cfg: TrackerConfig):
+        self.cfg = cfg
+        self.reset()
+
+    def reset(self) -> None:
+        self._model = self.cfg.kalman_model
+        dim = 6 if self._model == "ca" else 4
+        self._table = TrackTable(extra={"kf_x": (dim,), "kf_p": (dim, dim), "wh": (2,)},
+                                 history=self.cfg.history_frames)
+        self._last_seq: Optional[int] = None
+
+    def apply_config(self, cfg: TrackerConfig) -> None:
+        """Adopt new tracker tunables live; a model change restarts the tracks."""
+        self.cfg = cfg
+        if cfg.kalman_model != self._model:
+            self.reset()
+        self._table.set_history(cfg.history_frames)
+
+    @property
+    def tracks(self) -> TrackBatch:
+        """All live tracks (including tentative ones below min_hits)."""
+        return self._table.snapshot(self._table.active())
+
+    def update(self, detections: Sequence[Detection],
+               frame: Optional[FrameEnvelope] = None) -> TrackBatch:
+        """Predict every track to this frame, associate, correct, spawn, prune.
+        ``frame`` (when given) stamps matched/new tracks with its ``capture_t`` and
+        its ``seq`` sets how many frames to predict across."""
+        detections, low = split_tiers(detections, self.cfg.high_score_threshold)
+        capture_t = frame.capture_t if frame is not None else None
+        table = self._table
+        steps = self._steps(frame)
+        table.frame += steps
+        slots = table.active()
+        self._predict(slots, steps)
+        matches = self._match(slots, detections)
+        rows = np.array([m[0] for m in matches], dtype=np.intp)
+        self._apply(slots[rows], matches, detections, capture_t)
+        matched = np.zeros(len(slots), dtype=bool)
+        matched[rows] = True
+        if low:
+            # Second stage: the low tier only extends confirmed tracks left unmatched.
+            rest = np.flatnonzero(~matched & (table.hits[slots] >= self.cfg.min_hits))
+            pairs = self._match(slots[rest], low, gate=False)
+            rows = rest[np.array([p[0] for p in pairs], dtype=np.intp)]
+            self._apply(slots[rows], pairs, low, capture_t)
+            matched[rows] = True
+        table.mark_missed(slots[~matched])
+
+        used = {m[1] for m in matches}
+        new = [d for i, d in enumerate(detections) if i not in used]
+        if new:
+            self._spawn(new, capture_t)
+
+        # A tentative track dies on its first miss: its wide velocity prior would let
+        # the gate chain scattered false positives into a confirmed track.
+        slots = table.active()
+        confirmed = table.hits[slots] >= self.cfg.min_hits
+        stale = table.time_since_update[slots] > np.where(confirmed,
+                                                          self.cfg.max_age_frames, 0)
+        if stale.any():
+            table.release(slots[stale])
+        return table.snapshot(slots[confirmed & ~stale])
+
+    def _steps(self, frame: Optional[FrameEnvelope]) -> int:
+        if frame is None:
+            return 1
+        last, self._last_seq = self._last_seq, frame.seq
+        if last is None or frame.seq <= last:
+            return 1
+        return min(frame.seq - last, self.cfg.max_age_frames + 1)
+
+    def _sizes(self, slots: np.ndarray) -> np.ndarray:
+        wh = self._table.extra["wh"][slots]
+        return np.sqrt(np.maximum(wh[:, 0] * wh[:, 1], 1.0))
+
+    def _predict(self, slots: np.ndarray, steps: int) -> None:
+        if not len(slots):
+            return
+        f1, g1 = _per_axis(self._model, float(steps))
+        eye = np.eye(2)
+        f = np.kron(f1, eye)
+        q = np.kron(np.outer(g1, g1), eye)
+        sigma = self.cfg.kalman_process_noise * self._sizes(slots)
+        x, p = self._table.extra["kf_x"], self._table.extra["kf_p"]
+        x[slots] = x[slots] @ f.T
+        p[slots] = f @ p[slots] @ f.T + q * (sigma * sigma)[:, None, None]
+
+    def _innovation_cov(self, slots: np.ndarray) -> np.ndarray:
+        r = (self.cfg.kalman_measurement_noise * self._sizes(slots)) ** 2
+        return self._table.extra["kf_p"][slots, :2, :2] + r[:, None, None] * np.eye(2)
+
+    def _apply(self, slots: np.ndarray, matches, detections: Sequence[Detection],
+               capture_t: Optional[float]) -> None:
+        """Correct the rows ``slots`` with their matched detections (one batched
+        update) and refresh their box / centre / velocity columns."""
+        if not matches:
+            return
+        dets = [detections[m[1]] for m in matches]
+        self._correct(slots, np.array([(d.cx, d.cy) for d in dets], dtype=np.float64))
+        t = self._table
+        boxes = np.array([d.xyxy for d in dets], dtype=np.float64)
+        wh = boxes[:, 2:] - boxes[:, :2]
+        t.extra["wh"][slots] = wh
+        x = t.extra["kf_x"][slots]
+        t.cxy[slots] = x[:, :2]
+        t.vxy[slots] = x[:, 2:4]
+        t.xyxy[slots] = np.hstack([x[:, :2] - wh / 2.0, x[:, :2] + wh / 2.0])
+        t.scores[slots] = [d.score for d in dets]
+        t.cls_ids[slots] = [d.cls_id for d in dets]
+        t.mark_matched(slots, capture_t)
+
+    def _match(self, slots: np.ndarray, detections: Sequence[Detection], gate: bool = True):
+        """(index into ``slots``, detection index) pairs for the tracks ``slots``.
+        Without ``gate`` only predicted-box IoU admits a pair (the low tier: a
+        coasting track's wide gate would otherwise collect stray low-score boxes)."""
+        if not len(slots) or not detections:
+            return []
+        c = self.cfg
+        x, half = self._table.extra["kf_x"][slots, :2], self._table.extra["wh"][slots] / 2.0
+        z = np.array([(d.cx, d.cy) for d in detections], dtype=np.float64)
+        iou = iou_matrix(np.hstack([x - half, x + half]),
+                         np.asarray([d.xyxy for d in detections], dtype=np.float64))
+        y = z[None, :, :] - x[:, None, :]                              # [N, M, 2]
+        s_inv = np.linalg.inv(self._innovation_cov(slots))
+        d2 = np.einsum("nmi,nij,nmj->nm", y, s_inv, y)
+        valid = iou >= c.iou_match_threshold
+        if gate:
+            valid |= d2 <= c.kalman_gate_chi2
+        score = np.where(valid, iou + np.exp(-0.5 * np.minimum(d2, 700.0)), -1.0)
+        return ASSIGNMENTS[c.assignment](score, 0.0)
+
+    def _correct(self, slots: np.ndarray, z: np.ndarray) -> None:
+        xs, ps = self._table.extra["kf_x"], self._table.extra["kf_p"]
+        p = ps[slots]
+        k = p[:, :, :2] @ np.linalg.inv(self._innovation_cov(slots))  # [k, d, 2]
+        y = z - xs[slots, :2]
+        xs[slots] += (k @ y[:, :, None])[:, :, 0]
+        p = p - k @ p[:, :2, :]
+        ps[slots] = (p + p.transpose(0, 2, 1)) / 2.0
+
+    def _spawn(self, detections: List[Detection], capture_t: Optional[float]) -> None:
+        t = self._table
+        slots = t.spawn(detections, capture_t)
+        n, dim = len(detections), t.extra["kf_x"].shape[1]
+        wh = t.xyxy[slots, 2:] - t.xyxy[slots, :2]
+        meas = self.cfg.kalman_measurement_noise * np.sqrt(np.maximum(wh[:, 0] * wh[:, 1], 1.0))
+        var = np.empty((n, dim))
+        var[:, :2] = (meas * meas)[:, None]
+        var[:, 2:4] = self.cfg.kalman_init_speed_px ** 2
+        var[:, 4:] = (self.cfg.kalman_init_speed_px / 2.0) ** 2     # ca: acceleration
+        t.extra["kf_x"][slots] = 0.0
+        t.extra["kf_x"][slots, :2] = t.cxy[slots]
+        t.extra["kf_p"][slots] = var[:, :, None] * np.eye(dim)
+        t.extra["wh"][slots] = wh
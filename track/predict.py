@@ -1,15 +1,38 @@
-"""Constant-velocity lead prediction (pure logic).
+"""Lead prediction (pure logic).
 
 Predict where a track's centroid will be after the actuation horizon
 (servo travel + water time-of-flight), so the turret aims where the bird *will*
 be, not where it was. A brand-new track has no velocity yet, so it degrades to
-"aim at the current centroid" (lead = 0). Seam left for constant-acceleration.
+"aim at the current centroid" (lead = 0).
+
+The track's position is already as old as its source frame, so the measured
+capture-to-now latency is added to the actuation horizon.
+
+``predict_position`` / ``predict_lead`` extrapolate one track at constant
+velocity (the tracker's EMA ``vx``/``vy``). ``predict_positions`` /
+``predict_leads`` do a whole ``TrackBatch`` at once with ``predict.model``:
+
+* ``cv`` — the same constant-velocity extrapolation;
+* ``linear`` / ``quadratic`` — a least-squares polynomial through the track's
+  centroid history (``tracker.history_frames``), samples weighted by
+  ``history_decay`` per frame of age, evaluated ``lead`` frames past the newest;
+* ``turn`` — constant speed and turn rate, both read off the quadratic fit at
+  the newest sample (velocity, and the acceleration component across it): a
+  banking bird is led along its arc rather than off the tangent.
+
+Fits are batched: one ``[N, H, k]`` design and one stacked ``solve`` for all
+tracks. A track with fewer than ``min_history`` centroids falls back to ``cv``.
 """
 from __future__ import annotations
 
-from typing import Tuple
+from typing import Optional, Tuple, Union
+
+import numpy as np
 
 from contracts import Track
+from track.table import TrackBatch
+
+PREDICT_MODELS = ("cv", "linear", "quadratic", "turn")
 
 
 def lead_frames_from_seconds(seconds: float, fps: float) -> float:
@@ -25,6 +48,80 @@ def predict_position(track: Track, lead_frames: float) -> Tuple[float, float]:
             track.cy + track.vy * lead_frames)
 
 
-def predict_lead(track: Track, lead_time_s: float, fps: float) -> Tuple[float, float]:
-    """Predicted centroid after ``lead_time_s`` seconds."""
-    return predict_position(track, lead_frames_from_seconds(lead_time_s, fps))
+def measured_latency_s(track: Track, now: Optional[float]) -> float:
+    """Age of the track's last observation (0 when it carries no capture time)."""
+    if now is None or track.capture_t is None:
+        return 0.0
+    return max(0.0, now - track.capture_t)
+
+
+def predict_lead(track: Track, lead_time_s: float, fps: float,
+                 latency_s: float = 0.0) -> Tuple[float, float]:
+    """Predicted centroid ``latency_s + lead_time_s`` after the track was observed."""
+    return predict_position(track, lead_frames_from_seconds(lead_time_s + latency_s, fps))
+
+
+def predict_positions(tracks: TrackBatch, lead_frames: Union[float, np.ndarray],
+                      model: str = "cv", min_history: int = 6,
+                      history_decay: float = 0.85) -> np.ndarray:
+    """``[N, 2]`` centroids of every row ``lead_frames`` ahead (scalar or ``[N]``)."""
+    if model not in PREDICT_MODELS:
+        raise ValueError(f"unknown predict model {model!r}")
+    lead = np.broadcast_to(np.asarray(lead_frames, dtype=np.float64), (len(tracks),))
+    out = tracks.cxy + tracks.vxy * lead[:, None]
+    if model == "cv" or not len(tracks) or not tracks.hist_xy.shape[1]:
+        return out
+    rows = np.flatnonzero(np.minimum(tracks.hist_n, tracks.hist_xy.shape[1]) >= min_history)
+    if not rows.size:
+        return out
+    coef = _fit(tracks, rows, 1 if model == "linear" else 2, history_decay)
+    p0, v = coef[:, 0], coef[:, 1]
+    t = lead[rows, None]
+    if model == "linear":
+        out[rows] = p0 + v * t
+    elif model == "quadratic":
+        out[rows] = p0 + v * t + coef[:, 2] * (t * t)
+    else:
+        out[rows] = p0 + _turn_offset(v, 2.0 * coef[:, 2], lead[rows])
+    return out
+
+
+def predict_leads(tracks: TrackBatch, lead_time_s: float, fps: float,
+                  latency_s: Union[float, np.ndarray] = 0.0, model: str = "cv",
+                  min_history: int = 6, history_decay: float = 0.85) -> np.ndarray:
+    """``predict_lead`` for every row of ``tracks`` with ``model``: ``[N, 2]``."""
+    if fps <= 0:
+        raise ValueError("fps must be positive")
+    lead = (lead_time_s + np.asarray(latency_s, dtype=np.float64)) * fps
+    return predict_positions(tracks, lead, model, min_history, history_decay)
+
+
+def _fit(tracks: TrackBatch, rows: np.ndarray, degree: int, decay: float) -> np.ndarray:
+    """Weighted polynomial coefficients ``[n, degree + 1, 2]`` of the centroid
+    history of ``rows``, in frames relative to each row's newest sample."""
+    xy, frame = tracks.hist_xy[rows], tracks.hist_frame[rows]
+    depth = frame.shape[1]
+    valid = np.arange(depth)[None, :] < tracks.hist_n[rows, None]
+    newest = np.where(valid, frame, -np.inf).max(axis=1, keepdims=True)
+    t = np.where(valid, frame - newest, 0.0)                          # <= 0
+    w = np.where(valid, decay ** -t, 0.0)
+    x = t[:, :, None] ** np.arange(degree + 1)                        # [n, H, k]
+    xw = x * w[:, :, None]
+    a = xw.transpose(0, 2, 1) @ x                                     # [n, k, k]
+    b = xw.transpose(0, 2, 1) @ xy                                    # [n, k, 2]
+    return np.linalg.solve(a, b)
+
+
+def _turn_offset(v: np.ndarray, acc: np.ndarray, lead: np.ndarray) -> np.ndarray:
+    """Displacement after ``lead`` frames at constant speed ``|v|`` and the turn
+    rate ``acc`` implies (its component across ``v`` over the speed)."""
+    vz = v[:, 0] + 1j * v[:, 1]
+    speed2 = np.maximum((vz * vz.conjugate()).real, 1e-12)
+    omega = (v[:, 0] * acc[:, 1] - v[:, 1] * acc[:, 0]) / speed2     # rad/frame
+    turn = omega * lead
+    small = np.abs(turn) < 1e-6
+    # v * (e^{i w T} - 1) / (i w), -> v * T as w -> 0
+    gain = np.where(small, lead + 0j,
+                    (np.exp(1j * turn) - 1.0) / (1j * np.where(small, 1.0, omega)))
+    d = vz * gain
+    return np.stack([d.real, d.imag], axis=1)
@@ -0,0 +1,291 @@
+"""Array-backed track store: one preallocated NumPy column per ``Track`` field.
+
+A tracker that keeps a ``Track`` dataclass per bird and rebuilds lists, dicts and
+candidate tuples of them every frame spends most of a 200-bird frame allocating
+Python objects. ``TrackTable`` keeps ids, boxes, centroids, velocities, scores,
+hits, ages and capture times as columns indexed by *slot*. A finished track's
+slot goes on a free list and the next new track reuses it; the columns only
+grow (doubling) when every slot is taken. Trackers update them with fancy-indexed
+vector ops, and may register extra per-track columns (the Kalman state).
+
+``snapshot`` copies a set of rows into a ``TrackBatch``: immutable columns
+that outlive the next ``update``, so the control / web threads can read a frame's
+tracks while the decode thread tracks the next one. Strategy and control consume
+the batch's columns directly; anything that wants ``Track`` objects iterates it
+and gets ``TrackView`` rows — two-slot objects reading the columns, with the
+``Track`` fields and ``area_px``.
+"""
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from contracts import Detection
+
+_NO_TIME = math.nan                         # capture_t column value for None
+
+
+class TrackBatch:
+    """One frame's tracks as columns (row order: track id ascending)."""
+
+    __slots__ = ("ids", "cls_ids", "scores", "xyxy", "cxy", "vxy", "ages", "hits",
+                 "time_since_update", "capture_t", "hist_xy", "hist_frame", "hist_n")
+
+    def __init__(self, ids, cls_ids, scores, xyxy, cxy, vxy, ages, hits,
+                 time_since_update, capture_t, hist_xy=None, hist_frame=None, hist_n=None):
+        self.ids = ids                      # [N] int64
+        self.cls_ids = cls_ids              # [N] int64
+        self.scores = scores                # [N] float64
+        self.xyxy = xyxy                    # [N, 4] full-frame px
+        self.cxy = cxy                      # [N, 2] centroid px
+        self.vxy = vxy                      # [N, 2] px/frame
+        self.ages = ages                    # [N] int64
+        self.hits = hits                    # [N] int64
+        self.time_since_update = time_since_update  # [N] int64
+        self.capture_t = capture_t          # [N] float64, NaN = None
+        # Centroid history ring (unordered; the newest min(n, H) samples are valid)
+        n = len(ids)
+        self.hist_xy = np.zeros((n, 0, 2)) if hist_xy is None else hist_xy    # [N, H, 2]
+        self.hist_frame = np.zeros((n, 0)) if hist_frame is None else hist_frame  # [N, H]
+        self.hist_n = np.zeros(n, dtype=np.int64) if hist_n is None else hist_n  # samples pushed
+
+    @classmethod
+    def empty(cls) -> "TrackBatch":
+        return cls.from_tracks(())
+
+    @classmethod
+    def from_tracks(cls, tracks: Sequence) -> "TrackBatch":
+        """Columns of any ``Track``-like objects (``contracts.Track``, views); no
+        position history."""
+        if isinstance(tracks, TrackBatch):
+            return tracks
+        tracks = list(tracks)
+        n = len(tracks)
+        ints = np.array([(t.id, t.cls_id, t.age, t.hits, t.time_since_update)
+                         for t in tracks], dtype=np.int64).reshape(n, 5)
+        floats = np.array([(t.score, *t.xyxy, t.cx, t.cy, t.vx, t.vy,
+                            _NO_TIME if t.capture_t is None else t.capture_t)
+                           for t in tracks], dtype=np.float64).reshape(n, 10)
+        return cls(ints[:, 0], ints[:, 1], floats[:, 0], floats[:, 1:5], floats[:, 5:7],
+                   floats[:, 7:9], ints[:, 2], ints[:, 3], ints[:, 4], floats[:, 9])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i: int) -> "TrackView":
+        n = len(self.ids)
+        if not -n <= i < n:
+            raise IndexError("track index out of range")
+        return TrackView(self, i % n)
+
+    def __iter__(self) -> Iterator["TrackView"]:
+        return (TrackView(self, i) for i in range(len(self.ids)))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (TrackBatch, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return "TrackBatch(%r)" % list(self)
+
+    def find(self, track_id: int) -> Optional["TrackView"]:
+        """The row of ``track_id``, or None."""
+        hit = np.flatnonzero(self.ids == track_id)
+        return TrackView(self, int(hit[0])) if hit.size else None
+
+    def rows(self, index) -> "TrackBatch":
+        """A sub-batch (boolean mask or integer index)."""
+        return TrackBatch(*(getattr(self, name)[index] for name in TrackBatch.__slots__))
+
+
+class TrackView:
+    """One ``TrackBatch`` row with the ``contracts.Track`` fields (read-only)."""
+
+    __slots__ = ("_batch", "_i")
+
+    def __init__(self, batch: TrackBatch, i: int):
+        self._batch = batch
+        self._i = i
+
+    id = property(lambda self: int(self._batch.ids[self._i]))
+    cls_id = property(lambda self: int(self._batch.cls_ids[self._i]))
+    score = property(lambda self: float(self._batch.scores[self._i]))
+    cx = property(lambda self: float(self._batch.cxy[self._i, 0]))
+    cy = property(lambda self: float(self._batch.cxy[self._i, 1]))
+    vx = property(lambda self: float(self._batch.vxy[self._i, 0]))
+    vy = property(lambda self: float(self._batch.vxy[self._i, 1]))
+    age = property(lambda self: int(self._batch.ages[self._i]))
+    hits = property(lambda self: int(self._batch.hits[self._i]))
+    time_since_update = property(lambda self: int(self._batch.time_since_update[self._i]))
+
+    @property
+    def xyxy(self) -> Tuple[float, float, float, float]:
+        return tuple(self._batch.xyxy[self._i].tolist())
+
+    @property
+    def capture_t(self) -> Optional[float]:
+        t = float(self._batch.capture_t[self._i])
+        return None if math.isnan(t) else t
+
+    @property
+    def area_px(self) -> float:
+        x1, y1, x2, y2 = self.xyxy
+        return max(0.0, x2 - x1) * max(0.0, y2 - y1)
+
+    def __eq__(self, other) -> bool:
+        try:
+            return all(getattr(self, n) == getattr(other, n) for n in _FIELDS)
+        except AttributeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return "TrackView(%s)" % ", ".join("%s=%r" % (n, getattr(self, n)) for n in _FIELDS)
+
+
+_FIELDS = ("id", "cls_id", "score", "xyxy", "cx", "cy", "vx", "vy", "age", "hits",
+           "time_since_update", "capture_t")
+
+
+class TrackTable:
+    """Slot-indexed track columns with free-list slot reuse.
+
+    ``live`` marks the slots in use; ``active`` lists them in id (creation) order,
+    the order trackers associate and return tracks in. ``extra`` adds per-track
+    columns by name -> row shape (e.g. a Kalman state ``(4,)`` and covariance
+    ``(4, 4)``), reachable as ``table.extra[name]``.
+
+    With ``history`` > 0 every track also keeps a ring of its last ``history``
+    centroids, each stamped with the tracker's frame clock ``frame`` (which the
+    tracker advances), for the lead predictor's path fit.
+    """
+
+    def __init__(self, capacity: int = 64, extra: Optional[Dict[str, Tuple[int, ...]]] = None,
+                 history: int = 0):
+        self._extra_shapes = dict(extra or {})
+        self.frame = 0
+        self.hist_xy = np.zeros((0, history, 2))
+        self.hist_frame = np.zeros((0, history))
+        self.hist_n = np.zeros(0, dtype=np.int64)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.cls_ids = np.zeros(0, dtype=np.int64)
+        self.scores = np.zeros(0)
+        self.xyxy = np.zeros((0, 4))
+        self.cxy = np.zeros((0, 2))
+        self.vxy = np.zeros((0, 2))
+        self.ages = np.zeros(0, dtype=np.int64)
+        self.hits = np.zeros(0, dtype=np.int64)
+        self.time_since_update = np.zeros(0, dtype=np.int64)
+        self.capture_t = np.zeros(0)
+        self.live = np.zeros(0, dtype=bool)
+        self.extra: Dict[str, np.ndarray] = {
+            name: np.zeros((0,) + shape) for name, shape in self._extra_shapes.items()}
+        self._free: List[int] = []
+        self._next_id = 1
+        self._grow(max(1, capacity))
+
+    @property
+    def capacity(self) -> int:
+        return len(self.live)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.live))
+
+    @property
+    def history(self) -> int:
+        return self.hist_xy.shape[1]
+
+    def reset(self) -> None:
+        self.live[:] = False
+        self._free = list(range(self.capacity - 1, -1, -1))
+        self._next_id = 1
+        self.frame = 0
+
+    def set_history(self, history: int) -> None:
+        """Resize the centroid rings; every track's history starts over."""
+        if history != self.history:
+            self.hist_xy = np.zeros((self.capacity, history, 2))
+            self.hist_frame = np.zeros((self.capacity, history))
+            self.hist_n[:] = 0
+
+    def active(self) -> np.ndarray:
+        """Live slots, oldest track first."""
+        slots = np.flatnonzero(self.live)
+        return slots[np.argsort(self.ids[slots], kind="stable")]
+
+    def spawn(self, detections: Sequence[Detection], capture_t: Optional[float]) -> np.ndarray:
+        """New tentative tracks (hits = age = 1) for ``detections``; their slots."""
+        n = len(detections)
+        if n > len(self._free):
+            self._grow(max(self.capacity * 2, self.capacity + n))
+        slots = np.array([self._free.pop() for _ in range(n)], dtype=np.intp)
+        self.ids[slots] = np.arange(self._next_id, self._next_id + n)
+        self._next_id += n
+        self.cls_ids[slots] = [d.cls_id for d in detections]
+        self.scores[slots] = [d.score for d in detections]
+        self.xyxy[slots] = [d.xyxy for d in detections]
+        self.cxy[slots] = [(d.cx, d.cy) for d in detections]
+        self.vxy[slots] = 0.0
+        self.ages[slots] = 1
+        self.hits[slots] = 1
+        self.time_since_update[slots] = 0
+        self.capture_t[slots] = _NO_TIME if capture_t is None else capture_t
+        self.live[slots] = True
+        self.hist_n[slots] = 0
+        self._record(slots)
+        return slots
+
+    def mark_matched(self, slots: np.ndarray, capture_t: Optional[float]) -> None:
+        """Count a hit on ``slots`` (their box / centre / velocity already set)."""
+        self.hits[slots] += 1
+        self.ages[slots] += 1
+        self.time_since_update[slots] = 0
+        self.capture_t[slots] = _NO_TIME if capture_t is None else capture_t
+        self._record(slots)
+
+    def mark_missed(self, slots: np.ndarray) -> None:
+        self.time_since_update[slots] += 1
+        self.ages[slots] += 1
+
+    def release(self, slots: np.ndarray) -> None:
+        """Free ``slots`` for reuse."""
+        self.live[slots] = False
+        self._free.extend(np.asarray(slots).tolist()[::-1])
+
+    def snapshot(self, slots: np.ndarray) -> TrackBatch:
+        """An immutable copy of the rows at ``slots``."""
+        return TrackBatch(self.ids[slots], self.cls_ids[slots], self.scores[slots],
+                          self.xyxy[slots], self.cxy[slots], self.vxy[slots],
+                          self.ages[slots], self.hits[slots],
+                          self.time_since_update[slots], self.capture_t[slots],
+                          self.hist_xy[slots], self.hist_frame[slots], self.hist_n[slots])
+
+    def _record(self, slots: np.ndarray) -> None:
+        """Push the current centroid of ``slots`` into their history rings."""
+        if not self.history:
+            return
+        at = self.hist_n[slots] % self.history
+        self.hist_xy[slots, at] = self.cxy[slots]
+        self.hist_frame[slots, at] = self.frame
+        self.hist_n[slots] += 1
+
+    def _grow(self, capacity: int) -> None:
+        old = self.capacity
+        for name in ("ids", "cls_ids", "scores", "xyxy", "cxy", "vxy", "ages", "hits",
+                     "time_since_update", "capture_t", "live", "hist_xy", "hist_frame",
+                     "hist_n"):
+            setattr(self, name, _resized(getattr(self, name), capacity))
+        for name, col in self.extra.items():
+            self.extra[name] = _resized(col, capacity)
+        # pop() hands out the lowest free slot first
+        self._free = list(range(capacity - 1, old - 1, -1)) + self._free
+
+
+def _resized(col: np.ndarray, rows: int) -> np.ndarray:
+    out = np.zeros((rows,) + col.shape[1:], dtype=col.dtype)
+    out[:len(col)] = col
+    return out
@@ -1,54 +1,59 @@
-"""Lightweight multi-object tracker: greedy IoU association + constant-velocity.
+"""Lightweight multi-object tracker: IoU association + constant-velocity.
 
 Chosen over ByteTrack for P1: zero extra deps, pure Python/NumPy, Python-3.9 clean,
 and fully unit-testable on the Mac. It works with **any** ``Detection`` source, so
 swapping in ByteTrack later (if the chosen detector integrates it cleanly) is a
 ``track/`` change that leaves strategy/aim untouched. Velocity (px/frame) is an
 EMA-smoothed finite difference, feeding the lead predictor.
+
+Association scores all tracks against all detections as one NumPy IoU matrix
+(``track.assign``) and pairs them greedily (highest IoU first) or, with
+``tracker.assignment: optimal``, for the largest total IoU.
+
+Tracks live in a ``track.table.TrackTable`` (one NumPy column per field, slots
+reused through a free list) and every frame's matched rows are updated in one
+vector op. ``update`` returns a ``TrackBatch`` snapshot: columns for strategy /
+control, ``Track``-shaped rows when iterated. With ``history_frames`` each track also
+keeps its last detected centroids for ``track.predict``'s path-fitting models.
 """
 from __future__ import annotations
 
-from typing import List, Sequence
-
-from contracts import Detection, Track
+from typing import Optional, Sequence
 
+import numpy as np
 
-def _iou(a, b) -> float:
-    ax1, ay1, ax2, ay2 = a
-    bx1, by1, bx2, by2 = b
-    ix1 = max(ax1, bx1)
-    iy1 = max(ay1, by1)
-    ix2 = min(ax2, bx2)
-    iy2 = min(ay2, by2)
-    iw = max(0.0, ix2 - ix1)
-    ih = max(0.0, iy2 - iy1)
-    inter = iw * ih
-    area_a = max(0.0, ax2 - ax1) * max(0.0, ay2 - ay1)
-    area_b = max(0.0, bx2 - bx1) * max(0.0, by2 - by1)
-    union = area_a + area_b - inter
-    return inter / union if union > 0.0 else 0.0
+from contracts import Detection, FrameEnvelope
+from track.assign import ASSIGNMENTS, iou_matrix, split_tiers
+from track.table import TrackBatch, TrackTable
 
 
 class IouTracker:
-    """Greedy IoU tracker producing stable integer track ids.
+    """IoU tracker producing stable integer track ids.
 
     A track is *returned* (active) once it reaches ``min_hits`` and while it has
     been seen within ``max_age_frames`` — so a briefly-occluded target keeps its
     id and the predictor can extrapolate across the gap.
+
+    With ``high_score_threshold`` > 0 association runs in two stages (ByteTrack):
+    detections at or above it are matched and spawn tracks as usual; the rest are
+    then matched against the confirmed tracks still unmatched and never spawn one,
+    so a bird dimming while it banks or flies into the sun keeps its id.
     """
 
     def __init__(self, iou_match_threshold: float = 0.3, max_age_frames: int = 30,
-                 min_hits: int = 3, velocity_smoothing: float = 0.5):
+                 min_hits: int = 3, velocity_smoothing: float = 0.5,
+                 assignment: str = "greedy", high_score_threshold: float = 0.0,
+                 history_frames: int = 0):
         self.iou_threshold = iou_match_threshold
         self.max_age_frames = max_age_frames
         self.min_hits = min_hits
         self.alpha = velocity_smoothing
-        self._tracks: List[Track] = []
-        self._next_id = 1
+        self.assignment = assignment
+        self.high_score_threshold = high_score_threshold
+        self._table = TrackTable(history=history_frames)
 
     def reset(self) -> None:
-        self._tracks = []
-        self._next_id = 1
+        self._table.reset()
 
     def apply_config(self, cfg) -> None:
         """Adopt new tracker tunables live (next ``update`` uses them)."""
@@ -56,76 +61,76 @@ class IouTracker:
         self.max_age_frames = cfg.max_age_frames
         self.min_hits = cfg.min_hits
         self.alpha = cfg.velocity_smoothing
-
-    def update(self, detections: Sequence[Detection]) -> List[Track]:
-        detections = list(detections)
-        matches = self._match(detections)
-
-        matched_tracks = set()
-        matched_dets = set()
-        for ti, di in matches:
-            self._update_track(self._tracks[ti], detections[di])
-            matched_tracks.add(ti)
-            matched_dets.add(di)
+        self.assignment = cfg.assignment
+        self.high_score_threshold = cfg.high_score_threshold
+        self._table.set_history(cfg.history_frames)
+
+    def update(self, detections: Sequence[Detection],
+               frame: Optional[FrameEnvelope] = None) -> TrackBatch:
+        """Associate one frame's detections. ``frame`` (when given) stamps each
+        matched/new track with that frame's ``capture_t`` for latency-aware lead."""
+        detections, low = split_tiers(detections, self.high_score_threshold)
+        capture_t = frame.capture_t if frame is not None else None
+        table = self._table
+        table.frame += 1
+        slots = table.active()
+        matches = self._match(table.xyxy[slots], detections)
+        rows = np.array([m[0] for m in matches], dtype=np.intp)
+        self._apply(slots[rows], matches, detections, capture_t)
+        matched = np.zeros(len(slots), dtype=bool)
+        matched[rows] = True
+
+        # Second stage: the low tier only extends confirmed tracks left unmatched.
+        if low:
+            rest = np.flatnonzero(~matched & (table.hits[slots] >= self.min_hits))
+            pairs = self._match(table.xyxy[slots[rest]], low)
+            rows = rest[np.array([p[0] for p in pairs], dtype=np.intp)]
+            self._apply(slots[rows], pairs, low, capture_t)
+            matched[rows] = True
 
         # Age unmatched tracks.
-        for ti, track in enumerate(self._tracks):
-            if ti not in matched_tracks:
-                track.time_since_update += 1
-                track.age += 1
+        table.mark_missed(slots[~matched])
 
         # Spawn tracks for unmatched detections.
-        for di, det in enumerate(detections):
-            if di not in matched_dets:
-                self._tracks.append(self._new_track(det))
+        used = {m[1] for m in matches}
+        new = [d for i, d in enumerate(detections) if i not in used]
+        if new:
+            table.spawn(new, capture_t)
 
         # Drop stale tracks.
-        self._tracks = [t for t in self._tracks
-                        if t.time_since_update <= self.max_age_frames]
+        slots = table.active()
+        stale = table.time_since_update[slots] > self.max_age_frames
+        if stale.any():
+            table.release(slots[stale])
+            slots = slots[~stale]
 
-        return [t for t in self._tracks if t.hits >= self.min_hits]
+        return table.snapshot(slots[table.hits[slots] >= self.min_hits])
 
     @property
-    def tracks(self) -> List[Track]:
+    def tracks(self) -> TrackBatch:
         """All live tracks (including tentative ones below min_hits)."""
-        return list(self._tracks)
-
-    def _match(self, detections: Sequence[Detection]):
-        candidates = []
-        for ti, track in enumerate(self._tracks):
-            for di, det in enumerate(detections):
-                iou = _iou(track.xyxy, det.xyxy)
-                if iou >= self.iou_threshold:
-                    candidates.append((iou, ti, di))
-        candidates.sort(reverse=True)  # highest IoU first
-        used_t, used_d = set(), set()
-        matches = []
-        for _, ti, di in candidates:
-            if ti in used_t or di in used_d:
-                continue
-            used_t.add(ti)
-            used_d.add(di)
-            matches.append((ti, di))
-        return matches
-
-    def _new_track(self, det: Detection) -> Track:
-        track = Track(
-            id=self._next_id, cls_id=det.cls_id, score=det.score, xyxy=det.xyxy,
-            cx=det.cx, cy=det.cy, vx=0.0, vy=0.0, age=1, hits=1, time_since_update=0,
-        )
-        self._next_id += 1
-        return track
-
-    def _update_track(self, track: Track, det: Detection) -> None:
-        steps = track.time_since_update + 1  # frames since last position update
-        inst_vx = (det.cx - track.cx) / steps
-        inst_vy = (det.cy - track.cy) / steps
-        track.vx = self.alpha * inst_vx + (1.0 - self.alpha) * track.vx
-        track.vy = self.alpha * inst_vy + (1.0 - self.alpha) * track.vy
-        track.cx, track.cy = det.cx, det.cy
-        track.xyxy = det.xyxy
-        track.score = det.score
-        track.cls_id = det.cls_id
-        track.hits += 1
-        track.age += 1
-        track.time_since_update = 0
+        return self._table.snapshot(self._table.active())
+
+    def _match(self, boxes: np.ndarray, detections: Sequence[Detection]):
+        """(row of ``boxes``, detection index) pairs; ``boxes`` is ``[N, 4]`` xyxy."""
+        if not len(boxes) or not detections:
+            return []
+        iou = iou_matrix(boxes, np.asarray([d.xyxy for d in detections], dtype=np.float64))
+        return ASSIGNMENTS[self.assignment](iou, self.iou_threshold)
+
+    def _apply(self, slots: np.ndarray, matches, detections: Sequence[Detection],
+               capture_t: Optional[float]) -> None:
+        """Update the table rows ``slots`` with their matched detections."""
+        if not matches:
+            return
+        dets = [detections[m[1]] for m in matches]
+        t = self._table
+        centres = np.array([(d.cx, d.cy) for d in dets], dtype=np.float64)
+        steps = (t.time_since_update[slots] + 1)[:, None]  # frames since last position update
+        inst = (centres - t.cxy[slots]) / steps
+        t.vxy[slots] = self.alpha * inst + (1.0 - self.alpha) * t.vxy[slots]
+        t.cxy[slots] = centres
+        t.xyxy[slots] = [d.xyxy for d in dets]
+        t.scores[slots] = [d.score for d in dets]
+        t.cls_ids[slots] = [d.cls_id for d in dets]
+        t.mark_matched(slots, capture_t)